@@ -7,52 +7,47 @@
 # PAYPAL DONATION : (if you like it and want to support me)
 # https://www.paypal.com/donate/?hosted_button_id=LAMNRY6DDWDC4
 # ==========================
+# The inspector window. Everything that reads 3ds Max (class scans,
+# caches, inspectors, exports, snapshots, profiling) lives in the
+# max_inspector package next to this file, which does not need Qt.
+# Dialogs and the engine parts only they use are imported when opened.
+
+import os
+import re
+import sys
+import time
 
-from PySide6 import QtWidgets, QtCore, QtGui
 import pymxs
-import json
-import os 
 
-rt = pymxs.runtime
+try:
+    _script_dir = os.path.dirname(os.path.realpath(__file__))
+except NameError:
+    _script_dir = os.path.dirname(pymxs.runtime.getSourceFileName() or "")
+if _script_dir and _script_dir not in sys.path:
+    sys.path.insert(0, _script_dir)
 
-print(f"--- PYTHON DEBUG: Script file loaded. 'rt' object should be: {rt} ---")
+if __name__ == "__main__":
+    # Re-running the script in the same 3ds Max session picks up edits to the package
+    for _name in [n for n in sys.modules if n == "max_inspector" or n.startswith("max_inspector.")]:
+        del sys.modules[_name]
 
-def safe_repr(val):
-    try:
-        s = str(val)
-        # More robust check for maxscript 'undefined'
-        if s in ("undefined", "<undefined>", "Undef"):
-            return ""
-        return s
-    except Exception:
-        return "<unreadable>"
+from PySide6 import QtWidgets, QtCore, QtGui
 
-def get_type_name(val):
-    try:
-        try:
-            cls = rt.classOf(val)
-            return str(cls)
-        except Exception:
-            return type(val).__name__
-    except Exception:
-        return "unknown"
-
-def try_classid(obj):
-    try:
-        try:
-            cid = rt.classID(obj)
-            return safe_repr(cid)
-        except Exception:
-            pass
-        try:
-            cid = getattr(obj, "classID", None)
-            if cid is not None:
-                return safe_repr(cid)
-        except Exception:
-            pass
-    except Exception:
-        pass
-    return "<unknown>"
+from max_inspector import inspectors
+from max_inspector.batch import BATCH_SCOPES, BatchRecordSource, iter_batch_export, open_batch_writer
+from max_inspector.bulk import get_bulk_helpers
+from max_inspector.cache import LayeredClassCache, read_json_class_cache
+from max_inspector.index import ClassLookupIndex, ClassSearchIndex, ClassTable, group_class_rows, prepare_class_rows
+from max_inspector.profiling import Profiler, active_profiler, disable_profiling, profile_scope
+from max_inspector.properties import PropertySchemaCache, property_snapshot
+from max_inspector.results import InspectionCache
+from max_inspector.runtime import rt, get_type_name, safe_repr
+from max_inspector.scan import (diff_class_fingerprint, get_class_fingerprint, get_scan_categories,
+                                iter_class_fingerprint, iter_class_scan)
+from max_inspector.scene import SCENE_PAGE_SIZE, SCENE_REBUILD_THRESHOLD, SceneTreeSource, get_node_by_handle
+from max_inspector.snapshots import SnapshotWriter, iter_capture_snapshot
+from max_inspector.ui.base import (ROW_ID_ROLE, ClassGroupModel, ClassListModel, ClassRowsProxyModel,
+                                   CooperativeJob, ReportBuffer, SceneEventWatcher)
 
 class MaxInspector(QtWidgets.QWidget):
     def __init__(self):
@@ -69,20 +64,51 @@ class MaxInspector(QtWidgets.QWidget):
                     os.makedirs("c:/temp")
                 script_path = "c:/temp/max_inspector.py"
                 
-        self._cache_file_path = os.path.join(os.path.dirname(script_path), "max_classes_cache.json")
+        self._cache_file_path = os.path.join(os.path.dirname(script_path), "max_classes_cache.bin")
+        # Shared by every session using this script folder; a per-user overlay
+        # takes the saves when the folder is read-only (network installs)
+        self._class_cache = LayeredClassCache(self._cache_file_path)
+        # Legacy JSON cache, migrated to the binary format on first load
+        self._json_cache_file_path = os.path.join(os.path.dirname(script_path), "max_classes_cache.json")
+        # File stats of the last asset audits, so re-audits only touch changed files
+        self._asset_cache_file_path = os.path.join(os.path.dirname(script_path), "max_assets_cache.json")
         # --- END CACHE ---
         
         self.setWindowTitle("3DS Max Inspector Script Helper")
         self.setMinimumSize(1000, 800)
-        self._all_classes = []  # list of (name, super, classid, plugin)
+        self._all_classes = ClassTable()  # (name, super, classid, plugin) rows, stored by column
         self._by_super = {}
         self._by_plugin = {}
+        self._search_index = None  # built on first search after each populate
+        self._lookup_index = ClassLookupIndex([])
+        self._bulk_scan = True  # one MAXScript call per category instead of per class
+        self._scan_job = None
+        self._cache_fingerprint = {}  # plugin files + category counts of the cached scan
+        self._staleness_job = None  # startup comparison of the cache fingerprint with the session
+        self._schema_cache = PropertySchemaCache()
+        self._inspection_cache = InspectionCache()  # report lines per node, dropped by node change callbacks
+        self._batch_job = None
+        self._snapshot_job = None
+        self._asset_job = None
+        self._asset_cache = None  # AssetStatCache, loaded on the first audit
+        self._profiler_dialog = None
         
         self.build_ui()
         self.populate_tree()
+
+        # --- Keep the scene tree in sync without full refreshes ---
+        self._scene_watcher = SceneEventWatcher(parent=self)
+        self._scene_watcher.changed.connect(self.apply_scene_changes)
+        self._scene_watcher.modified.connect(self._inspection_cache.invalidate)
+        try:
+            self._scene_watcher.start()
+        except Exception as e:
+            self.log(f"--- PYTHON: Scene change callbacks unavailable ({e}). Use 'Refresh Scene'. ---")
+            self._inspection_cache = None  # nothing would tell it about edits
         
         # --- Auto-load from cache on startup ---
-        self.load_from_cache()
+        if self.load_from_cache():
+            self.check_cache_staleness()
 
     def build_ui(self):
         main_layout = QtWidgets.QVBoxLayout(self)
@@ -92,6 +118,7 @@ class MaxInspector(QtWidgets.QWidget):
         self.tree = QtWidgets.QTreeWidget()
         self.tree.setHeaderHidden(True)
         self.tree.itemClicked.connect(self.on_item_clicked)
+        self.tree.itemExpanded.connect(self.on_tree_item_expanded)
         self.tree.setMinimumWidth(300)
         top_layout.addWidget(self.tree, 2)
 
@@ -101,19 +128,23 @@ class MaxInspector(QtWidgets.QWidget):
         self.btn_refresh = QtWidgets.QPushButton("Refresh Scene")
         self.btn_select_current = QtWidgets.QPushButton("Select Current Object")
         
-        self.btn_load_classes = QtWidgets.QPushButton("Re-Scan All Classes (Slow)")
+        self.btn_load_classes = QtWidgets.QPushButton("Re-Scan All Classes")
         self.btn_load_classes.setStyleSheet("background-color: #FFFFFF; color: #000000;") 
+        self.btn_update_classes = QtWidgets.QPushButton("Update Classes")
+        self.btn_update_classes.setToolTip("Re-scan only the categories whose plugins or class counts changed")
         
         self.btn_clear = QtWidgets.QPushButton("Clear Report")
         btns_layout.addWidget(self.btn_refresh)
         btns_layout.addWidget(self.btn_select_current)
         btns_layout.addWidget(self.btn_load_classes)
+        btns_layout.addWidget(self.btn_update_classes)
         btns_layout.addWidget(self.btn_clear)
         center_layout.addLayout(btns_layout)
 
-        self.report = QtWidgets.QTextEdit()
+        self.report = QtWidgets.QPlainTextEdit()
         self.report.setReadOnly(True)
-        self.report.setLineWrapMode(QtWidgets.QTextEdit.NoWrap)
+        self.report.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.report_buffer = ReportBuffer(self.report, parent=self)
         font = self.report.font()
         font.setPointSize(10)
         self.report.setFont(font)
@@ -125,22 +156,31 @@ class MaxInspector(QtWidgets.QWidget):
         label = QtWidgets.QLabel("Classes")
         right_layout.addWidget(label)
 
+        # One shared model holds every class row; tabs are views over it
+        self.class_model = ClassListModel(self)
+        self.super_group_model = ClassGroupModel(self.class_model, "SuperClass -> Class", self)
+        self.plugin_group_model = ClassGroupModel(self.class_model, "Plugin -> Class", self)
+
+        def create_class_tree(model):
+            tree = QtWidgets.QTreeView()
+            tree.setUniformRowHeights(True)
+            tree.setModel(model)
+            tree.clicked.connect(self.on_class_tree_clicked)
+            tree.doubleClicked.connect(self.copy_class_item)
+            return tree
+
         self.classes_tabs = QtWidgets.QTabWidget()
         # Tab 1: By SuperClass (Tree)
         self.tab_super = QtWidgets.QWidget()
         t1_layout = QtWidgets.QVBoxLayout(self.tab_super)
-        self.tree_by_super = QtWidgets.QTreeWidget()
-        self.tree_by_super.setHeaderLabels(["SuperClass -> Class"])
-        self.tree_by_super.itemClicked.connect(self.on_class_tree_clicked)
+        self.tree_by_super = create_class_tree(self.super_group_model)
         t1_layout.addWidget(self.tree_by_super)
         self.classes_tabs.addTab(self.tab_super, "By SuperClass")
 
         # Tab 2: By Plugin (Tree)
         self.tab_plugin = QtWidgets.QWidget()
         t2_layout = QtWidgets.QVBoxLayout(self.tab_plugin)
-        self.tree_by_plugin = QtWidgets.QTreeWidget()
-        self.tree_by_plugin.setHeaderLabels(["Plugin -> Class"])
-        self.tree_by_plugin.itemClicked.connect(self.on_class_tree_clicked)
+        self.tree_by_plugin = create_class_tree(self.plugin_group_model)
         t2_layout.addWidget(self.tree_by_plugin)
         self.classes_tabs.addTab(self.tab_plugin, "By Plugin")
 
@@ -150,42 +190,67 @@ class MaxInspector(QtWidgets.QWidget):
         search_row = QtWidgets.QHBoxLayout()
         self.class_search = QtWidgets.QLineEdit()
         self.class_search.setPlaceholderText("Search classes...")
-        self.class_search.textChanged.connect(self.filter_all_classes)
+        # Debounce typing: the filter runs once the user pauses
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(120)
+        self._search_timer.timeout.connect(lambda: self.filter_all_classes(self.class_search.text()))
+        self.class_search.textChanged.connect(self._search_timer.start)
         self.btn_copy_class = QtWidgets.QPushButton("Copy Selected")
         self.btn_copy_class.clicked.connect(self.copy_selected_class)
         search_row.addWidget(self.class_search)
         search_row.addWidget(self.btn_copy_class)
         t3_layout.addLayout(search_row)
-        self.class_list = QtWidgets.QListWidget()
-        self.class_list.itemClicked.connect(self.on_class_list_clicked)
-        self.class_list.itemDoubleClicked.connect(self.copy_class_item)
+        # Helper function to create a list view over a model
+        def create_class_list(model):
+            class_list = QtWidgets.QListView()
+            class_list.setUniformItemSizes(True)
+            class_list.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+            class_list.setModel(model)
+            class_list.clicked.connect(self.on_class_list_clicked)
+            class_list.doubleClicked.connect(self.copy_class_item)
+            return class_list
+
+        self.all_classes_proxy = ClassRowsProxyModel(self.class_model, self)
+        self.class_list = create_class_list(self.all_classes_proxy)
         t3_layout.addWidget(self.class_list)
         self.classes_tabs.addTab(self.tab_all, "All Classes")
 
         # Helper function to create a new tab with a list
-        def create_class_tab(name, tooltip):
+        def create_class_tab(name, tooltip, model):
             tab = QtWidgets.QWidget()
             layout = QtWidgets.QVBoxLayout(tab)
             layout.setContentsMargins(2, 2, 2, 2) # Make it tight
-            class_list = QtWidgets.QListWidget()
-            class_list.itemClicked.connect(self.on_class_list_clicked)
-            class_list.itemDoubleClicked.connect(self.copy_class_item)
+            class_list = create_class_list(model)
             layout.addWidget(class_list)
             self.classes_tabs.addTab(tab, name)
             self.classes_tabs.setTabToolTip(self.classes_tabs.count() - 1, tooltip)
             return class_list
 
-        self.list_superclasses = create_class_tab("SuperClasses", "Core MaxScript SuperClasses (classOf, superClassOf, ...)")
-        self.list_geometry = create_class_tab("Geometry", "geometry.classes (Box, Sphere, Editable_Poly...)")
-        self.list_shapes = create_class_tab("Shapes", "shape.classes (Line, Circle, Text...)")
-        self.list_lights = create_class_tab("Lights", "light.classes (Omni, Spot, VrayLight...)")
-        self.list_cameras = create_class_tab("Cameras", "camera.classes (FreeCamera, TargetCamera...)")
-        self.list_helpers = create_class_tab("Helpers", "helper.classes (Point, Dummy, Protractor...)")
-        self.list_modifiers = create_class_tab("Modifiers", "modifier.classes (Bend, UVW_Map, Edit_Poly...)")
-        self.list_spacewarps = create_class_tab("SpaceWarps", "spacewarp.classes (Gravity, Wind, Displace...)")
-        self.list_materials = create_class_tab("Materials", "material.classes (Standard, Physical, VrayMtl...)")
-        self.list_textures = create_class_tab("Textures", "textureMap.classes (Bitmap, Noise, Gradient...)")
-        self.list_effects = create_class_tab("RenderFX", "renderEffect.classes (Blur, File_Output, VrayDenoiser...)")
+        # (We still populate SuperClasses manually)
+        super_list = ["Node", "GeometryClass", "Shape", "Light", "Camera", "Helper", 
+                      "Modifier", "SpacewarpObject", "Material", "TextureMap", 
+                      "RenderEffect", "Controller", "Texmap", "Mtl", "Atmospheric", 
+                      "maxObject", "Value"]
+        self.superclass_model = QtCore.QStringListModel(sorted(super_list, key=lambda x: x.lower()), self)
+        self.list_superclasses = create_class_tab("SuperClasses", "Core MaxScript SuperClasses (classOf, superClassOf, ...)", self.superclass_model)
+
+        # Category tabs: one row-id proxy per superclass over the shared model
+        self.category_proxies = {}
+        def create_category_tab(sc, name, tooltip):
+            proxy = self.category_proxies[sc] = ClassRowsProxyModel(self.class_model, self)
+            return create_class_tab(name, tooltip, proxy)
+
+        self.list_geometry = create_category_tab("GeometryClass", "Geometry", "geometry.classes (Box, Sphere, Editable_Poly...)")
+        self.list_shapes = create_category_tab("Shape", "Shapes", "shape.classes (Line, Circle, Text...)")
+        self.list_lights = create_category_tab("Light", "Lights", "light.classes (Omni, Spot, VrayLight...)")
+        self.list_cameras = create_category_tab("Camera", "Cameras", "camera.classes (FreeCamera, TargetCamera...)")
+        self.list_helpers = create_category_tab("Helper", "Helpers", "helper.classes (Point, Dummy, Protractor...)")
+        self.list_modifiers = create_category_tab("Modifier", "Modifiers", "modifier.classes (Bend, UVW_Map, Edit_Poly...)")
+        self.list_spacewarps = create_category_tab("SpacewarpObject", "SpaceWarps", "spacewarp.classes (Gravity, Wind, Displace...)")
+        self.list_materials = create_category_tab("Material", "Materials", "material.classes (Standard, Physical, VrayMtl...)")
+        self.list_textures = create_category_tab("TextureMap", "Textures", "textureMap.classes (Bitmap, Noise, Gradient...)")
+        self.list_effects = create_category_tab("RenderEffect", "RenderFX", "renderEffect.classes (Blur, File_Output, VrayDenoiser...)")
 
         right_layout.addWidget(self.classes_tabs, 3)
 
@@ -204,20 +269,41 @@ class MaxInspector(QtWidgets.QWidget):
         self.progress_bar = QtWidgets.QProgressBar()
         self.progress_bar.setVisible(False) # Hide it by default
         self.progress_bar.setAlignment(QtCore.Qt.AlignCenter)
-        main_layout.addWidget(self.progress_bar)
+        self.btn_cancel_job = QtWidgets.QPushButton("Cancel")
+        self.btn_cancel_job.setVisible(False)
+        progress_row = QtWidgets.QHBoxLayout()
+        progress_row.addWidget(self.progress_bar, 1)
+        progress_row.addWidget(self.btn_cancel_job)
+        main_layout.addLayout(progress_row)
         # --- END ADDED ---
 
         # Connect basic buttons
         self.btn_refresh.clicked.connect(self.populate_tree)
         self.btn_select_current.clicked.connect(self.select_current_object)
-        self.btn_clear.clicked.connect(self.report.clear)
+        self.btn_clear.clicked.connect(self.report_buffer.clear)
         self.btn_load_classes.clicked.connect(self.run_full_scan)
+        self.btn_cancel_job.clicked.connect(self.cancel_jobs)
+        self.btn_update_classes.clicked.connect(self.run_incremental_scan)
 
     def log(self, text):
-        self.report.append(text)
+        self.report_buffer.write(text)
+
+    def log_lines(self, lines):
+        """Logs every line an inspector generator yields."""
+        for text in lines:
+            self.report_buffer.write(text)
 
     def populate_tree(self):
         self.tree.clear()
+        self._schema_cache.invalidate()  # 'Refresh Scene' also forgets cached property schemas
+        if self._inspection_cache is not None:
+            self._inspection_cache.clear()  # ...and cached inspection results
+        self._scene_items = {}  # anim handle -> QTreeWidgetItem, for loaded nodes only
+        self._scene_loaded = set()  # handles whose first page of children is loaded
+        try:
+            self._scene_source = SceneTreeSource(get_bulk_helpers())
+        except Exception:
+            self._scene_source = SceneTreeSource()
         
         obj_root = QtWidgets.QTreeWidgetItem(self.tree, ["Object"])
         scene_root = QtWidgets.QTreeWidgetItem(self.tree, ["Scene"])
@@ -225,31 +311,141 @@ class MaxInspector(QtWidgets.QWidget):
         render_root = QtWidgets.QTreeWidgetItem(self.tree, ["Render / Environment"])
 
         for name in ["Properties", "Methods", "Material", "Modifiers", "Controllers",
-                     "Custom Attributes", "User Properties", "Transform Matrix", "Base Params", "Class Info"]:
+                     "Custom Attributes", "User Properties", "Transform Matrix", "Base Params", "Class Info",
+                     "Geometry", "Reference Graph", "Animation Keys"]:
             QtWidgets.QTreeWidgetItem(obj_root, [name])
 
         QtWidgets.QTreeWidgetItem(scene_root, ["All Objects (expand)"])
+        # Scene nodes are fetched page by page when their parent is expanded
         objects_container = QtWidgets.QTreeWidgetItem(scene_root, ["Objects"])
-        try:
-            for o in rt.objects:
-                try:
-                    item = QtWidgets.QTreeWidgetItem(objects_container, [safe_repr(o.name)])
-                    item.setData(0, QtCore.Qt.UserRole, ("scene_obj", o))
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        objects_container.setData(0, QtCore.Qt.UserRole, ("scene_node", 0))
+        objects_container.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+        self._objects_item = objects_container
             
-        for name in ["Scene Info", "File Info", "Units Setup", "Selection Sets"]:
+        for name in ["Scene Info", "Scene Statistics", "Asset Audit...", "File Info", "Units Setup", "Selection Sets",
+                     "Batch Export...", "Take Snapshot...", "Compare Snapshots..."]:
             QtWidgets.QTreeWidgetItem(scene_root, [name])
 
-        for name in ["gw (Graphics Window)", "callbacks", "Viewports", "Material Editor", "Plugins / Classes"]:
+        for name in ["gw (Graphics Window)", "callbacks", "Viewports", "Material Editor", "Plugins / Classes",
+                     "Profiler..."]:
             QtWidgets.QTreeWidgetItem(system_root, [name])
 
         for name in ["Render Settings", "Environment Map", "Renderers.Current", "Exposure/Color Management"]:
             QtWidgets.QTreeWidgetItem(render_root, [name])
             
-        self.tree.expandAll()
+        for root in (obj_root, scene_root, system_root, render_root):
+            root.setExpanded(True)
+        objects_container.setExpanded(True)
+
+    def on_tree_item_expanded(self, item):
+        data = item.data(0, QtCore.Qt.UserRole)
+        if not data or not isinstance(data, tuple) or data[0] not in ("scene_node", "scene_obj"):
+            return
+        handle = data[1]
+        if handle not in self._scene_loaded:
+            self._scene_loaded.add(handle)
+            self.load_scene_children(item, handle, 0)
+
+    def load_scene_children(self, parent_item, parent_handle, start):
+        """Appends one page of children under parent_item, plus a 'more' item if needed."""
+        try:
+            total, page = self._scene_source.children(parent_handle, start, SCENE_PAGE_SIZE)
+        except Exception as e:
+            self.log(f"Error reading scene children: {e}")
+            return
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for handle, name, child_count, cls in page:
+                item = QtWidgets.QTreeWidgetItem(parent_item, [name])
+                item.setData(0, QtCore.Qt.UserRole, ("scene_obj", handle))
+                item.setToolTip(0, cls)
+                if child_count:
+                    item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+                self._scene_items[handle] = item
+            remaining = total - start - len(page)
+            if remaining > 0:
+                more = QtWidgets.QTreeWidgetItem(parent_item, [f"... {remaining} more (click to load)"])
+                more.setData(0, QtCore.Qt.UserRole, ("scene_more", parent_handle, start + len(page)))
+            elif total == 0 and parent_handle != 0:
+                parent_item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
+    def apply_scene_changes(self, added, deleted, renamed):
+        """Applies one coalesced batch of scene events to the loaded part of the scene tree."""
+        if self._inspection_cache is not None:
+            self._inspection_cache.discard(deleted)
+        if len(added) + len(deleted) > SCENE_REBUILD_THRESHOLD:
+            # Huge bursts (merges, deletes of whole layers): reload lazily instead
+            self.reload_scene_objects()
+            return
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for handle in deleted:
+                item = self._scene_items.get(handle)
+                if item is not None:
+                    self.forget_scene_item(item)
+                    if item.parent() is not None:
+                        item.parent().removeChild(item)
+
+            interesting = [h for h in added if h not in self._scene_items]
+            interesting += [h for h in renamed if h in self._scene_items]
+            for handle, parent_handle, name, child_count, cls in self._scene_source.node_info(interesting):
+                item = self._scene_items.get(handle)
+                if item is not None:
+                    item.setText(0, name)
+                    continue
+                parent_item = self._scene_items.get(parent_handle) if parent_handle else self._objects_item
+                if parent_item is None:
+                    continue  # parent is not in the loaded part of the tree
+                if parent_handle not in self._scene_loaded:
+                    parent_item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+                    continue  # children will be fetched when the parent is expanded
+                item = QtWidgets.QTreeWidgetItem([name])
+                item.setData(0, QtCore.Qt.UserRole, ("scene_obj", handle))
+                item.setToolTip(0, cls)
+                if child_count:
+                    item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+                # Keep a trailing '... more' item last
+                last = parent_item.child(parent_item.childCount() - 1) if parent_item.childCount() else None
+                last_data = last.data(0, QtCore.Qt.UserRole) if last is not None else None
+                if last_data and last_data[0] == "scene_more":
+                    parent_item.insertChild(parent_item.childCount() - 1, item)
+                else:
+                    parent_item.addChild(item)
+                self._scene_items[handle] = item
+        except Exception as e:
+            self.log(f"Error applying scene changes: {e}")
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
+    def forget_scene_item(self, item):
+        """Drops an item and its loaded descendants from the handle maps."""
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            data = current.data(0, QtCore.Qt.UserRole)
+            if data and data[0] == "scene_obj":
+                self._scene_items.pop(data[1], None)
+                self._scene_loaded.discard(data[1])
+            stack.extend(current.child(i) for i in range(current.childCount()))
+
+    def reload_scene_objects(self):
+        """Drops the loaded scene nodes and re-fetches the first page of the root."""
+        for i in reversed(range(self._objects_item.childCount())):
+            self._objects_item.removeChild(self._objects_item.child(i))
+        self._scene_items = {}
+        self._scene_loaded = set()
+        if self._objects_item.isExpanded():
+            self._scene_loaded.add(0)
+            self.load_scene_children(self._objects_item, 0, 0)
+
+    def closeEvent(self, event):
+        if self._staleness_job is not None:
+            self._staleness_job.cancel()
+        self._scene_watcher.stop()
+        disable_profiling()
+        super().closeEvent(event)
 
     # --- Inspector functions (V5.9) ---
     def select_current_object(self):
@@ -265,42 +461,65 @@ class MaxInspector(QtWidgets.QWidget):
     def on_item_clicked(self, item, col):
         data = item.data(0, QtCore.Qt.UserRole)
         if data and isinstance(data, tuple) and data[0] == "scene_obj":
-            obj = data[1]
-            self.inspect_object_all(obj)
+            obj = get_node_by_handle(data[1])
+            if obj is None:
+                self.log(f"? Node '{item.text(0)}' no longer exists. Click 'Refresh Scene'.")
+                return
+            with profile_scope("Inspect Node"):
+                self.inspect_object_all(obj)
+            self.report_buffer.flush()
+            return
+        if data and isinstance(data, tuple) and data[0] == "scene_more":
+            _, parent_handle, start = data
+            parent_item = item.parent()
+            parent_item.removeChild(item)
+            self.load_scene_children(parent_item, parent_handle, start)
             return
         text = item.text(0)
         
-        try:
-            if text == "Properties": self.inspect_selected("properties")
-            elif text == "Methods": self.inspect_selected("methods")
-            elif text == "Material": self.inspect_selected("material")
-            elif text == "Modifiers": self.inspect_selected("modifiers")
-            elif text == "Controllers": self.inspect_selected("controllers")
-            elif text == "Custom Attributes": self.inspect_selected("custom_attributes")
-            elif text == "User Properties": self.inspect_selected("user_properties")
-            elif text == "Transform Matrix": self.inspect_selected("transform")
-            elif text == "Base Params": self.inspect_selected("base_params")
-            elif text == "Class Info": self.inspect_selected("class_info")
-            elif text == "All Objects (expand)": self.inspect_scene_objects()
-            elif text == "Scene Info": self.inspect_scene_info()
-            elif text == "File Info": self.inspect_file_info()
-            elif text == "Units Setup": self.inspect_units()
-            elif text == "Selection Sets": self.inspect_selection_sets()
-            elif text == "gw (Graphics Window)": self.inspect_gw()
-            elif text == "callbacks": self.inspect_callbacks()
-            elif text == "Viewports": self.inspect_viewports()
-            elif text == "Material Editor": self.inspect_material_editor()
-            elif text == "Plugins / Classes":
-                self.classes_tabs.setCurrentIndex(0)
-                self.class_list.setFocus()
-            elif text == "Render Settings": self.inspect_render_settings()
-            elif text == "Environment Map": self.inspect_environment()
-            elif text == "Renderers.Current": self.inspect_current_renderer()
-            elif text == "Exposure/Color Management": self.inspect_color_mgmt()
-            else: self.log(f"Clicked: {text}")
-        except Exception as e:
-            self.log(f"--- CRITICAL ERROR processing click for '{text}' ---")
-            self.log(f"--- {e} ---")
+        with profile_scope(text):
+            try:
+                if text == "Properties": self.inspect_selected("properties")
+                elif text == "Methods": self.inspect_selected("methods")
+                elif text == "Material": self.inspect_selected("material")
+                elif text == "Modifiers": self.inspect_selected("modifiers")
+                elif text == "Controllers": self.inspect_selected("controllers")
+                elif text == "Custom Attributes": self.inspect_selected("custom_attributes")
+                elif text == "User Properties": self.inspect_selected("user_properties")
+                elif text == "Transform Matrix": self.inspect_selected("transform")
+                elif text == "Base Params": self.inspect_selected("base_params")
+                elif text == "Class Info": self.inspect_selected("class_info")
+                elif text == "Geometry": self.inspect_selected("geometry")
+                elif text == "Reference Graph": self.inspect_selected("reference_graph")
+                elif text == "Animation Keys": self.inspect_selected("animation_keys")
+                elif text == "All Objects (expand)": self.inspect_scene_objects()
+                elif text == "Scene Info": self.inspect_scene_info()
+                elif text == "Scene Statistics": self.inspect_scene_statistics()
+                elif text == "Asset Audit...": self.run_asset_audit()
+                elif text == "File Info": self.inspect_file_info()
+                elif text == "Units Setup": self.inspect_units()
+                elif text == "Selection Sets": self.inspect_selection_sets()
+                elif text == "Batch Export...": self.run_batch_export()
+                elif text == "Take Snapshot...": self.run_take_snapshot()
+                elif text == "Compare Snapshots...": self.run_compare_snapshots()
+                elif text == "gw (Graphics Window)": self.inspect_gw()
+                elif text == "callbacks": self.inspect_callbacks()
+                elif text == "Viewports": self.inspect_viewports()
+                elif text == "Material Editor": self.inspect_material_editor()
+                elif text == "Plugins / Classes":
+                    self.classes_tabs.setCurrentIndex(0)
+                    self.class_list.setFocus()
+                elif text == "Profiler...": self.show_profiler()
+                elif text == "Render Settings": self.inspect_render_settings()
+                elif text == "Environment Map": self.inspect_environment()
+                elif text == "Renderers.Current": self.inspect_current_renderer()
+                elif text == "Exposure/Color Management": self.inspect_color_mgmt()
+                else: self.log(f"Clicked: {text}")
+            except Exception as e:
+                self.log(f"--- CRITICAL ERROR processing click for '{text}' ---")
+                self.log(f"--- {e} ---")
+            finally:
+                self.report_buffer.flush()
         
     def get_target_object(self):
         if rt.selection.count > 0: return rt.selection[0]
@@ -321,336 +540,415 @@ class MaxInspector(QtWidgets.QWidget):
         elif mode == "transform": self.inspect_transform(obj)
         elif mode == "base_params": self.inspect_base_params(obj)
         elif mode == "class_info": self.inspect_class_info(obj)
+        elif mode == "geometry": self.inspect_geometry(obj)
+        elif mode == "reference_graph": self.show_reference_graph(obj)
+        elif mode == "animation_keys": self.show_animation_keys(obj)
         
     def inspect_object_all(self, obj):
+        """
+        Runs every section of OBJECT_INSPECTORS on `obj`. Sections cached
+        for this node at the current time are replayed; only the ones a
+        node change callback invalidated since are recomputed.
+        """
         self.log(f"\n=== Inspect: {safe_repr(obj.name)} ({get_type_name(obj)}) ===")
-        self.inspect_properties(obj); self.inspect_material(obj); self.inspect_modifiers(obj)
-        self.inspect_controllers(obj); self.inspect_methods(obj); self.inspect_class_info(obj)
-        self.inspect_base_params(obj); self.inspect_custom_attributes(obj); self.inspect_user_properties(obj)
+        cache = self._inspection_cache
+        if cache is not None:
+            handle, now = int(rt.getHandleByAnim(obj)), safe_repr(rt.currentTime)
+        for name, inspect in inspectors.OBJECT_INSPECTORS:
+            lines = cache.get(handle, name, now) if cache is not None else None
+            if lines is None:
+                with profile_scope(name):
+                    if inspect is inspectors.inspect_class_info:
+                        lines = list(inspect(obj, self._lookup_index, self._all_classes))
+                    else:
+                        lines = list(inspect(obj, self.read_properties))
+                if cache is not None:
+                    cache.put(handle, name, now, lines)
+            self.log_lines(lines)
         self.log("\n")
         
-    def inspect_properties(self, obj):
-        self.log(f"\n--- Properties of {safe_repr(obj.name)} ---")
-        try: names = rt.getPropNames(obj)
-        except Exception: names = []
-        for p in names:
-            try:
-                val = rt.getProperty(obj, p); t = get_type_name(val); rep = safe_repr(val)
-                self.log(f"{p} ({t}) = {rep}")
-            except Exception: self.log(f"{p} (unknown) = <unreadable>")
-        if not names: self.log("<no properties found or unreadable>"); self.log("")
-        
-    def inspect_methods(self, obj):
-        self.log(f"\n--- Methods of {safe_repr(obj.name)} ---")
-        try:
-            for m in rt.getMethods(obj): self.log(str(m))
-        except Exception: 
-            self.log("<unable to retrieve methods (rt.getMethods failed)>"); 
-        self.log("")
-        
-    def inspect_material(self, obj):
-        self.log(f"\n--- Material of {safe_repr(obj.name)} ---")
-        try:
-            mat = obj.material
-            if not mat: self.log("No Material assigned!"); return
-            self.log(f"Material: {safe_repr(mat)} ({get_type_name(mat)})")
-            try: props = rt.getPropNames(mat)
-            except Exception: props = []
-            for p in props:
-                try: v = rt.getProperty(mat, p); self.log(f"{p} ({get_type_name(v)}) = {safe_repr(v)}")
-                except Exception: self.log(f"{p} = <unreadable>")
-        except Exception as e: self.log("Error reading material: " + str(e)); self.log("")
-        
-    def inspect_modifiers(self, obj):
-        self.log(f"\n--- Modifiers on {safe_repr(obj.name)} ---")
-        try:
-            try: mods = list(obj.modifiers)
-            except Exception: mods = obj.modifiers if hasattr(obj, "modifiers") else []
-            if not mods: self.log("<no modifiers>"); return
-            for m in mods:
-                self.log(f"> {safe_repr(m)} ({get_type_name(m)})")
-                try: props = rt.getPropNames(m)
-                except Exception: props = []
-                for p in props:
-                    try: v = rt.getProperty(m, p); self.log(f"  {p} ({get_type_name(v)}) = {safe_repr(v)}")
-                    except Exception: self.log(f"  {p} = <unreadable>")
-        except Exception as e: self.log("Error reading modifiers: " + str(e)); self.log("")
+    def read_properties(self, value):
+        """(name, type name, value text) of every property, in one runtime call per value."""
+        return property_snapshot(value, self._schema_cache)
+
+    # The inspectors themselves live in max_inspector.inspectors and yield report lines
+    def inspect_properties(self, obj): self.log_lines(inspectors.inspect_properties(obj, self.read_properties))
+    def inspect_methods(self, obj): self.log_lines(inspectors.inspect_methods(obj, self.read_properties))
+    def inspect_material(self, obj): self.log_lines(inspectors.inspect_material(obj, self.read_properties))
+    def inspect_modifiers(self, obj): self.log_lines(inspectors.inspect_modifiers(obj, self.read_properties))
+    def inspect_controllers(self, obj): self.log_lines(inspectors.inspect_controllers(obj, self.read_properties))
+    def inspect_custom_attributes(self, obj): self.log_lines(inspectors.inspect_custom_attributes(obj, self.read_properties))
+    def inspect_user_properties(self, obj): self.log_lines(inspectors.inspect_user_properties(obj, self.read_properties))
+    def inspect_transform(self, obj): self.log_lines(inspectors.inspect_transform(obj, self.read_properties))
+    def inspect_base_params(self, obj): self.log_lines(inspectors.inspect_base_params(obj, self.read_properties))
+    def inspect_geometry(self, obj): self.log_lines(inspectors.inspect_geometry(obj, self.read_properties))
+
+    def inspect_class_info(self, obj):
+        self.log_lines(inspectors.inspect_class_info(obj, self._lookup_index, self._all_classes))
         
-    def inspect_controllers(self, obj):
-        self.log(f"\n--- Controllers of {safe_repr(obj.name)} ---")
-        # --- V5.8: Using safer rt.getPropertyController ---
+    def show_reference_graph(self, obj):
+        """Opens the lazily expanded reference graph of `obj`."""
+        from max_inspector.refgraph import RefGraphWalker
+        from max_inspector.ui.dialogs import RefGraphDialog
         try:
-            for prop_name in ["position", "rotation", "scale"]:
-                try: 
-                    ctrl = rt.getPropertyController(obj, prop_name)
-                    self.log(f"{prop_name.capitalize()} ({get_type_name(ctrl)}) = {safe_repr(ctrl)}")
-                except Exception: 
-                    self.log(f"{prop_name.capitalize()} = <unreadable>")
-        except Exception as e: 
-            self.log("Error reading controllers: " + str(e)); 
-        self.log("")
-        
-    # --- V5.8: IMPLEMENTED ---
-    def inspect_custom_attributes(self, obj): 
-        self.log(f"\n--- Custom Attributes of {safe_repr(obj.name)} ---")
+            try: helpers = get_bulk_helpers()
+            except Exception: helpers = None
+            dialog = RefGraphDialog(RefGraphWalker(helpers), int(rt.getHandleByAnim(obj)), safe_repr(obj.name),
+                                    on_inspect=self.inspect_anim, parent=self)
+        except Exception as e:
+            self.log(f"<unable to read the reference graph: {e}>")
+            return None
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
+        return dialog
+
+    def show_animation_keys(self, obj):
+        """Opens the controller tree of `obj` with a streaming key table."""
+        from max_inspector.anim import read_controller_tree
+        from max_inspector.ui.dialogs import AnimationKeysDialog
         try:
-            ca_defs = rt.custAttributes.getDefs(obj)
-            if not ca_defs or ca_defs.count == 0:
-                self.log("<no custom attributes found>")
-                self.log("")
-                return
-            
-            for ca_def in ca_defs:
-                self.log(f"Definition: {safe_repr(ca_def.name)}")
-                ca_block = rt.custAttributes.get(obj, ca_def)
-                for p in rt.getPropNames(ca_block):
-                    try:
-                        v = rt.getProperty(ca_block, p)
-                        self.log(f"  .{p} ({get_type_name(v)}) = {safe_repr(v)}")
-                    except Exception:
-                        self.log(f"  .{p} = <unreadable>")
+            try: helpers = get_bulk_helpers()
+            except Exception: helpers = None
+            rows = read_controller_tree(int(rt.getHandleByAnim(obj)), helpers)
+            dialog = AnimationKeysDialog(rows, safe_repr(obj.name), helpers, parent=self)
         except Exception as e:
-            self.log(f"<unable to read custom attributes: {e}>")
-        self.log("")
+            self.log(f"<unable to read the controllers: {e}>")
+            return None
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
+        return dialog
+
+    def inspect_anim(self, handle):
+        """Logs the properties of any anim (material, map, controller...) by anim handle."""
+        anim = rt.getAnimByHandle(handle)
+        if anim is None:
+            self.log("? This object no longer exists.")
+            return
+        self.log_lines(inspectors.inspect_anim(anim, self.read_properties))
+        self.report_buffer.flush()
+
+    def inspect_scene_objects(self): self.log_lines(inspectors.inspect_scene_objects())
+    def inspect_scene_info(self): self.log_lines(inspectors.inspect_scene_info())
+    def inspect_scene_statistics(self): self.log_lines(inspectors.inspect_scene_statistics())
+    def inspect_file_info(self): self.log_lines(inspectors.inspect_file_info())
+    def inspect_units(self): self.log_lines(inspectors.inspect_units())
+    def inspect_selection_sets(self): self.log_lines(inspectors.inspect_selection_sets())
+    def inspect_plugins(self): self.log_lines(inspectors.inspect_plugins())
+    def inspect_environment(self): self.log_lines(inspectors.inspect_environment())
+    def inspect_current_renderer(self): self.log_lines(inspectors.inspect_current_renderer())
+    def inspect_gw(self): self.log_lines(inspectors.inspect_gw(self.read_properties))
+    def inspect_callbacks(self): self.log_lines(inspectors.inspect_callbacks(self.read_properties))
+    def inspect_viewports(self): self.log_lines(inspectors.inspect_viewports())
+    def inspect_material_editor(self): self.log_lines(inspectors.inspect_material_editor(self.read_properties))
+    def inspect_render_settings(self): self.log_lines(inspectors.inspect_render_settings())
+    def inspect_color_mgmt(self): self.log_lines(inspectors.inspect_color_mgmt())
+
+    # -----------------------------------------------------------------
+    # --- BATCH EXPORT ---
+    # -----------------------------------------------------------------
+    def background_jobs(self):
+        return (self._scan_job, self._batch_job, self._snapshot_job, self._asset_job)
+
+    def is_job_running(self):
+        return any(job is not None and job.is_running() for job in self.background_jobs())
 
-    # --- V5.8: IMPLEMENTED ---
-    def inspect_user_properties(self, obj): 
-        self.log(f"\n--- User Properties of {safe_repr(obj.name)} ---")
+    def layer_names(self):
         try:
-            buf = rt.getUserPropBuffer(obj)
-            if not buf:
-                self.log("<no user properties>")
-            else:
-                self.log(buf)
-        except Exception as e:
-            self.log(f"<unable to read user properties: {e}>")
-        self.log("")
+            return [safe_repr(rt.LayerManager.getLayer(i).name) for i in range(rt.LayerManager.count)]
+        except Exception:
+            return []
+
+    def ask_batch_options(self):
+        """Returns (scope, layer name, include properties) from a small dialog, or None if cancelled."""
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle("Batch Export")
+        form = QtWidgets.QFormLayout(dialog)
+        scope_box = QtWidgets.QComboBox()
+        scope_box.addItems(["Selection", "Layer", "Whole Scene"])  # same order as BATCH_SCOPES
+        layer_box = QtWidgets.QComboBox()
+        layer_box.addItems(self.layer_names())
+        layer_box.setEnabled(False)
+        scope_box.currentIndexChanged.connect(lambda i: layer_box.setEnabled(BATCH_SCOPES[i] == "layer"))
+        props_check = QtWidgets.QCheckBox("Include all properties of nodes, materials and modifiers")
+        props_check.setChecked(True)
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        form.addRow("Scope:", scope_box)
+        form.addRow("Layer:", layer_box)
+        form.addRow(props_check)
+        form.addRow(buttons)
+        if dialog.exec() != QtWidgets.QDialog.Accepted:
+            return None
+        return BATCH_SCOPES[scope_box.currentIndex()], layer_box.currentText(), props_check.isChecked()
+
+    def run_batch_export(self):
+        """Asks for a scope and a target file, then exports one record per node in the background."""
+        if self.is_job_running():
+            self.log("--- PYTHON: A class scan, export or snapshot is already running. ---")
+            return
+        options = self.ask_batch_options()
+        if options is None:
+            return
+        path, chosen = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Batch Inspection", "", "NDJSON (*.ndjson);;CSV (*.csv);;SQLite (*.sqlite)")
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += re.search(r"\*(\.\w+)", chosen).group(1)
+        self.start_batch_export(*options, path)
 
-    def inspect_transform(self, obj): 
-        self.log(f"\n--- Transform Matrix of {safe_repr(obj.name)} ---"); 
+    def start_batch_export(self, scope, layer_name, with_properties, path):
         try:
-            self.log(safe_repr(obj.transform))
+            helpers = get_bulk_helpers()
         except Exception as e:
-            self.log(f"<unable to read transform: {e}>")
-        self.log("")
-
-    # --- V5.8: IMPLEMENTED ---
-    def inspect_base_params(self, obj): 
-        self.log(f"\n--- Base Params of {safe_repr(obj.name)} ---")
-        common_params = ['radius', 'length', 'width', 'height', 'segs', 'sides', 'capsegs']
-        found_any = False
-        for p in common_params:
-            try:
-                # Use getattr for Python-side check, safer than rt.getProperty
-                v = getattr(obj, p) 
-                self.log(f"{p} ({get_type_name(v)}) = {safe_repr(v)}")
-                found_any = True
-            except Exception:
-                pass # Property doesn't exist on this object, skip silently
-        if not found_any:
-            self.log("<no common base parameters found>")
-        self.log("")
-    
-    def inspect_class_info(self, obj):
-        self.log(f"\n--- Class Info for {safe_repr(obj.name)} ---")
+            helpers = None
+            self.log(f"--- PYTHON: Bulk helpers unavailable ({e}); exporting node by node. ---")
+        source = BatchRecordSource(helpers, self._schema_cache)
         try:
-            try: mxs_cls = rt.classOf(obj)
-            except Exception: mxs_cls = "<unknown>"
-            
-            # --- V5.6 SAFE SUPERCLASS ---
-            try: super_cls = rt.superClassOf(obj)
-            except Exception: super_cls = "<unknown (superClassOf failed)>"
-                
-            py_type = type(obj).__name__; cid = try_classid(obj)
-            self.log(f"MXS Class: {safe_repr(mxs_cls)}"); self.log(f"SuperClass: {safe_repr(super_cls)}")
-            self.log(f"Python Type: {py_type}"); self.log(f"ClassID: {cid}")
-        except Exception as e: self.log("Error reading class info: " + str(e)); self.log("")
-        
-    def inspect_scene_objects(self): self.log("\n--- Scene Objects ---"); [self.log(f"{safe_repr(o.name)} ({get_type_name(o)})") for o in rt.objects]; self.log("")
-    
-    # --- V5.9: PARANOID MODE ---
-    def inspect_scene_info(self): 
-        self.log("\n--- Scene Info ---")
-        try:
-            try: self.log(f"Scene name: {safe_repr(rt.filename)}")
-            except Exception: self.log(f"Scene name: {safe_repr(rt.maxFileName)}") # Fallback
-        except Exception: self.log("Scene name: <failed to get>")
-        try: self.log(f"Num objects: {len(list(rt.objects))}")
-        except Exception: self.log("Num objects: <failed to get>")
-        self.log("")
-
-    # --- V5.9: PARANOID MODE ---
-    def inspect_file_info(self): 
-        self.log("\n--- File Info ---")
+            handles = source.handles(scope, layer_name)
+            writer = open_batch_writer(path)
+        except Exception as e:
+            self.log(f"--- PYTHON: Batch export failed: {e} ---")
+            return
+
+        self._batch_writer = writer
+        self._batch_path = path
+        self._batch_progress = (0, 0)  # (nodes processed, records written)
+        self._batch_started = time.perf_counter()
+        self.progress_bar.setRange(0, len(handles))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.btn_cancel_job.setVisible(True)
+        self.log(f"--- PYTHON: Exporting {len(handles)} objects ({scope}) to {path}... ---")
+        self._batch_job = CooperativeJob(self.iter_batch_export(source, handles, writer, with_properties),
+                                         parent=self, name="Batch Export")
+        self._batch_job.finished.connect(self.on_batch_finished)
+        self._batch_job.start()
+
+    def iter_batch_export(self, source, handles, writer, with_properties):
+        """Generator behind start_batch_export: one step per chunk of nodes."""
+        for done, written in iter_batch_export(source, handles, writer, with_properties):
+            self._batch_progress = (done, written)
+            self.progress_bar.setValue(done)
+            self.progress_bar.setFormat(f"Exporting {done}/{len(handles)} objects...")
+            yield
+
+    def on_batch_finished(self, completed):
+        job, self._batch_job = self._batch_job, None
+        self.progress_bar.setVisible(False)
+        self.btn_cancel_job.setVisible(False)
         try:
-            try: self.log(f"Filename: {safe_repr(rt.filename)}")
-            except Exception: self.log(f"Filename: {safe_repr(rt.maxFileName)}") # Fallback
-        except Exception: self.log("Filename: <failed to get>")
-        self.log("")
-        
-    def inspect_units(self): self.log("\n--- Units Setup ---"); self.log(safe_repr(rt.units)); self.log("")
-    def inspect_selection_sets(self): self.log("\n--- Selection Sets ---"); [self.log(safe_repr(s)) for s in rt.selectionSets]; self.log("")
-    def inspect_plugins(self): self.log("\n--- Plugins / Classes (short) ---"); [self.log(safe_repr(c)) for c in rt.pluginClasses]; self.log("")
-    def inspect_environment(self): self.log("\n--- Environment / EnvironmentMap ---"); self.log(f"EnvMap: {safe_repr(rt.environmentMap)}"); self.log("")
-    def inspect_current_renderer(self): self.log("\n--- Renderer.Current ---"); self.log(safe_repr(rt.renderers.current)); self.log("")
+            self._batch_writer.close()
+        except Exception as e:
+            self.log(f"--- PYTHON: Could not finish writing {self._batch_path}: {e} ---")
+        _, written = self._batch_progress
+        elapsed = time.perf_counter() - self._batch_started
+        if completed:
+            rate = written / elapsed if elapsed > 0 else 0.0
+            self.log(f"--- PYTHON: Exported {written} objects to {self._batch_path} "
+                     f"in {elapsed:.1f}s ({rate:.0f} objects/s). ---")
+        elif job.cancelled:
+            self.log(f"--- PYTHON: Batch export cancelled after {written} objects; {self._batch_path} is incomplete. ---")
+        else:
+            self.log(f"--- PYTHON CRITICAL ERROR during batch export: {job.error} ---")
 
     # -----------------------------------------------------------------
-    # --- IMPLEMENTED placeholder functions (V5.10) ---
+    # --- SCENE SNAPSHOTS ---
     # -----------------------------------------------------------------
-    
-    def inspect_gw(self):
-        self.log("\n--- GW (Graphics Window) ---")
+    def run_take_snapshot(self):
+        """Captures every node of the scene into a snapshot file in the background."""
+        if self.is_job_running():
+            self.log("--- PYTHON: A class scan, export or snapshot is already running. ---")
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Scene Snapshot", "", "Inspector Snapshot (*.snapshot)")
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += ".snapshot"
         try:
-            props = rt.getPropNames(rt.gw)
-            for p in props:
-                try:
-                    v = rt.getProperty(rt.gw, p)
-                    self.log(f"{p} ({get_type_name(v)}) = {safe_repr(v)}")
-                except Exception:
-                    self.log(f"{p} = <unreadable>")
+            helpers = get_bulk_helpers()
+            handles = BatchRecordSource(helpers).handles("scene")
+            writer = SnapshotWriter(path)
         except Exception as e:
-            self.log(f"Error reading rt.gw properties: {e}")
-        self.log("")
+            self.log(f"--- PYTHON: Snapshot failed: {e} ---")
+            return
 
-    def inspect_callbacks(self):
-        self.log("\n--- Callbacks ---")
+        self._snapshot_writer = writer
+        self._snapshot_path = path
+        self._snapshot_started = time.perf_counter()
+        self.progress_bar.setRange(0, len(handles))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.btn_cancel_job.setVisible(True)
+        self.log(f"--- PYTHON: Taking a snapshot of {len(handles)} objects to {path}... ---")
+        self._snapshot_job = CooperativeJob(self.iter_take_snapshot(helpers, handles, writer), parent=self,
+                                            name="Take Snapshot")
+        self._snapshot_job.finished.connect(self.on_snapshot_finished)
+        self._snapshot_job.start()
+
+    def iter_take_snapshot(self, helpers, handles, writer):
+        for done in iter_capture_snapshot(helpers, handles, writer):
+            self.progress_bar.setValue(done)
+            self.progress_bar.setFormat(f"Snapshot {done}/{len(handles)} objects...")
+            yield
+
+    def on_snapshot_finished(self, completed):
+        job, self._snapshot_job = self._snapshot_job, None
+        self.progress_bar.setVisible(False)
+        self.btn_cancel_job.setVisible(False)
+        writer = self._snapshot_writer
+        if not completed:
+            writer.abort()
+            if job.cancelled:
+                self.log("--- PYTHON: Snapshot cancelled. ---")
+            else:
+                self.log(f"--- PYTHON CRITICAL ERROR during snapshot: {job.error} ---")
+            return
         try:
-            self.log("Listing callback items (use 'callbacks.show()' in Listener for details):")
-            props = rt.getPropNames(rt.callbacks)
-            for p in props:
-                try:
-                    v = rt.getProperty(rt.callbacks, p)
-                    self.log(f".{p} = {safe_repr(v)}")
-                except Exception:
-                    self.log(f".{p} = <unreadable>")
-        except Exception as e:
-            self.log(f"Error reading rt.callbacks: {e}")
-        self.log("")
-
-    # --- V5.9: PARANOID MODE ---
-    def inspect_viewports(self):
-        self.log("\n--- Viewports ---")
+            scene_file = safe_repr(rt.maxFileName)
+        except Exception:
+            scene_file = ""
+        writer.close({"created": time.strftime("%Y-%m-%d %H:%M:%S"), "scene": scene_file})
+        self.log(f"--- PYTHON: Snapshot of {writer.count} objects saved to {self._snapshot_path} "
+                 f"in {time.perf_counter() - self._snapshot_started:.1f}s "
+                 f"({os.path.getsize(self._snapshot_path) / 1e6:.1f} MB). ---")
+
+    def run_compare_snapshots(self):
+        """Asks for an older and a newer snapshot and shows what changed between them."""
+        old_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Older Snapshot", "", "Inspector Snapshot (*.snapshot)")
+        if not old_path:
+            return
+        new_path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Newer Snapshot", os.path.dirname(old_path),
+                                                            "Inspector Snapshot (*.snapshot)")
+        if new_path:
+            self.show_snapshot_diff(old_path, new_path)
+
+    def show_snapshot_diff(self, old_path, new_path):
+        from max_inspector.snapshots import SceneSnapshot, SnapshotDiff
+        from max_inspector.ui.dialogs import SnapshotDiffDialog
         try:
-            try: self.log(f"Active Viewport Index: {rt.viewport.activeViewport}")
-            except Exception: self.log("Active Viewport Index: <failed>")
-            try: self.log(f"Layout: {rt.viewport.layout}")
-            except Exception: self.log("Layout: <failed>")
-            
+            start = time.perf_counter()
+            old = SceneSnapshot(old_path)
             try:
-                num_vps = rt.viewport.GetNumViewports() # Modern, safer method
+                diff = SnapshotDiff(old, SceneSnapshot(new_path))
             except Exception:
-                self.log("Number of Viewports: <failed to get count>")
-                self.log("")
-                return
-            
-            self.log(f"Number of Viewports: {num_vps}")
-            
-            for i in range(1, num_vps + 1):
-                self.log(f"\n--- Viewport {i} ---")
-                try: self.log(f"Type: {rt.viewport.getType(index=i)}")
-                except Exception: self.log("Type: <failed>")
-                try: self.log(f"Camera: {safe_repr(rt.viewport.getCamera(index=i))}")
-                except Exception: self.log("Camera: <failed>")
-                try: self.log(f"Shading: {rt.viewport.getShading(index=i)}")
-                except Exception: self.log("Shading: <failed>")
-                try: self.log(f"Is Wireframe: {rt.viewport.isWireframe(index=i)}")
-                except Exception: self.log("Is Wireframe: <failed>")
-                        
+                old.close()
+                raise
         except Exception as e:
-            self.log(f"Error reading rt.viewport: {e}")
-        self.log("")
-        
-    # --- V5.10: Using Functions instead of Properties ---
-    def inspect_material_editor(self):
-        self.log("\n--- Material Editor (MEdit / SME) ---")
+            self.log(f"--- PYTHON: Could not compare snapshots: {e} ---")
+            return None
+        self.log(f"--- PYTHON: Snapshot diff: {len(diff.changed)} changed, {len(diff.added)} added, "
+                 f"{len(diff.removed)} removed, {diff.unchanged} unchanged "
+                 f"({time.perf_counter() - start:.2f}s). ---")
+        for warning in diff.warnings:
+            self.log(f"--- PYTHON: Warning: {warning} ---")
+        dialog = SnapshotDiffDialog(diff, self)
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
+        return dialog
+
+    # -----------------------------------------------------------------
+    # --- ASSET AUDIT ---
+    # -----------------------------------------------------------------
+    def run_asset_audit(self):
+        """Gathers the scene's asset paths, then checks the files on a thread pool in the background."""
+        if self.is_job_running():
+            self.log("--- PYTHON: A class scan, export or snapshot is already running. ---")
+            return
+        answer = QtWidgets.QMessageBox.question(
+            self, "Asset Audit", "Also hash the file contents? This finds identical files under different "
+            "paths but reads every changed file in full.",
+            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No | QtWidgets.QMessageBox.Cancel,
+            QtWidgets.QMessageBox.No)
+        if answer == QtWidgets.QMessageBox.Cancel:
+            return
+        from max_inspector.assets import AssetAudit, AssetStatCache, read_asset_refs
         try:
-            self.log("--- Compact Material Editor (rt.matEditor) ---")
-            active_slot_index = 1 # Default to 1
-            try: 
-                self.log(f"Is Open: {rt.matEditor.isOpen()}")
-            except Exception: self.log("Is Open: <failed>")
-            try: 
-                active_slot_index = rt.matEditor.GetActiveSlot() # <-- V5.10 FIX
-                self.log(f"Active Slot Index: {active_slot_index}")
-            except Exception: self.log(f"Active Slot Index: <failed, assuming 1>")
-            
-            self.log("\n--- Slate Material Editor (rt.sme) ---")
-            try: self.log(f"Is Open: {rt.sme.isOpen()}")
-            except Exception: self.log("Is Open: <failed>")
-            try: 
-                active_view = rt.sme.GetActiveView() # <-- V5.10 FIX
-                self.log(f"Active View Name: {active_view.name if active_view else 'None'}")
-            except Exception: self.log("Active View Name: <failed>")
-            
-            self.log(f"\n--- Active Material (from Compact Slot {active_slot_index}) ---")
-            try:
-                active_mat = rt.matEditor.GetMtl(active_slot_index) # Use the index we found
-                self.log(f"Material: {safe_repr(active_mat)}")
-                
-                if active_mat:
-                    self.log("--- Properties of Active Material ---")
-                    props = rt.getPropNames(active_mat)
-                    for p in props:
-                        try:
-                            v = rt.getProperty(active_mat, p)
-                            self.log(f"{p} ({get_type_name(v)}) = {safe_repr(v)}")
-                        except Exception:
-                            self.log(f"{p} = <unreadable>")
-            except Exception:
-                self.log("Could not get active material slot.")
-                        
+            try: helpers = get_bulk_helpers()
+            except Exception: helpers = None
+            refs = read_asset_refs(helpers)
+            if self._asset_cache is None:
+                self._asset_cache = AssetStatCache(self._asset_cache_file_path)
+            audit = AssetAudit(refs, safe_repr(rt.maxFilePath), self._asset_cache,
+                               hash_files=answer == QtWidgets.QMessageBox.Yes)
         except Exception as e:
-            self.log(f"Error reading Material Editor properties: {e}")
-        self.log("")
+            self.log(f"--- PYTHON: Asset audit failed: {e} ---")
+            return
 
-    # --- V5.9: PARANOID MODE ---
-    def inspect_render_settings(self):
-        self.log("\n--- Render Settings ---")
-        try:
-            self.log(f"Range: {safe_repr(rt.renderSceneDialog.timeType)}")
-        except Exception:
-            self.log("Range: (Attribute 'timeType' not found)")
+        self._asset_audit = audit
+        self.progress_bar.setRange(0, max(1, len(audit.files)))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.btn_cancel_job.setVisible(True)
+        self.log(f"--- PYTHON: Checking {len(audit.files)} asset files... ---")
+        self._asset_job = CooperativeJob(self.iter_asset_audit(audit), parent=self, name="Asset Audit")
+        self._asset_job.finished.connect(self.on_asset_audit_finished)
+        self._asset_job.start()
+
+    def iter_asset_audit(self, audit):
+        for done, total in audit.iter_check():
+            self.progress_bar.setValue(done)
+            self.progress_bar.setFormat(f"Checking assets {done}/{total}...")
+            yield
+
+    def on_asset_audit_finished(self, completed):
+        job, self._asset_job = self._asset_job, None
+        self.progress_bar.setVisible(False)
+        self.btn_cancel_job.setVisible(False)
+        if not completed:
+            if job.cancelled:
+                self.log("--- PYTHON: Asset audit cancelled. ---")
+            else:
+                self.log(f"--- PYTHON CRITICAL ERROR during asset audit: {job.error} ---")
+            return
+        self.log_lines(inspectors.inspect_assets(self._asset_audit))
         try:
-            self.log(f"W: {safe_repr(rt.renderWidth)} H: {safe_repr(rt.renderHeight)}")
-        except Exception:
-            self.log("W/H: (Attributes 'renderWidth/Height' not found)")
-        self.log("")
+            self._asset_cache.save()
+        except Exception as e:
+            self.log(f"--- PYTHON: Could not save the asset cache {self._asset_cache_file_path}: {e} ---")
+        self.report_buffer.flush()
+
+    def show_profiler(self):
+        """Opens the profiler panel; profiling itself is switched on from there."""
+        if self._profiler_dialog is None:
+            from max_inspector.ui.dialogs import ProfilerDialog
+            self._profiler_dialog = ProfilerDialog(active_profiler() or Profiler(), self)
+        else:
+            self._profiler_dialog.refresh()
+        self._profiler_dialog.show()
+        self._profiler_dialog.raise_()
+        return self._profiler_dialog
 
-    # --- V5.9: PARANOID MODE ---
-    def inspect_color_mgmt(self):
-        self.log("\n--- Color / Exposure Management ---")
-        try:
-            self.log(safe_repr(rt.colorManager))
-        except Exception:
-            self.log("(Attribute 'colorManager' not found)")
-        self.log("")
-        
     # -----------------------------------------------------------------
     # --- CORE FUNCTIONS (SCAN, CACHE, POPULATE) (V5.2) ---
     # -----------------------------------------------------------------
     
     def load_from_cache(self):
-        """Tries to load class data from the JSON cache file."""
+        """Tries to load class data from the shared binary cache and the user's overlay, migrating the JSON cache if needed."""
         self.log(f"--- PYTHON: Looking for cache file: {self._cache_file_path} ---")
-        if not os.path.exists(self._cache_file_path):
-            self.log("--- PYTHON: Cache file not found. ---")
-            self.log("--- Please click 'Re-Scan All Classes' to build the class list. ---")
-            return False
+        if not os.path.exists(self._cache_file_path) and not os.path.exists(self._class_cache.user_path):
+            return self.migrate_json_cache()
             
         try:
             self.log("--- PYTHON: Cache file found. Loading... ---")
-            with open(self._cache_file_path, 'r') as f:
-                cached_data = json.load(f) # This loads a list of lists
-
-            if not cached_data:
+            loaded = self._class_cache.load()
+            for path, error in self._class_cache.errors:
+                self.log(f"--- PYTHON ERROR: Skipped unreadable cache file {path}: {error} ---")
+            if loaded is None:
+                self.log("--- Cache may be corrupt. Please run 'Re-Scan All Classes' to rebuild it. ---")
+                return False
+            rows, meta = loaded
+            if not rows:
                 self.log("--- PYTHON: Cache file is empty. ---")
                 self.log("--- Please click 'Re-Scan All Classes' to rebuild. ---")
                 return False
                 
-            self.log(f"--- PYTHON: Cache loaded. Found {len(cached_data)} classes. Populating UI... ---")
-            
-            # This is the key call, now with the V5.2 fix
-            self.populate_ui_from_data(cached_data) 
+            if self._class_cache.user_path in self._class_cache.sources:
+                self.log(f"--- PYTHON: Applied user cache overlay: {self._class_cache.user_path} ---")
+            self.log(f"--- PYTHON: Cache loaded. Found {len(rows)} classes. Populating UI... ---")
+            self.populate_ui_from_data(rows)
+            self._cache_fingerprint = meta
             
             self.log("--- PYTHON: UI populated from cache. Ready. ---")
             return True
@@ -661,153 +959,236 @@ class MaxInspector(QtWidgets.QWidget):
             self.log("--- Cache may be corrupt. Please run 'Re-Scan All Classes' to rebuild it. ---")
             return False
 
+    def migrate_json_cache(self):
+        """Loads the legacy JSON cache (if any) and rewrites it in the binary format."""
+        if not os.path.exists(self._json_cache_file_path):
+            self.log("--- PYTHON: Cache file not found. ---")
+            self.log("--- Please click 'Re-Scan All Classes' to build the class list. ---")
+            return False
+
+        try:
+            self.log(f"--- PYTHON: Migrating legacy JSON cache: {self._json_cache_file_path} ---")
+            cached_data = read_json_class_cache(self._json_cache_file_path)
+
+            if not cached_data:
+                self.log("--- PYTHON: Cache file is empty. ---")
+                self.log("--- Please click 'Re-Scan All Classes' to rebuild. ---")
+                return False
+
+            self.log(f"--- PYTHON: Cache loaded. Found {len(cached_data)} classes. Populating UI... ---")
+            self.populate_ui_from_data(cached_data)
+            self.save_to_cache()
+            return True
+
+        except Exception as e:
+            self.log(f"--- PYTHON ERROR: Failed to read or parse JSON cache file! ---")
+            self.log(f"--- ERROR: {e} ---")
+            self.log("--- Cache may be corrupt. Please run 'Re-Scan All Classes' to rebuild it. ---")
+            return False
+
     def save_to_cache(self):
-        """Saves the current _all_classes list to the JSON cache file."""
+        """Saves the current _all_classes list to the shared binary cache, or to the user overlay if it is read-only."""
         if not self._all_classes:
             self.log("--- PYTHON Warning: No classes to save. Cache not written. ---")
             return
             
         self.log(f"--- PYTHON: Saving {len(self._all_classes)} classes to cache file... ---")
         try:
-            # self._all_classes is a list of tuples, which json saves as a list of lists
-            with open(self._cache_file_path, 'w') as f:
-                json.dump(self._all_classes, f, indent=2)
-            self.log(f"--- PYTHON: Cache file saved successfully to: {self._cache_file_path} ---")
+            path = self._class_cache.save(self._all_classes, self._cache_fingerprint)
+            if path != self._cache_file_path:
+                self.log(f"--- PYTHON: Shared cache is not writable ({self._class_cache.last_write_error}). ---")
+            self.log(f"--- PYTHON: Cache file saved successfully to: {path} ---")
         except Exception as e:
             self.log(f"--- PYTHON ERROR: Failed to save cache file! ---")
             self.log(f"--- ERROR: {e} ---")
 
+    def get_scan_categories(self):
+        """Returns the (superclass name, superclass) pairs whose .classes get scanned."""
+        categories_to_scan, error = get_scan_categories()
+        if error is None:
+            self.log("--- PYTHON: Found 'Controller' SuperClass via hack. ---")
+        else:
+            self.log(f"--- PYTHON: Could not find 'Controller' class list: {error} ---")
+            self.log("--- (This is non-critical, Controller tab may be incomplete) ---")
+        return categories_to_scan
+
     # --- V5.1 SCAN FUNCTION ---
-    # This uses the Python loop (V4) but with the manual
-    # SuperClass assignment (V5) to bypass rt.superClassOf()
+    # Uses the manual SuperClass assignment (V5) to bypass rt.superClassOf().
+    # Each category is scanned by one MAXScript call (bulk mode); the
+    # per-class Python loop is kept as a fallback. The scan runs as a
+    # CooperativeJob so the UI stays responsive and can cancel it.
     def run_full_scan(self):
         """
-        Performs a full, slow scan by collecting classes from all
-        individual categories, updating a progress bar.
+        Starts a full scan of all individual categories, streaming each
+        finished category into the class views and updating a progress bar.
         """
-        self.log("--- PYTHON: Starting new full class scan (V5.1 Logic)... ---")
-        self.progress_bar.setValue(0)
-        self.progress_bar.setVisible(True)
-        
-        scanned_data = []
-        failed_classes = []
-        
-        # This is the list of all "SuperClass.classes" collections
-        # We access them via 'rt' (Python) which is safe.
-        # We manually pair them with their proper SuperClass name.
-        categories_to_scan = [
-            ("Modifier", rt.Modifier),
-            ("Light", rt.Light),
-            ("GeometryClass", rt.GeometryClass),
-            ("Shape", rt.Shape),
-            ("Camera", rt.Camera),
-            ("Helper", rt.Helper),
-            ("SpacewarpObject", rt.SpacewarpObject),
-            ("Material", rt.Material),
-            ("TextureMap", rt.TextureMap),
-            ("RenderEffect", rt.RenderEffect),
-            ("Atmospheric", rt.Atmospheric),
-        ]
-        
-        # --- V5.9 HACK FIX: Try rt.Bezier_Float, a very common controller ---
-        try:
-            pos_controller_class = rt.classOf(rt.Bezier_Float) 
-            # We assume rt.superClassOf is safe ONCE for a known object
-            controller_superclass = rt.superClassOf(pos_controller_class)
-            categories_to_scan.append(("Controller", controller_superclass))
-            self.log("--- PYTHON: Found 'Controller' SuperClass via hack. ---")
-        except Exception as e:
-            self.log(f"--- PYTHON: Could not find 'Controller' class list: {e} ---")
-            self.log("--- (This is non-critical, Controller tab may be incomplete) ---")
+        if self.is_job_running():
+            self.log("--- PYTHON: A class scan, export or snapshot is already running. ---")
+            return
 
-        
-        try:
-            self.log("--- PYTHON: Collecting class lists from all categories...")
-            
-            # --- Step 1: Collect all class lists into one big list ---
-            self.progress_bar.setFormat("Collecting class lists...")
-            QtWidgets.QApplication.processEvents()
-            
-            # This list will hold tuples of (class_object, superclass_name_string)
-            class_object_pairs = []
-            
-            for superclass_name, class_collection_obj in categories_to_scan:
-                try:
-                    mxs_class_list = class_collection_obj.classes
-                    if mxs_class_list is not None:
-                        for c in mxs_class_list:
-                            class_object_pairs.append((c, superclass_name))
-                    else:
-                        self.log(f"--- Warning: {superclass_name}.classes was None.")
-                except Exception as e:
-                    self.log(f"--- Error collecting {superclass_name}.classes: {e}")
-
-            # --- Step 2: Scan the big list (just like before) ---
-            total_classes = len(class_object_pairs)
-            if total_classes == 0:
-                self.log(f"--- PYTHON CRITICAL ERROR: Collected 0 classes from all categories! ---")
-                self.log(f"--- This should not happen. Scan aborted. ---")
-                print(f"--- PYTHON DEBUG: Collected 0 classes. Aborting. ---")
-                self.progress_bar.setVisible(False)
-                return
+        self.log("--- PYTHON: Starting new full class scan... ---")
+        categories_to_scan = self.get_scan_categories()
+        helpers = self.get_scan_helpers()
+        with profile_scope("Class Fingerprint"):
+            fingerprint = get_class_fingerprint(categories_to_scan, helpers)
+        self.start_class_scan(categories_to_scan, helpers, fingerprint, keep_rows=[])
+
+    def run_incremental_scan(self):
+        """Re-scans only the categories whose class count or plugin files changed since the cached scan."""
+        if self.is_job_running():
+            self.log("--- PYTHON: A class scan, export or snapshot is already running. ---")
+            return
+        if not self._all_classes or not self._cache_fingerprint:
+            self.log("--- PYTHON: No scan fingerprint in the cache. Running a full scan instead. ---")
+            self.run_full_scan()
+            return
 
-            self.progress_bar.setRange(0, total_classes)
-            self.log(f"--- PYTHON: Found {total_classes} classes to scan. ---")
-            print(f"--- PYTHON DEBUG: Starting scan of {total_classes} classes... ---")
+        categories = self.get_scan_categories()
+        helpers = self.get_scan_helpers()
+        with profile_scope("Class Fingerprint"):
+            fingerprint = get_class_fingerprint(categories, helpers)
+        changed, changed_files = diff_class_fingerprint(self._cache_fingerprint, fingerprint, self._all_classes)
+        for path in changed_files[:20]:
+            self.log(f"--- Changed plugin file: {path}")
+        if changed_files and not changed:
+            # A plugin changed but no cached class is attributed to it: rescan everything
+            changed = {name for name, _ in categories}
+        if not changed:
+            self.log("--- PYTHON: Class cache is up to date. Nothing to re-scan. ---")
+            self._cache_fingerprint = fingerprint
+            return
 
-            # Loop through all collected classes
-            for i, (c, sc) in enumerate(class_object_pairs):
-                # Update progress bar
-                self.progress_bar.setValue(i + 1)
-                
-                if i % 50 == 0: # Update every 50 classes
-                    QtWidgets.QApplication.processEvents()
-                    self.progress_bar.setFormat(f"Scanning: {i}/{total_classes}...")
-                
-                try:
-                    cname = safe_repr(c)
-                    if not cname or cname == "<Unstringable Class>":
-                        failed_classes.append(f"Class_{i}_Unstringable")
-                        continue
-
-                    # We use the 'sc' (superclass_name) we already have
-                    
-                    # We still *try* to get classID and pluginName,
-                    # wrapping them in safe calls.
-                    try:
-                        cid = safe_repr(rt.classID(c))
-                    except Exception:
-                        cid = ""
-                        
-                    try:
-                        pname = safe_repr(rt.pluginName(c))
-                    except Exception:
-                        pname = ""
-                    
-                    scanned_data.append((cname, sc, cid, pname))
-                    
-                except Exception as e_inner:
-                    failed_classes.append(cname if 'cname' in locals() else f"Class_{i}_Error: {e_inner}")
-            
-            self.log("--- PYTHON: Scan complete. ---")
-            print("--- PYTHON DEBUG: Scan complete. ---")
-            if failed_classes:
-                self.log(f"--- PYTHON: Warning: Failed to parse {len(failed_classes)} classes. ---")
-                print(f"--- PYTHON DEBUG: Failed classes: {failed_classes} ---")
+        self.log(f"--- PYTHON: Re-scanning {len(changed)} changed categories: {', '.join(sorted(changed))} ---")
+        keep_rows = [row for row in self._all_classes if row[1] not in changed]
+        self.start_class_scan([c for c in categories if c[0] in changed], helpers, fingerprint, keep_rows)
+
+    def check_cache_staleness(self):
+        """
+        Compares the cache fingerprint with the session in a CooperativeJob,
+        after the window is shown: category counts first, then the plugin
+        file stats, which are only walked while the counts still match.
+        Logs only when the cache is stale or cannot be checked.
+        """
+        if not self._cache_fingerprint:
+            self.log("--- PYTHON: Cache has no scan fingerprint; 'Update Classes' will run a full scan. ---")
+            return
+        self._staleness_job = CooperativeJob(self.iter_check_cache_staleness(), parent=self, name="Cache Check")
+        self._staleness_job.finished.connect(self.on_staleness_checked)
+        self._staleness_job.start()
+
+    def iter_check_cache_staleness(self):
+        """Generator behind check_cache_staleness; leaves (changed categories, changed files) in _staleness."""
+        self._staleness = None
+        categories, _ = get_scan_categories()
+        fingerprint = {}
+        cached_counts = self._cache_fingerprint.get("category_counts", {})
+        for _ in iter_class_fingerprint(categories, self.get_scan_helpers(), fingerprint):
+            if fingerprint["category_counts"] != cached_counts:
+                # Stale already: skip walking the plugin folders and leave the files out of the diff
+                fingerprint["plugin_files"] = self._cache_fingerprint.get("plugin_files", {})
+                break
+            yield
+        self._staleness = diff_class_fingerprint(self._cache_fingerprint, fingerprint, self._all_classes)
+
+    def on_staleness_checked(self, completed):
+        job, self._staleness_job = self._staleness_job, None
+        if not completed:
+            if not job.cancelled:
+                self.log(f"--- PYTHON: Could not check the class cache for changes: {job.error} ---")
+            return
+        changed, changed_files = self._staleness
+        if changed or changed_files:
+            self.log(f"--- PYTHON: Class cache is stale ({len(changed)} categories, "
+                     f"{len(changed_files)} plugin files changed). Click 'Update Classes'. ---")
+            self.btn_update_classes.setStyleSheet("background-color: #FFD54F; color: #000000;")
+        else:
+            self.btn_update_classes.setStyleSheet("")
 
+    def get_scan_helpers(self):
+        if not self._bulk_scan:
+            return None
+        try:
+            return get_bulk_helpers()
         except Exception as e:
-            self.log(f"--- PYTHON CRITICAL ERROR during scan loop! ---")
-            self.log(f"--- ERROR: {e} ---")
-            print(f"--- PYTHON CRITICAL ERROR during scan loop! Error: {e} ---")
-            self.progress_bar.setVisible(False)
+            self.log(f"--- PYTHON: Bulk scan helpers unavailable, using per-class scan: {e} ---")
+            return None
+
+    def start_class_scan(self, categories_to_scan, helpers, fingerprint, keep_rows):
+        """Runs the scan job over `categories_to_scan`; results are merged with `keep_rows`."""
+        if self._staleness_job is not None:
+            self._staleness_job.cancel()  # the scan replaces the fingerprint it compares against
+        self._scan_result = ([], [])  # (scanned_data, failed_classes)
+        self._scan_previous = self._all_classes
+        self._scan_keep = keep_rows
+        self._scan_fingerprint = fingerprint
+        self.progress_bar.setRange(0, len(categories_to_scan))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.btn_cancel_job.setVisible(True)
+        self.btn_load_classes.setEnabled(False)
+        self.btn_update_classes.setEnabled(False)
+        self.log(f"--- PYTHON: Scanning {len(categories_to_scan)} categories... ---")
+        self._scan_job = CooperativeJob(self.iter_full_scan(categories_to_scan, helpers), parent=self, name="Class Scan")
+        self._scan_job.finished.connect(self.on_scan_finished)
+        self._scan_job.start()
+
+    def iter_full_scan(self, categories_to_scan, helpers):
+        """Generator behind run_full_scan: one step per category (bulk) or per class."""
+        scanned_data, failed_classes = self._scan_result
+        for step in iter_class_scan(categories_to_scan, helpers, scanned_data, failed_classes, log=self.log):
+            if step is None:
+                yield
+                continue
+            i, superclass_name, added = step
+            if added is None:
+                self.progress_bar.setValue(i)
+                self.progress_bar.setFormat(f"Scanning {superclass_name} ({i + 1}/{len(categories_to_scan)})...")
+                yield superclass_name
+            else:
+                # Stream the partial result into the views
+                if added:
+                    self.populate_ui_from_data(self._scan_keep + scanned_data)
+                yield
+
+    def cancel_jobs(self):
+        for job in self.background_jobs():
+            if job is not None:
+                job.cancel()
+
+    def on_scan_finished(self, completed):
+        scanned_data, failed_classes = self._scan_result
+        job, self._scan_job = self._scan_job, None
+        self.progress_bar.setVisible(False)
+        self.btn_cancel_job.setVisible(False)
+        self.btn_load_classes.setEnabled(True)
+        self.btn_update_classes.setEnabled(True)
+
+        if not completed:
+            if job.cancelled:
+                self.log(f"--- PYTHON: Scan cancelled after {len(scanned_data)} classes. Cache not updated. ---")
+            else:
+                self.log(f"--- PYTHON CRITICAL ERROR during scan loop! ---")
+                self.log(f"--- ERROR: {job.error} ---")
+                print(f"--- PYTHON CRITICAL ERROR during scan loop! Error: {job.error} ---")
+            self.populate_ui_from_data(self._scan_previous)
             return
 
+        if not scanned_data and not self._scan_keep:
+            self.log(f"--- PYTHON CRITICAL ERROR: Collected 0 classes from all categories! ---")
+            self.log(f"--- This should not happen. Scan aborted. ---")
+            self.populate_ui_from_data(self._scan_previous)
+            return
+
+        self.log("--- PYTHON: Scan complete. ---")
+        if failed_classes:
+            self.log(f"--- PYTHON: Warning: Failed to parse {len(failed_classes)} classes. ---")
+            self.log(f"--- Failed classes: {', '.join(failed_classes)} ---")
+
         # --- Success! ---
-        self.progress_bar.setVisible(False)
         self.log(f"--- PYTHON: Populating UI with {len(scanned_data)} new classes... ---")
-        
-        # Populate all UI elements with the new data
-        self.populate_ui_from_data(scanned_data)
+        self.populate_ui_from_data(self._scan_keep + scanned_data)
+        self._cache_fingerprint = self._scan_fingerprint
+        self.btn_update_classes.setStyleSheet("")
         
         # Save the new data to the cache
         self.save_to_cache()
@@ -817,105 +1198,29 @@ class MaxInspector(QtWidgets.QWidget):
     # --- V5.2 FIX: This function now correctly handles loading from JSON ---
     def populate_ui_from_data(self, class_data_list):
         """
-        Clears and populates all class lists and trees from a
-        list of (cname, sc, cid, pname) tuples OR lists.
+        Rebuilds the shared class model, category proxies and grouped
+        trees from a list of (cname, sc, cid, pname) tuples OR lists.
         """
-        # Clear all UI lists first
-        self.class_list.clear()
-        self.tree_by_super.clear()
-        self.tree_by_plugin.clear()
-        self.list_geometry.clear()
-        self.list_shapes.clear()
-        self.list_lights.clear()
-        self.list_cameras.clear()
-        self.list_helpers.clear()
-        self.list_modifiers.clear()
-        self.list_spacewarps.clear()
-        self.list_materials.clear()
-        self.list_textures.clear()
-        self.list_effects.clear()
-        self.list_superclasses.clear()
-
-        # (We still populate SuperClasses manually)
-        super_list = ["Node", "GeometryClass", "Shape", "Light", "Camera", "Helper", 
-                      "Modifier", "SpacewarpObject", "Material", "TextureMap", 
-                      "RenderEffect", "Controller", "Texmap", "Mtl", "Atmospheric", 
-                      "maxObject", "Value"]
-        self.list_superclasses.addItems(sorted(super_list, key=lambda x: x.lower()))
-
-        # Define buckets
-        buckets = {
-            "GeometryClass": [], "Shape": [], "Light": [], "Camera": [],
-            "Helper": [], "Modifier": [], "SpacewarpObject": [],
-            "Material": [], "TextureMap": [], "RenderEffect": []
-        }
-        
-        # --- V5.2 FIX ---
-        # When loading from JSON, class_data_list is a list of LISTS [].
-        # Lists are not hashable and cannot be used by dict.fromkeys().
-        # We must convert them back to TUPLES () first.
-        try:
-            # Convert [c, s, cid, p] to (c, s, cid, p)
-            hashable_data = [tuple(item) for item in class_data_list]
-            # Now de-duplicate using the tuples
-            unique_class_data = list(dict.fromkeys(hashable_data))
-        except Exception as e:
-            self.log(f"--- PYTHON ERROR: Could not de-duplicate class list: {e} ---")
-            # Fallback: just use the raw list (might have duplicates)
-            unique_class_data = [tuple(item) for item in class_data_list]
-        # --- END V5.2 FIX ---
-        
-        # Store the master list
-        self._all_classes = sorted(unique_class_data, key=lambda x: x[0].lower())
-        
-        # Reset dictionaries
-        self._by_super = {}
-        self._by_plugin = {}
-
-        # Process the data list
-        for cname, sc, cid, pname in self._all_classes:
-            # Add to 'All Classes' tab
-            self.class_list.addItem(cname)
-            
-            # Add to categorized buckets
-            if sc in buckets:
-                buckets[sc].append(cname)
-
-            # Add to 'By SuperClass' tree data
-            key_sc = sc if sc else "<no_super>"
-            self._by_super.setdefault(key_sc, []).append((cname, cid, pname))
-            
-            # Add to 'By Plugin' tree data
-            key_p = pname if pname else "<core>"
-            self._by_plugin.setdefault(key_p, []).append((cname, sc, cid))
-
-        # --- Populate all UI elements ---
-
-        # Populate categorized lists from buckets
-        list_mapping = {
-            "GeometryClass": self.list_geometry, "Shape": self.list_shapes,
-            "Light": self.list_lights, "Camera": self.list_cameras,
-            "Helper": self.list_helpers, "Modifier": self.list_modifiers,
-            "SpacewarpObject": self.list_spacewarps, "Material": self.list_materials,
-            "TextureMap": self.list_textures, "RenderEffect": self.list_effects
-        }
-        for sc, widget in list_mapping.items():
-            class_list = sorted(buckets.get(sc, []), key=lambda x: x.lower())
-            widget.addItems(class_list)
-
-        # Populate tree_by_super
-        for sc in sorted(self._by_super.keys(), key=lambda x: x.lower()):
-            parent = QtWidgets.QTreeWidgetItem(self.tree_by_super, [sc])
-            for cname, cid, pname in sorted(self._by_super[sc], key=lambda x: x[0].lower()):
-                child = QtWidgets.QTreeWidgetItem(parent, [cname])
-                child.setData(0, QtCore.Qt.UserRole, ("class", cname, sc, cid, pname))
-
-        # Populate tree_by_plugin
-        for p in sorted(self._by_plugin.keys(), key=lambda x: x.lower()):
-            parent = QtWidgets.QTreeWidgetItem(self.tree_by_plugin, [p])
-            for cname, sc, cid in sorted(self._by_plugin[p], key=lambda x: x[0].lower()):
-                child = QtWidgets.QTreeWidgetItem(parent, [cname])
-                child.setData(0, QtCore.Qt.UserRole, ("class", cname, sc, cid, p))
+        # Store the master table (interned, column-oriented)
+        self._all_classes = ClassTable(prepare_class_rows(class_data_list))
+
+        # Group row ids as index arrays (rows are already sorted by name, so groups are too)
+        self._by_super, self._by_plugin = group_class_rows(self._all_classes)
+
+        # --- Populate all models ---
+        self._lookup_index = ClassLookupIndex(self._all_classes)
+        self._search_index = None
+        if self._inspection_cache is not None:
+            self._inspection_cache.discard_section("Class Info")
+        self.class_model.set_rows(self._all_classes)
+        self.filter_all_classes(self.class_search.text())
+        for sc, proxy in self.category_proxies.items():
+            proxy.set_source_rows(self._by_super.get(sc, []))
+
+        self.super_group_model.set_groups(
+            [(sc, self._by_super[sc]) for sc in sorted(self._by_super, key=lambda x: x.lower())])
+        self.plugin_group_model.set_groups(
+            [(p, self._by_plugin[p]) for p in sorted(self._by_plugin, key=lambda x: x.lower())])
 
         # Expand trees
         self.tree_by_super.expandToDepth(0)
@@ -925,69 +1230,67 @@ class MaxInspector(QtWidgets.QWidget):
     # --------------------------------
 
     def filter_all_classes(self, text):
-        text = text.strip().lower()
-        self.class_list.clear()
-        if not text:
-            for cname, sc, cid, pname in self._all_classes:
-                self.class_list.addItem(cname)
+        if not text.strip():
+            self.all_classes_proxy.set_source_rows(range(len(self._all_classes)))
             return
-        for cname, sc, cid, pname in self._all_classes:
-            if text in cname.lower() or text in sc.lower() or text in pname.lower():
-                self.class_list.addItem(cname)
+        if self._search_index is None:
+            self._search_index = ClassSearchIndex(self._all_classes)
+        self.all_classes_proxy.set_source_rows(self._search_index.search(text))
 
     # --- REVERTED (V5.4) ---
     # This now only shows cached info and avoids the 'getDefinition' error
-    def on_class_list_clicked(self, item):
-        name = item.text()
-        
+    def show_class_info(self, row_id):
+        """Shows the cached info of one class row, plus any same-named classes."""
+        cname, sc, cid, pname = self._all_classes[row_id]
+        lines = [f"Class: {cname}", f"SuperClass: {sc}", f"ClassID: {cid}", f"Plugin: {pname}"]
+        others = [r for r in self._lookup_index.rows_for_name(cname) if r != row_id]
+        if others:
+            lines.append("")
+            lines.append("Same name also defined as:")
+            for r in others:
+                _, o_sc, o_cid, o_pname = self._all_classes[r]
+                lines.append(f"  {o_sc} (ClassID: {o_cid}, Plugin: {o_pname})")
+        owner = self._lookup_index.row_for_classid(cid) if cid else None
+        if owner is not None and owner != row_id:
+            lines.append(f"\nClassID also used by: {self._all_classes[owner][0]}")
+        self.class_info.setPlainText("\n".join(lines) + "\n")
+
+    def on_class_list_clicked(self, index):
         # Handle clicks on the static "SuperClasses" tab first
-        if self.classes_tabs.currentWidget() == self.list_superclasses.parentWidget():
-             self.class_info.setPlainText(f"SuperClass: {name}\n(This is a base MaxScript class)")
+        if index.model() is self.superclass_model:
+             self.class_info.setPlainText(f"SuperClass: {index.data()}\n(This is a base MaxScript class)")
              return
         
-        # Find the class in our master list
-        match = next(((c,sid,cid,p) for (c,sid,cid,p) in self._all_classes if c == name), None)
-        
-        if match:
-            cname, sc, cid, pname = match
-            # Just display the cached info
-            self.class_info.setPlainText(
-                f"Class: {cname}\n"
-                f"SuperClass: {sc}\n"
-                f"ClassID: {cid}\n"
-                f"Plugin: {pname}\n"
-            )
+        row_id = index.data(ROW_ID_ROLE)
+        if row_id is not None:
+            self.show_class_info(row_id)
         else:
-            self.class_info.setPlainText(f"Class: {name}\n(no extra info)")
+            self.class_info.setPlainText(f"Class: {index.data()}\n(no extra info)")
 
     # --- REVERTED (V5.4) ---
-    def on_class_tree_clicked(self, item, col=0):
-        data = item.data(0, QtCore.Qt.UserRole)
+    def on_class_tree_clicked(self, index):
+        row_id = index.data(ROW_ID_ROLE)
         
-        if data and data[0] == "class":
+        if row_id is not None:
             # Item is a class
-            _, cname, sc, cid, pname = data
-            # Just display the cached info
-            self.class_info.setPlainText(
-                f"Class: {cname}\n"
-                f"SuperClass: {sc}\n"
-                f"ClassID: {cid}\n"
-                f"Plugin: {pname}\n"
-            )
+            self.show_class_info(row_id)
         else:
             # Item is a parent (category)
-            self.class_info.setPlainText(f"{item.text(0)}")
+            self.class_info.setPlainText(f"{index.data()}")
 
-    def copy_class_item(self, item):
-        name = item.text()
+    def copy_class_item(self, index):
+        # Group rows in the trees are not classes
+        if index.data(ROW_ID_ROLE) is None and index.model() is not self.superclass_model:
+            return
+        name = index.data()
         QtWidgets.QApplication.clipboard().setText(name)
         self.log(f"Copied class name to clipboard: {name}")
 
     def copy_selected_class(self):
-        it = self.class_list.currentItem()
-        if it:
-            QtWidgets.QApplication.clipboard().setText(it.text())
-            self.log(f"Copied class name to clipboard: {it.text()}")
+        index = self.class_list.currentIndex()
+        if index.isValid():
+            QtWidgets.QApplication.clipboard().setText(index.data())
+            self.log(f"Copied class name to clipboard: {index.data()}")
         else:
             self.log("No class selected to copy.")
 
@@ -1003,7 +1306,6 @@ def main():
     try:
         _max_inspector_ui = MaxInspector()
         _max_inspector_ui.show()
-        print("--- PYTHON DEBUG: MaxInspector UI is running. ---")
     except Exception as e:
         print(f"--- PYTHON CRITICAL ERROR: Failed to create MaxInspector UI! ---")
         print(f"--- ERROR: {e} ---")
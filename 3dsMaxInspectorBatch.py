@@ -0,0 +1,27 @@
+# ==========================
+# 3ds Max Inspector - batch mode
+# IMAN SHIRANI
+# GITHUB :
+# https://github.com/imanshirani/3ds-Max-Inspector/
+# ==========================
+# Builds the class cache and writes scene reports without the window:
+#   3dsmaxbatch.exe 3dsMaxInspectorBatch.py -mxsString args:"--cache max_classes_cache.bin --report scene.json"
+# Options: see max_inspector/cli.py. Any failure makes the script raise,
+# so 3dsmaxbatch exits with an error.
+
+import os
+import sys
+
+try:
+    _script_dir = os.path.dirname(os.path.realpath(__file__))
+except NameError:
+    import pymxs
+    _script_dir = os.path.dirname(pymxs.runtime.getSourceFileName() or "")
+if _script_dir and _script_dir not in sys.path:
+    sys.path.insert(0, _script_dir)
+
+from max_inspector import cli
+
+_status = cli.main(cli.batch_argv())
+if _status:
+    raise SystemExit(_status)
@@ -0,0 +1,101 @@
+"""
+Reads the controller tree and the keys of a heavily animated node against
+the fake runtime: per-sub-anim and per-key pymxs calls (the fallback
+path) versus one controllerTree call and one controllerKeys call per
+KEY_CHUNK_SIZE keys. Also times the longest single load step (how long
+the UI would stall) and filling a table with every key as Qt items
+versus the paged KeyTableModel.
+
+    python benchmarks/bench_anim_keys.py [keys per track]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from common import load_inspector
+from tests import fake_pymxs
+from max_inspector.anim import KeyTrack, read_controller_tree
+from max_inspector.ui.dialogs import KeyTableModel
+
+
+def build_node(rt, keys):
+    """Node 1: Position_XYZ and Euler_XYZ with keys on every axis, a Point3 scale track, a script and a list."""
+    def track(offset):
+        return rt.make_controller("Bezier_Float", [(float(f), ((f * 0.5 + offset) % 100.0,)) for f in range(keys)])
+
+    def xyz(class_name, prefix, offset):
+        axes = [rt.sub_anim(f"{prefix} {a}", track(offset + i)) for i, a in enumerate("XYZ")]
+        return rt.sub_anim(prefix, rt.make_controller(class_name, keyable=False), axes)
+
+    scale = rt.make_controller("Bezier_Scale", [(float(f), (1.0, 1.0, 1.0 + f * 0.01)) for f in range(keys // 2)],
+                               value_class="Point3")
+    transform = rt.sub_anim("Transform", rt.make_controller("Position_Rotation_Scale", keyable=False), [
+        xyz("Position_XYZ", "Position", 0), xyz("Euler_XYZ", "Rotation", 3), rt.sub_anim("Scale", scale)])
+    listed = rt.make_controller("Float_List", keyable=False)
+    params = rt.sub_anim("Object (Box)", None, [
+        rt.sub_anim("Length", rt.make_controller("Float_Script", keyable=False, script="sin (currentTime * 10)")),
+        rt.sub_anim("Width", listed, [rt.sub_anim("Bezier Float", track(7)), rt.sub_anim("Noise Float", None)]),
+        rt.sub_anim("Height", None)])
+    rt.load_scene(1)
+    rt.animate_node(1, [rt.sub_anim("Visibility", None), rt.sub_anim("Space Warps", None), transform, params])
+
+
+def main():
+    keys = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    mod = load_inspector()
+    rt = fake_pymxs.runtime
+    helpers = mod.get_bulk_helpers()
+    build_node(rt, keys)
+    app = mod.QtWidgets.QApplication.instance() or mod.QtWidgets.QApplication([])
+
+    for label, h in (("per sub-anim", None), ("bulk", helpers)):
+        rt.reset_counts()
+        start = time.perf_counter()
+        rows = read_controller_tree(1, h)
+        print(f"tree  {label:>12}: {len(rows)} tracks, {rt.total_calls:>8} crossings, "
+              f"{(time.perf_counter() - start) * 1000:7.1f}ms")
+    handle = next(r[2] for r in rows if r[1] == "Position X")
+
+    print(f"\nkeys of one {keys:,}-key float track")
+    for label, h in (("per key", None), ("bulk", helpers)):
+        track = KeyTrack(handle, h)
+        rt.reset_counts()
+        start = time.perf_counter()
+        longest = 0.0
+        steps = track.load_steps()
+        while True:
+            step = time.perf_counter()
+            try:
+                next(steps)
+            except StopIteration:
+                break
+            longest = max(longest, time.perf_counter() - step)
+        print(f"keys  {label:>12}: {len(track):,} keys, {rt.total_calls:>8} crossings, "
+              f"{(time.perf_counter() - start) * 1000:7.0f}ms, longest step {longest * 1000:6.2f}ms")
+
+    QtWidgets = mod.QtWidgets
+    start = time.perf_counter()
+    table = QtWidgets.QTableWidget(len(track), 1 + track.dims)
+    for row in range(len(track)):
+        table.setItem(row, 0, QtWidgets.QTableWidgetItem(f"{track.times[row]:g}"))
+        for col, x in enumerate(track.value(row), 1):
+            table.setItem(row, col, QtWidgets.QTableWidgetItem(f"{x:.6g}"))
+    print(f"\nQTableWidget, every key as items: {(time.perf_counter() - start) * 1000:7.0f}ms")
+    del table
+
+    start = time.perf_counter()
+    view = QtWidgets.QTableView()
+    model = KeyTableModel(track)
+    view.setModel(model)
+    model.track_grew()
+    view.resize(600, 800)
+    view.show()
+    app.processEvents()
+    print(f"KeyTableModel, paged:             {(time.perf_counter() - start) * 1000:7.0f}ms "
+          f"({model.rowCount():,} rows exposed)")
+
+
+if __name__ == "__main__":
+    main()
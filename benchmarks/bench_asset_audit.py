@@ -0,0 +1,90 @@
+"""
+Asset audit over 20k texture paths (200 folders on local disk, 5% of
+them missing): gathering the paths from the fake scene (one assetPaths
+call against per-property calls), then checking the files with one
+worker against the thread pool, cold, re-stat'ed and from the cache, with
+and without content hashes. --latency MS adds a simulated per-file round
+trip to every stat, the way a network share answers.
+
+    python benchmarks/bench_asset_audit.py [--files N] [--latency MS]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import common  # noqa: F401  (routes pymxs to the fake runtime)
+from tests import fake_pymxs
+from max_inspector import assets
+from max_inspector.assets import AssetAudit, AssetStatCache, read_asset_refs
+from max_inspector.bulk import get_bulk_helpers
+
+
+def build_scene(rt, root, files):
+    folders = 200
+    for d in range(folders):
+        os.makedirs(os.path.join(root, f"lib_{d:03d}"))
+    for i in range(files):
+        if i % 20:
+            with open(os.path.join(root, f"lib_{i % folders:03d}", f"tex_{i:06d}.png"), "wb") as f:
+                f.write(os.urandom(256 + i % 4096))
+    rt.load_scene(files // 4)
+
+    def make(h):
+        maps = [rt.make_object("Bitmaptexture", "TextureMap",
+                               {"filename": f"lib_{i % folders:03d}/tex_{i:06d}.png"}, name=f"Map #{i}")
+                for i in range((h - 1) * 4, h * 4)]
+        mat = rt.make_object("PhysicalMaterial", "Material", {"base_color_map": maps[0], "bump_map": maps[1],
+                                                              "roughness_map": maps[2], "cutout_map": maps[3]})
+        obj = rt.make_object("Box", "GeometryClass", {})
+        obj.material = mat
+        return obj
+
+    rt.dress_nodes(make)
+
+
+def main():
+    files, latency = 20_000, 0.0
+    if "--files" in sys.argv:
+        files = int(sys.argv[sys.argv.index("--files") + 1])
+    if "--latency" in sys.argv:
+        latency = float(sys.argv[sys.argv.index("--latency") + 1]) / 1000.0
+    if latency:
+        stat_files = assets._stat_files
+
+        def slow_stat_files(directory, items, listing):
+            time.sleep(latency * (1 if listing else len(items)))
+            return stat_files(directory, items, listing)
+
+        assets._stat_files = slow_stat_files
+
+    rt = fake_pymxs.runtime
+    root = tempfile.mkdtemp(prefix="bench_assets_")
+    try:
+        build_scene(rt, root, files)
+        for path, helpers in (("bulk", get_bulk_helpers()), ("per-prop", None)):
+            rt.reset_counts()
+            start = time.perf_counter()
+            refs = read_asset_refs(helpers)
+            print(f"gather {path:>8}: {len(refs)} paths, {rt.total_calls} crossings, "
+                  f"{(time.perf_counter() - start) * 1000:.0f}ms")
+
+        print(f"\n{'run':>26} {'workers':>8} {'time':>9} {'cached':>7} {'hashed':>7} {'missing':>8}")
+        cache = AssetStatCache()
+        runs = [("cold", 1, False, None, assets.ASSET_STAT_MAX_AGE),
+                ("cold", assets.ASSET_AUDIT_WORKERS, False, None, assets.ASSET_STAT_MAX_AGE),
+                ("cold + cache fill", assets.ASSET_AUDIT_WORKERS, True, cache, assets.ASSET_STAT_MAX_AGE),
+                ("re-audit", assets.ASSET_AUDIT_WORKERS, True, cache, assets.ASSET_STAT_MAX_AGE),
+                ("re-stat, hashes kept", assets.ASSET_AUDIT_WORKERS, True, cache, 0.0)]
+        for label, workers, hash_files, run_cache, max_age in runs:
+            audit = AssetAudit(refs, root, run_cache, hash_files, workers, max_age).run()
+            name = label + (" +hash" if hash_files else "")
+            print(f"{name:>26} {workers:>8} {audit.elapsed * 1000:>7.0f}ms {audit.from_cache:>7} "
+                  f"{audit.hashed:>7} {len(audit.missing()):>8}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
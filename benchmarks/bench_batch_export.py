@@ -0,0 +1,81 @@
+"""
+Throughput of the batch inspection export (objects/sec) into NDJSON, CSV
+and SQLite against the fake runtime, with the bulk objectRecords helper
+and with the node-by-node fallback, plus the traced peak memory of an
+export at two scene sizes to show it does not grow with the node count.
+
+    python benchmarks/bench_batch_export.py [nodes]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import load_inspector
+from tests import fake_pymxs
+from bench_property_schema import synthetic_props
+
+
+def dress_scene(rt, seed=0):
+    rnd = random.Random(seed)
+    object_props = [synthetic_props(rt, rnd, 60) for _ in range(5)]
+    material_props = synthetic_props(rt, rnd, 40)
+    modifier_props = [synthetic_props(rt, rnd, 20) for _ in range(3)]
+
+    def make(handle):
+        kind = handle % len(object_props)
+        obj = rt.make_object(f"Primitive_{kind}", "GeometryClass", object_props[kind]())
+        obj.material = rt.make_object("PhysicalMaterial", "Material", material_props(), name=f"Mat_{handle}")
+        for m, props in enumerate(modifier_props[:handle % 4]):
+            obj.modifiers.append(rt.make_object(f"Modifier_{m}", "Modifier", props(), name=f"Mod_{m}"))
+        return obj
+
+    rt.dress_nodes(make, layers=("0", "Props", "Characters"))
+
+
+def export(mod, helpers, path, with_properties=True):
+    source = mod.BatchRecordSource(helpers, mod.PropertySchemaCache())
+    handles = source.handles("scene")
+    writer = mod.open_batch_writer(path)
+    written = 0
+    for _, written in mod.iter_batch_export(source, handles, writer, with_properties):
+        pass
+    writer.close()
+    return written
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    mod = load_inspector()
+    rt = fake_pymxs.runtime
+    helpers = mod.get_bulk_helpers()
+    tmp = tempfile.mkdtemp()
+    print(f"{'nodes':>7} {'path':>9} {'format':>7} {'props':>6} {'crossings':>10} {'objects/s':>10} {'size':>9}")
+    for nodes, path_name, use_helpers in ((count, "bulk", True), (count // 10, "per-node", False)):
+        rt.load_scene(nodes)
+        dress_scene(rt)
+        for ext in (".ndjson", ".csv", ".sqlite"):
+            for with_properties in (True, False):
+                path = os.path.join(tmp, "export" + ext)
+                rt.reset_counts()
+                start = time.perf_counter()
+                written = export(mod, helpers if use_helpers else None, path, with_properties)
+                elapsed = time.perf_counter() - start
+                assert written == nodes
+                print(f"{nodes:>7} {path_name:>9} {ext[1:]:>7} {'yes' if with_properties else 'no':>6} "
+                      f"{rt.total_calls:>10} {written / elapsed:>10.0f} {os.path.getsize(path) / 1e6:>7.1f}MB")
+
+    for nodes in (count // 2, count):
+        rt.load_scene(nodes)
+        dress_scene(rt)
+        tracemalloc.start()
+        export(mod, helpers, os.path.join(tmp, "export.ndjson"))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"peak traced memory exporting {nodes} nodes to NDJSON: {peak / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
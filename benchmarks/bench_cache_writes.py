@@ -0,0 +1,137 @@
+"""
+Class cache writes under crashes and concurrent sessions. Writer
+processes rewrite one cache file in a loop and are killed at random
+moments while a reader keeps opening it: written in place, as before, the
+reader sees truncated or half-written files, or is killed outright when
+the file shrinks under its memory map; with the atomic, locked writes
+every open succeeds. Also times opening a 500k-row cache with and
+without the checksum check, and reading the shared cache plus a one
+category user overlay.
+
+    python benchmarks/bench_cache_writes.py [--kills N]
+"""
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from common import best_of
+from bench_class_cache import synthetic_rows
+from max_inspector import cache as cache_module
+from max_inspector.cache import BinaryClassCache, LayeredClassCache, pack_class_cache, write_class_cache
+
+CRASH_ROWS = 5_000
+
+
+def write_in_place(path, rows):
+    """The old write: open the cache with "wb" and write into it."""
+    data = pack_class_cache(rows)
+    with open(path, "wb") as f:
+        for i in range(0, len(data), 1 << 16):
+            f.write(data[i:i + (1 << 16)])
+            f.flush()
+
+
+def writer(path, atomic, seed, ready):
+    rows = synthetic_rows(CRASH_ROWS, seed)
+    ready.release()
+    while True:
+        if atomic:
+            write_class_cache(path, rows)
+        else:
+            write_in_place(path, rows)
+
+
+def reader(path, deadline, counts):
+    while time.time() < deadline:
+        try:
+            open_and_read(path)
+            counts[0] += 1
+        except (ValueError, IndexError, OSError):
+            counts[1] += 1
+
+
+def crash_run(path, atomic, kills):
+    """Returns (good reads, corrupt reads, reader crashes, cache readable at the end)."""
+    write_class_cache(path, synthetic_rows(CRASH_ROWS))
+    counts = multiprocessing.Array("l", 2)
+    crashes = 0
+    for k in range(kills):
+        ready = multiprocessing.Semaphore(0)
+        procs = [multiprocessing.Process(target=writer, args=(path, atomic, k * 2 + i, ready)) for i in range(2)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            ready.acquire()
+        # The reader maps the file: truncating it under the mapping kills the reader (SIGBUS), so it runs apart
+        deadline = time.time() + random.uniform(0.05, 0.3)
+        while time.time() < deadline:
+            read = multiprocessing.Process(target=reader, args=(path, deadline, counts))
+            read.start()
+            read.join()
+            crashes += read.exitcode != 0
+        for p in procs:
+            p.kill()  # a crash mid-write, no cleanup
+            p.join()
+    try:
+        survived = len(open_and_read(path)) == CRASH_ROWS
+    except (ValueError, IndexError, OSError):
+        survived = False
+    return counts[0], counts[1], crashes, survived
+
+
+def open_and_read(path):
+    with BinaryClassCache(path) as cache:
+        return list(cache)
+
+
+def main():
+    kills = 10
+    if "--kills" in sys.argv:
+        kills = int(sys.argv[sys.argv.index("--kills") + 1])
+    tmp = tempfile.mkdtemp(prefix="mxic_writes_")
+    try:
+        print(f"{'write':>9} {'reads ok':>9} {'corrupt':>8} {'reader crashes':>15} {'readable after':>15}")
+        for label, atomic in (("in place", False), ("atomic", True)):
+            ok, bad, crashes, survived = crash_run(os.path.join(tmp, f"{label.replace(' ', '_')}.bin"), atomic, kills)
+            print(f"{label:>9} {ok:>9} {bad:>8} {crashes:>15} {str(survived):>15}")
+
+        rows = synthetic_rows(500_000)
+        path = os.path.join(tmp, "big.bin")
+        write_class_cache(path, rows)
+
+        def open_cache(verify):
+            with BinaryClassCache(path, verify) as cache:
+                len(cache)
+
+        print(f"\n500k rows, {os.path.getsize(path) / 2**20:.1f} MB: "
+              f"open {best_of(lambda: open_cache(False)) * 1000:.2f}ms, "
+              f"open + checksum {best_of(lambda: open_cache(True)) * 1000:.2f}ms")
+
+        layered = LayeredClassCache(path, os.path.join(tmp, "user", "big.overlay.bin"))
+        edited = [r for r in rows if r[1] != "Light"] + [("NewLight", "Light", "#(1, 2)", "x.dlo")]
+
+        def read_only(target, *args):
+            if target == path:
+                raise PermissionError(13, "Permission denied", target)
+            write_class_cache(target, *args)
+
+        cache_module.write_class_cache = read_only  # the shared folder is read-only: the save goes to the overlay
+        try:
+            assert layered.save(edited) == layered.user_path
+        finally:
+            cache_module.write_class_cache = write_class_cache
+        load = best_of(layered.load)
+        loaded, _ = layered.load()
+        assert sorted(loaded) == sorted(edited)
+        print(f"shared + overlay ({os.path.getsize(layered.user_path)} bytes): load {load * 1000:.0f}ms, "
+              f"shared alone {best_of(lambda: open_and_read(path)) * 1000:.0f}ms")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
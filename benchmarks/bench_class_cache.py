@@ -0,0 +1,58 @@
+"""
+Compares loading the legacy indented JSON class cache with the binary,
+memory-mapped cache at 5k, 50k and 500k synthetic rows.
+
+    python benchmarks/bench_class_cache.py
+"""
+import json
+import os
+import random
+import tempfile
+
+from common import best_of
+from max_inspector.cache import BinaryClassCache, write_class_cache
+
+SUPERCLASSES = ["GeometryClass", "Shape", "Light", "Camera", "Helper", "Modifier",
+                "SpacewarpObject", "Material", "TextureMap", "RenderEffect",
+                "Atmospheric", "Controller"]
+PLUGINS = [""] * 8 + [f"plugin_{i}.dlo" for i in range(40)]
+
+
+def synthetic_rows(count, seed=0):
+    rnd = random.Random(seed)
+    return [(f"Class_{i:07d}", rnd.choice(SUPERCLASSES),
+             f"#({rnd.getrandbits(31)}, {rnd.getrandbits(31)})", rnd.choice(PLUGINS))
+            for i in range(count)]
+
+
+def main():
+    tmp = tempfile.mkdtemp(prefix="mxic_bench_")
+    print(f"{'rows':>8} {'json KB':>9} {'bin KB':>9} {'json load':>10} {'bin load':>10} {'bin open':>10}")
+    for count in (5_000, 50_000, 500_000):
+        rows = synthetic_rows(count)
+        json_path = os.path.join(tmp, f"cache_{count}.json")
+        bin_path = os.path.join(tmp, f"cache_{count}.bin")
+        with open(json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+        write_class_cache(bin_path, rows)
+
+        def load_json():
+            with open(json_path) as f:
+                return [tuple(r) for r in json.load(f)]
+
+        def load_bin():
+            with BinaryClassCache(bin_path) as cache:
+                return list(cache)
+
+        def open_bin():
+            with BinaryClassCache(bin_path) as cache:
+                return cache[len(cache) // 2]
+
+        assert load_bin() == rows
+        print(f"{count:>8} {os.path.getsize(json_path) // 1024:>9} {os.path.getsize(bin_path) // 1024:>9}"
+              f" {best_of(load_json) * 1000:>8.1f}ms {best_of(load_bin) * 1000:>8.1f}ms"
+              f" {best_of(open_bin) * 1000:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmarks ClassSearchIndex against the old linear three-field scan of
+filter_all_classes at 100k synthetic classes, including an incremental
+typing sequence where each query extends the previous one.
+
+    python benchmarks/bench_class_search.py [rows]
+"""
+import random
+import sys
+import time
+
+from common import best_of, load_inspector
+
+SYLLABLES = ["ab", "al", "bez", "cam", "cor", "dis", "ed", "fl", "gen", "hel", "in", "lo",
+             "map", "mo", "na", "no", "pol", "ra", "shell", "sp", "tex", "tur", "vr", "xy"]
+SUPERCLASSES = ["GeometryClass", "Shape", "Light", "Camera", "Helper", "Modifier",
+                "SpacewarpObject", "Material", "TextureMap", "RenderEffect"]
+PLUGINS = [""] * 8 + [f"plugin_{i}.dlo" for i in range(40)]
+
+
+def word_rows(count, seed=0):
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(count):
+        name = "_".join("".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(1, 3)))
+                        for _ in range(rnd.randint(1, 3)))
+        rows.append((f"{name}{i}", rnd.choice(SUPERCLASSES), "", rnd.choice(PLUGINS)))
+    return rows
+
+
+def linear_filter(rows, text):
+    text = text.strip().lower()
+    return [i for i, (cname, sc, cid, pname) in enumerate(rows)
+            if text in cname.lower() or text in sc.lower() or text in pname.lower()]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    mod = load_inspector()
+    rows = word_rows(count)
+
+    start = time.perf_counter()
+    index = mod.ClassSearchIndex(rows)
+    print(f"index build for {count} rows: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    print(f"{'query':>14} {'hits':>7} {'linear':>10} {'indexed':>10}")
+    for query in ("shellmap", "tex_pol", "plugin_17", "vrcam", "zzz", "modifier"):
+        assert index.search(query) == linear_filter(rows, query)
+        linear = best_of(lambda: linear_filter(rows, query))
+
+        def indexed():
+            index.search("")
+            return index.search(query)
+
+        hits = len(indexed())
+        print(f"{query:>14} {hits:>7} {linear * 1000:>8.2f}ms {best_of(indexed) * 1000:>8.3f}ms")
+
+    # Typing "shellmap" one key at a time, as the debounced UI would see it
+    typed = "shellmap"
+    index.search("")
+    start = time.perf_counter()
+    for n in range(1, len(typed) + 1):
+        index.search(typed[:n])
+    incremental = time.perf_counter() - start
+    start = time.perf_counter()
+    for n in range(1, len(typed) + 1):
+        linear_filter(rows, typed[:n])
+    print(f"incremental typing of {typed!r}: linear {(time.perf_counter() - start) * 1000:.1f}ms,"
+          f" indexed {incremental * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Memory of the master class rows, their superclass/plugin groupings and
+the name/classID lookup at 5k and 500k rows, measured with tracemalloc:
+the list of 4-tuples with lists of row ids per group and dict lookups,
+against the ClassTable with array('I') group columns and the hash-table
+ClassLookupIndex. Both are built from the JSON cache text (load,
+de-duplicate and sort, group, index), so the strings are counted too;
+the JSON loader gives every repeated superclass and plugin name its own
+string. Also times building each (untraced) and a full pass over the
+rows, measures the search index each layout adds on the first search
+(list and array('I') posting lists), and times a class click (the
+same-name and classID lookups of show_class_info) on each.
+
+    python benchmarks/bench_class_table.py [--max-rows N]
+"""
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import common  # noqa: F401  (puts the package on sys.path)
+from bench_class_cache import synthetic_rows
+from max_inspector.index import ClassLookupIndex, ClassSearchIndex, ClassTable, group_class_rows, prepare_class_rows
+
+
+def legacy_group(rows):
+    """The grouping the table replaces: a list of int row ids per superclass and plugin."""
+    by_super, by_plugin = {}, {}
+    for row_id, (cname, sc, cid, pname) in enumerate(rows):
+        by_super.setdefault(sc if sc else "<no_super>", []).append(row_id)
+        by_plugin.setdefault(pname if pname else "<core>", []).append(row_id)
+    return by_super, by_plugin
+
+
+def legacy_lookup(rows):
+    """The dict-based name and classID lookups ClassLookupIndex replaces."""
+    by_name, by_classid = {}, {}
+    for row_id, (cname, sc, cid, pname) in enumerate(rows):
+        by_name.setdefault(cname, []).append(row_id)
+        if cid:
+            by_classid.setdefault(cid, row_id)
+    return by_name, by_classid
+
+
+def legacy_search(rows):
+    """ClassSearchIndex as it was before its posting lists became arrays: a list of int row ids per trigram."""
+    haystacks = [f"{cname}\n{sc}\n{pname}".lower() for cname, sc, cid, pname in rows]
+    postings = {}
+    for row_id, hay in enumerate(haystacks):
+        for gram in {hay[i:i + 3] for i in range(len(hay) - 2)}:
+            postings.setdefault(gram, []).append(row_id)
+    return haystacks, postings
+
+
+def build_tuples(text):
+    table = prepare_class_rows(json.loads(text))
+    return table, legacy_group(table), legacy_lookup(table)
+
+
+def build_table(text):
+    table = ClassTable(prepare_class_rows(json.loads(text)))
+    return table, group_class_rows(table), ClassLookupIndex(table)
+
+
+def measure(build, text):
+    start = time.perf_counter()
+    build(text)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = build(text)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    table = result[0]
+    start = time.perf_counter()
+    for row in table:
+        pass
+    scan = time.perf_counter() - start
+    return result, current, peak, elapsed, scan
+
+
+def traced_size(build, *args):
+    tracemalloc.start()
+    result = build(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def click_time(rows_for_name, row_for_classid, names, class_ids):
+    """Mean time of the two lookups a click in the class list makes."""
+    start = time.perf_counter()
+    for cname, cid in zip(names, class_ids):
+        rows_for_name(cname)
+        row_for_classid(cid)
+    return (time.perf_counter() - start) / len(names)
+
+
+def main():
+    max_rows = 500_000
+    if "--max-rows" in sys.argv:
+        max_rows = int(sys.argv[sys.argv.index("--max-rows") + 1])
+    print(f"{'rows':>8} {'layout':>8} {'retained':>10} {'peak':>10} {'build':>9} {'iterate':>9} "
+          f"{'+ search':>10} {'click':>9}")
+    for count in (5_000, 500_000):
+        if count > max_rows:
+            break
+        text = json.dumps(synthetic_rows(count))
+        picks = random.Random(0).sample(range(count), min(count, 10_000))
+        results = {}
+        for layout, build, search in (("tuples", build_tuples, legacy_search),
+                                      ("columns", build_table, ClassSearchIndex)):
+            result, current, peak, elapsed, scan = measure(build, text)
+            results[layout] = result
+            rows, _, lookup = result
+            _, search_size = traced_size(search, rows)
+            names, class_ids = [rows[i][0] for i in picks], [rows[i][2] for i in picks]
+            if layout == "tuples":
+                by_name, by_classid = lookup
+                click = click_time(lambda n: by_name.get(n, []), by_classid.get, names, class_ids)
+            else:
+                click = click_time(lookup.rows_for_name, lookup.row_for_classid, names, class_ids)
+            print(f"{count:>8} {layout:>8} {current / 2**20:>8.2f}MB {peak / 2**20:>8.2f}MB "
+                  f"{elapsed * 1000:>7.0f}ms {scan * 1000:>7.0f}ms {search_size / 2**20:>8.2f}MB "
+                  f"{click * 1e6:>7.2f}us")
+        (tuples, groups, (by_name, by_classid)), (table, table_groups, lookup) = results["tuples"], results["columns"]
+        assert list(table) == tuples and table[count // 2] == tuples[count // 2]
+        assert all(list(table_groups[0][k]) == v for k, v in groups[0].items())
+        assert all(list(table_groups[1][k]) == v for k, v in groups[1].items())
+        assert all(lookup.rows_for_name(tuples[i][0]) == by_name[tuples[i][0]] for i in picks)
+        assert all(lookup.row_for_classid(tuples[i][2]) == by_classid.get(tuples[i][2]) for i in picks)
+
+
+if __name__ == "__main__":
+    main()
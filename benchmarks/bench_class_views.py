@@ -0,0 +1,93 @@
+"""
+Headless (offscreen Qt) benchmark of populating the class panels: the old
+per-item QListWidget/QTreeWidget approach versus the shared model/view
+setup in populate_ui_from_data. Each variant runs in its own process so
+the reported RSS growth is not polluted by the other one.
+
+    python benchmarks/bench_class_views.py [rows]
+"""
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from bench_class_cache import synthetic_rows
+from common import load_inspector
+
+CATEGORIES = ["GeometryClass", "Shape", "Light", "Camera", "Helper", "Modifier",
+              "SpacewarpObject", "Material", "TextureMap", "RenderEffect"]
+
+
+def rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def legacy_populate(QtWidgets, QtCore, rows):
+    """The pre-model populate_ui_from_data, reduced to its widget work."""
+    class_list = QtWidgets.QListWidget()
+    tree_by_super = QtWidgets.QTreeWidget()
+    tree_by_plugin = QtWidgets.QTreeWidget()
+    lists = {sc: QtWidgets.QListWidget() for sc in CATEGORIES}
+    rows = sorted(set(rows), key=lambda x: x[0].lower())
+    buckets, by_super, by_plugin = {sc: [] for sc in CATEGORIES}, {}, {}
+    for cname, sc, cid, pname in rows:
+        class_list.addItem(cname)
+        if sc in buckets:
+            buckets[sc].append(cname)
+        by_super.setdefault(sc or "<no_super>", []).append((cname, cid, pname))
+        by_plugin.setdefault(pname or "<core>", []).append((cname, sc, cid))
+    for sc, widget in lists.items():
+        widget.addItems(sorted(buckets[sc], key=lambda x: x.lower()))
+    for tree, groups in ((tree_by_super, by_super), (tree_by_plugin, by_plugin)):
+        for key in sorted(groups, key=lambda x: x.lower()):
+            parent = QtWidgets.QTreeWidgetItem(tree, [key])
+            for entry in sorted(groups[key], key=lambda x: x[0].lower()):
+                child = QtWidgets.QTreeWidgetItem(parent, [entry[0]])
+                child.setData(0, QtCore.Qt.UserRole, ("class",) + entry)
+        tree.expandToDepth(0)
+    return [class_list, tree_by_super, tree_by_plugin] + list(lists.values())
+
+
+def run_variant(variant, count):
+    mod = load_inspector()
+    QtWidgets, QtCore = mod.QtWidgets, mod.QtCore
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    class BenchInspector(mod.MaxInspector):
+        def load_from_cache(self):
+            return False
+
+    ui = BenchInspector()
+    rows = synthetic_rows(count)
+    app.processEvents()
+    before = rss_kb()
+    start = time.perf_counter()
+    if variant == "legacy":
+        keep = legacy_populate(QtWidgets, QtCore, rows)
+    else:
+        ui.populate_ui_from_data(rows)
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    print(f"{variant:>7} {count:>8} {elapsed * 1000:>10.1f}ms {(rss_kb() - before) / 1024:>9.1f}MB")
+
+
+def main():
+    if len(sys.argv) > 2:
+        run_variant(sys.argv[1], int(sys.argv[2]))
+        return
+    counts = [int(sys.argv[1])] if len(sys.argv) > 1 else [3_000, 30_000, 100_000]
+    print(f"{'variant':>7} {'rows':>8} {'populate':>12} {'RSS delta':>11}")
+    for count in counts:
+        for variant in ("legacy", "model"):
+            subprocess.run([sys.executable, __file__, variant, str(count)], check=True)
+
+
+if __name__ == "__main__":
+    main()
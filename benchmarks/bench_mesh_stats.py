@@ -0,0 +1,69 @@
+"""
+Geometry inspector against the fake runtime on grid meshes with one UV
+channel at 100k, 1M and 10M triangles: runtime crossings and time to
+read the mesh (one writeMesh call into a memory-mapped file), time for
+the topology stats, and the tracemalloc peak of the stats so the memory
+budget stays bounded as the mesh grows. The per-vertex fallback is
+measured at the smallest size.
+
+    python benchmarks/bench_mesh_stats.py [--max-tris N]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import common  # noqa: F401  (routes pymxs to the fake runtime)
+from tests import fake_pymxs
+from max_inspector.bulk import get_bulk_helpers
+from max_inspector.mesh import MeshBuffer, MeshStats
+
+
+def grid_mesh(n):
+    """An n x n quad grid (2n^2 triangles) with a planar UV mapping."""
+    side = np.arange(n + 1, dtype=np.float32)
+    xs, ys = np.meshgrid(side, side)
+    verts = np.stack([xs.ravel(), ys.ravel(), np.zeros(xs.size, np.float32)], axis=1)
+    normals = np.zeros_like(verts)
+    normals[:, 2] = 1
+    cell = np.arange(n * n, dtype=np.int32)
+    a = cell // n * (n + 1) + cell % n
+    faces = np.concatenate([np.stack([a, a + 1, a + n + 2], axis=1), np.stack([a, a + n + 2, a + n + 1], axis=1)])
+    return verts, faces, normals, {1: (verts / n, faces)}
+
+
+def main():
+    max_tris = 10_000_000
+    if "--max-tris" in sys.argv:
+        max_tris = int(sys.argv[sys.argv.index("--max-tris") + 1])
+    rt = fake_pymxs.runtime
+    helpers = get_bulk_helpers()
+
+    print(f"{'tris':>10} {'path':>9} {'crossings':>10} {'read':>9} {'stats':>9} {'stats peak':>11} {'elements':>9}")
+    for n in (224, 707, 2236):
+        if 2 * n * n > max_tris:
+            break
+        rt.load_scene(1)
+        rt.set_mesh(1, *grid_mesh(n))
+        paths = [("bulk", helpers)] + ([("per-vert", None)] if n == 224 else [])
+        for path, path_helpers in paths:
+            rt.reset_counts()
+            start = time.perf_counter()
+            buffer = MeshBuffer.read(1, path_helpers)
+            read = time.perf_counter() - start
+            crossings = rt.total_calls
+            tracemalloc.start()
+            start = time.perf_counter()
+            stats = MeshStats(buffer)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            buffer.close()
+            assert stats.num_faces == 2 * n * n and stats.elements() == 1 and stats.isolated_verts == 0
+            print(f"{stats.num_faces:>10} {path:>9} {crossings:>10} {read * 1000:>7.0f}ms {elapsed * 1000:>7.0f}ms "
+                  f"{peak / 2**20:>9.1f}MB {stats.elements():>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Clicking nodes under Scene -> Objects: time and runtime crossings of
+inspect_object_all() for heavy objects (300 properties, a 40 property
+material, 3 modifiers) the first time, when switching back to them, after
+a material or parameter edit reported by the node change callback (only
+the sections showing it are recomputed) and after the time slider moves.
+Then clicks through the whole scene with a small memory cap to show the
+least recently inspected nodes being evicted.
+
+    python benchmarks/bench_object_inspection.py [nodes]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from common import load_inspector
+from tests import fake_pymxs
+from bench_property_schema import synthetic_props
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    mod = load_inspector()
+    app = mod.QtWidgets.QApplication.instance() or mod.QtWidgets.QApplication([])
+    rt = fake_pymxs.runtime
+    rnd = random.Random(0)
+    object_props, material_props = synthetic_props(rt, rnd, 300), synthetic_props(rt, rnd, 40)
+    modifier_props = [synthetic_props(rt, rnd, 20) for _ in range(3)]
+
+    def make(h):
+        obj = rt.make_object("HeavyPrimitive", "GeometryClass", object_props())
+        obj.material = rt.make_object("PhysicalMaterial", "Material", material_props(), name=f"Mat_{h}")
+        for m, props in enumerate(modifier_props):
+            obj.modifiers.append(rt.make_object(f"Modifier_{m}", "Modifier", props(), name=f"Mod_{m}"))
+        return obj
+
+    rt.load_scene(count, nested=0)
+    rt.dress_nodes(make)
+
+    class BenchInspector(mod.MaxInspector):
+        def load_from_cache(self):
+            return False
+
+    ui = BenchInspector()
+    ui.log_lines = lambda lines: None
+    ui.log = lambda text: None
+    cache = ui._inspection_cache
+    a, b = mod.get_node_by_handle(1), mod.get_node_by_handle(2)
+
+    def click(label, node):
+        rt.reset_counts()
+        hits = cache.hits
+        start = time.perf_counter()
+        ui.inspect_object_all(node)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>34} {elapsed * 1000:>8.2f}ms {rt.total_calls:>10} {cache.hits - hits:>7}/9")
+
+    print(f"{'click':>34} {'time':>10} {'crossings':>10} {'cached':>9}")
+    click("A, first time", a)
+    click("B, first time", b)
+    click("A again", a)
+    click("B again", b)
+    rt.edit_nodes([1], "materialOtherEvent")
+    click("A after a material edit", a)
+    rt.edit_nodes([1], "geometryChanged")
+    click("A after a parameter edit", a)
+    rt.edit_nodes([1], "nameChanged")
+    click("A after a rename", a)
+    rt._globals["currentTime"] = fake_pymxs.FakeTime(rt, 10)
+    click("A at another frame", a)
+
+    per_node = cache.size / len(cache)
+    ui._inspection_cache = cache = mod.InspectionCache(max_bytes=int(per_node * 50))
+    start = time.perf_counter()
+    for h in range(1, count + 1):
+        ui.inspect_object_all(mod.get_node_by_handle(h))
+    print(f"\n{count} nodes with a {cache._max_bytes / 2**20:.1f} MB cap ({per_node / 1024:.0f} KB per node): "
+          f"{(time.perf_counter() - start) * 1000:.0f}ms, {len(cache)} nodes kept, {cache.size / 2**20:.1f} MB")
+    ui.close()
+
+
+if __name__ == "__main__":
+    main()
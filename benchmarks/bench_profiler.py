@@ -0,0 +1,87 @@
+"""
+Cost of the opt-in pymxs profiler against the counting fake runtime: the
+Properties, Material and Modifiers inspectors (per-property reads, so
+thousands of calls per object) with profiling never enabled, enabled,
+and disabled again, plus the per-call overhead of the wrapper. Prints
+the busiest scopes and checks the Chrome trace export.
+
+    python benchmarks/bench_profiler.py [objects]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from bench_property_schema import synthetic_objects
+from common import best_of, load_inspector
+from tests import fake_pymxs
+from max_inspector.profiling import enable_profiling
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    mod = load_inspector()
+    app = mod.QtWidgets.QApplication.instance() or mod.QtWidgets.QApplication([])
+    rt = fake_pymxs.runtime
+    objects = synthetic_objects(rt, count)
+
+    class BenchInspector(mod.MaxInspector):
+        def load_from_cache(self):
+            return False
+
+    class UncachedSchemas(mod.PropertySchemaCache):
+        def schema_key(self, value):
+            return None
+
+    ui = BenchInspector()
+    ui.log = lambda text: None
+    ui.read_properties = UncachedSchemas().read
+
+    def inspect_all():
+        for obj in objects:
+            with mod.profile_scope("Inspect Node"):
+                for name, inspect in (("Properties", ui.inspect_properties), ("Material", ui.inspect_material),
+                                      ("Modifiers", ui.inspect_modifiers)):
+                    with mod.profile_scope(name):
+                        inspect(obj)
+
+    def many_calls():
+        for _ in range(100000):
+            mod.rt.classOf(1.0)
+
+    rt.reset_counts()
+    inspect_all()
+    print(f"{count} objects, {rt.total_calls:,} fake crossings per pass")
+    print(f"{'profiling':>10} {'inspectors':>11} {'100k calls':>11}")
+    results = {}
+    for label in ("never on", "on", "off again"):
+        if label == "on":
+            profiler = enable_profiling()
+        elif label == "off again":
+            mod.disable_profiling()
+        results[label] = (best_of(inspect_all), best_of(many_calls))
+        print(f"{label:>10} {results[label][0] * 1000:>9.0f}ms {results[label][1] * 1000:>9.0f}ms")
+    on, off = results["on"], results["never on"]
+    print(f"wrapper overhead: {(on[1] - off[1]) / 100000 * 1e6:.2f}us per call; "
+          f"off again vs never on: {(results['off again'][0] / off[0] - 1) * 100:+.1f}%")
+
+    print("\nbusiest scopes:")
+    for scope, seconds, calls in profiler.summary()[:4]:
+        top = ", ".join(f"{call} x{n:,}" for call, n, _ in calls[:3])
+        print(f"  {scope:<32} {seconds * 1000:>8.1f}ms  {top}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.json")
+        written = profiler.write_chrome_trace(path)
+        with open(path) as f:
+            trace = json.load(f)
+        print(f"\nChrome trace: {written:,} events written, {len(trace['traceEvents']):,} read back "
+              f"({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
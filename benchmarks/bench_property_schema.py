@@ -0,0 +1,92 @@
+"""
+Counts pymxs boundary crossings of the Properties, Material and Modifiers
+inspectors over a synthetic scene using the counting fake runtime: the
+bulk property snapshot (one MAXScript call per value), and the fallback
+property_snapshot() takes when the bulk helpers cannot run, per property
+reads without and with the per-class property schema cache.
+
+    python benchmarks/bench_property_schema.py [objects]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from common import load_inspector
+from tests import fake_pymxs
+from max_inspector import properties
+
+
+def synthetic_props(rt, rnd, count):
+    makers = [lambda: rnd.random() * 100, lambda: rnd.randrange(100), lambda: rnd.random() < 0.5,
+              lambda: rt.wrap("Point3", "[0,0,0]"), lambda: rt.wrap("Color", "(color 0 0 0)"),
+              lambda: None]
+    kinds = [rnd.randrange(len(makers)) for _ in range(count)]
+    return lambda: {f"prop_{i:02d}": makers[k]() for i, k in enumerate(kinds)}
+
+
+def synthetic_objects(rt, count, seed=0):
+    rnd = random.Random(seed)
+    object_props = [synthetic_props(rt, rnd, 60) for _ in range(5)]
+    material_props = synthetic_props(rt, rnd, 40)
+    modifier_props = [synthetic_props(rt, rnd, 20) for _ in range(3)]
+    objects = []
+    for i in range(count):
+        kind = rnd.randrange(len(object_props))
+        obj = rt.make_object(f"Primitive_{kind}", "GeometryClass", object_props[kind](), name=f"Obj_{i}")
+        obj.material = rt.make_object("PhysicalMaterial", "Material", material_props(), name=f"Mat_{i}")
+        for m, props in enumerate(modifier_props):
+            obj.modifiers.append(rt.make_object(f"Modifier_{m}", "Modifier", props(), name=f"Mod_{m}"))
+        objects.append(obj)
+    return objects
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    mod = load_inspector()
+    app = mod.QtWidgets.QApplication.instance() or mod.QtWidgets.QApplication([])
+    rt = fake_pymxs.runtime
+    objects = synthetic_objects(rt, count)
+
+    class BenchInspector(mod.MaxInspector):
+        def load_from_cache(self):
+            return False
+
+    class UncachedSchemas(mod.PropertySchemaCache):
+        def schema_key(self, value):
+            return None
+
+    ui = BenchInspector()
+    ui.log = lambda text: None
+    mod.get_bulk_helpers()
+    print(f"{count} objects, 5 classes x 60 props, material 40 props, 3 modifiers x 20 props")
+    print(f"{'mode':>10} {'crossings':>10} {'per object':>11} {'time':>9}")
+    schemas = mod.PropertySchemaCache()
+    get_bulk_helpers = properties.get_bulk_helpers
+
+    def helpers_unavailable():
+        raise RuntimeError("MaxInspectorBulk could not be defined")
+
+    for mode, schema_cache, helpers in (("snapshot", None, get_bulk_helpers),
+                                        ("fallback", UncachedSchemas(), helpers_unavailable),
+                                        ("fb+cache", schemas, helpers_unavailable)):
+        ui.read_properties = lambda value: mod.property_snapshot(value, schema_cache)
+        properties.get_bulk_helpers = helpers
+        rt.reset_counts()
+        start = time.perf_counter()
+        try:
+            for obj in objects:
+                ui.inspect_properties(obj)
+                ui.inspect_material(obj)
+                ui.inspect_modifiers(obj)
+        finally:
+            properties.get_bulk_helpers = get_bulk_helpers
+        elapsed = time.perf_counter() - start
+        print(f"{mode:>10} {rt.total_calls:>10} {rt.total_calls / count:>11.0f} {elapsed * 1000:>7.1f}ms")
+    print(f"schema cache: {len(schemas)} classes, {schemas.hits} hits, {schemas.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Walks deep, heavily shared material trees against the fake runtime: a
+naive recursive walk (one refChildren call per reference, no visited set)
+versus RefGraphWalker (memoized by anim handle, one call per level).
+
+    python benchmarks/bench_ref_graph.py [nodes]
+"""
+import random
+import sys
+import time
+
+from common import load_inspector
+from tests import fake_pymxs
+from max_inspector.bulk import parse_bulk_records, parse_mxs_int
+from max_inspector.refgraph import REF_GRAPH_MAX_DEPTH, RefGraphWalker
+
+
+def build_scene(rt, nodes, seed=0):
+    """
+    Each node: Multi material -> 40 sub-materials (pool of 400) -> 4 maps
+    from the first of five layers of 300 maps, where every map references
+    3 maps of the next layer.
+    """
+    rnd = random.Random(seed)
+    layers = []
+    for depth in range(5):
+        layer = [rt.make_object("CompositeTexturemap", "TextureMap", {}, name=f"Map_{depth}_{i}") for i in range(300)]
+        if layers:
+            for m in layers[-1]:
+                for k in range(3):
+                    m._add_ref(f"Layer {k + 1}", rnd.choice(layer))
+        layers.append(layer)
+    maps = layers[0]
+    subs = []
+    for i in range(400):
+        sub = rt.make_object("PhysicalMaterial", "Material", {}, name=f"Sub_{i}")
+        for slot in ("base_color_map", "bump_map", "roughness_map", "cutout_map"):
+            sub._add_ref(slot, rnd.choice(maps))
+        subs.append(sub)
+    multis = []
+    for i in range(max(1, nodes // 10)):
+        multi = rt.make_object("Multimaterial", "Material", {}, name=f"Multi_{i}")
+        for j in range(40):
+            multi._add_ref(f"Sub-Material {j + 1}", rnd.choice(subs))
+        multis.append(multi)
+    rt.load_scene(nodes)
+
+    def make(handle):
+        obj = rt.make_object("Editable_Poly", "GeometryClass", {})
+        obj.material = multis[handle % len(multis)]
+        return obj
+
+    rt.dress_nodes(make)
+
+
+def naive_walk(mod, helpers, handle, depth, max_depth):
+    """One level at a time per anim, re-walking shared sub-trees every time they are reached."""
+    if depth >= max_depth:
+        return 0
+    count = 0
+    for f in parse_bulk_records(helpers.refChildren([handle])):
+        count += 1 + naive_walk(mod, helpers, parse_mxs_int(f[1]), depth + 1, max_depth)
+    return count
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    mod = load_inspector()
+    rt = fake_pymxs.runtime
+    helpers = mod.get_bulk_helpers()
+    build_scene(rt, nodes)
+    max_depth = REF_GRAPH_MAX_DEPTH
+    print(f"{'walk':>8} {'refs listed':>12} {'distinct':>9} {'crossings':>10} {'time':>9}")
+
+    rt.reset_counts()
+    start = time.perf_counter()
+    listed = sum(naive_walk(mod, helpers, h, 0, max_depth) for h in range(1, nodes + 1))
+    print(f"{'naive':>8} {listed:>12} {'-':>9} {rt.total_calls:>10} {(time.perf_counter() - start) * 1000:>7.0f}ms")
+
+    rt.reset_counts()
+    start = time.perf_counter()
+    walker = RefGraphWalker(helpers)
+    listed = distinct = 0
+    for h in range(1, nodes + 1):
+        entries = walker.walk(h, max_depth)
+        listed += len(entries)
+        distinct += sum(1 for e in entries if e[-1])
+    print(f"{'walker':>8} {listed:>12} {distinct:>9} {rt.total_calls:>10} {(time.perf_counter() - start) * 1000:>7.0f}ms")
+    print(f"walker graph reads: {walker.fetches}")
+
+
+if __name__ == "__main__":
+    main()
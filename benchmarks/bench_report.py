@@ -0,0 +1,52 @@
+"""
+Offscreen benchmark of writing report lines: one QTextEdit.append per line
+(the old log()) versus ReportBuffer batching into a QPlainTextEdit.
+
+    python benchmarks/bench_report.py [lines]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from common import load_inspector
+from max_inspector.ui.base import REPORT_MAX_BLOCKS
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    mod = load_inspector()
+    QtWidgets = mod.QtWidgets
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    lines = [f"prop_{i} (Float) = {i * 0.5}" for i in range(count)]
+
+    old = QtWidgets.QTextEdit()
+    old.setReadOnly(True)
+    old.setLineWrapMode(QtWidgets.QTextEdit.NoWrap)
+    old.show()
+    start = time.perf_counter()
+    for line in lines:
+        old.append(line)
+    app.processEvents()
+    old_time = time.perf_counter() - start
+
+    new = QtWidgets.QPlainTextEdit()
+    new.setReadOnly(True)
+    new.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+    new.show()
+    buffer = mod.ReportBuffer(new)
+    start = time.perf_counter()
+    for line in lines:
+        buffer.write(line)
+    buffer.flush()
+    app.processEvents()
+    new_time = time.perf_counter() - start
+
+    assert new.document().blockCount() == min(count, REPORT_MAX_BLOCKS)
+    print(f"{count} lines: QTextEdit.append per line {old_time * 1000:.0f}ms, "
+          f"ReportBuffer {new_time * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
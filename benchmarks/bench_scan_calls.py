@@ -0,0 +1,56 @@
+"""
+Counts pymxs boundary crossings and wall time of the per-class class scan
+versus the bulk (one MAXScript call per superclass) scan, using the
+counting fake runtime.
+
+    python benchmarks/bench_scan_calls.py
+"""
+import random
+import time
+import types
+
+from common import load_inspector
+from tests import fake_pymxs
+from max_inspector.scan import scan_category_bulk, scan_category_per_class
+
+
+def synthetic_classes(count, seed=0):
+    rnd = random.Random(seed)
+    names = fake_pymxs.SUPERCLASS_NAMES
+    return [(f"Class_{i:06d}", rnd.choice(names), f"#({rnd.getrandbits(31)}, {i})",
+             rnd.choice(["", "", "", "plugin_a.dlo", "plugin_b.dlm"]))
+            for i in range(count)]
+
+
+def run_scan(mod, categories, bulk):
+    rows = []
+    helpers = mod.get_bulk_helpers() if bulk else None
+    for superclass_name, superclass in categories:
+        if bulk:
+            found, _ = scan_category_bulk(superclass_name, superclass, helpers)
+        else:
+            found, _ = scan_category_per_class(superclass_name, superclass)
+        rows.extend(found)
+    return rows
+
+
+def main():
+    mod = load_inspector()
+    rt = fake_pymxs.runtime
+    quiet = types.SimpleNamespace(log=lambda text: None)
+    print(f"{'classes':>8} {'mode':>9} {'crossings':>10} {'time':>9}")
+    for count in (3_000, 30_000):
+        rt.load_classes(synthetic_classes(count))
+        results = {}
+        for mode in ("per-class", "bulk"):
+            rt.reset_counts()
+            start = time.perf_counter()
+            categories = mod.MaxInspector.get_scan_categories(quiet)
+            results[mode] = run_scan(mod, categories, bulk=(mode == "bulk"))
+            elapsed = time.perf_counter() - start
+            print(f"{count:>8} {mode:>9} {rt.total_calls:>10} {elapsed * 1000:>7.1f}ms")
+        assert sorted(results["bulk"]) == sorted(results["per-class"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Scene Statistics against the fake runtime at 10k, 100k and 1M nodes:
+time to read the per-node fields into NumPy columns (paged sceneStats
+calls) and time for all aggregates, with the pure-Python equivalent of the
+group-bys for comparison. The node-by-node fallback is measured at the
+smallest size.
+
+    python benchmarks/bench_scene_stats.py [--max-nodes N]
+"""
+import collections
+import sys
+import time
+
+from common import load_inspector
+from tests import fake_pymxs
+from max_inspector.stats import SceneStats
+
+
+def aggregate(stats):
+    stats.totals()
+    stats.by_class()
+    stats.by_superclass()
+    stats.material_reuse()
+    stats.extents()
+    stats.face_histogram()
+    stats.modifier_histogram()
+
+
+def aggregate_python(rows, classes):
+    """The same group-bys with dicts and Counters over per-node tuples."""
+    counts, faces, verts = collections.Counter(), collections.Counter(), collections.Counter()
+    for cls, row in zip(classes, rows):
+        counts[cls] += 1
+        faces[cls] += row[1]
+        verts[cls] += row[2]
+    collections.Counter(row[4] for row in rows if row[4])
+    [min(row[5 + axis] for row in rows) for axis in range(3)]
+    [max(row[8 + axis] for row in rows) for axis in range(3)]
+    collections.Counter(row[3] for row in rows)
+    return counts
+
+
+def main():
+    max_nodes = 1_000_000
+    if "--max-nodes" in sys.argv:
+        max_nodes = int(sys.argv[sys.argv.index("--max-nodes") + 1])
+    mod = load_inspector()
+    rt = fake_pymxs.runtime
+    helpers = mod.get_bulk_helpers()
+    materials = [rt.make_object("PhysicalMaterial", "Material", {}, name=f"Mat_{i}") for i in range(500)]
+
+    def make(handle):
+        obj = rt.make_object(f"Primitive_{handle % 9}", "GeometryClass" if handle % 5 else "Shape", {})
+        obj.material = materials[handle % 500] if handle % 3 else None
+        for m in range(handle % 4):
+            obj.modifiers.append(rt.make_object(f"Modifier_{m}", "Modifier", {}))
+        return obj
+
+    print(f"{'nodes':>9} {'path':>9} {'crossings':>10} {'gather':>9} {'numpy agg':>10} {'python agg':>11}")
+    for nodes in (10_000, 100_000, 1_000_000):
+        if nodes > max_nodes:
+            break
+        rt.load_scene(nodes)
+        rt.dress_nodes(make)
+        paths = [("bulk", helpers)] + ([("per-node", None)] if nodes == 10_000 else [])
+        for path, path_helpers in paths:
+            rt.reset_counts()
+            start = time.perf_counter()
+            stats = SceneStats.gather(path_helpers)
+            gather = time.perf_counter() - start
+            crossings = rt.total_calls
+            start = time.perf_counter()
+            aggregate(stats)
+            numpy_agg = time.perf_counter() - start
+            rows = stats._values.tolist()
+            classes = [stats.class_names[c] for c in stats.class_codes]
+            start = time.perf_counter()
+            aggregate_python(rows, classes)
+            python_agg = time.perf_counter() - start
+            assert len(stats) == nodes
+            print(f"{nodes:>9} {path:>9} {crossings:>10} {gather * 1000:>7.0f}ms {numpy_agg * 1000:>8.1f}ms "
+                  f"{python_agg * 1000:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmarks building the Scene -> Objects tree against the fake runtime at
+10k, 100k and 1M nodes: the old eager walk over rt.objects versus the
+lazy, paged tree of populate_tree (first page of the root, then one
+expanded node).
+
+    python benchmarks/bench_scene_tree.py [--max-eager N]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from common import load_inspector
+from tests import fake_pymxs
+
+
+def eager_populate(mod, tree):
+    """The pre-lazy populate_tree object loop."""
+    QtWidgets, QtCore = mod.QtWidgets, mod.QtCore
+    container = QtWidgets.QTreeWidgetItem(tree, ["Objects"])
+    for o in mod.rt.objects:
+        item = QtWidgets.QTreeWidgetItem(container, [mod.safe_repr(o.name)])
+        item.setData(0, QtCore.Qt.UserRole, ("scene_obj", o))
+    tree.expandAll()
+
+
+def main():
+    max_eager = 100_000
+    if "--max-eager" in sys.argv:
+        max_eager = int(sys.argv[sys.argv.index("--max-eager") + 1])
+    mod = load_inspector()
+    app = mod.QtWidgets.QApplication.instance() or mod.QtWidgets.QApplication([])
+    rt = fake_pymxs.runtime
+
+    class BenchInspector(mod.MaxInspector):
+        def load_from_cache(self):
+            return False
+
+    ui = BenchInspector()
+    print(f"{'nodes':>9} {'variant':>8} {'time':>11} {'crossings':>10} {'items':>9}")
+    for count in (10_000, 100_000, 1_000_000):
+        rt.load_scene(count)
+        if count <= max_eager:
+            tree = mod.QtWidgets.QTreeWidget()
+            rt.reset_counts()
+            start = time.perf_counter()
+            eager_populate(mod, tree)
+            elapsed = time.perf_counter() - start
+            print(f"{count:>9} {'eager':>8} {elapsed * 1000:>9.1f}ms {rt.total_calls:>10} {count:>9}")
+            tree.clear()
+        else:
+            print(f"{count:>9} {'eager':>8} {'(skipped)':>11}")
+
+        rt.reset_counts()
+        start = time.perf_counter()
+        ui.populate_tree()
+        # Expand the first loaded node that has children
+        nested = next(item for handle, item in ui._scene_items.items() if rt._node_children[handle])
+        nested.setExpanded(True)
+        app.processEvents()
+        elapsed = time.perf_counter() - start
+        print(f"{count:>9} {'lazy':>8} {elapsed * 1000:>9.1f}ms {rt.total_calls:>10} {len(ui._scene_items):>9}")
+
+
+if __name__ == "__main__":
+    main()
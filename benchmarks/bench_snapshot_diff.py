@@ -0,0 +1,108 @@
+"""
+Scene snapshots against the fake runtime: capture time and file size of
+two snapshots of the same scene, the second one after editing 1% of the
+nodes (property changes, renames, deletions and new nodes), then the time
+to diff them and to expand every changed node. Last, the second snapshot
+with every anim handle reassigned, as after reloading the scene: nodes
+are then matched on their hierarchy path.
+
+    python benchmarks/bench_snapshot_diff.py [nodes]
+"""
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from common import load_inspector
+from tests import fake_pymxs
+from bench_property_schema import synthetic_props
+from max_inspector.snapshots import SceneSnapshot, SnapshotDiff
+
+
+def dress_scene(rt, seed=0):
+    rnd = random.Random(seed)
+    object_props = [synthetic_props(rt, rnd, 20) for _ in range(5)]
+    materials = [rt.make_object("PhysicalMaterial", "Material", synthetic_props(rt, rnd, 40)(), name=f"Mat_{i}")
+                 for i in range(200)]
+    modifiers = [rt.make_object(f"Modifier_{m}", "Modifier", synthetic_props(rt, rnd, 15)(), name=f"Mod_{m}")
+                 for m in range(3)]
+
+    def make(handle):
+        obj = rt.make_object(f"Primitive_{handle % 5}", "GeometryClass", object_props[handle % 5]())
+        obj.material = materials[handle % len(materials)]
+        obj.modifiers.extend(modifiers[:handle % 4])  # instanced modifiers
+        return obj
+
+    rt.dress_nodes(make)
+
+
+def capture(mod, helpers, path):
+    handles = mod.BatchRecordSource(helpers).handles("scene")
+    writer = mod.SnapshotWriter(path)
+    for _ in mod.iter_capture_snapshot(helpers, handles, writer):
+        pass
+    writer.close()
+    return writer.count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    mod = load_inspector()
+    rt = fake_pymxs.runtime
+    helpers = mod.get_bulk_helpers()
+    tmp = tempfile.mkdtemp()
+    rt.load_scene(count)
+    dress_scene(rt)
+
+    old_path, new_path = os.path.join(tmp, "old.snapshot"), os.path.join(tmp, "new.snapshot")
+    start = time.perf_counter()
+    nodes = capture(mod, helpers, old_path)
+    print(f"snapshot of {nodes} nodes: {time.perf_counter() - start:.1f}s, {os.path.getsize(old_path) / 1e6:.1f} MB")
+
+    rnd = random.Random(1)
+    edits = max(1, count // 100)
+    for h in rnd.sample(range(1, count + 1), edits):
+        rt._node_object(h)._props["prop_00"] = -1.0
+    for h in rnd.sample(range(1, count + 1), edits // 4):
+        rt.rename_node(h, f"Renamed_{h}")
+    for h in rnd.sample(range(1, count + 1), edits // 4):
+        rt.user_props[h] = "exportable = true"
+    rt.delete_nodes([h for h in rnd.sample(range(1, count + 1), edits // 4) if rt._node_alive[h]])
+    rt.create_nodes([f"New_{i}" for i in range(edits // 4)])
+
+    start = time.perf_counter()
+    nodes = capture(mod, helpers, new_path)
+    print(f"snapshot of {nodes} nodes: {time.perf_counter() - start:.1f}s, {os.path.getsize(new_path) / 1e6:.1f} MB")
+
+    start = time.perf_counter()
+    diff = SnapshotDiff(SceneSnapshot(old_path), SceneSnapshot(new_path))
+    elapsed = time.perf_counter() - start
+    print(f"diff: {len(diff.changed)} changed, {len(diff.added)} added, {len(diff.removed)} removed, "
+          f"{diff.unchanged} unchanged in {elapsed:.2f}s")
+    start = time.perf_counter()
+    fields = sum(len(diff.changes(h)) for h in diff.changed)
+    print(f"expanded all {len(diff.changed)} changed nodes ({fields} field changes) "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    reloaded_path = os.path.join(tmp, "reloaded.snapshot")
+    shutil.copyfile(new_path, reloaded_path)
+    with sqlite3.connect(reloaded_path) as db:  # a bijection of the handles, through negatives to keep them unique
+        db.execute("UPDATE nodes SET handle = -handle")
+        db.execute("UPDATE nodes SET handle = (-handle * 7919) % 1000003")
+    start = time.perf_counter()
+    reloaded = SnapshotDiff(SceneSnapshot(old_path), SceneSnapshot(reloaded_path))
+    elapsed = time.perf_counter() - start
+    print(f"after a reload: {len(reloaded.changed)} changed, {len(reloaded.added)} added, "
+          f"{len(reloaded.removed)} removed, {reloaded.unchanged} unchanged in {elapsed:.2f}s "
+          f"(matched on {'handles' if reloaded.handles_matched else 'paths'})")
+    assert not reloaded.handles_matched and reloaded.unchanged == diff.unchanged
+    reloaded.close()
+    diff.close()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Shared helpers for the benchmark scripts."""
+import importlib.util
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from tests import fake_pymxs  # noqa: E402  (needs ROOT on sys.path)
+
+# The engine package imports pymxs on first use, so the benches can import it directly
+sys.modules.setdefault("pymxs", fake_pymxs)
+
+
+def load_inspector():
+    """Imports 3dsMaxInspector.py against the fake pymxs runtime."""
+    spec = importlib.util.spec_from_file_location(
+        "max_inspector_script", os.path.join(ROOT, "3dsMaxInspector.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def best_of(fn, repeat=3):
+    """Returns the fastest wall time of `repeat` calls to fn(), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,54 @@
+"""
+3ds Max Inspector engine: class scans and caches, scene, property,
+animation, mesh and reference-graph inspection, asset audits, batch
+export, snapshots and profiling, with no Qt dependency. The inspector
+window is a thin layer over it in max_inspector.ui.
+
+Submodules are imported on first use (PEP 562), so `import max_inspector`
+is cheap and neither pymxs nor NumPy is loaded until something needs it.
+"""
+import importlib
+
+_EXPORTS = {
+    "runtime": ("rt", "pymxs_runtime", "set_runtime", "runtime_override", "attime",
+                "safe_repr", "get_type_name", "try_classid"),
+    "bulk": ("MXS_BULK_VERSION", "get_bulk_helpers", "parse_mxs_int", "parse_mxs_numbers",
+             "unescape_bulk_field", "parse_bulk_records"),
+    "scan": ("SCAN_SUPERCLASSES", "get_scan_categories", "iter_class_scan", "iter_scan_category_per_class",
+             "scan_category_per_class", "scan_category_bulk", "iter_plugin_files_fingerprint",
+             "plugin_files_fingerprint", "iter_class_fingerprint", "get_class_fingerprint", "diff_class_fingerprint"),
+    "cache": ("CLASS_CACHE_VERSION", "cache_lock", "write_file_atomic", "pack_class_cache", "write_class_cache",
+              "read_json_class_cache", "write_json_class_cache", "BinaryClassCache", "user_cache_path",
+              "LayeredClassCache"),
+    "index": ("prepare_class_rows", "group_class_rows", "ClassTable", "ClassLookupIndex", "ClassSearchIndex"),
+    "properties": ("PropertySchema", "PropertySchemaCache", "property_snapshot"),
+    "scene": ("SCENE_PAGE_SIZE", "get_node_by_handle", "SceneTreeSource"),
+    "batch": ("BATCH_SCOPES", "BATCH_WRITERS", "BatchRecordSource", "open_batch_writer", "iter_batch_export"),
+    "stats": ("numpy_available", "SceneStats"),
+    "snapshots": ("SnapshotWriter", "iter_capture_snapshot", "SceneSnapshot", "SnapshotDiff"),
+    "refgraph": ("REF_GRAPH_MAX_DEPTH", "RefGraphWalker"),
+    "anim": ("read_controller_tree", "key_value_fields", "KeyTrack"),
+    "mesh": ("MeshBuffer", "MeshStats", "component_labels"),
+    "assets": ("read_asset_refs", "hash_file", "AssetStatCache", "AssetAudit"),
+    "profiling": ("Profiler", "ProfiledRuntime", "enable_profiling", "disable_profiling",
+                  "active_profiler", "profile_scope"),
+    "inspectors": ("OBJECT_INSPECTORS",),
+    "results": ("NODE_CHANGE_EVENTS", "InspectionCache"),
+    "cli": (),
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE_OF) + ["inspectors"]
+
+def __getattr__(name):
+    if name in _EXPORTS:  # submodule, e.g. max_inspector.inspectors
+        return importlib.import_module(f".{name}", __name__)
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
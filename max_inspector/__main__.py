@@ -0,0 +1,6 @@
+"""python -m max_inspector: batch mode, see max_inspector.cli."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,149 @@
+"""Controller trees and streamed animation key reads."""
+import array
+import bisect
+import collections
+
+from .bulk import parse_bulk_records, parse_mxs_int, parse_mxs_numbers
+from .runtime import rt, attime, get_type_name, safe_repr
+
+# --- ANIMATION KEYS ---
+CONTROLLER_TREE_MAX_DEPTH = 8
+KEY_CHUNK_SIZE = 5000  # keys per controllerKeys call; bounds how long one load step holds the UI
+KEY_PAGE_SIZE = 1000  # key table rows added per fetchMore
+KEY_VALUE_LABELS = {"Point2": ("X", "Y"), "Point3": ("X", "Y", "Z"), "Point4": ("X", "Y", "Z", "W"),
+                    "Color": ("R", "G", "B"), "Quat": ("Euler X", "Euler Y", "Euler Z")}
+
+def read_controller_tree(handle, helpers=None, max_depth=CONTROLLER_TREE_MAX_DEPTH):
+    """
+    Controller tree below the sub-anims of an anim as (depth, name,
+    controller handle, class, superclass, key count, kind, detail) tuples
+    in depth-first order, without branches that hold no controller.
+    One controllerTree call with the bulk helpers.
+    """
+    if helpers is not None:
+        rows = [(int(f[0]), f[1], parse_mxs_int(f[2]), f[3], f[4], int(f[5]), f[6], f[7])
+                for f in parse_bulk_records(helpers.controllerTree(handle, max_depth))]
+    else:
+        rows = []
+        anim = rt.getAnimByHandle(handle)
+        if anim is not None:
+            _controllers_per_anim(anim, 1, max_depth, rows)
+
+    # Keep a sub-anim if it or anything below it has a controller
+    keep = [False] * len(rows)
+    below = collections.defaultdict(bool)  # depth -> a controller was seen in the current subtree
+    for i in range(len(rows) - 1, -1, -1):
+        depth, handle = rows[i][0], rows[i][2]
+        keep[i] = bool(handle) or below[depth + 1]
+        below[depth + 1] = False
+        below[depth] = below[depth] or keep[i]
+    return [row for row, kept in zip(rows, keep) if kept]
+
+def _controllers_per_anim(v, depth, max_depth, rows):
+    # Fallback without the bulk helpers: several pymxs calls per sub-anim
+    try: count = v.numSubs
+    except Exception: return
+    for i in range(1, count + 1):
+        sa = rt.getSubAnim(v, i)
+        try: name = safe_repr(sa.name)
+        except Exception: name = str(i)
+        try: c = sa.controller
+        except Exception: c = None
+        if c is None:
+            rows.append((depth, name, 0, "", "", -1, "", ""))
+        else:
+            try: keys = int(rt.numKeys(c))
+            except Exception: keys = -1
+            kind, detail = "procedural", ""
+            try:
+                detail, kind = safe_repr(c.script), "script"
+            except Exception:
+                try:
+                    detail, kind = safe_repr(c.getExpression()), "expression"
+                except Exception:
+                    if get_type_name(c).lower().endswith("_list"):
+                        try: active = safe_repr(c.getActive())
+                        except Exception: active = "?"
+                        kind, detail = "list", f"active {active}"
+                    elif keys >= 0:
+                        kind = "keyframe"
+            rows.append((depth, name, int(rt.getHandleByAnim(c)), get_type_name(c),
+                         safe_repr(rt.superClassOf(c)), keys, kind, detail))
+        if depth < max_depth:
+            _controllers_per_anim(sa, depth + 1, max_depth, rows)
+
+def key_value_fields(v):
+    """Python twin of MaxInspectorBulkDef.keyValueFields()."""
+    cls = get_type_name(v)
+    if cls in ("Float", "Integer"):
+        return [float(v)]
+    if cls == "Quat":
+        v = rt.quatToEuler(v)
+        return [v.x, v.y, v.z]
+    if cls == "Color":
+        return [v.r, v.g, v.b]
+    if cls in KEY_VALUE_LABELS:
+        return [getattr(v, axis) for axis in "xyzw"[:len(KEY_VALUE_LABELS[cls])]]
+    return []
+
+class KeyTrack:
+    """
+    Keys of one controller as packed columns: key frames in one
+    array('d'), value numbers (`dims` per key) in another. load_steps()
+    streams them in with one controllerKeys call per KEY_CHUNK_SIZE keys,
+    so it can run as a CooperativeJob while the keys read so far are shown.
+    """
+    def __init__(self, handle, helpers=None):
+        self.handle = handle
+        self._helpers = helpers
+        self.times = array.array("d")
+        self.values = array.array("d")
+        self.dims = 0
+        self.value_class = ""
+        self.total = None  # key count, known after the first read
+
+    def __len__(self):
+        return len(self.times)
+
+    def is_complete(self):
+        return self.total is not None and len(self) >= self.total
+
+    def value(self, row):
+        return self.values[row * self.dims:(row + 1) * self.dims]
+
+    def row_at_frame(self, frame):
+        """Row of the first key at or after `frame` (keys are sorted by time)."""
+        return bisect.bisect_left(self.times, frame)
+
+    def load_steps(self, chunk_size=KEY_CHUNK_SIZE):
+        if self._helpers is None:
+            yield from self._load_steps_per_key()
+            return
+        while not self.is_complete():
+            result = self._helpers.controllerKeys(self.handle, len(self), chunk_size)
+            self.total = parse_mxs_int(str(result[0]))
+            times = parse_mxs_numbers(str(result[3]))
+            if not times:
+                self.total = len(self)  # keys were deleted while reading
+                break
+            if not len(self):
+                self.dims, self.value_class = parse_mxs_int(str(result[1])), str(result[2])
+            self.times.extend(times)
+            self.values.extend(parse_mxs_numbers(str(result[4])))
+            yield
+
+    def _load_steps_per_key(self):
+        # Fallback without the bulk helpers: several pymxs calls per key
+        c = rt.getAnimByHandle(self.handle)
+        try: self.total = max(int(rt.numKeys(c)), 0)
+        except Exception: self.total = 0
+        for i in range(len(self) + 1, self.total + 1):
+            t = rt.getKeyTime(c, i)
+            with attime(t):
+                v = c.value
+            fields = key_value_fields(v)
+            if not len(self):
+                self.dims, self.value_class = len(fields), get_type_name(v)
+            self.times.append(float(t.frame))
+            self.values.extend((fields + [float("nan")] * self.dims)[:self.dims])
+            yield
@@ -0,0 +1,289 @@
+"""
+Asset audit: the files a scene's materials, maps and modifiers point at
+and whether they are there. Paths are gathered in one bulk call on the
+main thread; the checks (stat and an optional content hash) are plain
+file I/O with no pymxs, so they run on a thread pool and are cached by
+path, size and mtime.
+"""
+import hashlib
+import json
+import os
+import stat
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .bulk import parse_bulk_records, parse_mxs_int
+from .cache import write_file_atomic
+from .runtime import rt, safe_repr
+
+# --- TUNING ---
+# Network shares answer one request at a time per file, so the checks are
+# latency bound: many workers, files batched per directory, and on Windows
+# one directory listing (which carries the size and mtime of every entry)
+# in place of a stat per file when a directory holds enough of the assets.
+ASSET_AUDIT_WORKERS = 32
+ASSET_STAT_BATCH = 64  # files per stat task
+ASSET_SCANDIR_MIN_FILES = 16  # assets in one directory before it is listed instead of stat'ed (Windows)
+ASSET_STAT_MAX_AGE = 300.0  # seconds a cached check is trusted without touching the file
+ASSET_HASH_CHUNK = 1 << 20
+ASSET_DIGEST_SIZE = 16
+ASSET_POLL_SECONDS = 0.02  # longest a step of iter_check() waits for the pool
+ASSET_CACHE_VERSION = 1
+_LISTING_HAS_STATS = os.name == "nt"  # DirEntry.stat() needs no extra call on Windows only
+
+# Property names that hold file paths (matched case-insensitively, as in MAXScript's isAssetProp)
+ASSET_PROPERTY_WORDS = ("file", "path", "mapname", "source")
+
+# --- GATHERING (main thread) ---
+def read_asset_refs(helpers=None):
+    """
+    Returns [(anim handle, class, owner name, property, path), ...] for the
+    file paths held by every node's material and modifiers (and the maps
+    and sub-materials below them) and by the environment map: one
+    assetPaths call with `helpers`, per-property calls without.
+    """
+    if helpers is not None:
+        return [(parse_mxs_int(h), cls, name, prop, path)
+                for h, cls, name, prop, path in (f for f in parse_bulk_records(helpers.assetPaths()) if len(f) == 5)]
+    refs, seen = [], set()
+    for node in rt.objects:
+        _walk_asset_refs(node.material, refs, seen)
+        for m in node.modifiers:
+            _walk_asset_refs(m, refs, seen)
+    try: _walk_asset_refs(rt.environmentMap, refs, seen)
+    except Exception: pass
+    return refs
+
+def _walk_asset_refs(value, refs, seen):
+    if value is None:
+        return
+    handle = int(rt.getHandleByAnim(value))
+    if handle in seen:
+        return
+    seen.add(handle)
+    cls, name = safe_repr(rt.classOf(value)), safe_repr(getattr(value, "name", ""))
+    try: props = list(rt.getPropNames(value))
+    except Exception: props = []
+    for p in props:
+        try: val = rt.getProperty(value, p)
+        except Exception: continue
+        if isinstance(val, str):
+            prop = safe_repr(p)
+            if val and any(word in prop.lower() for word in ASSET_PROPERTY_WORDS):
+                refs.append((handle, cls, name, prop, val))
+            continue
+        try: sc = rt.superClassOf(val)
+        except Exception: continue
+        if sc == rt.Material or sc == rt.TextureMap:
+            _walk_asset_refs(val, refs, seen)
+    for count, get in ((rt.getNumSubMtls, rt.getSubMtl), (rt.getNumSubTexmaps, rt.getSubTexmap)):
+        try: n = int(count(value))
+        except Exception: n = 0
+        for i in range(1, n + 1):
+            _walk_asset_refs(get(value, i), refs, seen)
+
+# --- FILE CHECKS (worker threads) ---
+def _missing(error=None):
+    return (False, 0, -1, "", "" if error is None or isinstance(error, FileNotFoundError) else str(error))
+
+def _stat_files(directory, items, listing):
+    """[(key, (exists, size, mtime_ns, "", error)), ...] for (key, path) items of one directory."""
+    results = []
+    if listing:
+        try:
+            with os.scandir(directory) as it:
+                entries = {os.path.normcase(e.name): e for e in it}
+        except OSError as e:
+            return [(key, _missing(e)) for key, _ in items]
+        for key, path in items:
+            entry = entries.get(os.path.normcase(os.path.basename(path)))
+            try:
+                if entry is None or not entry.is_file():
+                    raise FileNotFoundError(path)
+                st = entry.stat()
+                results.append((key, (True, st.st_size, st.st_mtime_ns, "", "")))
+            except OSError as e:
+                results.append((key, _missing(e)))
+        return results
+    for key, path in items:
+        try:
+            st = os.stat(path)
+            if not stat.S_ISREG(st.st_mode):
+                raise FileNotFoundError(path)
+            results.append((key, (True, st.st_size, st.st_mtime_ns, "", "")))
+        except OSError as e:
+            results.append((key, _missing(e)))
+    return results
+
+def hash_file(path):
+    """Hex BLAKE2b digest of a file's content, read in chunks."""
+    digest = hashlib.blake2b(digest_size=ASSET_DIGEST_SIZE)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(ASSET_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# --- STAT CACHE ---
+class AssetStatCache:
+    """
+    Checked file stats by normalized path: [mtime_ns, size, digest,
+    checked at] (mtime_ns -1 for a missing file), optionally kept in a
+    JSON file between sessions.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == ASSET_CACHE_VERSION:
+                    self.entries = data.get("entries", {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, result, checked):
+        exists, size, mtime_ns, digest, error = result
+        if error:
+            self.entries.pop(key, None)  # unreadable: check again next time
+        else:
+            self.entries[key] = [mtime_ns, size, digest, checked]
+
+    def save(self):
+        if self.path:
+            data = json.dumps({"version": ASSET_CACHE_VERSION, "entries": self.entries}, separators=(",", ":"))
+            write_file_atomic(self.path, data.encode("utf-8"))
+
+# --- AUDIT ---
+class AssetAudit:
+    """
+    Checks the files of read_asset_refs() records. Relative paths resolve
+    against `base_dir` (the scene folder). `results` maps each normalized
+    path to (exists, size, mtime_ns, digest, error); `files` maps it to
+    (path as resolved, [indices into refs]). With `hash_files`, existing
+    files also get a content digest, reused from `cache` while their size
+    and mtime are unchanged.
+    """
+    def __init__(self, refs, base_dir="", cache=None, hash_files=False,
+                 workers=ASSET_AUDIT_WORKERS, max_age=ASSET_STAT_MAX_AGE):
+        self.refs = refs
+        self.cache = cache
+        self.hash_files = hash_files
+        self.workers = workers
+        self.max_age = max_age
+        self.files = {}
+        for i, ref in enumerate(refs):
+            path = ref[4]
+            if not os.path.isabs(path) and base_dir:
+                path = os.path.join(base_dir, path)
+            path = os.path.normpath(path)
+            self.files.setdefault(os.path.normcase(path), (path, []))[1].append(i)
+        self.results = {}
+        self.from_cache = 0  # files answered by the cache without any file I/O
+        self.hashed = 0
+        self.elapsed = 0.0
+
+    def iter_check(self):
+        """
+        Runs the checks on a thread pool; yields (files done, total) every
+        ASSET_POLL_SECONDS at most so the caller can report progress or
+        hand control back to an event loop. Closing the generator cancels
+        the checks that have not started.
+        """
+        start = now = time.time()
+        total = len(self.files)
+        previous, groups = {}, {}
+        for key, (path, _) in self.files.items():
+            entry = self.cache.get(key) if self.cache is not None else None
+            if entry is not None and now - entry[3] < self.max_age and (entry[2] or entry[0] < 0 or not self.hash_files):
+                self.results[key] = (entry[0] >= 0, entry[1], entry[0], entry[2], "")
+                self.from_cache += 1
+                continue
+            previous[key] = entry
+            groups.setdefault(os.path.dirname(path), []).append((key, path))
+        done = len(self.results)
+        yield done, total
+        if done == total:
+            self.elapsed = time.time() - start
+            return
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(previous))),
+                                  thread_name_prefix="max_inspector_assets")
+        pending = {}
+        for directory, items in groups.items():
+            if _LISTING_HAS_STATS and len(items) >= ASSET_SCANDIR_MIN_FILES:
+                pending[pool.submit(_stat_files, directory, items, True)] = None
+            else:
+                for i in range(0, len(items), ASSET_STAT_BATCH):
+                    pending[pool.submit(_stat_files, directory, items[i:i + ASSET_STAT_BATCH], False)] = None
+        try:
+            while pending:
+                finished, _ = wait(pending, timeout=ASSET_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    hashed_key = pending.pop(future)
+                    if hashed_key is not None:
+                        exists, size, mtime_ns, _, _ = self.results[hashed_key]
+                        try:
+                            result = (exists, size, mtime_ns, future.result(), "")
+                        except OSError as e:
+                            result = (exists, size, mtime_ns, "", str(e))
+                        self._finish(hashed_key, result, now)
+                        done += 1
+                        continue
+                    for key, result in future.result():
+                        entry = previous[key]
+                        exists, size, mtime_ns = result[:3]
+                        if exists and entry is not None and entry[:2] == [mtime_ns, size]:
+                            result = (exists, size, mtime_ns, entry[2], "")
+                        if self.hash_files and exists and not result[3]:
+                            self.results[key] = result
+                            pending[pool.submit(hash_file, self.files[key][0])] = key
+                            self.hashed += 1
+                        else:
+                            self._finish(key, result, now)
+                            done += 1
+                yield done, total
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.elapsed = time.time() - start
+
+    def _finish(self, key, result, checked):
+        self.results[key] = result
+        if self.cache is not None:
+            self.cache.put(key, result, checked)
+
+    def run(self):
+        """Runs every check to completion and returns self."""
+        for _ in self.iter_check():
+            pass
+        return self
+
+    def missing(self):
+        """Normalized paths of the files that do not exist (or could not be checked), sorted."""
+        return sorted(key for key, result in self.results.items() if not result[0])
+
+    def total_size(self):
+        return sum(result[1] for result in self.results.values() if result[0])
+
+    def largest(self, count=10):
+        """(size, path) of the largest existing files, largest first."""
+        sizes = sorted(((r[1], self.files[key][0]) for key, r in self.results.items() if r[0]), reverse=True)
+        return sizes[:count]
+
+    def duplicates(self):
+        """Lists of paths whose content digest is the same (hashed audits only), largest groups first."""
+        by_digest = {}
+        for key, result in self.results.items():
+            if result[3]:
+                by_digest.setdefault(result[3], []).append(self.files[key][0])
+        return sorted((sorted(paths) for paths in by_digest.values() if len(paths) > 1), key=len, reverse=True)
+
+    def owners(self, key):
+        """'Class "name".property' for every reference to one file."""
+        return [f'{cls} "{name}".{prop}' for _, cls, name, prop, _ in (self.refs[i] for i in self.files[key][1])]
@@ -0,0 +1,195 @@
+"""Batch inspection of many nodes, streamed to NDJSON, CSV or SQLite."""
+import csv
+import json
+import os
+import sqlite3
+
+from .bulk import parse_bulk_records, parse_mxs_int
+from .properties import property_snapshot
+from .runtime import rt, get_type_name, safe_repr
+from .scene import get_node_by_handle
+
+# --- BATCH INSPECTION ---
+BATCH_CHUNK_SIZE = 50  # nodes per objectRecords call
+BATCH_SCOPES = ("selection", "layer", "scene")
+
+class BatchRecordSource:
+    """
+    Produces batch inspection records for many nodes: one dict per node
+    with its class, layer, material, modifier stack and (optionally) every
+    property of the node, material and modifiers. With the bulk helpers a
+    whole chunk of nodes is one MAXScript call.
+    """
+    def __init__(self, helpers=None, schema_cache=None):
+        self._helpers = helpers
+        self._schema_cache = schema_cache
+
+    def handles(self, scope, layer_name=""):
+        """Anim handles of the nodes in `scope` ("selection", "layer" or "scene")."""
+        if scope not in BATCH_SCOPES:
+            raise ValueError(f"Unknown batch scope: {scope}")
+        if self._helpers is not None:
+            return [parse_mxs_int(f[0]) for f in parse_bulk_records(self._helpers.nodeHandles(scope, layer_name))]
+        if scope == "selection":
+            nodes = rt.selection
+        else:
+            nodes = rt.objects
+        handles = []
+        for node in nodes:
+            if scope == "layer" and safe_repr(node.layer.name) != layer_name:
+                continue
+            handles.append(int(rt.getHandleByAnim(node)))
+        return handles
+
+    def records(self, handles, with_properties=True):
+        """Returns the records of the live nodes among `handles`."""
+        if self._helpers is not None:
+            return parse_object_records(self._helpers.objectRecords(list(handles), with_properties))
+        records = []
+        for handle in handles:
+            node = get_node_by_handle(handle)
+            if node is not None:
+                records.append(self._record_per_node(handle, node, with_properties))
+        return records
+
+    def _record_per_node(self, handle, node, with_properties):
+        # Fallback without the bulk helpers: several pymxs calls per value
+        mat = node.material
+        mods = list(node.modifiers)
+        try: superclass = safe_repr(rt.superClassOf(node))
+        except Exception: superclass = ""
+        record = {"handle": handle, "name": safe_repr(node.name), "class": get_type_name(node),
+                  "superclass": superclass, "layer": safe_repr(node.layer.name),
+                  "material": safe_repr(mat), "material_class": get_type_name(mat) if mat else "",
+                  "modifiers": [{"index": i, "name": safe_repr(m.name), "class": get_type_name(m)}
+                                for i, m in enumerate(mods, 1)],
+                  "properties": []}
+        if with_properties:
+            owners = [("", node)] + ([("mat", mat)] if mat else []) + [(str(i), m) for i, m in enumerate(mods, 1)]
+            for owner, value in owners:
+                record["properties"].extend({"owner": owner, "name": p, "type": t, "value": rep}
+                                            for p, t, rep in property_snapshot(value, self._schema_cache))
+        return record
+
+def parse_object_records(text):
+    """Groups the O/M/P lines of MaxInspectorBulk.objectRecords() into one dict per node."""
+    records = []
+    record = None
+    for f in parse_bulk_records(text):
+        kind = f[0]
+        if kind == "O":
+            record = {"handle": parse_mxs_int(f[1]), "name": f[2], "class": f[3], "superclass": f[4],
+                      "layer": f[5], "material": f[6], "material_class": f[7],
+                      "modifiers": [], "properties": []}
+            records.append(record)
+        elif kind == "M":
+            record["modifiers"].append({"index": int(f[1]), "name": f[2], "class": f[3]})
+        elif kind == "P":
+            readable = len(f) >= 5
+            record["properties"].append({"owner": f[1], "name": f[2],
+                                         "type": f[3] if readable else None,
+                                         "value": f[4] if readable else None})
+    return records
+
+class NdjsonBatchWriter:
+    """One JSON object per line and per node."""
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8", newline="\n")
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n")
+
+    def close(self):
+        self._file.close()
+
+class CsvBatchWriter:
+    """
+    Long format: one row per node, one per modifier and one per property.
+    `owner` is empty for the node itself, "mat" for its material or the
+    modifier index.
+    """
+    COLUMNS = ["handle", "name", "class", "superclass", "layer", "material", "material_class",
+               "owner", "owner_name", "owner_class", "property", "type", "value"]
+
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.COLUMNS)
+
+    def write(self, record):
+        head = [record["handle"], record["name"], record["class"], record["superclass"],
+                record["layer"], record["material"], record["material_class"]]
+        rows = [head + ["", "", "", "", "", ""]]
+        owners = {"": (record["name"], record["class"]), "mat": (record["material"], record["material_class"])}
+        for m in record["modifiers"]:
+            owners[str(m["index"])] = (m["name"], m["class"])
+            rows.append(head + [m["index"], m["name"], m["class"], "", "", ""])
+        for p in record["properties"]:
+            owner_name, owner_class = owners.get(p["owner"], ("", ""))
+            rows.append(head + [p["owner"], owner_name, owner_class, p["name"],
+                                "" if p["type"] is None else p["type"],
+                                "<unreadable>" if p["value"] is None else p["value"]])
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+class SqliteBatchWriter:
+    """objects, modifiers and properties tables keyed on the node's anim handle."""
+    COMMIT_EVERY = 1000  # records per transaction
+
+    def __init__(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+        self._db = sqlite3.connect(path)
+        self._db.executescript("""
+            CREATE TABLE objects (handle INTEGER PRIMARY KEY, name TEXT, class TEXT, superclass TEXT,
+                                  layer TEXT, material TEXT, material_class TEXT, modifier_count INTEGER);
+            CREATE TABLE modifiers (handle INTEGER, idx INTEGER, name TEXT, class TEXT);
+            CREATE TABLE properties (handle INTEGER, owner TEXT, name TEXT, type TEXT, value TEXT);
+        """)
+        self._pending = 0
+
+    def write(self, record):
+        h = record["handle"]
+        self._db.execute("INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (h, record["name"], record["class"], record["superclass"], record["layer"],
+                          record["material"], record["material_class"], len(record["modifiers"])))
+        self._db.executemany("INSERT INTO modifiers VALUES (?, ?, ?, ?)",
+                             [(h, m["index"], m["name"], m["class"]) for m in record["modifiers"]])
+        self._db.executemany("INSERT INTO properties VALUES (?, ?, ?, ?, ?)",
+                             [(h, p["owner"], p["name"], p["type"], p["value"]) for p in record["properties"]])
+        self._pending += 1
+        if self._pending >= self.COMMIT_EVERY:
+            self._db.commit()
+            self._pending = 0
+
+    def close(self):
+        self._db.execute("CREATE INDEX modifiers_class ON modifiers (class)")
+        self._db.execute("CREATE INDEX properties_handle ON properties (handle)")
+        self._db.commit()
+        self._db.close()
+
+BATCH_WRITERS = {".ndjson": NdjsonBatchWriter, ".jsonl": NdjsonBatchWriter,
+                 ".csv": CsvBatchWriter, ".sqlite": SqliteBatchWriter, ".db": SqliteBatchWriter}
+
+def open_batch_writer(path):
+    """Picks the export writer from the file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in BATCH_WRITERS:
+        raise ValueError(f"Unsupported export format '{ext}' (use .ndjson, .csv or .sqlite)")
+    return BATCH_WRITERS[ext](path)
+
+def iter_batch_export(source, handles, writer, with_properties=True, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Generator: fetches the records of `handles` chunk by chunk and streams
+    them into `writer`, so only one chunk is in memory at a time. Yields
+    (nodes processed, records written) after each chunk.
+    """
+    written = 0
+    for start in range(0, len(handles), chunk_size):
+        for record in source.records(handles[start:start + chunk_size], with_properties):
+            writer.write(record)
+            written += 1
+        yield min(start + chunk_size, len(handles)), written
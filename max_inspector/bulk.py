@@ -0,0 +1,559 @@
+"""MAXScript bulk helpers and the parsing of their results."""
+import array
+import re
+
+from .runtime import rt
+
+# --- MAXSCRIPT BULK HELPERS ---
+# MAXScript functions that run a whole loop on the Max side and return a
+# single string, so Python crosses the pymxs boundary once per batch
+# instead of several times per item. Records are separated by newlines
+# and fields by tabs; field text is escaped by esc() and decoded by
+# parse_bulk_records(). Bump MXS_BULK_VERSION whenever the source changes
+# so a session that loaded an older definition picks up the new one.
+MXS_BULK_VERSION = 14
+MXS_MESH_WRITE_CHUNK = 65536  # points writeMesh converts and writes per .NET call
+_MXS_BULK_SOURCE = r"""
+struct MaxInspectorBulkDef
+(
+    version = %d,
+    meshWriteChunk = %d,
+
+    fn esc v =
+    (
+        local s = try (v as string) catch ""
+        if s == "undefined" do s = ""
+        s = substituteString s "\\" "\\\\"
+        s = substituteString s "\t" "\\t"
+        s = substituteString s "\r" "\\r"
+        substituteString s "\n" "\\n"
+    ),
+
+    -- name, classID, plugin for every class of one superclass
+    fn scanClasses superCls =
+    (
+        local ss = stringStream ""
+        for c in superCls.classes do
+        (
+            local cname = try (c as string) catch ""
+            if cname != "" do
+            (
+                local cid = try (c.classID) catch ""
+                local pname = try (pluginName c) catch ""
+                format "%%\t%%\t%%\n" (esc cname) (esc cid) (esc pname) to:ss
+            )
+        )
+        ss as string
+    ),
+
+    -- anim handle, parent handle (0 = root), name, child count, class for each live node
+    fn nodeInfo handles =
+    (
+        local ss = stringStream ""
+        for h in handles do
+        (
+            local n = getAnimByHandle h
+            if n != undefined and isValidNode n do
+            (
+                local p = if n.parent == undefined then 0 else (getHandleByAnim n.parent)
+                format "%%\t%%\t%%\t%%\t%%\n" h p (esc n.name) n.children.count (esc (classOf n)) to:ss
+            )
+        )
+        ss as string
+    ),
+
+    -- directories 3ds Max loads plugin binaries from
+    fn pluginDirs =
+    (
+        local ss = stringStream ""
+        try (for i = 1 to pluginPaths.count() do format "%%\n" (esc (pluginPaths.get i)) to:ss) catch ()
+        format "%%\n" (esc ((getDir #maxroot) + "plugins")) to:ss
+        ss as string
+    ),
+
+    -- writes prefix + name, class and value of every property of a value
+    -- to ss; only prefix + name for a property whose getProperty throws
+    fn writeProps ss prefix v =
+    (
+        local names = try (getPropNames v) catch #()
+        for p in names do
+        (
+            local val = undefined
+            if (try (val = getProperty v p; true) catch false) then
+                format "%%%%\t%%\t%%\n" prefix (esc p) (esc (classOf val)) (esc val) to:ss
+            else
+                format "%%%%\n" prefix (esc p) to:ss
+        )
+    ),
+
+    fn propSnapshot v =
+    (
+        local ss = stringStream ""
+        writeProps ss "" v
+        ss as string
+    ),
+
+    -- anim handles of the nodes in the selection, a layer or the whole scene
+    fn nodeHandles scope layerName =
+    (
+        local nodes = #()
+        case scope of
+        (
+            "selection": nodes = selection as array
+            "layer":
+            (
+                local layer = LayerManager.getLayerFromName layerName
+                if layer != undefined do layer.nodes &nodes
+            )
+            default: nodes = objects as array
+        )
+        local ss = stringStream ""
+        for n in nodes do format "%%\n" (getHandleByAnim n) to:ss
+        ss as string
+    ),
+
+    -- batch inspection record of one node: an O line (handle, name, class,
+    -- superclass, layer, material, material class, modifier count), an M
+    -- line (index, name, class) per modifier and, with withProps, P lines
+    -- (owner, then the writeProps fields) where the owner is "" for the
+    -- object, "mat" for its material or the modifier index
+    fn writeObjectRecord ss h n withProps =
+    (
+        local mat = n.material
+        local mods = n.modifiers
+        format "O\t%%\t%%\t%%\t%%\t%%\t%%\t%%\t%%\n" h (esc n.name) (esc (classOf n)) (esc (superClassOf n)) \
+            (esc n.layer.name) (esc mat) (esc (if mat == undefined then "" else classOf mat)) mods.count to:ss
+        for i = 1 to mods.count do
+            format "M\t%%\t%%\t%%\n" i (esc mods[i].name) (esc (classOf mods[i])) to:ss
+        if withProps do
+        (
+            writeProps ss "P\t\t" n
+            if mat != undefined do writeProps ss "P\tmat\t" mat
+            for i = 1 to mods.count do writeProps ss ("P\t" + i as string + "\t") mods[i]
+        )
+    ),
+
+    fn objectRecords handles withProps =
+    (
+        local ss = stringStream ""
+        for h in handles do
+        (
+            local n = getAnimByHandle h
+            if n != undefined and isValidNode n do writeObjectRecord ss h n withProps
+        )
+        ss as string
+    ),
+
+    -- snapshot records: the objectRecords lines with properties, then an
+    -- H line with the node's hierarchy path ("parent/child/node"), C
+    -- lines (track, controller class, value) for the transform tracks, A
+    -- lines (definition name, then the writeProps fields) per custom
+    -- attribute on the node and its base object, and a U line with the
+    -- user property buffer
+    fn snapshotRecords handles =
+    (
+        local ss = stringStream ""
+        for h in handles do
+        (
+            local n = getAnimByHandle h
+            if n != undefined and isValidNode n do
+            (
+                writeObjectRecord ss h n true
+                local path = esc n.name
+                local p = n.parent
+                while p != undefined do (path = (esc p.name) + "/" + path; p = p.parent)
+                format "H\t%%\n" path to:ss
+                for track in #(#position, #rotation, #scale) do
+                (
+                    local c = try (getPropertyController n.controller track) catch undefined
+                    if c != undefined do
+                        format "C\t%%\t%%\t%%\n" track (esc (classOf c)) (esc (try (c.value) catch "")) to:ss
+                )
+                for o in #(n, n.baseObject) do
+                    for i = 1 to (try (custAttributes.count o) catch 0) do
+                    (
+                        local ca = custAttributes.get o i
+                        local caName = try ((custAttributes.getDef o i).name as string) catch ("CA" + i as string)
+                        writeProps ss ("A\t" + (esc caName) + "\t") ca
+                    )
+                format "U\t%%\n" (esc (getUserPropBuffer n)) to:ss
+            )
+        )
+        ss as string
+    ),
+
+    -- scene statistics of the live nodes among handles: #("class\tsuperclass"
+    -- lines, one line of space-separated numbers per node: anim handle,
+    -- faces, vertices, modifier count, material anim handle (0 = none),
+    -- world bounding box min xyz and max xyz)
+    fn sceneStats handles =
+    (
+        local names = stringStream ""
+        local nums = stringStream ""
+        for h in handles do
+        (
+            local n = getAnimByHandle h
+            if n != undefined and isValidNode n do
+            (
+                local pc = try (getPolygonCount n) catch #(0, 0)
+                local mat = n.material
+                local bmin = n.min
+                local bmax = n.max
+                format "%%\t%%\n" (esc (classOf n)) (esc (superClassOf n)) to:names
+                format "%% %% %% %% %% %% %% %% %% %% %%\n" h pc[1] pc[2] n.modifiers.count \
+                    (if mat == undefined then 0 else getHandleByAnim mat) bmin.x bmin.y bmin.z bmax.x bmax.y bmax.z to:nums
+            )
+        )
+        #(names as string, nums as string)
+    ),
+
+    -- appends values (floats, or integers when asInt) to the .NET stream
+    -- s as little-endian 4-byte values: one conversion, one copy and one
+    -- write for the whole array
+    fn writeValues s values asInt =
+    (
+        local count = values.count
+        if count > 0 do
+        (
+            local typed = dotNet.ValueToDotNetObject values (dotNetClass (if asInt then "System.Int32[]" else "System.Single[]"))
+            local bytes = (dotNetClass "System.Array").CreateInstance (dotNetClass "System.Byte") (count * 4)
+            (dotNetClass "System.Buffer").BlockCopy typed 0 bytes 0 (count * 4)
+            s.Write bytes 0 (count * 4)
+        )
+    ),
+
+    -- writes x, y, z of `count` mesh points to s, gathered into arrays of
+    -- up to meshWriteChunk points: what is #vert, #normal or #mapVert
+    -- (float32), or #face or #mapFace (int32, made 0-based)
+    fn writeMeshPoints s m what ch count =
+    (
+        local asInt = what == #face or what == #mapFace
+        local values = #()
+        values.count = 3 * (amin count meshWriteChunk)
+        local k = 0
+        for i = 1 to count do
+        (
+            local p = case what of
+            (
+                #vert: getVert m i
+                #normal: getNormal m i
+                #face: getFace m i
+                #mapVert: meshop.getMapVert m ch i
+                #mapFace: meshop.getMapFace m ch i
+            )
+            if asInt then
+            (
+                values[k + 1] = (p.x as integer) - 1; values[k + 2] = (p.y as integer) - 1; values[k + 3] = (p.z as integer) - 1
+            )
+            else
+            (
+                values[k + 1] = p.x; values[k + 2] = p.y; values[k + 3] = p.z
+            )
+            k += 3
+            if k == values.count do (writeValues s values asInt; k = 0)
+        )
+        if k > 0 do (values.count = k; writeValues s values asInt)
+    ),
+
+    -- writes the world-space mesh of node h to the binary file at path,
+    -- little-endian: vertex positions (float32 x3), faces (int32 x3,
+    -- 0-based), vertex normals (float32 x3), then per supported map
+    -- channel >= 1 its map vertices (float32 x3) and map faces (int32 x3).
+    -- Returns "verts faces" plus " channel:mapVerts:mapFaces" per channel,
+    -- or "" when the node has no mesh.
+    fn writeMesh h path =
+    (
+        local n = getAnimByHandle h
+        local m = try (snapshotAsMesh n) catch undefined
+        if m == undefined then "" else
+        (
+            local s = dotNetObject "System.IO.FileStream" path (dotNetClass "System.IO.FileMode").Create
+            local info = stringStream ""
+            try
+            (
+                local nv = m.numVerts
+                local nf = m.numFaces
+                writeMeshPoints s m #vert 0 nv
+                writeMeshPoints s m #face 0 nf
+                writeMeshPoints s m #normal 0 nv
+                format "%% %%" nv nf to:info
+                for ch = 1 to (meshop.getNumMaps m) - 1 where meshop.getMapSupport m ch do
+                (
+                    local nmv = meshop.getNumMapVerts m ch
+                    local nmf = meshop.getNumMapFaces m ch
+                    writeMeshPoints s m #mapVert ch nmv
+                    writeMeshPoints s m #mapFace ch nmf
+                    format " %%:%%:%%" ch nmv nmf to:info
+                )
+            )
+            catch (s.Close(); delete m; throw())
+            s.Close()
+            delete m
+            info as string
+        )
+    ),
+
+    -- one reference graph edge: parent handle, child handle, slot, class,
+    -- superclass, name
+    fn writeRef ss parentHandle slot child =
+    (
+        if child != undefined do
+        (
+            local childName = try (child.name) catch ((classOf child) as string)
+            format "%%\t%%\t%%\t%%\t%%\t%%\n" parentHandle (getHandleByAnim child) (esc slot) \
+                (esc (classOf child)) (esc (superClassOf child)) (esc childName) to:ss
+        )
+    ),
+
+    -- controllers below the sub-anims of v, looking through sub-anims
+    -- without a controller (parameter blocks) up to two levels down
+    fn writeSubAnimRefs ss parentHandle v prefix levels =
+    (
+        for i = 1 to (try (v.numSubs) catch 0) do
+        (
+            local sa = getSubAnim v i
+            local slot = prefix + (try (sa.name as string) catch (i as string))
+            local c = try (sa.controller) catch undefined
+            if c != undefined then writeRef ss parentHandle slot c
+            else if levels > 1 do writeSubAnimRefs ss parentHandle sa (slot + ".") (levels - 1)
+        )
+    ),
+
+    -- direct reference graph children of each anim handle: a node's base
+    -- object, material, modifiers and transform controller; a material's
+    -- or map's sub-materials and sub-maps; otherwise the controllers of
+    -- its sub-anims plus any map or material held in a property
+    fn refChildren handles =
+    (
+        local ss = stringStream ""
+        for h in handles do
+        (
+            local v = getAnimByHandle h
+            local sc = if v == undefined then undefined else superClassOf v
+            if v == undefined then ()
+            else if isValidNode v then
+            (
+                writeRef ss h "Object" v.baseObject
+                writeRef ss h "Material" v.material
+                for i = 1 to v.modifiers.count do writeRef ss h ("Modifier " + i as string) v.modifiers[i]
+                writeRef ss h "Transform" v.controller
+            )
+            else if sc == material or sc == textureMap then
+            (
+                for i = 1 to (try (getNumSubMtls v) catch 0) do
+                    writeRef ss h (try (getSubMtlSlotName v i) catch ("Sub-Material " + i as string)) (getSubMtl v i)
+                for i = 1 to (try (getNumSubTexmaps v) catch 0) do
+                    writeRef ss h (try (getSubTexmapSlotName v i) catch ("Map " + i as string)) (getSubTexmap v i)
+            )
+            else
+            (
+                writeSubAnimRefs ss h v "" 2
+                for p in (try (getPropNames v) catch #()) do
+                (
+                    local val = try (getProperty v p) catch undefined
+                    local vsc = try (superClassOf val) catch undefined
+                    if vsc == material or vsc == textureMap do writeRef ss h (p as string) val
+                )
+            )
+        )
+        ss as string
+    ),
+
+    -- controller tree below the sub-anims of v, depth first: depth, sub-anim
+    -- name, controller anim handle (0 = none), class, superclass, key count
+    -- (-1 = not keyable), kind (keyframe, script, expression, list or
+    -- procedural) and detail (script or expression text, list active index)
+    fn writeControllers ss v depth maxDepth =
+    (
+        for i = 1 to (try (v.numSubs) catch 0) do
+        (
+            local sa = getSubAnim v i
+            local c = try (sa.controller) catch undefined
+            local saName = try (sa.name as string) catch (i as string)
+            if c == undefined then
+                format "%%\t%%\t0\t\t\t-1\t\t\n" depth (esc saName) to:ss
+            else
+            (
+                local keys = try (numKeys c) catch -1
+                local kind = "procedural"
+                local detail = ""
+                if (try (detail = c.script; true) catch false) then kind = "script"
+                else if (try (detail = c.getExpression(); true) catch false) then kind = "expression"
+                else if matchPattern ((classOf c) as string) pattern:"*_list" then
+                (
+                    kind = "list"
+                    detail = "active " + (try ((c.getActive()) as string) catch "?")
+                )
+                else if keys >= 0 do kind = "keyframe"
+                format "%%\t%%\t%%\t%%\t%%\t%%\t%%\t%%\n" depth (esc saName) (getHandleByAnim c) (esc (classOf c)) \
+                    (esc (superClassOf c)) keys kind (esc detail) to:ss
+            )
+            if depth < maxDepth do writeControllers ss sa (depth + 1) maxDepth
+        )
+    ),
+
+    fn controllerTree h maxDepth =
+    (
+        local ss = stringStream ""
+        local v = getAnimByHandle h
+        if v != undefined do writeControllers ss v 1 maxDepth
+        ss as string
+    ),
+
+    -- numbers of one key value: a float, the components of a point, color
+    -- or (as euler angles) quat; none for other values
+    fn keyValueFields v =
+    (
+        case classOf v of
+        (
+            Float: #(v)
+            Integer: #(v as float)
+            Point2: #(v.x, v.y)
+            Point3: #(v.x, v.y, v.z)
+            Point4: #(v.x, v.y, v.z, v.w)
+            Color: #(v.r, v.g, v.b)
+            Quat: (local e = quatToEuler v; #(e.x, e.y, e.z))
+            default: #()
+        )
+    ),
+
+    -- keys start+1 .. start+count of one controller: #(key count, numbers
+    -- per value, value class, space-separated key frames, space-separated
+    -- value numbers)
+    fn controllerKeys h start count =
+    (
+        local c = getAnimByHandle h
+        local total = amax (try (numKeys c) catch 0) 0
+        local times = stringStream ""
+        local values = stringStream ""
+        local dims = -1
+        local valueClass = ""
+        for i = start + 1 to amin total (start + count) do
+        (
+            local t = getKeyTime c i
+            local v = at time t c.value
+            local nums = keyValueFields v
+            if dims < 0 do (dims = nums.count; valueClass = (classOf v) as string)
+            format "%% " t.frame to:times
+            for x in nums do format "%% " x to:values
+        )
+        #(total, amax dims 0, valueClass, times as string, values as string)
+    ),
+
+    -- asset path records of v and the materials and maps below it (sub-materials,
+    -- sub-maps and maps held in properties): anim handle, class, name,
+    -- property and value of every non-empty String property whose name
+    -- mentions file, path, mapname or source; `seen` holds visited handles
+    fn isAssetProp p =
+    (
+        matchPattern p pattern:"*file*" or matchPattern p pattern:"*path*" or \
+            matchPattern p pattern:"*mapname*" or matchPattern p pattern:"*source*"
+    ),
+
+    fn writeAssets ss v seen =
+    (
+        local h = if v == undefined then undefined else (getHandleByAnim v)
+        if h != undefined and not (hasDictValue seen (h as string)) do
+        (
+            seen[h as string] = true
+            for p in (try (getPropNames v) catch #()) do
+            (
+                local val = try (getProperty v p) catch undefined
+                if isKindOf val String then
+                (
+                    if val != "" and isAssetProp (p as string) do
+                        format "%%\t%%\t%%\t%%\t%%\n" h (esc (classOf v)) (esc (try (v.name) catch "")) (esc p) (esc val) to:ss
+                )
+                else
+                (
+                    local vsc = try (superClassOf val) catch undefined
+                    if vsc == material or vsc == textureMap do writeAssets ss val seen
+                )
+            )
+            for i = 1 to (try (getNumSubMtls v) catch 0) do writeAssets ss (getSubMtl v i) seen
+            for i = 1 to (try (getNumSubTexmaps v) catch 0) do writeAssets ss (getSubTexmap v i) seen
+        )
+    ),
+
+    -- asset path records of every node's material and modifiers and of the environment map
+    fn assetPaths =
+    (
+        local ss = stringStream ""
+        local seen = Dictionary #string
+        for n in objects do
+        (
+            writeAssets ss n.material seen
+            for m in n.modifiers do writeAssets ss m seen
+        )
+        writeAssets ss environmentMap seen
+        ss as string
+    ),
+
+    -- one page of a node's children (handle 0 = scene root): first line is
+    -- the total child count, then anim handle, name, child count, class
+    fn sceneChildren parentHandle start count =
+    (
+        local parentNode = if parentHandle == 0 then rootNode else (getAnimByHandle parentHandle)
+        local ss = stringStream ""
+        if parentNode == undefined or not (isValidNode parentNode or parentHandle == 0) then
+            format "0\n" to:ss
+        else
+        (
+            local kids = parentNode.children
+            format "%%\n" kids.count to:ss
+            for i = start + 1 to amin kids.count (start + count) do
+            (
+                local n = kids[i]
+                format "%%\t%%\t%%\t%%\n" (getHandleByAnim n) (esc n.name) n.children.count (esc (classOf n)) to:ss
+            )
+        )
+        ss as string
+    )
+)
+global MaxInspectorBulk = MaxInspectorBulkDef()
+""" % (MXS_BULK_VERSION, MXS_MESH_WRITE_CHUNK)
+
+_BULK_UNESCAPE = {"\\": "\\", "t": "\t", "r": "\r", "n": "\n"}
+_BULK_ESCAPE_RE = re.compile(r"\\(.)")
+
+def get_bulk_helpers():
+    """Defines the MAXScript bulk helpers once per session and returns the struct instance."""
+    helpers = rt.MaxInspectorBulk
+    if helpers is None or getattr(helpers, "version", None) != MXS_BULK_VERSION:
+        rt.execute(_MXS_BULK_SOURCE)
+        helpers = rt.MaxInspectorBulk
+    return helpers
+
+_MXS_INT_SUFFIXES = {ord("L"): None, ord("P"): None}
+
+def parse_mxs_int(text):
+    """Parses a MAXScript integer as printed by format (Integer64/IntegerPtr carry an L/P suffix)."""
+    return int(text.rstrip("LPlp"))
+
+def parse_mxs_numbers(text):
+    """
+    Packs space-separated MAXScript numbers into an array('d'): integers
+    may carry an Integer64/IntegerPtr suffix, non-finite values become NaN.
+    """
+    tokens = str(text).translate(_MXS_INT_SUFFIXES).split()
+    try:
+        return array.array("d", map(float, tokens))
+    except ValueError:
+        values = array.array("d")
+        for token in tokens:
+            try: values.append(float(token))
+            except ValueError: values.append(float("nan"))
+        return values
+
+def unescape_bulk_field(field):
+    """Decodes one field escaped by MaxInspectorBulkDef.esc()."""
+    if "\\" not in field:
+        return field
+    return _BULK_ESCAPE_RE.sub(lambda m: _BULK_UNESCAPE.get(m.group(1), m.group(1)), field)
+
+def parse_bulk_records(text):
+    """Splits a bulk helper result into lists of unescaped fields."""
+    unescape = lambda m: _BULK_UNESCAPE.get(m.group(1), m.group(1))
+    for line in str(text).split("\n"):
+        if line:
+            yield [_BULK_ESCAPE_RE.sub(unescape, f) if "\\" in f else f for f in line.split("\t")]
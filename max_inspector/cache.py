@@ -0,0 +1,399 @@
+"""
+Memory-mapped binary class cache, written crash- and concurrency-safely:
+every write goes to a temp file that is fsynced and renamed over the old
+one under an advisory lock, so readers only ever see a complete file.
+"""
+import contextlib
+import glob
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+
+# --- BINARY CLASS CACHE ---
+# Layout (little-endian, 3ds Max only runs on x64 Windows):
+#   header  : magic "MXIC", u16 version, u16 reserved, u32 string count, u32 row count
+#             (v3+) u32 body length, u32 CRC-32 of the body (everything after the header)
+#   offsets : (string count + 1) x u32 byte offsets into the string blob
+#   strings : UTF-8 blob of the interned string table, padded to 4 bytes
+#   rows    : row count x 4 x u32 string ids (name, superclass, classID, plugin)
+#   meta    : (v2+) u32 length + UTF-8 JSON object (scan fingerprint)
+CLASS_CACHE_MAGIC = b"MXIC"
+CLASS_CACHE_VERSION = 3
+_CACHE_READABLE_VERSIONS = (1, 2, 3)
+_CACHE_HEADER = struct.Struct("<4sHHII")
+_CACHE_CHECKSUM = struct.Struct("<II")  # follows _CACHE_HEADER from v3 on
+_CACHE_ROW = struct.Struct("<4I")
+
+# --- SAFE WRITES ---
+CACHE_LOCK_TIMEOUT = 10.0  # seconds a writer waits for another session's lock
+CACHE_REPLACE_TIMEOUT = 2.0  # seconds to retry the rename while a reader holds the file (Windows)
+CACHE_RETRY_SECONDS = 0.05
+# Per-user overlays on top of a shared (possibly read-only) cache
+USER_CACHE_DIR_NAME = "3dsMaxInspector"
+
+if os.name == "nt":
+    import msvcrt
+
+    def _try_lock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+@contextlib.contextmanager
+def cache_lock(path, timeout=CACHE_LOCK_TIMEOUT):
+    """
+    Holds an exclusive advisory lock on `path` + ".lock" so only one
+    session at a time writes `path`. Readers take no lock: writes are
+    atomic renames. Raises TimeoutError after `timeout` seconds.
+    """
+    f = open(path + ".lock", "a+b")
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                _try_lock(f)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"cache is locked by another session: {path}")
+                time.sleep(CACHE_RETRY_SECONDS)
+        try:
+            yield
+        finally:
+            _unlock(f)
+    finally:
+        f.close()
+
+def _replace(src, dst):
+    # Windows refuses to replace a file another process has open; readers close it quickly
+    deadline = time.monotonic() + CACHE_REPLACE_TIMEOUT
+    while True:
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(CACHE_RETRY_SECONDS)
+
+def _fsync_dir(directory):
+    # Makes the rename itself durable (POSIX; NTFS journals it and cannot open directories)
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _file_mode(path):
+    # mkstemp creates 0600 files; keep the mode of the file being replaced, or what open() would give
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def write_file_atomic(path, data):
+    """
+    Replaces `path` with the bytes `data`: written to a temp file in the
+    same folder, fsynced and renamed over `path` under cache_lock(), so
+    a crash or a second session never leaves a truncated file behind.
+    Temp files left by a crashed writer are removed on the way.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    with cache_lock(path):
+        for stale in glob.glob(os.path.join(glob.escape(directory), glob.escape(name) + ".*.tmp")):
+            try: os.remove(stale)
+            except OSError: pass
+        fd, tmp = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+        try:
+            os.chmod(tmp, _file_mode(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            _replace(tmp, path)
+        except BaseException:
+            try: os.remove(tmp)
+            except OSError: pass
+            raise
+    _fsync_dir(directory)
+
+def pack_class_cache(rows, meta=None):
+    """The bytes of a binary class cache holding (name, super, classid, plugin) rows and a meta dict."""
+    string_ids = {}
+    packed_rows = bytearray()
+    for row in rows:
+        ids = [string_ids.setdefault(s, len(string_ids)) for s in row]
+        packed_rows += _CACHE_ROW.pack(*ids)
+
+    encoded = [s.encode("utf-8") for s in string_ids]
+    offsets = [0]
+    for b in encoded:
+        offsets.append(offsets[-1] + len(b))
+    blob = b"".join(encoded)
+    blob += b"\0" * (-len(blob) % 4)
+    meta_blob = json.dumps(meta or {}, separators=(",", ":")).encode("utf-8")
+
+    body = b"".join((struct.pack(f"<{len(offsets)}I", *offsets), blob, packed_rows,
+                     struct.pack("<I", len(meta_blob)), meta_blob))
+    header = _CACHE_HEADER.pack(CLASS_CACHE_MAGIC, CLASS_CACHE_VERSION, 0,
+                                len(encoded), len(packed_rows) // _CACHE_ROW.size)
+    return header + _CACHE_CHECKSUM.pack(len(body), zlib.crc32(body)) + body
+
+def write_class_cache(path, rows, meta=None):
+    """Writes (name, super, classid, plugin) rows and an optional meta dict to a binary class cache."""
+    write_file_atomic(path, pack_class_cache(rows, meta))
+
+def read_json_class_cache(path):
+    """Rows of the legacy JSON cache, a list of [name, superclass, classid, plugin] lists."""
+    with open(path, "r") as f:
+        return [tuple(row) for row in json.load(f)]
+
+def write_json_class_cache(path, rows):
+    """Writes rows in the legacy JSON cache format (no scan fingerprint); the inspector migrates it on load."""
+    write_file_atomic(path, json.dumps([list(row) for row in rows]).encode("utf-8"))
+
+class BinaryClassCache:
+    """
+    Read-only, memory-mapped view over a binary class cache file.
+    Strings and rows are decoded on access, so opening the cache only
+    touches the header and the pages that are actually read (plus, for
+    v3 files with `verify`, one CRC-32 pass over the raw bytes).
+    """
+    def __init__(self, path, verify=True):
+        self._verify = verify
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        try:
+            self._open_views()
+        except Exception:
+            self.close()
+            raise
+
+    def _open_views(self):
+        if len(self._map) < _CACHE_HEADER.size:
+            raise ValueError("class cache is truncated")
+        magic, version, _, n_strings, n_rows = _CACHE_HEADER.unpack_from(self._map, 0)
+        if magic != CLASS_CACHE_MAGIC:
+            raise ValueError("not a class cache file")
+        if version not in _CACHE_READABLE_VERSIONS:
+            raise ValueError(f"unsupported class cache version {version}")
+
+        # Validate the section sizes before exposing any buffer views
+        offsets_pos = _CACHE_HEADER.size
+        if version >= 3:
+            offsets_pos += _CACHE_CHECKSUM.size
+            if len(self._map) < offsets_pos:
+                raise ValueError("class cache is truncated")
+            body_len, crc = _CACHE_CHECKSUM.unpack_from(self._map, _CACHE_HEADER.size)
+            if len(self._map) != offsets_pos + body_len:
+                raise ValueError("class cache is truncated")
+            if self._verify:
+                with memoryview(self._map) as view:
+                    if zlib.crc32(view[offsets_pos:]) != crc:
+                        raise ValueError("class cache is corrupt (checksum mismatch)")
+        blob_pos = offsets_pos + 4 * (n_strings + 1)
+        if len(self._map) < blob_pos:
+            raise ValueError("class cache is truncated")
+        (blob_len,) = struct.unpack_from("<I", self._map, blob_pos - 4)
+        rows_pos = blob_pos + blob_len + (-blob_len % 4)
+        meta_pos = rows_pos + _CACHE_ROW.size * n_rows
+        if len(self._map) < meta_pos:
+            raise ValueError("class cache is truncated")
+        self._meta_span = None
+        if version >= 2:
+            if len(self._map) < meta_pos + 4:
+                raise ValueError("class cache is truncated")
+            (meta_len,) = struct.unpack_from("<I", self._map, meta_pos)
+            if len(self._map) < meta_pos + 4 + meta_len:
+                raise ValueError("class cache is truncated")
+            self._meta_span = (meta_pos + 4, meta_pos + 4 + meta_len)
+
+        with memoryview(self._map) as view:
+            self._offsets = view[offsets_pos:blob_pos].cast("I")
+            self._blob = view[blob_pos:blob_pos + blob_len]
+            self._rows = view[rows_pos:rows_pos + _CACHE_ROW.size * n_rows].cast("I")
+        self._strings = [None] * n_strings
+        self._n_rows = n_rows
+
+    def string(self, string_id):
+        s = self._strings[string_id]
+        if s is None:
+            start, end = self._offsets[string_id], self._offsets[string_id + 1]
+            s = self._strings[string_id] = str(self._blob[start:end], "utf-8")
+        return s
+
+    def __len__(self):
+        return self._n_rows
+
+    @property
+    def meta(self):
+        """The metadata dict stored with the rows (empty for v1 files)."""
+        if self._meta_span is None:
+            return {}
+        start, end = self._meta_span
+        return json.loads(self._map[start:end].decode("utf-8") or "{}")
+
+    def __getitem__(self, row):
+        if not 0 <= row < self._n_rows:
+            raise IndexError(row)
+        base = row * 4
+        ids = self._rows[base:base + 4]
+        return (self.string(ids[0]), self.string(ids[1]),
+                self.string(ids[2]), self.string(ids[3]))
+
+    def strings(self):
+        """Decodes the whole string table at once (faster than per-row access for full loads)."""
+        if None in self._strings:
+            blob = bytes(self._blob)
+            offsets = self._offsets.tolist()
+            if blob.isascii():
+                # Byte offsets equal character offsets, so slice one decoded str
+                text = blob.decode("ascii")
+                self._strings = [text[a:b] for a, b in zip(offsets, offsets[1:])]
+            else:
+                self._strings = [str(blob[a:b], "utf-8") for a, b in zip(offsets, offsets[1:])]
+        return self._strings
+
+    def __iter__(self):
+        ids = map(self.strings().__getitem__, self._rows.tolist())
+        return zip(ids, ids, ids, ids)
+
+    def close(self):
+        for name in ("_offsets", "_blob", "_rows"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# --- SHARED CACHE + PER-USER OVERLAY ---
+def user_cache_path(shared_path):
+    """
+    The per-user overlay file for a shared cache: under %LOCALAPPDATA%
+    (~/.cache elsewhere), named after a hash of the shared path so
+    several installs do not share one overlay.
+    """
+    root = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    base, ext = os.path.splitext(os.path.basename(shared_path))
+    tag = zlib.crc32(os.path.normcase(os.path.abspath(shared_path)).encode("utf-8"))
+    return os.path.join(root, USER_CACHE_DIR_NAME, f"{base}.{tag:08x}.overlay{ext}")
+
+def _rows_by_superclass(rows):
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[1], []).append(tuple(row))
+    return groups
+
+class LayeredClassCache:
+    """
+    A shared class cache (e.g. next to the script on a network install,
+    read by many workstations at once) with a per-user overlay on top.
+    The overlay holds only the superclass categories whose rows differ
+    from the shared cache, listed in its meta under "overlay_categories",
+    plus the user's full scan fingerprint; when there is no readable
+    shared cache to layer on, it holds the whole cache and no list. Saves go to the shared file
+    when it can be written and to the overlay when it cannot.
+    """
+    OVERLAY_KEY = "overlay_categories"
+
+    def __init__(self, shared_path, user_path=None):
+        self.shared_path = shared_path
+        self.user_path = user_path if user_path is not None else user_cache_path(shared_path)
+        self.sources = []  # files the last load() used
+        self.errors = []  # (path, error) of the files the last load() skipped
+        self.last_write_error = None  # why the last save() could not write the shared cache
+
+    def _read(self, path):
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with BinaryClassCache(path) as cache:
+                return list(cache), cache.meta
+        except Exception as e:
+            self.errors.append((path, e))
+            return None
+
+    def load(self):
+        """
+        Returns (rows, meta) of the shared cache with the overlay applied,
+        or None when neither layer could be read. A corrupt layer is
+        skipped and recorded in `errors`. An overlay of changed categories
+        without its shared cache is incomplete and also returns None, so
+        the caller rescans instead of trusting its full fingerprint.
+        """
+        self.sources, self.errors = [], []
+        shared, overlay = self._read(self.shared_path), self._read(self.user_path)
+        if shared is not None:
+            self.sources.append(self.shared_path)
+        if overlay is None:
+            return shared
+        self.sources.append(self.user_path)
+        rows, meta = overlay
+        meta = dict(meta)
+        if self.OVERLAY_KEY not in meta:
+            return rows, meta  # written while there was no shared cache: complete on its own
+        replaced = set(meta.pop(self.OVERLAY_KEY))
+        if shared is None:
+            self.sources.remove(self.user_path)
+            self.errors.append((self.user_path, ValueError("overlay without its shared cache is incomplete")))
+            return None
+        return [row for row in shared[0] if row[1] not in replaced] + rows, meta
+
+    def save(self, rows, meta=None):
+        """
+        Writes `rows` to the shared cache, or the changed categories to the
+        overlay when the shared file cannot be written (the OSError is kept
+        in `last_write_error`); returns the path written.
+        """
+        self.last_write_error = None
+        try:
+            write_class_cache(self.shared_path, rows, meta)
+        except OSError as e:
+            self.last_write_error = e
+        else:
+            # The shared file now matches this session: an overlay would only shadow it
+            try: os.remove(self.user_path)
+            except OSError: pass
+            return self.shared_path
+
+        os.makedirs(os.path.dirname(self.user_path), exist_ok=True)
+        shared = self._read(self.shared_path)
+        if shared is None:
+            # Nothing to layer on: the overlay holds the whole cache (no overlay_categories)
+            write_class_cache(self.user_path, rows, meta)
+            return self.user_path
+        new, old = _rows_by_superclass(rows), _rows_by_superclass(shared[0])
+        changed = {sc for sc in set(old) | set(new) if sorted(old.get(sc, ())) != sorted(new.get(sc, ()))}
+        overlay_meta = dict(meta or {})
+        overlay_meta[self.OVERLAY_KEY] = sorted(changed)
+        write_class_cache(self.user_path, [row for sc in sorted(changed) for row in new.get(sc, ())], overlay_meta)
+        return self.user_path
@@ -0,0 +1,254 @@
+"""
+Batch mode: builds the class cache and writes scene reports without the
+inspector window, for render farm and CI jobs.
+
+    python -m max_inspector --cache max_classes_cache.json --report scene.json
+    3dsmaxbatch.exe 3dsMaxInspectorBatch.py -mxsString args:"--scene C:/shots/a.max --report C:/out/a.ndjson"
+
+Outside 3ds Max, --runtime MODULE[:ATTR] points the engine at a stub
+runtime (MODULE.runtime by default) instead of pymxs.
+"""
+import argparse
+import importlib
+import json
+import os
+import shlex
+import sys
+import time
+
+from . import inspectors, runtime
+from .batch import BATCH_SCOPES, BatchRecordSource, iter_batch_export, open_batch_writer
+from .bulk import get_bulk_helpers
+from .cache import BinaryClassCache, write_class_cache, write_json_class_cache
+from .index import prepare_class_rows
+from .runtime import rt, safe_repr
+from .scan import diff_class_fingerprint, get_class_fingerprint, get_scan_categories, iter_class_scan
+
+# --- EXIT STATUS ---
+EXIT_OK = 0
+EXIT_PARTIAL = 1     # outputs written, but some report sections failed
+EXIT_USAGE = 2       # bad arguments (argparse uses 2 as well)
+EXIT_NO_RUNTIME = 3  # neither pymxs nor a --runtime stub could be loaded
+EXIT_FAILED = 4      # scene failed to load, scan found no classes, or an output could not be written
+
+# Scene report sections, in report order
+REPORT_SECTIONS = (("Scene Info", inspectors.inspect_scene_info), ("File Info", inspectors.inspect_file_info),
+                   ("Units", inspectors.inspect_units), ("Scene Statistics", inspectors.inspect_scene_statistics),
+                   ("Selection Sets", inspectors.inspect_selection_sets),
+                   ("Environment", inspectors.inspect_environment),
+                   ("Renderer", inspectors.inspect_current_renderer),
+                   ("Render Settings", inspectors.inspect_render_settings),
+                   ("Color Management", inspectors.inspect_color_mgmt),
+                   ("Plugins", inspectors.inspect_plugins), ("Scene Objects", inspectors.inspect_scene_objects),
+                   ("Assets", inspectors.inspect_assets))
+
+def log(text):
+    print(text, file=sys.stderr, flush=True)
+
+def _bulk_helpers():
+    try:
+        return get_bulk_helpers()
+    except Exception as e:
+        log(f"--- PYTHON: Bulk helpers unavailable, using per-item calls: {e} ---")
+        return None
+
+# --- CLASS CACHE ---
+def scan_classes(categories, helpers):
+    """Runs the class scan shared with the inspector's Re-Scan to completion; returns (rows, failed)."""
+    rows, failed = [], []
+    for step in iter_class_scan(categories, helpers, rows, failed, log=log):
+        if step is not None and step[2] is not None:
+            log(f"--- PYTHON: {step[1]}: {step[2]} classes ---")
+    return rows, failed
+
+def build_class_cache(path, update=False):
+    """
+    Scans the classes and writes the cache to `path`: the binary format,
+    or the legacy JSON list for a .json path. With `update`, an existing
+    binary cache is re-scanned only in the categories its fingerprint
+    says changed. Returns an exit status.
+    """
+    categories, error = get_scan_categories()
+    if error is not None:
+        log(f"--- PYTHON: Could not find 'Controller' class list: {error} ---")
+    helpers = _bulk_helpers()
+    fingerprint = get_class_fingerprint(categories, helpers)
+    as_json = os.path.splitext(path)[1].lower() == ".json"
+
+    keep = []
+    if update and not as_json and os.path.exists(path):
+        try:
+            with BinaryClassCache(path) as cache:
+                cached, cached_fingerprint = list(cache), cache.meta
+        except Exception as e:
+            log(f"--- PYTHON: Could not read {path} ({e}); running a full scan. ---")
+        else:
+            if cached and cached_fingerprint:
+                changed, changed_files = diff_class_fingerprint(cached_fingerprint, fingerprint, cached)
+                if changed_files and not changed:
+                    changed = {name for name, _ in categories}
+                if not changed:
+                    log(f"--- PYTHON: Class cache is up to date: {path} ---")
+                    return EXIT_OK
+                log(f"--- PYTHON: Re-scanning {len(changed)} changed categories: {', '.join(sorted(changed))} ---")
+                keep = [row for row in cached if row[1] not in changed]
+                categories = [c for c in categories if c[0] in changed]
+    elif update and as_json:
+        log("--- PYTHON: JSON caches have no scan fingerprint; running a full scan. ---")
+
+    start = time.perf_counter()
+    rows, failed = scan_classes(categories, helpers)
+    if not rows and not keep:
+        log("--- PYTHON ERROR: Collected 0 classes from all categories. Cache not written. ---")
+        return EXIT_FAILED
+    if failed:
+        log(f"--- PYTHON: Warning: Failed to parse {len(failed)} classes. ---")
+    rows = prepare_class_rows(keep + rows)
+    try:
+        if as_json:
+            write_json_class_cache(path, rows)
+        else:
+            write_class_cache(path, rows, fingerprint)
+    except Exception as e:
+        log(f"--- PYTHON ERROR: Failed to save cache file {path}: {e} ---")
+        return EXIT_FAILED
+    log(f"--- PYTHON: Saved {len(rows)} classes to {path} ({time.perf_counter() - start:.1f}s). ---")
+    return EXIT_OK
+
+# --- SCENE REPORT ---
+def report_sections(names=None):
+    """Yields {"section", "lines"[, "error"]} for the REPORT_SECTIONS in `names` (all by default)."""
+    for name, inspect in REPORT_SECTIONS:
+        if names and name not in names:
+            continue
+        record = {"section": name, "lines": []}
+        try:
+            for text in inspect():
+                text = text.strip("\n")
+                if text and not (text.startswith("--- ") and text.endswith(" ---")):
+                    record["lines"].append(text)
+        except Exception as e:
+            record["error"] = str(e)
+        yield record
+
+def write_scene_report(path, names=None):
+    """
+    Writes the scene report to `path`: one JSON document, or for .ndjson /
+    .jsonl a header line followed by one line per section, written as each
+    section finishes. Returns an exit status.
+    """
+    header = {"created": time.strftime("%Y-%m-%d %H:%M:%S"), "scene": _scene_file()}
+    errors = 0
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            if os.path.splitext(path)[1].lower() in (".ndjson", ".jsonl"):
+                f.write(json.dumps(dict(header, type="report")) + "\n")
+                for record in report_sections(names):
+                    errors += "error" in record
+                    f.write(json.dumps(dict(record, type="section")) + "\n")
+            else:
+                sections = list(report_sections(names))
+                errors = sum("error" in record for record in sections)
+                json.dump(dict(header, sections=sections), f, indent=1)
+    except Exception as e:
+        log(f"--- PYTHON ERROR: Failed to write report {path}: {e} ---")
+        return EXIT_FAILED
+    log(f"--- PYTHON: Scene report written to {path} ({errors} sections failed). ---")
+    return EXIT_PARTIAL if errors else EXIT_OK
+
+def _scene_file():
+    try: return safe_repr(rt.maxFilePath) + safe_repr(rt.maxFileName)
+    except Exception: return ""
+
+def export_nodes(path, scope, layer_name="", with_properties=True):
+    """Streams one record per node in `scope` to an NDJSON, CSV or SQLite file, like Batch Export. Returns an exit status."""
+    source = BatchRecordSource(_bulk_helpers())
+    try:
+        handles = source.handles(scope, layer_name)
+        writer = open_batch_writer(path)
+    except Exception as e:
+        log(f"--- PYTHON ERROR: Node export failed: {e} ---")
+        return EXIT_FAILED
+    written = 0
+    try:
+        for done, written in iter_batch_export(source, handles, writer, with_properties):
+            pass
+    except Exception as e:
+        log(f"--- PYTHON ERROR: Node export failed after {written} objects: {e} ---")
+        return EXIT_FAILED
+    finally:
+        writer.close()
+    log(f"--- PYTHON: Exported {written} objects ({scope}) to {path}. ---")
+    return EXIT_OK
+
+# --- ENTRY POINT ---
+def use_runtime(spec):
+    """Routes the engine to MODULE.ATTR for a 'MODULE[:ATTR]' spec (ATTR defaults to 'runtime')."""
+    module_name, _, attr = spec.partition(":")
+    runtime.set_runtime(getattr(importlib.import_module(module_name), attr or "runtime"))
+
+def batch_argv():
+    """
+    Arguments for a 3dsmaxbatch run: the `-mxsString args:"..."` value
+    split like a shell command line, or sys.argv[1:] outside 3ds Max.
+    """
+    try:
+        text = rt.GetDictValue(rt.maxOps.mxsCmdLineArgs, rt.Name("args"))
+        if text:
+            return shlex.split(str(text))
+    except Exception:
+        pass
+    return sys.argv[1:]
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="max_inspector", description="Build the 3ds Max class cache and write scene reports without the GUI.")
+    parser.add_argument("--runtime", metavar="MODULE[:ATTR]",
+                        help="use this runtime instead of pymxs (e.g. a stub for tests)")
+    parser.add_argument("--scene", metavar="FILE.max", help="load this scene before reporting")
+    parser.add_argument("--cache", metavar="PATH",
+                        help="scan the classes and write the cache (.bin, or the legacy .json format)")
+    parser.add_argument("--update", action="store_true",
+                        help="with a binary --cache, re-scan only the categories that changed")
+    parser.add_argument("--report", metavar="PATH", help="write the scene report (.json or .ndjson)")
+    parser.add_argument("--section", action="append", choices=[name for name, _ in REPORT_SECTIONS],
+                        help="report only this section (repeatable)")
+    parser.add_argument("--nodes", metavar="PATH", help="write one record per node (.ndjson, .csv or .sqlite)")
+    parser.add_argument("--scope", choices=BATCH_SCOPES, default="scene", help="nodes written by --nodes")
+    parser.add_argument("--layer", default="", help="layer name for --scope layer")
+    parser.add_argument("--no-properties", action="store_true", help="leave properties out of --nodes records")
+    return parser
+
+def main(argv=None):
+    """Runs the requested outputs in order (cache, report, nodes) and returns the worst exit status."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not (args.cache or args.report or args.nodes):
+        parser.error("nothing to do: give --cache, --report and/or --nodes")
+
+    try:
+        if args.runtime:
+            use_runtime(args.runtime)
+        elif runtime.runtime_override() is None:
+            runtime.pymxs_runtime()
+    except Exception as e:
+        log(f"--- PYTHON ERROR: No 3ds Max runtime ({e}). Run inside 3ds Max or 3dsmaxbatch, or pass --runtime. ---")
+        return EXIT_NO_RUNTIME
+
+    if args.scene:
+        try:
+            loaded = rt.loadMaxFile(args.scene, quiet=True)
+        except Exception as e:
+            loaded, args.scene = False, f"{args.scene} ({e})"
+        if not loaded:
+            log(f"--- PYTHON ERROR: Could not load scene {args.scene} ---")
+            return EXIT_FAILED
+
+    status = EXIT_OK
+    if args.cache:
+        status = max(status, build_class_cache(args.cache, args.update))
+    if args.report:
+        status = max(status, write_scene_report(args.report, args.section))
+    if args.nodes:
+        status = max(status, export_nodes(args.nodes, args.scope, args.layer, not args.no_properties))
+    return status
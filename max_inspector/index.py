@@ -0,0 +1,233 @@
+"""Class rows: normalizing, the columnar class table, grouping, and the lookup and search indexes over them."""
+from array import array
+from itertools import accumulate
+
+# --- CLASS ROWS ---
+def prepare_class_rows(rows):
+    """
+    Returns the (name, superclass, classid, plugin) rows as de-duplicated
+    tuples sorted by name. Rows loaded from JSON are lists, which are not
+    hashable, so they are converted first.
+    """
+    return sorted(dict.fromkeys(tuple(row) for row in rows), key=lambda x: x[0].lower())
+
+def group_class_rows(rows):
+    """
+    Returns ({superclass: row ids}, {plugin: row ids}) with "<no_super>"
+    and "<core>" for empty names; row ids are array('I') columns in the
+    order of `rows`, so groups of sorted rows are sorted too.
+    """
+    if isinstance(rows, ClassTable):
+        return rows.group_rows()
+    by_super, by_plugin = {}, {}
+    for row_id, (cname, sc, cid, pname) in enumerate(rows):
+        by_super.setdefault(sc if sc else "<no_super>", array("I")).append(row_id)
+        by_plugin.setdefault(pname if pname else "<core>", array("I")).append(row_id)
+    return by_super, by_plugin
+
+# --- CLASS TABLE ---
+# Thousands of rows share a dozen superclasses and a few hundred plugins,
+# so those columns are small-int codes into pools of the distinct strings.
+# Names and classIDs are nearly all distinct; they are kept as one joined
+# string per column plus end offsets, instead of one str object per row.
+class _StringColumn:
+    """A column of strings stored as one joined str and an array of end offsets."""
+    __slots__ = ("_blob", "_ends")
+
+    def __init__(self, strings):
+        strings = list(strings)
+        self._blob = "".join(strings)
+        self._ends = array("I", accumulate(map(len, strings)))
+
+    def __len__(self):
+        return len(self._ends)
+
+    def __getitem__(self, i):
+        ends = self._ends
+        if i < 0:
+            i += len(ends)
+        return self._blob[ends[i - 1] if i else 0:ends[i]]
+
+    def __iter__(self):
+        blob, start = self._blob, 0
+        for end in self._ends:
+            yield blob[start:end]
+            start = end
+
+class ClassTable:
+    """
+    Column-oriented class rows: name and classID as string columns,
+    superclass and plugin as array('I') codes into `superclasses` and
+    `plugins`. Indexing and iteration build (name, superclass, classid,
+    plugin) tuples on access, so the table stands in for the list of rows
+    (rows keep the order they were given in, normally prepare_class_rows()).
+    """
+    __slots__ = ("_names", "_class_ids", "superclasses", "plugins", "_super_codes", "_plugin_codes")
+
+    def __init__(self, rows=()):
+        rows = rows if isinstance(rows, list) else list(rows)
+        self._names = _StringColumn(row[0] for row in rows)
+        self._class_ids = _StringColumn(row[2] for row in rows)
+        super_pool, plugin_pool = {}, {}
+        self._super_codes = array("I", [super_pool.setdefault(row[1], len(super_pool)) for row in rows])
+        self._plugin_codes = array("I", [plugin_pool.setdefault(row[3], len(plugin_pool)) for row in rows])
+        self.superclasses, self.plugins = list(super_pool), list(plugin_pool)
+
+    def __len__(self):
+        return len(self._super_codes)
+
+    def __getitem__(self, row_id):
+        if isinstance(row_id, slice):
+            return [self[i] for i in range(*row_id.indices(len(self)))]
+        return (self._names[row_id], self.superclasses[self._super_codes[row_id]],
+                self._class_ids[row_id], self.plugins[self._plugin_codes[row_id]])
+
+    def __iter__(self):
+        superclasses, plugins = self.superclasses, self.plugins
+        for cname, sc, cid, pname in zip(self._names, self._super_codes, self._class_ids, self._plugin_codes):
+            yield cname, superclasses[sc], cid, plugins[pname]
+
+    def name(self, row_id):
+        return self._names[row_id]
+
+    def superclass(self, row_id):
+        return self.superclasses[self._super_codes[row_id]]
+
+    def class_id(self, row_id):
+        return self._class_ids[row_id]
+
+    def group_rows(self):
+        """group_class_rows() from the code columns: one row-id array per pool entry, no strings touched."""
+        grouped = []
+        for pool, codes, empty in ((self.superclasses, self._super_codes, "<no_super>"),
+                                   (self.plugins, self._plugin_codes, "<core>")):
+            buckets = [array("I") for _ in pool]
+            for row_id, code in enumerate(codes):
+                buckets[code].append(row_id)
+            groups = {}
+            for value, row_ids in zip(pool, buckets):
+                groups.setdefault(value if value else empty, array("I")).extend(row_ids)
+            grouped.append(groups)
+        return grouped[0], grouped[1]
+
+# --- CLASS LOOKUP INDEX ---
+class _RowHashTable:
+    """
+    Open-addressing hash table from a key to the first row id with that key,
+    stored as row id + 1 in an array('I') of at least twice as many slots as
+    keys (0 marks an empty slot). Only row ids are kept: each probe checks
+    the key against the rows through `key_of`.
+    """
+    __slots__ = ("_slots", "_mask", "_key_of")
+
+    def __init__(self, keys, key_of):
+        keys = list(keys)
+        size = 8
+        while size < 2 * len(keys):
+            size <<= 1
+        slots, mask = array("I", bytes(4 * size)), size - 1
+        for row_id, key in enumerate(keys):
+            if not key:
+                continue
+            i = hash(key) & mask
+            while slots[i]:
+                if keys[slots[i] - 1] == key:
+                    break  # the first row with this key wins
+                i = (i + 1) & mask
+            else:
+                slots[i] = row_id + 1
+        self._slots, self._mask, self._key_of = slots, mask, key_of
+
+    def get(self, key):
+        slots, mask, key_of = self._slots, self._mask, self._key_of
+        i = hash(key) & mask
+        while slots[i]:
+            row_id = slots[i] - 1
+            if key_of(row_id) == key:
+                return row_id
+            i = (i + 1) & mask
+        return None
+
+class ClassLookupIndex:
+    """
+    Lookups over class rows in prepare_class_rows() order: lower-cased
+    name -> first row of that name and classID -> first row with that
+    classID, each an open-addressing hash table of row ids (_RowHashTable)
+    verified against the rows, so a lookup is one hash and usually one
+    string comparison. The index holds about 8 bytes per row per key and
+    no strings of its own.
+    """
+    def __init__(self, rows):
+        if isinstance(rows, ClassTable):  # read the string columns directly: a click makes a few dozen reads
+            name_of, class_id_of = rows._names.__getitem__, rows._class_ids.__getitem__
+        else:
+            name_of, class_id_of = (lambda i: rows[i][0]), (lambda i: rows[i][2])
+        self._name_of = name_of
+        self._count = len(rows)
+        lower_names, class_ids = [], []  # only while building
+        for cname, sc, cid, pname in rows:
+            lower_names.append(cname.lower())
+            class_ids.append(cid)
+        self._by_name = _RowHashTable(lower_names, lambda i: name_of(i).lower())
+        self._by_classid = _RowHashTable(class_ids, class_id_of)
+
+    def rows_for_name(self, name):
+        """All row ids with this class name (the same name can exist under several superclasses)."""
+        lower = name.lower()
+        row_id = self._by_name.get(lower)
+        if row_id is None:
+            return []
+        name_of, count, hits = self._name_of, self._count, []
+        row_name = name_of(row_id)  # the hash table checked that it matches `lower`
+        # Rows are sorted by lower-cased name, so the rest of the name's rows follow the first
+        while True:
+            if row_name == name:
+                hits.append(row_id)
+            row_id += 1
+            if row_id >= count:
+                return hits
+            row_name = name_of(row_id)
+            if row_name.lower() != lower:
+                return hits
+
+    def row_for_classid(self, cid):
+        return self._by_classid.get(cid)
+
+# --- CLASS SEARCH INDEX ---
+class ClassSearchIndex:
+    """
+    Trigram index over the name, superclass and plugin of each class row.
+    A query is answered from the shortest posting list among its trigrams
+    and verified with a substring check; a query that extends the previous
+    one only re-checks the previous hits. Posting lists are array('I') row
+    ids. Hits are ascending row ids.
+    """
+    def __init__(self, rows):
+        # Fields are joined with a newline so matches never span two fields
+        self._haystacks = [f"{cname}\n{sc}\n{pname}".lower() for cname, sc, cid, pname in rows]
+        self._postings = {}
+        for row_id, hay in enumerate(self._haystacks):
+            for gram in {hay[i:i + 3] for i in range(len(hay) - 2)}:
+                self._postings.setdefault(gram, array("I")).append(row_id)
+        self._last_query = ""
+        self._last_hits = None
+
+    def search(self, query):
+        """Returns the row ids matching `query`, or None if the query is empty."""
+        query = query.strip().lower()
+        if not query:
+            self._last_query, self._last_hits = "", None
+            return None
+
+        if self._last_hits is not None and self._last_query in query:
+            candidates = self._last_hits
+        elif len(query) >= 3:
+            grams = {query[i:i + 3] for i in range(len(query) - 2)}
+            candidates = min((self._postings.get(g, ()) for g in grams), key=len)
+        else:
+            candidates = range(len(self._haystacks))
+
+        haystacks = self._haystacks
+        hits = [i for i in candidates if query in haystacks[i]]
+        self._last_query, self._last_hits = query, hits
+        return hits
@@ -0,0 +1,477 @@
+"""
+Inspectors: generators yielding the report lines for an object, the
+scene or a system interface. They never touch Qt, so the inspector
+window logs them and batch jobs can write them anywhere.
+
+`read_properties(value)` returns (name, type name, value text) per
+property, with a type name of None for unreadable properties; the
+window passes its schema-cached reader, the default is one bulk call
+per value.
+"""
+import time
+
+from .anim import read_controller_tree
+from .bulk import get_bulk_helpers
+from .properties import property_snapshot
+from .runtime import rt, get_type_name, safe_repr, try_classid
+from . import stats
+
+def _bulk_helpers_or_none():
+    try: return get_bulk_helpers()
+    except Exception: return None
+
+# --- OBJECT INSPECTORS ---
+def inspect_properties(obj, read_properties=property_snapshot):
+    yield f"\n--- Properties of {safe_repr(obj.name)} ---"
+    props = read_properties(obj)
+    for p, t, rep in props:
+        if t is None: yield f"{p} (unknown) = <unreadable>"
+        else: yield f"{p} ({t}) = {rep}"
+    if not props: yield "<no properties found or unreadable>"; yield ""
+
+def inspect_methods(obj, read_properties=property_snapshot):
+    yield f"\n--- Methods of {safe_repr(obj.name)} ---"
+    try:
+        for m in rt.getMethods(obj): yield str(m)
+    except Exception:
+        yield "<unable to retrieve methods (rt.getMethods failed)>"
+    yield ""
+
+def inspect_material(obj, read_properties=property_snapshot):
+    yield f"\n--- Material of {safe_repr(obj.name)} ---"
+    try:
+        mat = obj.material
+        if not mat: yield "No Material assigned!"; return
+        yield f"Material: {safe_repr(mat)} ({get_type_name(mat)})"
+        for p, t, rep in read_properties(mat):
+            if t is None: yield f"{p} = <unreadable>"
+            else: yield f"{p} ({t}) = {rep}"
+    except Exception as e: yield "Error reading material: " + str(e); yield ""
+
+def inspect_modifiers(obj, read_properties=property_snapshot):
+    yield f"\n--- Modifiers on {safe_repr(obj.name)} ---"
+    try:
+        try: mods = list(obj.modifiers)
+        except Exception: mods = obj.modifiers if hasattr(obj, "modifiers") else []
+        if not mods: yield "<no modifiers>"; return
+        for m in mods:
+            yield f"> {safe_repr(m)} ({get_type_name(m)})"
+            for p, t, rep in read_properties(m):
+                if t is None: yield f"  {p} = <unreadable>"
+                else: yield f"  {p} ({t}) = {rep}"
+    except Exception as e: yield "Error reading modifiers: " + str(e); yield ""
+
+def inspect_controllers(obj, read_properties=property_snapshot):
+    yield f"\n--- Controllers of {safe_repr(obj.name)} ---"
+    try:
+        rows = read_controller_tree(int(rt.getHandleByAnim(obj)), _bulk_helpers_or_none())
+        if not rows: yield "<no controllers>"
+        for depth, name, handle, cls, superclass, keys, kind, detail in rows:
+            indent = "  " * (depth - 1)
+            if not handle:
+                yield f"{indent}{name}"
+                continue
+            line = f"{indent}{name} ({cls})"
+            if keys >= 0: line += f" - {keys:,} keys"
+            if kind not in ("keyframe", "procedural"): line += f" [{kind}]"
+            yield line
+            for text in detail.splitlines():
+                yield f"{indent}    {text}"
+    except Exception as e:
+        yield "Error reading controllers: " + str(e)
+    yield ""
+
+def inspect_custom_attributes(obj, read_properties=property_snapshot):
+    yield f"\n--- Custom Attributes of {safe_repr(obj.name)} ---"
+    try:
+        ca_defs = rt.custAttributes.getDefs(obj)
+        if not ca_defs or ca_defs.count == 0:
+            yield "<no custom attributes found>"
+            yield ""
+            return
+
+        for ca_def in ca_defs:
+            yield f"Definition: {safe_repr(ca_def.name)}"
+            ca_block = rt.custAttributes.get(obj, ca_def)
+            for p, t, rep in read_properties(ca_block):
+                if t is None:
+                    yield f"  .{p} = <unreadable>"
+                else:
+                    yield f"  .{p} ({t}) = {rep}"
+    except Exception as e:
+        yield f"<unable to read custom attributes: {e}>"
+    yield ""
+
+def inspect_user_properties(obj, read_properties=property_snapshot):
+    yield f"\n--- User Properties of {safe_repr(obj.name)} ---"
+    try:
+        buf = rt.getUserPropBuffer(obj)
+        if not buf:
+            yield "<no user properties>"
+        else:
+            yield buf
+    except Exception as e:
+        yield f"<unable to read user properties: {e}>"
+    yield ""
+
+def inspect_transform(obj, read_properties=property_snapshot):
+    yield f"\n--- Transform Matrix of {safe_repr(obj.name)} ---"
+    try:
+        yield safe_repr(obj.transform)
+    except Exception as e:
+        yield f"<unable to read transform: {e}>"
+    yield ""
+
+def inspect_base_params(obj, read_properties=property_snapshot):
+    yield f"\n--- Base Params of {safe_repr(obj.name)} ---"
+    common_params = ['radius', 'length', 'width', 'height', 'segs', 'sides', 'capsegs']
+    found_any = False
+    props = {p: (t, rep) for p, t, rep in read_properties(obj) if t is not None}
+    for p in common_params:
+        if p in props:  # Property doesn't exist on this object, skip silently
+            t, rep = props[p]
+            yield f"{p} ({t}) = {rep}"
+            found_any = True
+    if not found_any:
+        yield "<no common base parameters found>"
+    yield ""
+
+def inspect_class_info(obj, lookup_index=None, class_rows=()):
+    """Class, superclass and classID of `obj`, cross-referenced with the scanned class rows."""
+    yield f"\n--- Class Info for {safe_repr(obj.name)} ---"
+    try:
+        try: mxs_cls = rt.classOf(obj)
+        except Exception: mxs_cls = "<unknown>"
+
+        # --- V5.6 SAFE SUPERCLASS ---
+        try: super_cls = rt.superClassOf(obj)
+        except Exception: super_cls = "<unknown (superClassOf failed)>"
+
+        py_type = type(obj).__name__; cid = try_classid(obj)
+        yield f"MXS Class: {safe_repr(mxs_cls)}"; yield f"SuperClass: {safe_repr(super_cls)}"
+        yield f"Python Type: {py_type}"; yield f"ClassID: {cid}"
+        # Cross-reference the scanned class table (no extra runtime calls)
+        if lookup_index is not None:
+            for row_id in lookup_index.rows_for_name(safe_repr(mxs_cls)):
+                _, c_sc, c_cid, c_pname = class_rows[row_id]
+                yield f"Class Table: {c_sc} (ClassID: {c_cid or '-'}, Plugin: {c_pname or '<core>'})"
+    except Exception as e: yield "Error reading class info: " + str(e); yield ""
+
+def inspect_anim(anim, read_properties=property_snapshot):
+    """Properties of any anim (material, map, controller...)."""
+    yield f"\n--- Properties of {safe_repr(anim)} ({get_type_name(anim)}) ---"
+    props = read_properties(anim)
+    for p, t, rep in props:
+        if t is None: yield f"{p} (unknown) = <unreadable>"
+        else: yield f"{p} ({t}) = {rep}"
+    if not props: yield "<no properties found or unreadable>"
+    yield ""
+
+def inspect_geometry(obj, read_properties=property_snapshot):
+    """Mesh topology stats of `obj`, from one packed read of its evaluated mesh."""
+    yield f"\n--- Geometry of {safe_repr(obj.name)} ---"
+    if not stats.numpy_available():
+        yield "<Geometry needs NumPy: install it for 3ds Max's Python (pip install numpy)>"
+        yield ""
+        return
+    from .mesh import MeshBuffer, MeshStats
+    try:
+        start = time.perf_counter()
+        buffer = MeshBuffer.read(int(rt.getHandleByAnim(obj)), _bulk_helpers_or_none())
+        read = time.perf_counter() - start
+        if buffer is None:
+            yield "<no mesh (not a geometry object, or it cannot be converted to a mesh)>"
+            yield ""
+            return
+        with buffer:
+            mesh = MeshStats(buffer)
+    except Exception as e:
+        yield f"<unable to read the mesh: {e}>"
+        yield ""
+        return
+
+    fmt = lambda v: "[" + ", ".join(f"{x:.3f}" for x in v) + "]"
+    yield f"Vertices: {mesh.num_verts:,}   Faces: {mesh.num_faces:,}   Surface area: {mesh.area:,.3f}"
+    if mesh.bounds is not None:
+        lo, hi = mesh.bounds
+        yield f"Bounds: min {fmt(lo)}  max {fmt(hi)}  size {fmt(hi - lo)}"
+    yield (f"Degenerate faces: {mesh.repeated_index_faces + mesh.zero_area_faces:,} "
+           f"({mesh.repeated_index_faces:,} repeated vertex, {mesh.zero_area_faces:,} zero area)")
+    if mesh.invalid_faces: yield f"Invalid faces (vertex index out of range): {mesh.invalid_faces:,}"
+    yield f"Isolated vertices: {mesh.isolated_verts:,}   Zero normals: {mesh.zero_normals:,}"
+    yield f"Faces against their vertex normals: {mesh.inverted_faces:,}"
+    counts = mesh.element_faces
+    if len(counts):
+        yield (f"Elements: {mesh.elements():,} (faces: largest {int(counts[0]):,}, smallest {int(counts[-1]):,})")
+        for i, count in enumerate(counts[:10]):
+            yield f"  Element {i + 1}: {int(count):,} faces"
+        if len(counts) > 10: yield f"  ... {len(counts) - 10:,} more"
+
+    for ch, nmv, nmf, uv_bounds, flipped, zero, shells, covered, overlap in mesh.uv:
+        yield f"\nMap Channel {ch}: {nmv:,} map vertices, {nmf:,} map faces, {shells:,} shells"
+        if uv_bounds is not None:
+            yield f"  UV bounds: min {fmt(uv_bounds[0])}  max {fmt(uv_bounds[1])}"
+        yield f"  Flipped faces: {flipped:,}   Zero-area faces: {zero:,}"
+        yield f"  0-1 tile: {covered:.2f}% covered, {overlap:.2f}% overlapping (texels covered twice or more)"
+    if not mesh.uv: yield "\nMap Channels: <none>"
+    yield f"\n(read in {read:.2f}s, analysed in {time.perf_counter() - start - read:.2f}s)"
+    yield ""
+
+# What clicking a node runs, in order; inspect_class_info takes the class table instead
+OBJECT_INSPECTORS = (("Properties", inspect_properties), ("Material", inspect_material),
+                     ("Modifiers", inspect_modifiers), ("Controllers", inspect_controllers),
+                     ("Methods", inspect_methods), ("Class Info", inspect_class_info),
+                     ("Base Params", inspect_base_params), ("Custom Attributes", inspect_custom_attributes),
+                     ("User Properties", inspect_user_properties))
+
+# --- SCENE INSPECTORS ---
+def inspect_scene_objects():
+    yield "\n--- Scene Objects ---"
+    for o in rt.objects: yield f"{safe_repr(o.name)} ({get_type_name(o)})"
+    yield ""
+
+# --- V5.9: PARANOID MODE ---
+def inspect_scene_info():
+    yield "\n--- Scene Info ---"
+    try:
+        try: yield f"Scene name: {safe_repr(rt.filename)}"
+        except Exception: yield f"Scene name: {safe_repr(rt.maxFileName)}"  # Fallback
+    except Exception: yield "Scene name: <failed to get>"
+    try: yield f"Num objects: {len(list(rt.objects))}"
+    except Exception: yield "Num objects: <failed to get>"
+    yield ""
+
+def inspect_scene_statistics():
+    yield "\n--- Scene Statistics ---"
+    if not stats.numpy_available():
+        yield "<Scene Statistics needs NumPy: install it for 3ds Max's Python (pip install numpy)>"
+        yield ""
+        return
+    try:
+        start = time.perf_counter()
+        scene = stats.SceneStats.gather(_bulk_helpers_or_none())
+        gathered = time.perf_counter() - start
+    except Exception as e:
+        yield f"<unable to gather scene statistics: {e}>"
+        yield ""
+        return
+
+    totals = scene.totals()
+    yield (f"Nodes: {len(scene):,}   Faces: {totals['faces']:,}   Vertices: {totals['verts']:,}   "
+           f"Modifiers: {totals['modifiers']:,}")
+    extents = scene.extents()
+    if extents is not None:
+        lo, hi = extents
+        fmt = lambda v: "[" + ", ".join(f"{x:.2f}" for x in v) + "]"
+        yield f"Bounds: min {fmt(lo)}  max {fmt(hi)}  size {fmt(hi - lo)}"
+
+    unique, without, shared = scene.material_reuse()
+    yield f"\nMaterials: {unique:,} unique, {without:,} nodes without material"
+    for handle, count in shared:
+        mat = rt.getAnimByHandle(handle)
+        yield f"  {safe_repr(mat.name) if mat is not None else handle}: {count:,} nodes"
+
+    yield "\nBy SuperClass (nodes / faces / vertices):"
+    for name, count, faces, verts in scene.by_superclass():
+        yield f"  {name}: {count:,} / {faces:,} / {verts:,}"
+    yield "\nBy Class (nodes / faces / vertices):"
+    for name, count, faces, verts in scene.by_class():
+        yield f"  {name}: {count:,} / {faces:,} / {verts:,}"
+
+    yield "\nFace Count Histogram (faces: nodes):"
+    for label, count in scene.face_histogram():
+        yield f"  {label}: {count:,}"
+    yield "\nModifier Count Histogram (modifiers: nodes):"
+    for mods, count in scene.modifier_histogram():
+        yield f"  {mods}: {count:,}"
+    yield f"\n(gathered and aggregated in {time.perf_counter() - start:.2f}s, {gathered:.2f}s reading the scene)"
+    yield ""
+
+def inspect_assets(audit=None, cache=None, hash_files=False):
+    """
+    Asset files of the scene and whether they exist. Reports a finished
+    AssetAudit, or gathers and checks the paths first when `audit` is None.
+    """
+    from .assets import AssetAudit, read_asset_refs
+    yield "\n--- Asset Audit ---"
+    if audit is None:
+        try:
+            audit = AssetAudit(read_asset_refs(_bulk_helpers_or_none()), safe_repr(rt.maxFilePath),
+                               cache, hash_files).run()
+        except Exception as e:
+            yield f"<unable to audit the scene's assets: {e}>"
+            yield ""
+            return
+
+    missing = audit.missing()
+    unreadable = [key for key in missing if audit.results[key][4]]
+    yield (f"Files: {len(audit.files):,} referenced by {len(audit.refs):,} properties   "
+           f"Missing: {len(missing) - len(unreadable):,}   Unreadable: {len(unreadable):,}   "
+           f"Total size: {audit.total_size() / 1e6:,.1f} MB")
+    for key in missing:
+        error = audit.results[key][4]
+        yield f"  {'UNREADABLE' if error else 'MISSING'}: {audit.files[key][0]}" + (f" ({error})" if error else "")
+        owners = audit.owners(key)
+        for owner in owners[:5]:
+            yield f"      used by {owner}"
+        if len(owners) > 5: yield f"      ... and {len(owners) - 5:,} more"
+
+    largest = audit.largest()
+    if largest:
+        yield "\nLargest files:"
+        for size, path in largest:
+            yield f"  {size / 1e6:,.1f} MB  {path}"
+    if audit.hash_files:
+        groups = audit.duplicates()
+        yield f"\nSame content under different paths: {len(groups):,} groups"
+        for paths in groups[:20]:
+            yield "  " + "  |  ".join(paths)
+    yield (f"\n(checked in {audit.elapsed:.2f}s: {audit.from_cache:,} from cache, "
+           f"{len(audit.files) - audit.from_cache:,} on disk, {audit.hashed:,} hashed)")
+    yield ""
+
+# --- V5.9: PARANOID MODE ---
+def inspect_file_info():
+    yield "\n--- File Info ---"
+    try:
+        try: yield f"Filename: {safe_repr(rt.filename)}"
+        except Exception: yield f"Filename: {safe_repr(rt.maxFileName)}"  # Fallback
+    except Exception: yield "Filename: <failed to get>"
+    yield ""
+
+def inspect_units(): yield "\n--- Units Setup ---"; yield safe_repr(rt.units); yield ""
+
+def inspect_selection_sets():
+    yield "\n--- Selection Sets ---"
+    for s in rt.selectionSets: yield safe_repr(s)
+    yield ""
+
+def inspect_plugins():
+    yield "\n--- Plugins / Classes (short) ---"
+    for c in rt.pluginClasses: yield safe_repr(c)
+    yield ""
+
+def inspect_environment(): yield "\n--- Environment / EnvironmentMap ---"; yield f"EnvMap: {safe_repr(rt.environmentMap)}"; yield ""
+def inspect_current_renderer(): yield "\n--- Renderer.Current ---"; yield safe_repr(rt.renderers.current); yield ""
+
+# --- SYSTEM INSPECTORS (V5.10) ---
+def inspect_gw(read_properties=property_snapshot):
+    yield "\n--- GW (Graphics Window) ---"
+    try:
+        for p, t, rep in read_properties(rt.gw):
+            if t is None:
+                yield f"{p} = <unreadable>"
+            else:
+                yield f"{p} ({t}) = {rep}"
+    except Exception as e:
+        yield f"Error reading rt.gw properties: {e}"
+    yield ""
+
+def inspect_callbacks(read_properties=property_snapshot):
+    yield "\n--- Callbacks ---"
+    try:
+        yield "Listing callback items (use 'callbacks.show()' in Listener for details):"
+        for p, t, rep in read_properties(rt.callbacks):
+            if t is None:
+                yield f".{p} = <unreadable>"
+            else:
+                yield f".{p} = {rep}"
+    except Exception as e:
+        yield f"Error reading rt.callbacks: {e}"
+    yield ""
+
+# --- V5.9: PARANOID MODE ---
+def inspect_viewports():
+    yield "\n--- Viewports ---"
+    try:
+        try: yield f"Active Viewport Index: {rt.viewport.activeViewport}"
+        except Exception: yield "Active Viewport Index: <failed>"
+        try: yield f"Layout: {rt.viewport.layout}"
+        except Exception: yield "Layout: <failed>"
+
+        try:
+            num_vps = rt.viewport.GetNumViewports()  # Modern, safer method
+        except Exception:
+            yield "Number of Viewports: <failed to get count>"
+            yield ""
+            return
+
+        yield f"Number of Viewports: {num_vps}"
+
+        for i in range(1, num_vps + 1):
+            yield f"\n--- Viewport {i} ---"
+            try: yield f"Type: {rt.viewport.getType(index=i)}"
+            except Exception: yield "Type: <failed>"
+            try: yield f"Camera: {safe_repr(rt.viewport.getCamera(index=i))}"
+            except Exception: yield "Camera: <failed>"
+            try: yield f"Shading: {rt.viewport.getShading(index=i)}"
+            except Exception: yield "Shading: <failed>"
+            try: yield f"Is Wireframe: {rt.viewport.isWireframe(index=i)}"
+            except Exception: yield "Is Wireframe: <failed>"
+
+    except Exception as e:
+        yield f"Error reading rt.viewport: {e}"
+    yield ""
+
+# --- V5.10: Using Functions instead of Properties ---
+def inspect_material_editor(read_properties=property_snapshot):
+    yield "\n--- Material Editor (MEdit / SME) ---"
+    try:
+        yield "--- Compact Material Editor (rt.matEditor) ---"
+        active_slot_index = 1  # Default to 1
+        try:
+            yield f"Is Open: {rt.matEditor.isOpen()}"
+        except Exception: yield "Is Open: <failed>"
+        try:
+            active_slot_index = rt.matEditor.GetActiveSlot()  # <-- V5.10 FIX
+            yield f"Active Slot Index: {active_slot_index}"
+        except Exception: yield f"Active Slot Index: <failed, assuming 1>"
+
+        yield "\n--- Slate Material Editor (rt.sme) ---"
+        try: yield f"Is Open: {rt.sme.isOpen()}"
+        except Exception: yield "Is Open: <failed>"
+        try:
+            active_view = rt.sme.GetActiveView()  # <-- V5.10 FIX
+            yield f"Active View Name: {active_view.name if active_view else 'None'}"
+        except Exception: yield "Active View Name: <failed>"
+
+        yield f"\n--- Active Material (from Compact Slot {active_slot_index}) ---"
+        try:
+            active_mat = rt.matEditor.GetMtl(active_slot_index)  # Use the index we found
+            yield f"Material: {safe_repr(active_mat)}"
+
+            if active_mat:
+                yield "--- Properties of Active Material ---"
+                for p, t, rep in read_properties(active_mat):
+                    if t is None:
+                        yield f"{p} = <unreadable>"
+                    else:
+                        yield f"{p} ({t}) = {rep}"
+        except Exception:
+            yield "Could not get active material slot."
+
+    except Exception as e:
+        yield f"Error reading Material Editor properties: {e}"
+    yield ""
+
+# --- V5.9: PARANOID MODE ---
+def inspect_render_settings():
+    yield "\n--- Render Settings ---"
+    try:
+        yield f"Range: {safe_repr(rt.renderSceneDialog.timeType)}"
+    except Exception:
+        yield "Range: (Attribute 'timeType' not found)"
+    try:
+        yield f"W: {safe_repr(rt.renderWidth)} H: {safe_repr(rt.renderHeight)}"
+    except Exception:
+        yield "W/H: (Attributes 'renderWidth/Height' not found)"
+    yield ""
+
+# --- V5.9: PARANOID MODE ---
+def inspect_color_mgmt():
+    yield "\n--- Color / Exposure Management ---"
+    try:
+        yield safe_repr(rt.colorManager)
+    except Exception:
+        yield "(Attribute 'colorManager' not found)"
+    yield ""
@@ -0,0 +1,319 @@
+"""
+Mesh geometry of a node as NumPy arrays and vectorized topology stats.
+The mesh is written to a packed binary file (one writeMesh call) and
+memory-mapped, so stats over very large meshes walk it in fixed-size
+chunks instead of loading it. NumPy is imported on first use.
+"""
+import array
+import mmap
+import os
+import sys
+import tempfile
+
+from . import stats
+from .runtime import rt, safe_repr
+
+np = None  # numpy, once _require_numpy() has imported it
+
+# --- MESH BUFFER ---
+# Memory: the packed mesh stays in the (page-cached) temp file; stats keep
+# only per-vertex arrays (~13 bytes per vertex: component labels, the
+# used-vertex mask and per-element face counts), one chunk of faces at a
+# time and one UV coverage grid, so a 10M-triangle mesh needs a few
+# hundred MB of disk and well under that in memory.
+MESH_CHUNK_FACES = 1 << 17  # faces per vectorized chunk (~30 MB of temporaries)
+MESH_UV_RESOLUTION = 2048  # texels per side of the UV coverage grid
+MESH_UV_SAMPLES_PER_BATCH = 1 << 19  # texel-center tests per UV rasterization batch (~100 bytes each)
+MESH_FALLBACK_WRITE_CHUNK = 65536  # values per file write on the per-vertex path
+_UV_SAMPLE_OFFSET = (0.5 + 1e-4 * 3.14159, 0.5 + 1e-4 * 2.71828)  # off-center so grid-aligned edges miss samples
+
+def _require_numpy():
+    global np
+    if not stats.numpy_available():
+        raise RuntimeError("Geometry needs NumPy (pip install numpy for 3ds Max's Python)")
+    np = stats.np
+
+def _write_values(f, typecode, values):
+    buf = array.array(typecode, values)
+    if sys.byteorder != "little":
+        buf.byteswap()
+    buf.tofile(f)
+
+def write_mesh_per_vertex(handle, path):
+    """
+    The per-vertex fallback of writeMesh: same file and result string,
+    several pymxs calls per vertex, face and map value.
+    """
+    node = rt.getAnimByHandle(handle)
+    try: m = rt.snapshotAsMesh(node)
+    except Exception: return ""
+    if m is None:
+        return ""
+    try:
+        nv, nf = int(rt.getNumVerts(m)), int(rt.getNumFaces(m))
+        info = [f"{nv} {nf}"]
+        with open(path, "wb") as f:
+            def write_points(count, read, typecode, offset=0):
+                values = []
+                for i in range(1, count + 1):
+                    p = read(i)
+                    values += (p.x + offset, p.y + offset, p.z + offset) if offset else (p.x, p.y, p.z)
+                    if len(values) >= MESH_FALLBACK_WRITE_CHUNK:
+                        _write_values(f, typecode, [int(v) for v in values] if typecode == "i" else values)
+                        values = []
+                _write_values(f, typecode, [int(v) for v in values] if typecode == "i" else values)
+
+            write_points(nv, lambda i: rt.getVert(m, i), "f")
+            write_points(nf, lambda i: rt.getFace(m, i), "i", -1)
+            write_points(nv, lambda i: rt.getNormal(m, i), "f")
+            meshop = rt.meshop
+            for ch in range(1, int(meshop.getNumMaps(m))):
+                if not meshop.getMapSupport(m, ch):
+                    continue
+                nmv, nmf = int(meshop.getNumMapVerts(m, ch)), int(meshop.getNumMapFaces(m, ch))
+                write_points(nmv, lambda i: meshop.getMapVert(m, ch, i), "f")
+                write_points(nmf, lambda i: meshop.getMapFace(m, ch, i), "i", -1)
+                info.append(f"{ch}:{nmv}:{nmf}")
+    finally:
+        try: rt.delete(m)
+        except Exception: pass
+    return " ".join(info)
+
+class MeshBuffer:
+    """
+    Read-only NumPy views over a packed mesh file written by writeMesh:
+    `verts` and `normals` (n, 3) float32, `faces` (n, 3) int32 and, per map
+    channel, `map_verts[ch]` and `map_faces[ch]`. The views are backed by
+    a memory map, so nothing is read until it is used. Requires NumPy.
+    """
+    def __init__(self, path, info):
+        _require_numpy()
+        self.path = path
+        fields = str(info).split()
+        self.num_verts, self.num_faces = int(fields[0]), int(fields[1])
+        self.channels = [tuple(int(x) for x in field.split(":")) for field in fields[2:]]  # (channel, verts, faces)
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._offset = 0
+        self.verts = self._take(np.float32, self.num_verts)
+        self.faces = self._take(np.int32, self.num_faces)
+        self.normals = self._take(np.float32, self.num_verts)
+        self.map_verts, self.map_faces = {}, {}
+        for ch, nmv, nmf in self.channels:
+            self.map_verts[ch] = self._take(np.float32, nmv)
+            self.map_faces[ch] = self._take(np.int32, nmf)
+
+    def _take(self, dtype, rows):
+        count = rows * 3
+        view = np.frombuffer(self._map, dtype=np.dtype(dtype).newbyteorder("<"), count=count,
+                             offset=self._offset).reshape(rows, 3)
+        self._offset += count * 4
+        return view
+
+    @classmethod
+    def read(cls, handle, helpers=None):
+        """
+        Writes the mesh of node `handle` to a temp file (one writeMesh call,
+        or per-vertex calls without the bulk helpers) and maps it. Returns
+        None for nodes without a mesh. close() deletes the file.
+        """
+        _require_numpy()
+        fd, path = tempfile.mkstemp(prefix="max_inspector_", suffix=".mesh")
+        os.close(fd)
+        try:
+            if helpers is not None:
+                info = safe_repr(helpers.writeMesh(handle, path))
+            else:
+                info = write_mesh_per_vertex(handle, path)
+            if not info:
+                os.remove(path)
+                return None
+            buffer = cls(path, info)
+        except Exception:
+            try: os.remove(path)
+            except OSError: pass
+            raise
+        buffer._owns_file = True
+        return buffer
+
+    def close(self):
+        """Drops the views and unmaps the file (deleting it if read() created it)."""
+        self.verts = self.faces = self.normals = None
+        self.map_verts, self.map_faces = {}, {}
+        try:
+            if isinstance(self._map, mmap.mmap):
+                self._map.close()
+        except BufferError:
+            pass  # a caller still holds a view; the map closes when it is collected
+        self._file.close()
+        if getattr(self, "_owns_file", False):
+            try: os.remove(self.path)
+            except OSError: pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# --- MESH STATS ---
+def _corner_reduce(ufunc, a):
+    """ufunc over the 3 entries of axis 1; much faster than a.min(axis=1) and friends on such a short axis."""
+    return ufunc(ufunc(a[:, 0], a[:, 1]), a[:, 2])
+
+def _face_chunks(faces, count, chunk_size):
+    """(start, valid faces, invalid count) per chunk; faces with an index outside [0, count) are dropped."""
+    for start in range(0, len(faces), chunk_size):
+        f = np.asarray(faces[start:start + chunk_size])
+        inside = (f >= 0) & (f < count)
+        valid = inside[:, 0] & inside[:, 1] & inside[:, 2]
+        yield start, (f if valid.all() else f[valid]), int(len(f) - valid.sum())
+
+def component_labels(faces, count, chunk_size=MESH_CHUNK_FACES):
+    """
+    Connected components of the triangles `faces` over `count` vertices:
+    returns an int32 array giving each vertex the smallest vertex index of
+    its component. Vectorized union-find, one pass over the faces per
+    round: each face hooks the roots of its corners onto the smallest of
+    them, then pointer jumping flattens the trees. Labels only ever point
+    at smaller indices, so a hook lost to a concurrent write in the same
+    chunk is redone next round, and every round removes at least the
+    largest root of each component still split, so memory stays at one
+    label per vertex.
+    """
+    labels = np.arange(count, dtype=np.int32)
+    while True:
+        changed = False
+        for _, f, _ in _face_chunks(faces, count, chunk_size):
+            corner = labels[f]
+            low = _corner_reduce(np.minimum, corner)
+            for c in range(3):
+                hook = corner[:, c] != low
+                if hook.any():
+                    changed = True
+                    labels[corner[hook, c]] = low[hook]
+        if not changed:
+            return labels
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+def _element_face_counts(faces, labels, chunk_size):
+    """Faces per component for the components that have faces, largest first."""
+    roots = np.flatnonzero(labels == np.arange(len(labels), dtype=labels.dtype))
+    element_of_root = np.full(len(labels), -1, dtype=np.int32)
+    element_of_root[roots] = np.arange(len(roots), dtype=np.int32)
+    counts = np.zeros(len(roots), dtype=np.int64)
+    for _, f, _ in _face_chunks(faces, len(labels), chunk_size):
+        counts += np.bincount(element_of_root[labels[f[:, 0]]], minlength=len(roots))
+    counts = counts[counts > 0]
+    return -np.sort(-counts)
+
+def _uv_coverage(uvs, faces, resolution, chunk_size):
+    """
+    Rasterizes the UV triangles (wrapped into the 0-1 tile) at texel
+    centers: returns a uint16 grid counting the faces that cover each texel.
+    """
+    grid = np.zeros(resolution * resolution, dtype=np.uint16)
+    for _, f, _ in _face_chunks(faces, len(uvs), chunk_size):
+        tri = uvs[f][:, :, :2].astype(np.float64) * resolution  # (n, 3, 2) in texels
+        lo = np.floor(_corner_reduce(np.minimum, tri)).astype(np.int64)
+        hi = np.floor(_corner_reduce(np.maximum, tri)).astype(np.int64)
+        size = np.minimum(hi - lo + 1, resolution)  # texels spanned (a full tile at most)
+        area = size[:, 0] * size[:, 1]
+        start = 0
+        while start < len(f):
+            # Batch faces so a batch tests at most MESH_UV_SAMPLES_PER_BATCH texel centers
+            end = start + max(1, int(np.searchsorted(np.cumsum(area[start:]), MESH_UV_SAMPLES_PER_BATCH)))
+            n = area[start:end]
+            face = np.repeat(np.arange(start, end), n)
+            k = np.arange(len(face)) - np.repeat(np.cumsum(n) - n, n)
+            x = lo[face, 0] + k % size[face, 0]
+            y = lo[face, 1] + k // size[face, 0]
+            px, py = x + _UV_SAMPLE_OFFSET[0], y + _UV_SAMPLE_OFFSET[1]
+            pos = neg = True
+            for a, b in ((0, 1), (1, 2), (2, 0)):
+                ax, ay = tri[face, a, 0], tri[face, a, 1]
+                edge = (tri[face, b, 0] - ax) * (py - ay) - (tri[face, b, 1] - ay) * (px - ax)
+                pos = pos & (edge >= 0)
+                neg = neg & (edge <= 0)
+            hit = pos | neg  # inside, for either winding
+            cells = (y[hit] % resolution) * resolution + (x[hit] % resolution)
+            texels, hits = np.unique(cells, return_counts=True)
+            grid[texels] = np.minimum(grid[texels].astype(np.int64) + hits, 65535)
+            start = end
+    return grid
+
+class MeshStats:
+    """
+    Vectorized topology stats of a MeshBuffer, computed chunk by chunk:
+    bounds, area, degenerate and invalid faces, isolated vertices, faces
+    against their vertex normals, elements, and per UV channel its
+    bounds, flipped and zero-area faces, shells and texel overlap.
+    """
+    def __init__(self, buffer, chunk_size=MESH_CHUNK_FACES, uv_resolution=MESH_UV_RESOLUTION):
+        _require_numpy()
+        self.num_verts, self.num_faces = buffer.num_verts, buffer.num_faces
+        verts, normals, nv = buffer.verts, buffer.normals, buffer.num_verts
+
+        self.bounds = None
+        for start in range(0, nv, chunk_size * 3):
+            chunk = np.asarray(verts[start:start + chunk_size * 3], dtype=np.float64)
+            lo, hi = chunk.min(axis=0), chunk.max(axis=0)
+            self.bounds = (lo, hi) if self.bounds is None else (np.minimum(self.bounds[0], lo),
+                                                                 np.maximum(self.bounds[1], hi))
+        scale = float(np.linalg.norm(self.bounds[1] - self.bounds[0])) if self.bounds is not None else 0.0
+        zero_area = (scale * 1e-7) ** 2
+
+        used = np.zeros(nv, dtype=bool)
+        self.area = 0.0
+        self.invalid_faces = self.repeated_index_faces = self.zero_area_faces = self.inverted_faces = 0
+        for _, f, invalid in _face_chunks(buffer.faces, nv, chunk_size):
+            self.invalid_faces += invalid
+            used[f.ravel()] = True
+            repeated = (f[:, 0] == f[:, 1]) | (f[:, 1] == f[:, 2]) | (f[:, 2] == f[:, 0])
+            self.repeated_index_faces += int(repeated.sum())
+            p = verts[f].astype(np.float64)
+            cross = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+            twice_area = np.einsum("ij,ij->i", cross, cross)
+            self.zero_area_faces += int((~repeated & (twice_area <= zero_area)).sum())
+            self.area += float(np.sqrt(twice_area).sum()) / 2.0
+            vertex_normals = _corner_reduce(np.add, normals[f].astype(np.float64))
+            self.inverted_faces += int((np.einsum("ij,ij->i", cross, vertex_normals) < 0).sum())
+        self.isolated_verts = int(nv - used.sum())
+        self.zero_normals = 0
+        for start in range(0, nv, chunk_size * 3):
+            nonzero = np.asarray(normals[start:start + chunk_size * 3]) != 0
+            self.zero_normals += int((~_corner_reduce(np.logical_or, nonzero)).sum())
+        del used
+
+        labels = component_labels(buffer.faces, nv, chunk_size)
+        self.element_faces = _element_face_counts(buffer.faces, labels, chunk_size)
+        del labels
+
+        self.uv = []  # (channel, verts, faces, bounds, flipped, zero area, shells, covered %, overlap %)
+        for ch, nmv, nmf in buffer.channels:
+            uvs, mfaces = buffer.map_verts[ch], buffer.map_faces[ch]
+            uv_bounds = None
+            if nmv:
+                uv = np.asarray(uvs[:, :2], dtype=np.float64)
+                uv_bounds = (uv.min(axis=0), uv.max(axis=0))
+                del uv
+            flipped = zero = 0
+            for _, f, _ in _face_chunks(mfaces, nmv, chunk_size):
+                t = uvs[f][:, :, :2].astype(np.float64)
+                signed = ((t[:, 1, 0] - t[:, 0, 0]) * (t[:, 2, 1] - t[:, 0, 1]) -
+                          (t[:, 1, 1] - t[:, 0, 1]) * (t[:, 2, 0] - t[:, 0, 0]))
+                flipped += int((signed < 0).sum())
+                zero += int((np.abs(signed) <= 1e-12).sum())
+            shells = len(_element_face_counts(mfaces, component_labels(mfaces, nmv, chunk_size), chunk_size))
+            grid = _uv_coverage(uvs, mfaces, uv_resolution, chunk_size)
+            covered, overlap = int((grid > 0).sum()), int((grid > 1).sum())
+            self.uv.append((ch, nmv, nmf, uv_bounds, flipped, zero, shells,
+                            100.0 * covered / grid.size, 100.0 * overlap / grid.size))
+
+    def elements(self):
+        return len(self.element_faces)
@@ -0,0 +1,165 @@
+"""Opt-in counting and timing of runtime calls, exported as Chrome traces."""
+import collections
+import contextlib
+import json
+import time
+
+from . import runtime
+
+# --- PROFILER ---
+# Opt-in: enable_profiling() points runtime.rt at a ProfiledRuntime, and
+# disable_profiling() puts the plain runtime back, so nothing is wrapped
+# or timed while profiling is off.
+PROFILE_MAX_EVENTS = 200000  # trace events kept; older ones are dropped
+PROFILED_STRUCTS = frozenset(["MaxInspectorBulk", "custAttributes", "LayerManager"])  # wrapped even if not callable
+_NO_SCOPE = contextlib.nullcontext()
+_profiler = None
+_unprofiled = None  # runtime override to restore when profiling stops
+
+class Profiler:
+    """
+    Counts and times the pymxs calls made through a ProfiledRuntime per
+    (scope, call), where the scope is the path of profile_scope() blocks
+    active at the time (inspector, job and scan phase), and keeps them as
+    Chrome trace events.
+    """
+    def __init__(self, max_events=PROFILE_MAX_EVENTS):
+        self._origin = time.perf_counter()
+        self._stack = []
+        self.calls = collections.defaultdict(lambda: [0, 0.0])  # (scope, call) -> [count, seconds]
+        self.scopes = collections.defaultdict(lambda: [0, 0.0])  # scope -> [entries, seconds]
+        self.events = collections.deque(maxlen=max_events)  # (name, category, scope, start, seconds)
+
+    def reset(self):
+        self.calls.clear()
+        self.scopes.clear()
+        self.events.clear()
+
+    @property
+    def current_scope(self):
+        return self._stack[-1] if self._stack else "(no inspector)"
+
+    @contextlib.contextmanager
+    def scope(self, name):
+        path = f"{self._stack[-1]} / {name}" if self._stack else name
+        self._stack.append(path)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            entry = self.scopes[path]
+            entry[0] += 1
+            entry[1] += seconds
+            self.events.append((name, "scope", path, start, seconds))
+
+    def record(self, call, start, seconds):
+        scope = self.current_scope
+        entry = self.calls[(scope, call)]
+        entry[0] += 1
+        entry[1] += seconds
+        self.events.append((call, "pymxs", scope, start, seconds))
+
+    def summary(self):
+        """[(scope, seconds, [(call, count, seconds), ...]), ...], slowest scope and call first."""
+        by_scope = collections.defaultdict(list)
+        for (scope, call), (count, seconds) in self.calls.items():
+            by_scope[scope].append((call, count, seconds))
+        rows = []
+        for scope in set(by_scope) | set(self.scopes):
+            calls = sorted(by_scope.get(scope, []), key=lambda c: -c[2])
+            seconds = self.scopes[scope][1] if scope in self.scopes else sum(c[2] for c in calls)
+            rows.append((scope, seconds, calls))
+        return sorted(rows, key=lambda r: -r[1])
+
+    def write_chrome_trace(self, path):
+        """Writes the recorded events as Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+        events = [{"name": name, "cat": category, "ph": "X", "pid": 1, "tid": 1,
+                   "ts": round((start - self._origin) * 1e6, 3), "dur": round(seconds * 1e6, 3),
+                   "args": {"scope": scope}}
+                  for name, category, scope, start, seconds in self.events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+class _ProfiledValue:
+    """A callable runtime value (function, struct, class) whose calls are timed."""
+    __slots__ = ("_value", "_name", "_profiler")
+
+    def __init__(self, value, name, profiler):
+        self._value = value
+        self._name = name
+        self._profiler = profiler
+
+    def __call__(self, *args, **kwargs):
+        args = [_unwrap(a) for a in args]
+        kwargs = {k: _unwrap(v) for k, v in kwargs.items()}
+        start = time.perf_counter()
+        try:
+            return self._value(*args, **kwargs)
+        finally:
+            self._profiler.record(self._name, start, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        value = getattr(self._value, name)
+        if value is None or not callable(value):
+            return value
+        return _ProfiledValue(value, f"{self._name}.{name}", self._profiler)
+
+    def __iter__(self): return iter(self._value)
+    def __len__(self): return len(self._value)
+    def __getitem__(self, key): return self._value[key]
+    def __bool__(self): return bool(self._value)
+    def __str__(self): return str(self._value)
+    def __repr__(self): return repr(self._value)
+    def __hash__(self): return hash(self._value)
+
+    def __eq__(self, other):
+        return self._value == _unwrap(other)
+
+def _unwrap(value):
+    """The runtime value behind a _ProfiledValue, so pymxs never sees the wrapper."""
+    return value._value if type(value) is _ProfiledValue else value
+
+class ProfiledRuntime:
+    """
+    Stands in for pymxs.runtime while profiling: calls through it are
+    counted and timed, and reads of runtime globals are timed as
+    'rt.<name>'. Values are otherwise handed through unchanged.
+    """
+    def __init__(self, runtime, profiler):
+        self._runtime = runtime
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        start = time.perf_counter()
+        value = getattr(self._runtime, name)
+        if value is None or not (callable(value) or name in PROFILED_STRUCTS):
+            self._profiler.record(f"rt.{name}", start, time.perf_counter() - start)
+            return value
+        return _ProfiledValue(value, name, self._profiler)
+
+def enable_profiling(profiler=None):
+    """Routes `rt` through a ProfiledRuntime and returns the Profiler collecting the calls."""
+    global _profiler, _unprofiled
+    if _profiler is None:
+        _unprofiled = runtime.runtime_override()
+    _profiler = profiler or _profiler or Profiler()
+    target = runtime.pymxs_runtime() if _unprofiled is None else _unprofiled
+    runtime.set_runtime(ProfiledRuntime(target, _profiler))
+    return _profiler
+
+def disable_profiling():
+    global _profiler, _unprofiled
+    if _profiler is not None:
+        runtime.set_runtime(_unprofiled)
+    _profiler = _unprofiled = None
+
+def active_profiler():
+    """The Profiler recording calls, or None while profiling is off."""
+    return _profiler
+
+def profile_scope(name):
+    """Context manager attributing the calls inside it to `name`; a no-op while profiling is off."""
+    return _NO_SCOPE if _profiler is None else _profiler.scope(name)
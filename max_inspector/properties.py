@@ -0,0 +1,157 @@
+"""Property reads of runtime values: per-class schema cache and bulk snapshots."""
+import collections
+
+from .bulk import get_bulk_helpers, parse_bulk_records
+from .runtime import rt, get_type_name, safe_repr
+
+# --- PROPERTY SCHEMA CACHE ---
+PROPERTY_SCHEMA_CACHE_SIZE = 256  # classes kept before the least recently used is dropped
+
+# Python types pymxs converts MAXScript values to; the MAXScript class of such
+# a value only depends on the Python type.
+_PRIMITIVE_TYPES = (bool, int, float, str, type(None))
+# Wrapped MAXScript value classes a parameter keeps for its whole life; only
+# reference-typed parameters (maps, materials, nodes...) can change class.
+_FIXED_VALUE_TYPES = frozenset(["Point2", "Point3", "Point4", "Color", "Matrix3", "Quat",
+                                "EulerAngles", "AngleAxis", "Box2", "Box3", "Ray", "Interval",
+                                "Name", "BitArray", "Time"])
+
+class PropertySchema:
+    """Property names of one class plus the last-seen type of each property value."""
+    __slots__ = ("names", "labels", "types")
+
+    def __init__(self, names):
+        self.names = names  # MAXScript names, passed back to getProperty
+        self.labels = [safe_repr(n) for n in names]
+        self.types = [None] * len(names)  # (python type, MAXScript class name)
+
+# One MAXScript call per schema key. Defined on its own rather than in the
+# MaxInspectorBulk struct, since the schema cache is the fallback for when
+# the bulk helpers cannot run. "" for scripted plugin instances, whose
+# parameters can be redefined without any part of the key changing, and
+# for values without a class ID.
+_MXS_SCHEMA_KEY_SOURCE = r"""
+fn MaxInspectorSchemaKey v =
+(
+    if (try (isMSPlugin v) catch true) then "" else
+    (
+        local cls = classOf v
+        local key = try ((superClassOf v) as string + "|" + cls as string + "|" + (cls.classID as string)) catch ""
+        if key != "" do
+        (
+            local owners = #(v)
+            if isValidNode v do append owners v.baseObject
+            try
+            (
+                if isMSCustAttrib v do key += "|" + ((getHashValue (custAttributes.getDefSource cls) 0) as string)
+                for o in owners do
+                (
+                    local defs = custAttributes.getDefs o
+                    if defs != undefined do
+                        for d in defs do key += "|" + ((getHashValue (custAttributes.getDefSource d) 0) as string)
+                )
+            )
+            catch (key = "")
+        )
+        key
+    )
+)
+"""
+
+class PropertySchemaCache:
+    """
+    LRU cache of property schemas keyed on the schema_key() of a value
+    (class, classID and custom attribute definition hashes), so a value of
+    a known class only needs getProperty per property: no getPropNames,
+    and no classOf for values whose class cannot change. A redefined
+    custom attribute changes the key; scripted plugin instances and values
+    without a key are read uncached.
+    """
+    def __init__(self, max_classes=PROPERTY_SCHEMA_CACHE_SIZE):
+        self._schemas = collections.OrderedDict()
+        self._max_classes = max_classes
+        self._key_fn = None  # MaxInspectorSchemaKey once defined, False if that failed
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._schemas)
+
+    def invalidate(self):
+        self._schemas.clear()
+        self._key_fn = None
+
+    def schema_key(self, value):
+        """
+        "superclass|class|classID" of `value`, plus a hash of the source of
+        every custom attribute definition on it (and on a node's base
+        object), from one MaxInspectorSchemaKey call; None for scripted
+        plugin instances, values without a class ID, or when the function
+        cannot be defined.
+        """
+        try:
+            if self._key_fn is None:
+                self._key_fn = False  # until it is defined; a failed definition is not retried before invalidate()
+                rt.execute(_MXS_SCHEMA_KEY_SOURCE)
+                self._key_fn = rt.MaxInspectorSchemaKey
+            if self._key_fn is False:
+                return None
+            return str(self._key_fn(value)) or None
+        except Exception:
+            return None
+
+    def schema_for(self, value):
+        """Returns the cached schema of `value`, reading its property names on a miss."""
+        key = self.schema_key(value)
+        schema = self._schemas.get(key) if key else None
+        if schema is not None:
+            self._schemas.move_to_end(key)
+            self.hits += 1
+            return schema
+        self.misses += 1
+        try: names = list(rt.getPropNames(value))
+        except Exception: names = []
+        schema = PropertySchema(names)
+        if key:
+            self._schemas[key] = schema
+            if len(self._schemas) > self._max_classes:
+                self._schemas.popitem(last=False)
+        return schema
+
+    def read(self, value):
+        """
+        Returns (name, type name, value text) for every property of `value`;
+        type name and value text are None for a property that cannot be read.
+        """
+        schema = self.schema_for(value)
+        types = schema.types
+        get_property = rt.getProperty
+        result = []
+        for i, (name, label) in enumerate(zip(schema.names, schema.labels)):
+            try:
+                val = get_property(value, name)
+            except Exception:
+                result.append((label, None, None))
+                continue
+            py_type, seen = types[i] or (None, None)
+            if py_type is type(val) and (py_type in _PRIMITIVE_TYPES or seen in _FIXED_VALUE_TYPES):
+                type_name = seen
+            else:
+                type_name = get_type_name(val)
+                types[i] = (type(val), type_name)
+            result.append((label, type_name, safe_repr(val)))
+        return result
+
+def property_snapshot(value, schema_cache=None):
+    """
+    Returns (name, type name, value text) for every property of `value` from
+    a single MaxInspectorBulk.propSnapshot() call; type name and value text
+    are None for a property that cannot be read. Falls back to per-property
+    reads through `schema_cache` when the bulk helper cannot run.
+    """
+    try:
+        text = get_bulk_helpers().propSnapshot(value)
+    except Exception:
+        return schema_cache.read(value) if schema_cache is not None else []
+    return [(f[0], f[1], f[2]) if len(f) >= 3 else (f[0], None, None)
+            for f in parse_bulk_records(text)]
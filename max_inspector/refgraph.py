@@ -0,0 +1,101 @@
+"""Reference graph walks of nodes, materials, maps, modifiers and controllers."""
+from .bulk import parse_bulk_records, parse_mxs_int
+from .runtime import rt, get_type_name, safe_repr
+
+# --- REFERENCE GRAPH ---
+REF_GRAPH_MAX_DEPTH = 8
+
+class RefGraphWalker:
+    """
+    Reference graph of nodes, materials, maps, modifiers and controllers,
+    keyed on anim handle. Children are memoized per handle and fetched for
+    a whole level of a walk in one refChildren call, so an anim shared by
+    many parents is read once and a walk is linear in the number of
+    distinct anims; the visited set also ends cycles.
+    """
+    def __init__(self, helpers=None):
+        self._helpers = helpers
+        self._children = {}
+        self.fetches = 0  # refChildren calls (or per-anim fallbacks) so far
+
+    def children(self, handle):
+        """[(child handle, slot, class, superclass, name), ...] of one anim."""
+        if handle not in self._children:
+            self.prefetch([handle])
+        return self._children[handle]
+
+    def prefetch(self, handles):
+        """Reads the children of every handle not read yet, in one call."""
+        missing = [h for h in dict.fromkeys(handles) if h not in self._children]
+        if not missing:
+            return
+        self.fetches += 1
+        for h in missing:
+            self._children[h] = []
+        if self._helpers is not None:
+            for parent, child, slot, cls, superclass, name in parse_bulk_records(self._helpers.refChildren(missing)):
+                self._children[parse_mxs_int(parent)].append((parse_mxs_int(child), slot, cls, superclass, name))
+        else:
+            for h in missing:
+                self._children[h] = self._children_per_anim(h)
+
+    def walk(self, root, max_depth=REF_GRAPH_MAX_DEPTH):
+        """
+        Returns the graph below `root` in depth-first order as (depth,
+        handle, slot, class, superclass, name, first) tuples, down to
+        `max_depth` levels. An anim is descended into only at its first
+        occurrence (`first` is False for the others).
+        """
+        # Breadth-first prefetch: one call per level for all new anims
+        seen = {root}
+        level = [root]
+        for _ in range(max_depth):
+            self.prefetch(level)
+            level = [c[0] for h in level for c in self._children[h] if c[0] not in seen]
+            seen.update(level)
+            if not level:
+                break
+
+        entries = []
+        visited = {root}
+        def visit(handle, depth):
+            for child in self.children(handle):
+                first = child[0] not in visited
+                visited.add(child[0])
+                entries.append((depth,) + child + (first,))
+                if first and depth < max_depth:
+                    visit(child[0], depth + 1)
+        visit(root, 1)
+        return entries
+
+    def _children_per_anim(self, handle):
+        # Fallback without the bulk helpers: several pymxs calls per child
+        v = rt.getAnimByHandle(handle)
+        if v is None:
+            return []
+        refs = []
+        def add(slot, child):
+            if child is not None:
+                try: name = safe_repr(child.name)
+                except Exception: name = get_type_name(child)
+                refs.append((int(rt.getHandleByAnim(child)), slot, get_type_name(child),
+                             safe_repr(rt.superClassOf(child)), name))
+        try:
+            if rt.isValidNode(v):
+                add("Object", v.baseObject)
+                add("Material", v.material)
+                for i, m in enumerate(v.modifiers, 1):
+                    add(f"Modifier {i}", m)
+                add("Transform", v.controller)
+            elif safe_repr(rt.superClassOf(v)) in ("material", "textureMap"):
+                for i in range(1, rt.getNumSubMtls(v) + 1):
+                    add(safe_repr(rt.getSubMtlSlotName(v, i)), rt.getSubMtl(v, i))
+                for i in range(1, rt.getNumSubTexmaps(v) + 1):
+                    add(safe_repr(rt.getSubTexmapSlotName(v, i)), rt.getSubTexmap(v, i))
+            else:
+                for i in range(1, v.numSubs + 1):
+                    sub = rt.getSubAnim(v, i)
+                    add(safe_repr(sub.name), sub.controller)
+        except Exception:
+            pass
+        return refs
@@ -0,0 +1,125 @@
+"""
+Per-node cache of inspector results: the report lines of each section of
+OBJECT_INSPECTORS, kept until a node change callback says the node
+changed in a way that section shows.
+"""
+import collections
+import sys
+
+# --- TUNING ---
+INSPECTION_CACHE_MAX_BYTES = 64 << 20  # report text kept before the least recently inspected nodes go
+
+# NodeEventCallback events by the kind of change they report. Custom
+# attribute edits reach the node as model events (attributes on the base
+# object and modifiers) or controller events (attributes on controllers).
+NODE_CHANGE_EVENTS = {
+    "parameters": ("geometryChanged", "topologyChanged", "mappingChanged", "extentionChannelChanged",
+                   "modelOtherEvent"),
+    "modifiers": ("modelStructured",),
+    "transform": ("controllerStructured", "controllerOtherEvent"),
+    "material": ("materialStructured", "materialOtherEvent"),
+    "user_properties": ("userPropertiesChanged",),
+    "name": ("nameChanged",),
+    "node": ("wireColorChanged", "renderPropertiesChanged", "displayPropertiesChanged",
+             "propertiesOtherEvent", "hideChanged", "freezeChanged", "linkChanged", "layerChanged",
+             "groupChanged", "hierarchyOtherEvent"),
+}
+NODE_CHANGE_KINDS = frozenset(NODE_CHANGE_EVENTS)
+
+# The change kinds each section of OBJECT_INSPECTORS shows. Every section
+# heading names the node; "Properties" lists the node's own properties,
+# which cover all kinds.
+SECTION_CHANGE_KINDS = {
+    "Properties": NODE_CHANGE_KINDS,
+    "Material": frozenset(["name", "material"]),
+    "Modifiers": frozenset(["name", "modifiers", "parameters"]),
+    "Controllers": frozenset(["name", "transform"]),
+    "Methods": frozenset(["name", "modifiers"]),  # a collapsed stack can change the base object class
+    "Class Info": frozenset(["name", "modifiers"]),
+    "Base Params": frozenset(["name", "modifiers", "parameters"]),
+    "Custom Attributes": frozenset(["name", "modifiers", "parameters", "transform", "node"]),
+    "User Properties": frozenset(["name", "user_properties", "node"]),
+}
+# Sections whose values do not depend on the time slider
+TIMELESS_SECTIONS = frozenset(["Methods", "Class Info", "User Properties"])
+
+def _lines_size(lines):
+    return sys.getsizeof(lines) + sum(sys.getsizeof(line) for line in lines)
+
+class InspectionCache:
+    """
+    LRU cache of report lines by (anim handle, section). Each entry is
+    stored with the time it was computed at, so animated sections are
+    recomputed after the time slider moves. invalidate() drops only the
+    sections that show the reported kind of change; the least recently
+    inspected nodes are dropped once the lines take more than `max_bytes`.
+    """
+    def __init__(self, max_bytes=INSPECTION_CACHE_MAX_BYTES):
+        self._nodes = collections.OrderedDict()  # handle -> {section: (time, lines, size)}
+        self._max_bytes = max_bytes
+        self.size = 0  # approximate bytes held
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def get(self, handle, section, time=None):
+        """The cached lines of `section` for node `handle` at `time`, or None."""
+        node = self._nodes.get(handle)
+        entry = node.get(section) if node is not None else None
+        if entry is None or (entry[0] != time and section not in TIMELESS_SECTIONS):
+            self.misses += 1
+            return None
+        self._nodes.move_to_end(handle)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, handle, section, time, lines):
+        """Caches `lines` (a list) for one section of a node; returns them."""
+        size = _lines_size(lines)
+        if size > self._max_bytes:
+            return lines  # would evict everything else
+        node = self._nodes.setdefault(handle, {})
+        self._nodes.move_to_end(handle)
+        old = node.get(section)
+        if old is not None:
+            self.size -= old[2]
+        node[section] = (time, lines, size)
+        self.size += size
+        while self.size > self._max_bytes:
+            _, evicted = self._nodes.popitem(last=False)
+            self.size -= sum(entry[2] for entry in evicted.values())
+        return lines
+
+    def invalidate(self, handles, kind):
+        """Drops the cached sections that show a `kind` change of any of `handles`."""
+        for handle in handles:
+            node = self._nodes.get(handle)
+            if node is None:
+                continue
+            for section in [s for s in node if kind in SECTION_CHANGE_KINDS.get(s, NODE_CHANGE_KINDS)]:
+                self.size -= node.pop(section)[2]
+            if not node:
+                del self._nodes[handle]
+
+    def discard(self, handles):
+        """Drops every section of `handles` (deleted nodes)."""
+        for handle in handles:
+            node = self._nodes.pop(handle, None)
+            if node is not None:
+                self.size -= sum(entry[2] for entry in node.values())
+
+    def discard_section(self, section):
+        """Drops one section of every node (e.g. Class Info after the class list is rebuilt)."""
+        for handle in list(self._nodes):
+            node = self._nodes[handle]
+            entry = node.pop(section, None)
+            if entry is not None:
+                self.size -= entry[2]
+                if not node:
+                    del self._nodes[handle]
+
+    def clear(self):
+        self._nodes.clear()
+        self.size = 0
@@ -0,0 +1,81 @@
+"""
+The 3ds Max runtime every module calls through, plus small helpers for
+turning runtime values into text.
+
+`rt` forwards to pymxs.runtime, which is imported on first use, so the
+package imports without 3ds Max. set_runtime() points it at another
+object instead: a fake runtime in tests, or the ProfiledRuntime while
+profiling.
+"""
+_runtime = None  # set_runtime() override
+_pymxs_runtime = None
+
+def pymxs_runtime():
+    """pymxs.runtime, imported on first use."""
+    global _pymxs_runtime
+    if _pymxs_runtime is None:
+        import pymxs
+        _pymxs_runtime = pymxs.runtime
+    return _pymxs_runtime
+
+class _RuntimeProxy:
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(pymxs_runtime() if _runtime is None else _runtime, name)
+
+    def __repr__(self):
+        return f"<runtime proxy for {pymxs_runtime() if _runtime is None else _runtime!r}>"
+
+rt = _RuntimeProxy()
+
+def set_runtime(runtime):
+    """Routes `rt` to `runtime`; None goes back to pymxs.runtime."""
+    global _runtime
+    _runtime = runtime
+
+def runtime_override():
+    """The object set_runtime() installed, or None while `rt` is pymxs.runtime."""
+    return _runtime
+
+def attime(t):
+    """pymxs.attime(t): evaluates controller values at time t inside the with block."""
+    import pymxs
+    return pymxs.attime(t)
+
+def safe_repr(val):
+    try:
+        s = str(val)
+        # More robust check for maxscript 'undefined'
+        if s in ("undefined", "<undefined>", "Undef"):
+            return ""
+        return s
+    except Exception:
+        return "<unreadable>"
+
+def get_type_name(val):
+    try:
+        try:
+            cls = rt.classOf(val)
+            return str(cls)
+        except Exception:
+            return type(val).__name__
+    except Exception:
+        return "unknown"
+
+def try_classid(obj):
+    try:
+        try:
+            cid = rt.classID(obj)
+            return safe_repr(cid)
+        except Exception:
+            pass
+        try:
+            cid = getattr(obj, "classID", None)
+            if cid is not None:
+                return safe_repr(cid)
+        except Exception:
+            pass
+    except Exception:
+        pass
+    return "<unknown>"
@@ -0,0 +1,186 @@
+"""Class scan of the superclass categories and the plugin fingerprint of a scan."""
+import os
+
+from .bulk import parse_bulk_records
+from .runtime import rt, safe_repr
+
+# --- CLASS SCAN ---
+def iter_scan_category_per_class(superclass_name, superclass, rows, failed):
+    """
+    Scans one superclass category with several pymxs calls per class,
+    appending to `rows` and `failed`. Yields after every class so the
+    caller can schedule the work in chunks.
+    """
+    mxs_class_list = superclass.classes
+    if mxs_class_list is None:
+        raise ValueError(f"{superclass_name}.classes was None")
+    for i, c in enumerate(mxs_class_list):
+        cname = None
+        try:
+            cname = safe_repr(c)
+            if not cname or cname == "<Unstringable Class>":
+                failed.append(f"{superclass_name}_{i}_Unstringable")
+                continue
+
+            # We still *try* to get classID and pluginName,
+            # wrapping them in safe calls.
+            try:
+                cid = safe_repr(rt.classID(c))
+            except Exception:
+                cid = ""
+                
+            try:
+                pname = safe_repr(rt.pluginName(c))
+            except Exception:
+                pname = ""
+            
+            rows.append((cname, superclass_name, cid, pname))
+            
+        except Exception as e_inner:
+            failed.append(cname or f"{superclass_name}_{i}_Error: {e_inner}")
+        yield
+
+def scan_category_per_class(superclass_name, superclass):
+    """Scans one superclass category with several pymxs calls per class. Returns (rows, failed)."""
+    rows, failed = [], []
+    for _ in iter_scan_category_per_class(superclass_name, superclass, rows, failed):
+        pass
+    return rows, failed
+
+def scan_category_bulk(superclass_name, superclass, helpers):
+    """Scans one superclass category with a single MAXScript call. Returns (rows, failed)."""
+    rows = []
+    for fields in parse_bulk_records(helpers.scanClasses(superclass)):
+        cname, cid, pname = (fields + ["", ""])[:3]
+        rows.append((cname, superclass_name, safe_repr(cid), safe_repr(pname)))
+    return rows, []
+
+# The superclasses whose .classes get scanned, by global name. 'Controller'
+# has no global of its own and is added through Bezier_Float.
+SCAN_SUPERCLASSES = ("Modifier", "Light", "GeometryClass", "Shape", "Camera", "Helper",
+                     "SpacewarpObject", "Material", "TextureMap", "RenderEffect", "Atmospheric")
+
+def get_scan_categories():
+    """
+    Returns ([(superclass name, superclass), ...], error) for the
+    categories to scan; `error` is the exception that kept 'Controller'
+    out of the list, or None.
+    """
+    # We access them via 'rt' (Python) which is safe, and pair them
+    # manually with their proper SuperClass name.
+    categories = [(name, getattr(rt, name)) for name in SCAN_SUPERCLASSES]
+    # --- V5.9 HACK FIX: Try rt.Bezier_Float, a very common controller ---
+    try:
+        pos_controller_class = rt.classOf(rt.Bezier_Float)
+        # We assume rt.superClassOf is safe ONCE for a known object
+        categories.append(("Controller", rt.superClassOf(pos_controller_class)))
+    except Exception as e:
+        return categories, e
+    return categories, None
+
+def iter_class_scan(categories, helpers, rows, failed, log=print):
+    """
+    Scans `categories` into `rows` and `failed`: one bulk call per
+    category with `helpers`, or several calls per class without them (or
+    when the bulk call fails). Yields (index, superclass name, None)
+    before each category, None after each class of a per-class scan, and
+    (index, superclass name, rows added) after each category, so the
+    caller can report progress and schedule the work in chunks.
+    """
+    for i, (superclass_name, superclass) in enumerate(categories):
+        yield i, superclass_name, None
+        scanned, category_failed = None, []
+        try:
+            if helpers is not None:
+                try:
+                    scanned, category_failed = scan_category_bulk(superclass_name, superclass, helpers)
+                except Exception as e:
+                    log(f"--- Bulk scan of {superclass_name} failed, falling back: {e}")
+            if scanned is None:
+                scanned = []
+                yield from iter_scan_category_per_class(superclass_name, superclass, scanned, category_failed)
+        except Exception as e:
+            log(f"--- Error collecting {superclass_name}.classes: {e}")
+        rows.extend(scanned or [])
+        failed.extend(category_failed)
+        yield i, superclass_name, len(scanned or [])
+
+# --- CLASS CACHE FINGERPRINT ---
+# Stored in the cache meta so startup can tell, without a scan, whether
+# plugins were installed/updated (file stats) or a category gained or
+# lost classes (superclass .classes counts), and which categories to rescan.
+def is_plugin_file(filename):
+    ext = os.path.splitext(filename)[1].lower()
+    return ext.startswith(".dl") or ext in (".bmi", ".bms", ".flt", ".gup")
+
+def iter_plugin_files_fingerprint(plugin_dirs, files):
+    """
+    Generator: adds {path: [mtime, size]} of the plugin binaries under the
+    given directories to `files`, one directory per step.
+    """
+    for plugin_dir in plugin_dirs:
+        for root, dirs, names in os.walk(plugin_dir):
+            for name in names:
+                if is_plugin_file(name):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    files[os.path.normcase(path)] = [st.st_mtime, st.st_size]
+            yield
+
+def plugin_files_fingerprint(plugin_dirs):
+    """Returns {path: [mtime, size]} for the plugin binaries under the given directories."""
+    files = {}
+    for _ in iter_plugin_files_fingerprint(plugin_dirs, files):
+        pass
+    return files
+
+def iter_class_fingerprint(categories, helpers, fingerprint):
+    """
+    Generator behind get_class_fingerprint(): fills `fingerprint` with the
+    class count of each category (first step), then the plugin file stats
+    one directory per step, so a caller can stop once the counts differ.
+    """
+    counts = {}
+    for superclass_name, superclass in categories:
+        try:
+            counts[superclass_name] = int(superclass.classes.count)
+        except Exception:
+            counts[superclass_name] = -1
+    fingerprint["category_counts"] = counts
+    fingerprint["plugin_files"] = files = {}
+    yield
+    plugin_dirs = []
+    if helpers is not None:
+        try:
+            plugin_dirs = [fields[0] for fields in parse_bulk_records(helpers.pluginDirs())]
+        except Exception:
+            plugin_dirs = []
+    yield from iter_plugin_files_fingerprint(plugin_dirs, files)
+
+def get_class_fingerprint(categories, helpers=None):
+    """Builds the cache fingerprint: plugin file stats plus the class count of each category."""
+    fingerprint = {}
+    for _ in iter_class_fingerprint(categories, helpers, fingerprint):
+        pass
+    return fingerprint
+
+def diff_class_fingerprint(old, new, rows):
+    """
+    Compares two fingerprints. Returns (categories to rescan, changed plugin files).
+    A category is rescanned if its class count changed or if a cached class
+    in it belongs to a changed plugin file.
+    """
+    old_files, new_files = old.get("plugin_files", {}), new.get("plugin_files", {})
+    changed_files = sorted(p for p in set(old_files) | set(new_files)
+                           if old_files.get(p) != new_files.get(p))
+
+    old_counts = old.get("category_counts", {})
+    categories = {sc for sc, n in new.get("category_counts", {}).items() if old_counts.get(sc) != n}
+
+    changed_names = {os.path.basename(p) for p in changed_files}
+    categories.update(sc for cname, sc, cid, pname in rows
+                      if pname and os.path.basename(os.path.normcase(pname)) in changed_names)
+    return categories, changed_files
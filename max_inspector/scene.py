@@ -0,0 +1,62 @@
+"""Paged reads of the scene node hierarchy."""
+from .bulk import parse_bulk_records, parse_mxs_int
+from .runtime import rt, get_type_name, safe_repr
+
+# --- SCENE TREE SOURCE ---
+SCENE_PAGE_SIZE = 500
+SCENE_REBUILD_THRESHOLD = 2000  # event batches larger than this reload the tree instead
+
+def get_node_by_handle(handle):
+    """Resolves an anim handle back to a live node, or None if it was deleted."""
+    try:
+        node = rt.getAnimByHandle(handle)
+        return node if node is not None and rt.isValidNode(node) else None
+    except Exception:
+        return None
+
+class SceneTreeSource:
+    """
+    Pages through the scene hierarchy by anim handle (0 = scene root).
+    Each page is one bulk MAXScript call; nothing holds pymxs node
+    wrappers, so deleted nodes cannot leave dangling references.
+    """
+    def __init__(self, helpers=None):
+        self._helpers = helpers
+
+    def children(self, parent_handle, start=0, count=SCENE_PAGE_SIZE):
+        """Returns (total, [(handle, name, child_count, class_name), ...]) for one page."""
+        if self._helpers is not None:
+            records = parse_bulk_records(self._helpers.sceneChildren(parent_handle, start, count))
+            total = parse_mxs_int(next(records, ["0"])[0])
+            return total, [(parse_mxs_int(h), name, int(n), cls) for h, name, n, cls in records]
+        return self._children_per_node(parent_handle, start, count)
+
+    def node_info(self, handles):
+        """Returns [(handle, parent_handle, name, child_count, class_name), ...] for the live nodes among `handles`."""
+        if not handles:
+            return []
+        if self._helpers is not None:
+            return [(parse_mxs_int(h), parse_mxs_int(p), name, int(n), cls)
+                    for h, p, name, n, cls in parse_bulk_records(self._helpers.nodeInfo(list(handles)))]
+        info = []
+        for handle in handles:
+            node = get_node_by_handle(handle)
+            if node is None:
+                continue
+            parent = node.parent
+            parent_handle = 0 if parent is None else int(rt.getHandleByAnim(parent))
+            info.append((handle, parent_handle, safe_repr(node.name), node.children.count, get_type_name(node)))
+        return info
+
+    def _children_per_node(self, parent_handle, start, count):
+        # Fallback without the bulk helpers: several pymxs calls per node
+        parent = rt.rootNode if parent_handle == 0 else get_node_by_handle(parent_handle)
+        if parent is None:
+            return 0, []
+        kids = parent.children
+        total = kids.count
+        page = []
+        for i in range(start, min(total, start + count)):
+            n = kids[i]
+            page.append((int(rt.getHandleByAnim(n)), safe_repr(n.name), n.children.count, get_type_name(n)))
+        return total, page
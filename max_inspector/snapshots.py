@@ -0,0 +1,285 @@
+"""Scene snapshots stored in SQLite and the diff of two snapshots."""
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+
+from .bulk import parse_bulk_records, parse_mxs_int, unescape_bulk_field
+
+# --- SCENE SNAPSHOTS ---
+SNAPSHOT_CHUNK_SIZE = 50  # nodes per snapshotRecords call
+SNAPSHOT_FORMAT_VERSION = 2  # 2: node paths, sections without anim handles
+SNAPSHOT_READ_VERSIONS = (1, 2)
+SNAPSHOT_DIGEST_SIZE = 16
+
+def snapshot_digest(data):
+    return hashlib.blake2b(data, digest_size=SNAPSHOT_DIGEST_SIZE).digest()
+
+def split_snapshot_records(text):
+    """
+    Splits MaxInspectorBulk.snapshotRecords() output into (handle, name,
+    path, sections) per node. A section is the raw text of one part of a
+    node that other nodes can share: the node itself (its O and H lines,
+    own properties, controllers, custom attributes and user properties),
+    its material, or one modifier. The anim handle is left out of the
+    section text, since it changes when the scene is reloaded.
+    """
+    handle = name = path = sections = None
+    for line in str(text).split("\n"):
+        if not line:
+            continue
+        kind = line[0]
+        if kind == "O":
+            if sections is not None:
+                yield handle, name, path, ["\n".join(lines) for lines in sections.values()]
+            fields = line.split("\t", 3)
+            handle, name, path = parse_mxs_int(fields[1]), unescape_bulk_field(fields[2]), None
+            sections = {"": [f"O\t\t{fields[2]}\t{fields[3]}"]}
+        elif kind in "MP":
+            sections.setdefault(line.split("\t", 2)[1], []).append(line)
+        else:
+            if kind == "H":
+                path = unescape_bulk_field(line[2:])
+            sections[""].append(line)
+    if sections is not None:
+        yield handle, name, path, ["\n".join(lines) for lines in sections.values()]
+
+_SNAPSHOT_NODE_FIELDS = ("Name", "Class", "SuperClass", "Layer", "Material", "Material Class", "Modifier Count")
+
+def snapshot_fields(text):
+    """Flattens the text of snapshot sections into {(group, key): value}."""
+    fields = {}
+    for f in parse_bulk_records(text):
+        kind = f[0]
+        if kind == "O":
+            for key, value in zip(_SNAPSHOT_NODE_FIELDS, f[2:]):
+                fields[("Node", key)] = value
+        elif kind == "H":
+            fields[("Node", "Path")] = f[1] if len(f) > 1 else ""
+        elif kind == "M":
+            fields[(f"Modifier {f[1]}", "")] = f"{f[2]} ({f[3]})"
+        elif kind == "P":
+            group = {"": "Properties", "mat": "Material"}.get(f[1], f"Modifier {f[1]}")
+            fields[(group, f[2])] = f"({f[3]}) {f[4]}" if len(f) >= 5 else "<unreadable>"
+        elif kind == "C":
+            fields[("Controllers", f[1])] = f"({f[2]}) {f[3]}"
+        elif kind == "A":
+            fields[("Custom Attributes", f"{f[1]}.{f[2]}")] = f"({f[3]}) {f[4]}" if len(f) >= 5 else "<unreadable>"
+        elif kind == "U":
+            fields[("User Properties", "")] = f[1] if len(f) > 1 else ""
+    return fields
+
+class SnapshotWriter:
+    """
+    Writes a scene snapshot: a SQLite file with one row per node (anim
+    handle, name, hierarchy path, digest, digests of its sections) and every distinct
+    section stored once, zlib-compressed and keyed on its digest, so a
+    material or modifier shared by many nodes costs one blob.
+    """
+    COMMIT_EVERY = 1000  # nodes per transaction
+
+    def __init__(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+        self._path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE nodes (handle INTEGER PRIMARY KEY, name TEXT, path TEXT, digest BLOB, sections BLOB);
+            CREATE TABLE sections (digest BLOB PRIMARY KEY, data BLOB) WITHOUT ROWID;
+        """)
+        self._stored = set()  # section digests written so far
+        self._pending = 0
+        self.count = 0
+
+    def add(self, handle, name, path, sections):
+        digests = []
+        for text in sections:
+            data = text.encode("utf-8")
+            digest = snapshot_digest(data)
+            if digest not in self._stored:
+                self._stored.add(digest)
+                self._db.execute("INSERT OR IGNORE INTO sections VALUES (?, ?)", (digest, zlib.compress(data)))
+            digests.append(digest)
+        joined = b"".join(digests)
+        self._db.execute("INSERT OR REPLACE INTO nodes VALUES (?, ?, ?, ?, ?)",
+                         (handle, name, path, snapshot_digest(joined), joined))
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.COMMIT_EVERY:
+            self._db.commit()
+            self._pending = 0
+
+    def close(self, meta=None):
+        meta = dict(meta or {}, version=SNAPSHOT_FORMAT_VERSION, nodes=self.count)
+        self._db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                             [(k, json.dumps(v)) for k, v in meta.items()])
+        self._db.commit()
+        self._db.close()
+
+    def abort(self):
+        """Closes and deletes an incomplete snapshot."""
+        self._db.close()
+        try: os.remove(self._path)
+        except OSError: pass
+
+def iter_capture_snapshot(helpers, handles, writer, chunk_size=SNAPSHOT_CHUNK_SIZE):
+    """Generator: snapshots `handles` chunk by chunk into `writer`, yielding the nodes processed so far."""
+    for start in range(0, len(handles), chunk_size):
+        for handle, name, path, sections in split_snapshot_records(
+                helpers.snapshotRecords(handles[start:start + chunk_size])):
+            writer.add(handle, name, path, sections)
+        yield min(start + chunk_size, len(handles))
+
+class SceneSnapshot:
+    """A snapshot file written by SnapshotWriter, opened for diffing."""
+    def __init__(self, path):
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        try:
+            self.meta = {k: json.loads(v) for k, v in self._db.execute("SELECT key, value FROM meta")}
+        except sqlite3.DatabaseError:
+            self._db.close()
+            raise ValueError(f"{path} is not an inspector snapshot")
+        if self.meta.get("version") not in SNAPSHOT_READ_VERSIONS:
+            self._db.close()
+            raise ValueError(f"Unsupported snapshot version {self.meta.get('version')}")
+
+    def nodes(self):
+        """{anim handle: (name, digest, joined section digests, hierarchy path or None)}"""
+        path = "path" if self.meta["version"] >= 2 else "NULL"
+        return {h: (name, digest, sections, node_path) for h, name, digest, sections, node_path
+                in self._db.execute(f"SELECT handle, name, digest, sections, {path} FROM nodes")}
+
+    def section(self, digest):
+        row = self._db.execute("SELECT data FROM sections WHERE digest = ?", (digest,)).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else ""
+
+    def fields(self, digests):
+        """Merged snapshot_fields() of the sections with these digests."""
+        fields = {}
+        for digest in digests:
+            fields.update(snapshot_fields(self.section(digest)))
+        return fields
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def split_digests(joined):
+    return [joined[i:i + SNAPSHOT_DIGEST_SIZE] for i in range(0, len(joined), SNAPSHOT_DIGEST_SIZE)]
+
+def path_keys(nodes):
+    """{(hierarchy path, n): anim handle}, n counting the nodes that share a path in handle order."""
+    keys, seen = {}, {}
+    for handle in sorted(nodes):
+        path = nodes[handle][3]
+        n = seen[path] = seen.get(path, 0) + 1
+        keys[(path, n)] = handle
+    return keys
+
+class SnapshotDiff:
+    """
+    Diff of two snapshots. Nodes are matched on anim handle while the
+    handles both snapshots share mostly point at the same hierarchy
+    paths; anim handles are reassigned when a scene is reloaded or
+    merged, so otherwise nodes are matched on their path (then their
+    order among nodes with that path) and `warnings` says so. Nodes with
+    equal digests are skipped without reading anything else; for a
+    changed node only the sections whose digests differ are decompressed
+    and compared. Nodes are (old handle, new handle) pairs, with None for
+    the side a node is missing from. A version 1 snapshot can be diffed
+    against a version 2 one (`mixed`): nodes are matched on anim handle and
+    compared on their sections with the anim handle and path left out.
+    """
+    def __init__(self, old, new):
+        self.old, self.new = old, new
+        self._old_nodes, self._new_nodes = old_nodes, new_nodes = old.nodes(), new.nodes()
+        self.warnings = []
+        self.mixed = old.meta["version"] != new.meta["version"]
+        if self.mixed:
+            self.warnings.append(f"The snapshots are of format versions {old.meta['version']} and "
+                                 f"{new.meta['version']}: nodes were matched on anim handles and hierarchy paths "
+                                 "are not compared.")
+        old_scene, new_scene = old.meta.get("scene"), new.meta.get("scene")
+        if old_scene and new_scene and old_scene != new_scene:
+            self.warnings.append(f"The snapshots are of different scene files ({old_scene} and {new_scene}).")
+
+        shared = old_nodes.keys() & new_nodes.keys()
+        same_path = sum(old_nodes[h][3] == new_nodes[h][3] for h in shared)
+        self.handles_matched = (min(old.meta["version"], new.meta["version"]) < 2  # v1 has no paths
+                                or not old_nodes or not new_nodes or 2 * same_path > len(shared))
+        if self.handles_matched:
+            pairs = [(h, h) for h in shared]
+            old_only, new_only = old_nodes.keys() - shared, new_nodes.keys() - shared
+        else:
+            old_keys, new_keys = path_keys(old_nodes), path_keys(new_nodes)
+            pairs = [(old_keys[k], new_keys[k]) for k in old_keys.keys() & new_keys.keys()]
+            old_only = [old_keys[k] for k in old_keys.keys() - new_keys.keys()]
+            new_only = [new_keys[k] for k in new_keys.keys() - old_keys.keys()]
+            self.warnings.append("Anim handles do not line up between the snapshots (the scene was reloaded or "
+                                 "merged), so nodes were matched on their hierarchy path: renamed or re-parented "
+                                 "nodes show as removed and added.")
+
+        self.added = sorted(((None, h) for h in new_only), key=self.sort_key)
+        self.removed = sorted(((h, None) for h in old_only), key=self.sort_key)
+        if self.mixed:
+            differ = lambda pair: (self._comparable_digests(old, old_nodes[pair[0]]) !=
+                                   self._comparable_digests(new, new_nodes[pair[1]]))
+        else:
+            differ = lambda pair: old_nodes[pair[0]][1] != new_nodes[pair[1]][1]
+        self.changed = sorted(filter(differ, pairs), key=self.sort_key)
+        self.unchanged = len(pairs) - len(self.changed)
+
+    @staticmethod
+    def _comparable_digests(snapshot, entry):
+        """
+        Section digests of a node with its own section (always the first)
+        rewritten the way both versions agree on: no anim handle in the O
+        line (version 1 kept it) and no H line (version 1 has none).
+        """
+        digests = split_digests(entry[2])
+        if not digests:
+            return digests
+        lines = [line for line in snapshot.section(digests[0]).split("\n") if not line.startswith("H\t")]
+        if lines and lines[0].startswith("O\t"):
+            lines[0] = "O\t\t" + lines[0].split("\t", 2)[2]
+        return [snapshot_digest("\n".join(lines).encode("utf-8"))] + digests[1:]
+
+    def name(self, node):
+        old_handle, new_handle = node
+        return (self._new_nodes[new_handle] if new_handle is not None else self._old_nodes[old_handle])[0]
+
+    def sort_key(self, node):
+        return self.name(node).lower()
+
+    def changes(self, node):
+        """[(group, key, old value, new value), ...] for one node; a value is None where the field does not exist."""
+        old_handle, new_handle = node
+        old_entry = self._old_nodes[old_handle] if old_handle is not None else None
+        new_entry = self._new_nodes[new_handle] if new_handle is not None else None
+        old_digests = split_digests(old_entry[2]) if old_entry else []
+        new_digests = split_digests(new_entry[2]) if new_entry else []
+        shared = set(old_digests) & set(new_digests)
+        old_fields = self.old.fields(d for d in old_digests if d not in shared)
+        new_fields = self.new.fields(d for d in new_digests if d not in shared)
+        changes = []
+        for key in sorted(old_fields.keys() | new_fields.keys()):
+            if self.mixed and key == ("Node", "Path"):
+                continue
+            old_value, new_value = old_fields.get(key), new_fields.get(key)
+            if old_value != new_value:
+                changes.append((key[0], key[1], old_value, new_value))
+        return changes
+
+    def close(self):
+        self.old.close()
+        self.new.close()
@@ -0,0 +1,135 @@
+"""Scene statistics as NumPy columns. NumPy is optional and imported on first use."""
+from .bulk import parse_bulk_records, parse_mxs_int, parse_mxs_numbers
+from .runtime import rt, get_type_name, safe_repr
+
+np = None  # numpy, once numpy_available() has imported it
+
+def numpy_available():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return False
+        np = numpy
+    return True
+
+# --- SCENE STATISTICS ---
+SCENE_STATS_PAGE_SIZE = 20000  # nodes per sceneStats call
+SCENE_STATS_COLUMNS = ("handle", "faces", "verts", "modifiers", "material",
+                       "min_x", "min_y", "min_z", "max_x", "max_y", "max_z")
+FACE_HISTOGRAM_BINS = (0, 1, 100, 1000, 10000, 100000, 1000000)
+
+class SceneStats:
+    """
+    Per-node numeric fields of the scene as NumPy columns (one float64
+    array per SCENE_STATS_COLUMNS entry) plus interned class and
+    superclass codes; every aggregate is a vectorized group-by over them.
+    Requires NumPy.
+    """
+    def __init__(self, class_names, class_codes, superclass_names, superclass_codes, values):
+        self.class_names = class_names
+        self.class_codes = class_codes
+        self.superclass_names = superclass_names
+        self.superclass_codes = superclass_codes
+        self._values = values.reshape(-1, len(SCENE_STATS_COLUMNS))
+
+    @classmethod
+    def gather(cls, helpers=None, page_size=SCENE_STATS_PAGE_SIZE):
+        """
+        Reads the whole scene: the anim handles of every node, then one
+        sceneStats call per page of them (per-node calls without the bulk
+        helpers). Nodes deleted after the handles were taken are skipped.
+        """
+        if not numpy_available():
+            raise RuntimeError("Scene Statistics needs NumPy (pip install numpy for 3ds Max's Python)")
+        combos = {}  # (class, superclass) -> code; raw "class\tsuperclass" lines in bulk mode
+        combo_codes, numbers = [], []
+        if helpers is not None:
+            handles = [parse_mxs_int(f[0]) for f in parse_bulk_records(helpers.nodeHandles("scene", ""))]
+            for start in range(0, len(handles), page_size):
+                result = helpers.sceneStats(handles[start:start + page_size])
+                combo_codes.extend(combos.setdefault(line, len(combos)) for line in str(result[0]).split("\n") if line)
+                numbers.append(np.frombuffer(parse_mxs_numbers(result[1]), dtype=np.float64))
+            pairs = list(parse_bulk_records("\n".join(combos)))
+        else:
+            rows = []
+            for n in rt.objects:
+                try: superclass_name = safe_repr(rt.superClassOf(n))
+                except Exception: superclass_name = ""
+                combo_codes.append(combos.setdefault((get_type_name(n), superclass_name), len(combos)))
+                rows.append(cls._node_row(n))
+            numbers.append(np.array(rows, dtype=np.float64).ravel())
+            pairs = list(combos)
+
+        # Intern the distinct class and superclass names, then map every node through its combination
+        classes, superclasses = {}, {}
+        combo_class = np.array([classes.setdefault(c, len(classes)) for c, _ in pairs], dtype=np.int32)
+        combo_super = np.array([superclasses.setdefault(sc, len(superclasses)) for _, sc in pairs], dtype=np.int32)
+        combo_codes = np.array(combo_codes, dtype=np.int32)
+        values = np.concatenate(numbers) if numbers else np.zeros(0)
+        return cls(list(classes), combo_class[combo_codes] if len(pairs) else combo_codes,
+                   list(superclasses), combo_super[combo_codes] if len(pairs) else combo_codes, values)
+
+    @staticmethod
+    def _node_row(n):
+        # Fallback without the bulk helpers: several pymxs calls per node
+        try:
+            faces, verts = rt.getPolygonCount(n)
+        except Exception:
+            faces, verts = 0, 0
+        mat = n.material
+        bmin, bmax = n.min, n.max
+        return [int(rt.getHandleByAnim(n)), faces, verts, n.modifiers.count,
+                int(rt.getHandleByAnim(mat)) if mat else 0,
+                bmin.x, bmin.y, bmin.z, bmax.x, bmax.y, bmax.z]
+
+    def __len__(self):
+        return len(self._values)
+
+    def column(self, name):
+        return self._values[:, SCENE_STATS_COLUMNS.index(name)]
+
+    def totals(self):
+        return {name: int(self.column(name).sum()) for name in ("faces", "verts", "modifiers")}
+
+    def _group(self, names, codes):
+        counts = np.bincount(codes, minlength=len(names))
+        faces = np.bincount(codes, weights=self.column("faces"), minlength=len(names))
+        verts = np.bincount(codes, weights=self.column("verts"), minlength=len(names))
+        order = np.argsort(-counts, kind="stable")
+        return [(names[i], int(counts[i]), int(faces[i]), int(verts[i])) for i in order]
+
+    def by_class(self):
+        """[(class, nodes, faces, vertices), ...] by descending node count."""
+        return self._group(self.class_names, self.class_codes)
+
+    def by_superclass(self):
+        return self._group(self.superclass_names, self.superclass_codes)
+
+    def material_reuse(self, top=10):
+        """Returns (unique materials, nodes without material, [(material handle, nodes), ...] most shared first)."""
+        mats = self.column("material")
+        assigned = mats[mats > 0]
+        handles, counts = np.unique(assigned, return_counts=True)
+        order = np.argsort(-counts, kind="stable")[:top]
+        return len(handles), int(len(mats) - len(assigned)), [(int(handles[i]), int(counts[i])) for i in order]
+
+    def extents(self):
+        """Returns (min xyz, max xyz) of all node bounding boxes, or None for an empty scene."""
+        if not len(self):
+            return None
+        return self._values[:, 5:8].min(axis=0), self._values[:, 8:11].max(axis=0)
+
+    def face_histogram(self):
+        """[(label, nodes), ...] over FACE_HISTOGRAM_BINS."""
+        edges = list(FACE_HISTOGRAM_BINS) + [np.inf]
+        counts, _ = np.histogram(self.column("faces"), bins=edges)
+        labels = ["0"] + [f"{lo:,}-{hi - 1:,}" for lo, hi in zip(FACE_HISTOGRAM_BINS[1:-1], FACE_HISTOGRAM_BINS[2:])]
+        labels.append(f"{FACE_HISTOGRAM_BINS[-1]:,}+")
+        return list(zip(labels, (int(c) for c in counts)))
+
+    def modifier_histogram(self):
+        """[(modifier count, nodes), ...] for the counts that occur."""
+        counts = np.bincount(self.column("modifiers").astype(np.int64))
+        return [(i, int(c)) for i, c in enumerate(counts) if c]
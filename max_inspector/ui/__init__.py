@@ -0,0 +1,5 @@
+"""
+The PySide6 side of the inspector: the widgets and models
+3dsMaxInspector.py builds its window from. Importing this package
+imports Qt; the rest of max_inspector does not.
+"""
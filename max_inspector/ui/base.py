@@ -0,0 +1,326 @@
+"""
+Qt building blocks shared by the inspector window and its dialogs:
+batched report output, time-sliced jobs, scene event coalescing and the
+class list models.
+"""
+import collections
+import time
+
+from PySide6 import QtCore
+
+from ..index import ClassTable
+from ..profiling import active_profiler
+from ..results import NODE_CHANGE_EVENTS
+from ..runtime import rt
+
+# --- REPORT BUFFER ---
+REPORT_MAX_BLOCKS = 200000  # scrollback limit of the report view, in lines
+
+class ReportBuffer(QtCore.QObject):
+    """
+    Collects report lines and writes them to a QPlainTextEdit in one batch,
+    either on flush() (end of an inspection) or from a short timer, instead
+    of one append (layout + repaint) per line. Pending lines live in a
+    ring buffer with the same limit as the view's scrollback.
+    """
+    def __init__(self, view, interval_ms=50, max_lines=REPORT_MAX_BLOCKS, parent=None):
+        super().__init__(parent)
+        self._view = view
+        self._view.setMaximumBlockCount(max_lines)
+        self._pending = collections.deque(maxlen=max_lines)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def write(self, text):
+        self._pending.append(text)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+        if self._pending:
+            text = "\n".join(self._pending)
+            self._pending.clear()
+            self._view.appendPlainText(text)
+
+    def clear(self):
+        self._timer.stop()
+        self._pending.clear()
+        self._view.clear()
+
+# --- COOPERATIVE JOBS ---
+class CooperativeJob(QtCore.QObject):
+    """
+    Runs a generator on the main thread (pymxs is not thread-safe) in
+    time-sliced chunks driven by a zero-interval QTimer. Each step of the
+    generator should be a small unit of work; the job hands control back
+    to the event loop once `budget_ms` of the current chunk is used.
+    A step may yield a phase label; later steps are profiled under
+    "<name>: <phase>".
+    """
+    finished = QtCore.Signal(bool)  # True when the generator ran to completion
+
+    def __init__(self, steps, budget_ms=12, parent=None, name="Job"):
+        super().__init__(parent)
+        self._steps = steps
+        self.name = name
+        self._scope = name
+        self._budget = budget_ms / 1000.0
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._run_chunk)
+        self.error = None
+        self.cancelled = False
+
+    def start(self):
+        self._timer.start()
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    def cancel(self):
+        if self.is_running():
+            self.cancelled = True
+            self._finish(False)
+
+    def _run_chunk(self):
+        deadline = time.perf_counter() + self._budget
+        try:
+            while time.perf_counter() < deadline:
+                profiler = active_profiler()
+                if profiler is None:
+                    phase = next(self._steps)
+                else:
+                    with profiler.scope(self._scope):
+                        phase = next(self._steps)
+                if phase is not None:
+                    self._scope = f"{self.name}: {phase}"
+        except StopIteration:
+            self._finish(True)
+        except Exception as e:
+            self.error = e
+            self._finish(False)
+
+    def _finish(self, completed):
+        self._timer.stop()
+        self._steps.close()
+        self.finished.emit(completed)
+
+# --- SCENE EVENTS ---
+class SceneEventWatcher(QtCore.QObject):
+    """
+    Listens for node created/deleted/renamed events through a MAXScript
+    NodeEventCallback and coalesces them over a short window, emitting
+    one `changed(added, deleted, renamed)` batch of anim handle sets.
+    Edits of existing nodes are emitted right away, uncoalesced, as
+    `modified(handles, kind)` with a NODE_CHANGE_EVENTS kind, so cached
+    results are never used after the callback reports the change.
+    """
+    changed = QtCore.Signal(object, object, object)
+    modified = QtCore.Signal(object, object)
+
+    def __init__(self, window_ms=200, parent=None):
+        super().__init__(parent)
+        self._callback = None
+        self._added, self._deleted, self._renamed = set(), set(), set()
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(window_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def start(self):
+        """
+        Registers the NodeEventCallback. When it cannot be registered (a
+        3ds Max without NodeEventCallback, or MAXScript rejecting a
+        handler) the error propagates to the caller, the watcher stays
+        stopped and emits nothing, and a later start() tries again.
+        """
+        if self._callback is None:
+            handlers = {event: self._modified_handler(kind)
+                        for kind, events in NODE_CHANGE_EVENTS.items() for event in events}
+            handlers.update(added=self._on_added, deleted=self._on_deleted, nameChanged=self._on_renamed)
+            self._callback = rt.NodeEventCallback(**handlers)
+
+    def stop(self):
+        """Unregisters the callback (MAXScript drops it once it is disabled and collected)."""
+        self._timer.stop()
+        callback, self._callback = self._callback, None
+        if callback is not None:
+            try:
+                callback.enabled = False
+                rt.gc(light=True)
+            except Exception:
+                pass
+
+    def _queue(self):
+        # Start (but never restart) the window, so a steady stream still flushes
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _on_added(self, event, handles):
+        self._added.update(handles)
+        self._queue()
+
+    def _on_deleted(self, event, handles):
+        for h in handles:
+            if h in self._added:
+                self._added.discard(h)  # created and deleted within one window
+            else:
+                self._deleted.add(h)
+            self._renamed.discard(h)
+        self._queue()
+
+    def _on_renamed(self, event, handles):
+        self._renamed.update(h for h in handles if h not in self._added)
+        self._queue()
+        self.modified.emit(list(handles), "name")
+
+    def _modified_handler(self, kind):
+        # A plain function per change kind, since pymxs passes MAXScript functions and methods, not partials
+        def on_modified(event, handles):
+            self.modified.emit(list(handles), kind)
+        return on_modified
+
+    def flush(self):
+        self._timer.stop()
+        added, deleted, renamed = self._added, self._deleted, self._renamed
+        self._added, self._deleted, self._renamed = set(), set(), set()
+        if added or deleted or renamed:
+            self.changed.emit(added, deleted, renamed)
+
+# --- CLASS MODELS ---
+# All class views share one ClassListModel over the master ClassTable.
+# Category tabs and grouped trees only hold row ids into it, and the
+# views create no per-item objects, so rows are stored exactly once.
+ROW_ID_ROLE = QtCore.Qt.UserRole + 1
+
+class ClassListModel(QtCore.QAbstractListModel):
+    """Flat model over the master ClassTable of (name, super, classid, plugin) rows."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = ClassTable()
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def class_row(self, row_id):
+        return self._rows[row_id]
+
+    def class_name(self, row_id):
+        return self._rows.name(row_id)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return self._rows.name(index.row())
+        if role == ROW_ID_ROLE:
+            return index.row()
+        return None
+
+class ClassRowsProxyModel(QtCore.QAbstractProxyModel):
+    """Exposes a subset of ClassListModel rows, given as a sequence of row ids (list, array or range)."""
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self._row_ids = []
+        self._source_to_proxy = None
+        self.setSourceModel(source)
+        source.modelReset.connect(lambda: self.set_source_rows([]))
+
+    def set_source_rows(self, row_ids):
+        self.beginResetModel()
+        self._row_ids = row_ids
+        self._source_to_proxy = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._row_ids)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._row_ids)) or column != 0:
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QtCore.QModelIndex()):
+        return QtCore.QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QtCore.QModelIndex()
+        return self.sourceModel().index(self._row_ids[proxy_index.row()], 0)
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QtCore.QModelIndex()
+        if self._source_to_proxy is None:
+            self._source_to_proxy = {r: i for i, r in enumerate(self._row_ids)}
+        row = self._source_to_proxy.get(source_index.row())
+        return QtCore.QModelIndex() if row is None else self.createIndex(row, 0)
+
+class ClassGroupModel(QtCore.QAbstractItemModel):
+    """
+    Two-level tree (group -> class) over ClassListModel rows. Groups are
+    (label, row ids) pairs; child indexes carry their group in internalId.
+    """
+    def __init__(self, source, header, parent=None):
+        super().__init__(parent)
+        self._source = source
+        self._header = header
+        self._groups = []
+
+    def set_groups(self, groups):
+        self.beginResetModel()
+        self._groups = groups
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if not parent.isValid():
+            return len(self._groups)
+        if parent.internalId() == 0:
+            return len(self._groups[parent.row()][1])
+        return 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if column != 0 or row < 0:
+            return QtCore.QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, 0, 0) if row < len(self._groups) else QtCore.QModelIndex()
+        if parent.internalId() == 0 and row < len(self._groups[parent.row()][1]):
+            return self.createIndex(row, 0, parent.row() + 1)
+        return QtCore.QModelIndex()
+
+    def parent(self, index=QtCore.QModelIndex()):
+        if not index.isValid() or index.internalId() == 0:
+            return QtCore.QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        group = index.internalId()
+        if group == 0:
+            return self._groups[index.row()][0] if role == QtCore.Qt.DisplayRole else None
+        row_id = self._groups[group - 1][1][index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return self._source.class_name(row_id)
+        if role == ROW_ID_ROLE:
+            return row_id
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self._header
+        return None
@@ -0,0 +1,445 @@
+"""Dialogs opened from the inspector window: snapshot diffs, reference graphs, animation keys and the profiler."""
+import os
+import time
+
+from PySide6 import QtWidgets, QtCore
+
+from ..anim import KEY_PAGE_SIZE, KEY_VALUE_LABELS, KeyTrack
+from ..profiling import active_profiler, disable_profiling, enable_profiling
+from ..refgraph import REF_GRAPH_MAX_DEPTH
+from ..scene import SCENE_PAGE_SIZE
+from .base import CooperativeJob
+
+# --- SNAPSHOT DIFF VIEW ---
+class SnapshotDiffDialog(QtWidgets.QDialog):
+    """
+    Shows a SnapshotDiff as a tree: Changed / Added / Removed groups whose
+    nodes are listed a page at a time, and whose field-level changes are
+    only computed when a node is expanded.
+    """
+    def __init__(self, diff, parent=None):
+        super().__init__(parent)
+        self._diff = diff
+        self.setWindowTitle("Snapshot Diff")
+        self.resize(900, 700)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(QtWidgets.QLabel(
+            f"{os.path.basename(diff.old.path)} -> {os.path.basename(diff.new.path)}: "
+            f"{len(diff.changed):,} changed, {len(diff.added):,} added, {len(diff.removed):,} removed, "
+            f"{diff.unchanged:,} unchanged"))
+        for warning in diff.warnings:
+            label = QtWidgets.QLabel(warning)
+            label.setWordWrap(True)
+            label.setStyleSheet("color: #d08000;")
+            layout.addWidget(label)
+        self.tree = QtWidgets.QTreeWidget()
+        self.tree.setHeaderLabels(["Node / Field", "Old", "New"])
+        self.tree.itemExpanded.connect(self.on_item_expanded)
+        self.tree.itemClicked.connect(self.on_item_clicked)
+        layout.addWidget(self.tree)
+        self._groups = {"Changed": diff.changed, "Added": diff.added, "Removed": diff.removed}
+        for label, nodes in self._groups.items():
+            group = QtWidgets.QTreeWidgetItem(self.tree, [f"{label} ({len(nodes):,})"])
+            self.add_node_page(group, label, 0)
+            group.setExpanded(label == "Changed")
+
+    def add_node_page(self, group, label, start):
+        nodes = self._groups[label]
+        end = min(len(nodes), start + SCENE_PAGE_SIZE)
+        for node in nodes[start:end]:
+            item = QtWidgets.QTreeWidgetItem(group, [self._diff.name(node)])
+            item.setData(0, QtCore.Qt.UserRole, ("diff_node", node))
+            item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+        if end < len(nodes):
+            more = QtWidgets.QTreeWidgetItem(group, [f"... {len(nodes) - end:,} more (click to load)"])
+            more.setData(0, QtCore.Qt.UserRole, ("diff_more", label, end))
+
+    def on_item_expanded(self, item):
+        data = item.data(0, QtCore.Qt.UserRole)
+        if not (isinstance(data, tuple) and data[0] == "diff_node") or item.childCount():
+            return
+        item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        groups = {}
+        for group, key, old, new in self._diff.changes(data[1]):
+            parent = groups.get(group)
+            if parent is None:
+                parent = groups[group] = QtWidgets.QTreeWidgetItem(item, [group])
+                parent.setExpanded(True)
+            if key:
+                QtWidgets.QTreeWidgetItem(parent, [key, "" if old is None else old, "" if new is None else new])
+            else:
+                parent.setText(1, "" if old is None else old)
+                parent.setText(2, "" if new is None else new)
+
+    def on_item_clicked(self, item, col):
+        data = item.data(0, QtCore.Qt.UserRole)
+        if isinstance(data, tuple) and data[0] == "diff_more":
+            _, label, start = data
+            group = item.parent()
+            group.removeChild(item)
+            self.add_node_page(group, label, start)
+
+    def done(self, result):
+        self._diff.close()
+        super().done(result)
+
+# --- REFERENCE GRAPH VIEW ---
+class RefGraphDialog(QtWidgets.QDialog):
+    """
+    Reference graph of one anim as a tree whose items load their children
+    when expanded. 'Expand to Depth' walks the graph once and shows every
+    anim under its first parent only; later occurrences and cycles are
+    leaves. Clicking an item calls `on_inspect(handle)`.
+    """
+    def __init__(self, walker, root_handle, root_label, on_inspect=None, parent=None):
+        super().__init__(parent)
+        self._walker = walker
+        self._root = root_handle
+        self._root_label = root_label
+        self._on_inspect = on_inspect
+        self.setWindowTitle(f"Reference Graph: {root_label}")
+        self.resize(800, 700)
+        layout = QtWidgets.QVBoxLayout(self)
+        controls = QtWidgets.QHBoxLayout()
+        controls.addWidget(QtWidgets.QLabel("Depth:"))
+        self.depth_box = QtWidgets.QSpinBox()
+        self.depth_box.setRange(1, 64)
+        self.depth_box.setValue(REF_GRAPH_MAX_DEPTH)
+        controls.addWidget(self.depth_box)
+        self.btn_expand = QtWidgets.QPushButton("Expand to Depth")
+        self.btn_expand.clicked.connect(self.expand_to_depth)
+        controls.addWidget(self.btn_expand)
+        controls.addStretch(1)
+        layout.addLayout(controls)
+        self.tree = QtWidgets.QTreeWidget()
+        self.tree.setHeaderLabels(["Slot", "Name", "Class", "SuperClass"])
+        self.tree.itemExpanded.connect(self.on_item_expanded)
+        self.tree.itemClicked.connect(self.on_item_clicked)
+        layout.addWidget(self.tree)
+        self.status = QtWidgets.QLabel("")
+        layout.addWidget(self.status)
+        self.reset_tree()
+
+    def reset_tree(self):
+        self.tree.clear()
+        root = QtWidgets.QTreeWidgetItem(self.tree, ["", self._root_label, "", ""])
+        root.setData(0, QtCore.Qt.UserRole, ("ref_anim", self._root, 0))
+        root.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+        return root
+
+    def add_child(self, parent_item, child, depth, expandable):
+        handle, slot, cls, superclass, name = child
+        item = QtWidgets.QTreeWidgetItem(parent_item, [slot, name, cls, superclass])
+        item.setData(0, QtCore.Qt.UserRole, ("ref_anim", handle, depth))
+        if expandable:
+            item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+        return item
+
+    def ancestors(self, item):
+        handles = set()
+        while item is not None:
+            handles.add(item.data(0, QtCore.Qt.UserRole)[1])
+            item = item.parent()
+        return handles
+
+    def on_item_expanded(self, item):
+        data = item.data(0, QtCore.Qt.UserRole)
+        if not (isinstance(data, tuple) and data[0] == "ref_anim") or item.childCount():
+            return
+        _, handle, depth = data
+        item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        above = self.ancestors(item)
+        for child in self._walker.children(handle):
+            child_item = self.add_child(item, child, depth + 1, child[0] not in above)
+            if child[0] in above:
+                child_item.setText(1, f"{child[4]} (cycle)")
+        self.status.setText(f"{self._walker.fetches} graph reads")
+
+    def expand_to_depth(self):
+        max_depth = self.depth_box.value()
+        start = time.perf_counter()
+        entries = self._walker.walk(self._root, max_depth)
+        root = self.reset_tree()
+        root.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        stack = [root]  # stack[d] is the item entries of depth d + 1 hang under
+        for depth, handle, slot, cls, superclass, name, first in entries:
+            del stack[depth:]
+            item = self.add_child(stack[-1], (handle, slot, cls, superclass, name), depth, False)
+            if not first:
+                item.setText(1, f"{name} (shared, shown above)")
+            stack.append(item)
+        # Already loaded by the walk: no lazy loads for the items expandAll opens
+        self.tree.blockSignals(True)
+        self.tree.expandAll()
+        self.tree.blockSignals(False)
+        distinct = sum(1 for e in entries if e[-1])
+        self.status.setText(f"{len(entries):,} references, {distinct:,} distinct anims, "
+                            f"{self._walker.fetches} graph reads, {time.perf_counter() - start:.2f}s")
+
+    def on_item_clicked(self, item, col):
+        data = item.data(0, QtCore.Qt.UserRole)
+        if self._on_inspect is not None and isinstance(data, tuple) and data[0] == "ref_anim":
+            self._on_inspect(data[1])
+
+# --- ANIMATION KEYS VIEW ---
+class KeyTableModel(QtCore.QAbstractTableModel):
+    """
+    Table over a KeyTrack: the frame and value numbers of each key, read
+    straight from its arrays. Rows are added a page at a time through
+    canFetchMore/fetchMore as the view scrolls, so neither loaded keys nor
+    keys still streaming in become Qt items.
+    """
+    def __init__(self, track, page_size=KEY_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self._track = track
+        self._page_size = page_size
+        self._shown = 0
+        self._dims = track.dims
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._shown
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else 1 + self._dims
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Vertical:
+            return str(section + 1)
+        if section == 0:
+            return "Frame"
+        return KEY_VALUE_LABELS.get(self._track.value_class, ("Value",) * self._dims)[section - 1]
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            row, col = index.row(), index.column()
+            if col == 0:
+                return f"{self._track.times[row]:g}"
+            return f"{self._track.values[row * self._dims + col - 1]:.6g}"
+        if role == QtCore.Qt.TextAlignmentRole:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        return None
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and self._shown < len(self._track)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        count = min(self._page_size, len(self._track) - self._shown)
+        if count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._shown, self._shown + count - 1)
+        self._shown += count
+        self.endInsertRows()
+
+    def show_up_to(self, row):
+        while self._shown <= row and self.canFetchMore():
+            self.fetchMore()
+
+    def track_grew(self):
+        """Called after the track read more keys; fills the first page."""
+        if self._dims != self._track.dims:
+            self.beginResetModel()
+            self._dims = self._track.dims
+            self._shown = 0
+            self.endResetModel()
+        if self._shown < self._page_size:
+            self.fetchMore()
+
+class AnimationKeysDialog(QtWidgets.QDialog):
+    """
+    Controller tree of one node with the keys of the selected controller
+    in a paged table. Keys are streamed in by a CooperativeJob, one
+    controllerKeys call per chunk, so large tracks never block the UI.
+    """
+    def __init__(self, rows, title, helpers=None, parent=None):
+        super().__init__(parent)
+        self._helpers = helpers
+        self._tracks = {}  # controller handle -> KeyTrack
+        self._track = None
+        self._job = None
+        self.setWindowTitle(f"Animation Keys: {title}")
+        self.resize(1000, 700)
+        layout = QtWidgets.QVBoxLayout(self)
+        splitter = QtWidgets.QSplitter(QtCore.Qt.Horizontal)
+        layout.addWidget(splitter)
+
+        self.tree = QtWidgets.QTreeWidget()
+        self.tree.setHeaderLabels(["Track", "Controller", "Keys", "Kind"])
+        self.tree.currentItemChanged.connect(self.on_current_changed)
+        splitter.addWidget(self.tree)
+        stack = [self.tree.invisibleRootItem()]  # stack[d] is the item rows of depth d + 1 hang under
+        for depth, name, handle, cls, superclass, keys, kind, detail in rows:
+            del stack[depth:]
+            item = QtWidgets.QTreeWidgetItem(stack[-1], [name, cls, f"{keys:,}" if keys >= 0 else "", kind])
+            if handle:
+                item.setData(0, QtCore.Qt.UserRole, ("controller", handle, keys, detail))
+            stack.append(item)
+        self.tree.expandAll()
+        self.tree.resizeColumnToContents(0)
+
+        right = QtWidgets.QWidget()
+        right_layout = QtWidgets.QVBoxLayout(right)
+        right_layout.setContentsMargins(0, 0, 0, 0)
+        self.detail = QtWidgets.QPlainTextEdit()
+        self.detail.setReadOnly(True)
+        self.detail.setMaximumHeight(120)
+        self.detail.setVisible(False)
+        right_layout.addWidget(self.detail)
+        controls = QtWidgets.QHBoxLayout()
+        controls.addWidget(QtWidgets.QLabel("Go to frame:"))
+        self.frame_box = QtWidgets.QDoubleSpinBox()
+        self.frame_box.setRange(-1e9, 1e9)
+        self.frame_box.setDecimals(2)
+        controls.addWidget(self.frame_box)
+        self.btn_go = QtWidgets.QPushButton("Go")
+        self.btn_go.clicked.connect(self.go_to_frame)
+        controls.addWidget(self.btn_go)
+        controls.addStretch(1)
+        right_layout.addLayout(controls)
+        self.table = QtWidgets.QTableView()
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        right_layout.addWidget(self.table)
+        self.status = QtWidgets.QLabel("Select a controller to read its keys.")
+        right_layout.addWidget(self.status)
+        splitter.addWidget(right)
+        splitter.setSizes([450, 550])
+
+    def on_current_changed(self, item, previous):
+        data = item.data(0, QtCore.Qt.UserRole) if item is not None else None
+        if not (isinstance(data, tuple) and data[0] == "controller"):
+            return
+        _, handle, keys, detail = data
+        self.detail.setPlainText(detail)
+        self.detail.setVisible(bool(detail))
+        self.stop_loading()
+        track = self._tracks.get(handle)
+        if track is None:
+            track = self._tracks[handle] = KeyTrack(handle, self._helpers)
+        self._track = track
+        model = KeyTableModel(track, parent=self.table)
+        self.table.setModel(model)
+        model.track_grew()
+        if keys > 0 and not track.is_complete():
+            self._job = CooperativeJob(self.iter_load(track, model), parent=self, name="Animation Keys")
+            self._job.finished.connect(self.on_load_finished)
+            self._job.start()
+        self.update_status()
+
+    def iter_load(self, track, model):
+        for _ in track.load_steps():
+            model.track_grew()
+            self.update_status()
+            yield
+
+    def on_load_finished(self, completed):
+        job, self._job = self._job, None
+        if job is not None and job.error is not None:
+            self.status.setText(f"Reading keys failed: {job.error}")
+        else:
+            self.update_status()
+
+    def update_status(self):
+        track = self._track
+        if track is None:
+            return
+        total = "?" if track.total is None else f"{track.total:,}"
+        loading = "" if track.is_complete() else " (loading...)"
+        self.status.setText(f"{len(track):,} of {total} keys read{loading} - {track.value_class or 'no value'}")
+
+    def go_to_frame(self):
+        model = self.table.model()
+        if self._track is None or model is None or not len(self._track):
+            return
+        row = min(self._track.row_at_frame(self.frame_box.value()), len(self._track) - 1)
+        model.show_up_to(row)
+        index = model.index(row, 0)
+        self.table.scrollTo(index, QtWidgets.QAbstractItemView.PositionAtCenter)
+        self.table.selectRow(row)
+
+    def stop_loading(self):
+        if self._job is not None:
+            self._job.cancel()
+        self._job = None
+
+    def done(self, result):
+        self.stop_loading()
+        super().done(result)
+
+# --- PROFILER VIEW ---
+class ProfilerDialog(QtWidgets.QDialog):
+    """
+    Turns pymxs call profiling on and off and shows the Profiler summary:
+    one row per scope (inspector, job or scan phase) with its calls below,
+    slowest first. The recorded events can be exported as a Chrome trace.
+    """
+    def __init__(self, profiler, parent=None):
+        super().__init__(parent)
+        self._profiler = profiler
+        self.setWindowTitle("Profiler")
+        self.resize(800, 600)
+        layout = QtWidgets.QVBoxLayout(self)
+        controls = QtWidgets.QHBoxLayout()
+        self.enabled_box = QtWidgets.QCheckBox("Profile pymxs calls")
+        self.enabled_box.setChecked(active_profiler() is profiler)
+        self.enabled_box.toggled.connect(self.set_enabled)
+        controls.addWidget(self.enabled_box)
+        controls.addStretch(1)
+        for label, slot in (("Refresh", self.refresh), ("Reset", self.reset),
+                            ("Export Chrome Trace...", self.export_trace)):
+            button = QtWidgets.QPushButton(label)
+            button.clicked.connect(slot)
+            controls.addWidget(button)
+        layout.addLayout(controls)
+        self.tree = QtWidgets.QTreeWidget()
+        self.tree.setHeaderLabels(["Scope / Call", "Calls", "Total ms", "Mean us", "% of Scope"])
+        layout.addWidget(self.tree)
+        self.status = QtWidgets.QLabel("")
+        layout.addWidget(self.status)
+        self.refresh()
+
+    def set_enabled(self, enabled):
+        if enabled:
+            enable_profiling(self._profiler)
+        else:
+            disable_profiling()
+        self.refresh()
+
+    def reset(self):
+        self._profiler.reset()
+        self.refresh()
+
+    def refresh(self):
+        self.tree.clear()
+        total_calls = 0
+        for scope, seconds, calls in self._profiler.summary():
+            count = sum(c[1] for c in calls)
+            in_calls = sum(c[2] for c in calls)
+            total_calls += count
+            item = QtWidgets.QTreeWidgetItem(self.tree, [scope, f"{count:,}", f"{seconds * 1000:.1f}", "",
+                                                         f"{100 * in_calls / seconds:.0f}" if seconds else ""])
+            for call, n, call_seconds in calls:
+                QtWidgets.QTreeWidgetItem(item, [call, f"{n:,}", f"{call_seconds * 1000:.1f}",
+                                                 f"{call_seconds * 1e6 / n:.1f}",
+                                                 f"{100 * call_seconds / seconds:.0f}" if seconds else ""])
+        for col in range(1, 5):
+            self.tree.resizeColumnToContents(col)
+        self.tree.setColumnWidth(0, 380)
+        state = "on" if active_profiler() is self._profiler else "off"
+        self.status.setText(f"Profiling is {state}. {total_calls:,} calls, "
+                            f"{len(self._profiler.events):,} trace events recorded.")
+
+    def export_trace(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Chrome Trace", "max_inspector_trace.json",
+                                                        "Chrome Trace (*.json)")
+        if not path:
+            return
+        try:
+            count = self._profiler.write_chrome_trace(path)
+        except Exception as e:
+            self.status.setText(f"Could not write the trace: {e}")
+            return
+        self.status.setText(f"Wrote {count:,} events to {path}. Open it in chrome://tracing or ui.perfetto.dev.")
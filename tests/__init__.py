@@ -0,0 +1 @@
+"""Tests of the max_inspector engine against the fake pymxs runtime (fake_pymxs)."""
@@ -0,0 +1,32 @@
+"""
+Every test that takes the `rt` fixture runs against a fresh FakeRuntime:
+the engine's `rt` is routed to it with runtime.set_runtime() and routed
+back to pymxs afterwards.
+"""
+import sys
+
+import pytest
+
+from tests import fake_pymxs
+
+# Modules that import pymxs themselves (runtime.attime) get the fake module
+sys.modules.setdefault("pymxs", fake_pymxs)
+
+from max_inspector import runtime  # noqa: E402
+from max_inspector.bulk import get_bulk_helpers  # noqa: E402
+
+
+@pytest.fixture
+def rt(monkeypatch):
+    fake = fake_pymxs.FakeRuntime()
+    monkeypatch.setattr(fake_pymxs, "runtime", fake)  # fake_pymxs.attime() reads the module's runtime
+    previous = runtime.runtime_override()
+    runtime.set_runtime(fake)
+    yield fake
+    runtime.set_runtime(previous)
+
+
+@pytest.fixture
+def helpers(rt):
+    """The bulk helpers (FakeBulkHelpers) defined on the fake runtime."""
+    return get_bulk_helpers()
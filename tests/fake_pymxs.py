@@ -0,0 +1,889 @@
+"""
+Stand-in for the ``pymxs`` module so the inspector can be imported, tested
+and benchmarked outside of 3ds Max.
+
+Every operation that would cross the Python/MAXScript boundary in a real
+session (global lookups on ``runtime``, calling a MAXScript function,
+reading a property of a MAXScript value, iterating a MAXScript array,
+converting a value to a string) is counted in ``runtime.calls``, so the
+benchmarks can compare how many round-trips each code path makes.
+
+The MAXScript bulk helpers (``MaxInspectorBulk``) cannot be interpreted
+here; when the inspector executes their definition, ``FakeBulkHelpers``
+is installed in their place and implements the same functions in Python
+with the same output format.
+"""
+import bisect
+import collections
+import contextlib
+import random
+
+SUPERCLASS_NAMES = ["Modifier", "Light", "GeometryClass", "Shape", "Camera", "Helper",
+                    "SpacewarpObject", "Material", "TextureMap", "RenderEffect",
+                    "Atmospheric", "Controller"]
+
+ANIM_HANDLE_BASE = 1 << 40
+PRIMITIVE_CLASSES = [(bool, "BooleanClass"), (int, "Integer"), (float, "Float"),
+                     (str, "String"), (type(None), "UndefinedClass")]
+
+
+def mxs_escape(value):
+    """Python twin of MaxInspectorBulkDef.esc()."""
+    s = "" if value is None else str(value)
+    if s == "undefined":
+        s = ""
+    return s.replace("\\", "\\\\").replace("\t", "\\t").replace("\r", "\\r").replace("\n", "\\n")
+
+
+class FakeValue:
+    """Base for MAXScript values: attribute reads and str() cross the boundary."""
+    _runtime = None
+
+    def __getattribute__(self, name):
+        if not name.startswith("_"):
+            object.__getattribute__(self, "_runtime").count(f".{name}")
+        return object.__getattribute__(self, name)
+
+    def __str__(self):
+        self._runtime.count("str()")
+        return self._repr()
+
+    def _repr(self):
+        return object.__repr__(self)
+
+
+class FakeArray(list):
+    """MAXScript array: every element read crosses the boundary."""
+
+    def __init__(self, runtime, items=()):
+        super().__init__(items)
+        self._runtime = runtime
+
+    def __iter__(self):
+        for item in list.__iter__(self):
+            self._runtime.count("array[i]")
+            yield item
+
+    def __getitem__(self, index):
+        self._runtime.count("array[i]")
+        return list.__getitem__(self, index)
+
+    @property
+    def count(self):
+        self._runtime.count(".count")
+        return len(self)
+
+
+class FakeClass(FakeValue):
+    def __init__(self, runtime, name, superclass, class_id="", plugin=""):
+        self._runtime = runtime
+        self._name = name
+        self._superclass = superclass
+        self._class_id = class_id
+        self._plugin = plugin
+
+    def _repr(self):
+        return self._name
+
+
+class FakeSuperClass(FakeValue):
+    def __init__(self, runtime, name):
+        self._runtime = runtime
+        self._name = name
+        self._classes = []
+
+    @property
+    def classes(self):
+        return FakeArray(self._runtime, self._classes)
+
+    def _repr(self):
+        return self._name
+
+
+class FakeNode(FakeValue):
+    """A scene node; the scene itself lives in flat lists on the runtime."""
+
+    def __init__(self, runtime, index):
+        self._runtime = runtime
+        self._index = index
+
+    @property
+    def name(self):
+        return self._runtime._node_names[self._index]
+
+    @property
+    def parent(self):
+        parent = self._runtime._node_parents[self._index]
+        return None if parent == 0 else FakeNode(self._runtime, parent)
+
+    @property
+    def children(self):
+        rt = self._runtime
+        return FakeArray(rt, [FakeNode(rt, i) for i in rt._node_children[self._index]])
+
+    @property
+    def _object(self):
+        return self._runtime._node_object(self._index)
+
+    @property
+    def baseObject(self):
+        return self._object
+
+    @property
+    def _props(self):
+        return self._object._props
+
+    @property
+    def material(self):
+        return self._object.material
+
+    @property
+    def modifiers(self):
+        return self._object.modifiers
+
+    @property
+    def min(self):
+        return FakePoint3(self._runtime, self._runtime._node_geometry(self._index)[2])
+
+    @property
+    def max(self):
+        return FakePoint3(self._runtime, self._runtime._node_geometry(self._index)[3])
+
+    @property
+    def layer(self):
+        return FakeLayer(self._runtime, self._runtime._node_layers[self._index])
+
+    @property
+    def numSubs(self):
+        return len(self._runtime._node_subanims.get(self._index, ()))
+
+    def _repr(self):
+        return f"${self._runtime._node_names[self._index]}"
+
+
+class FakeWrapped(FakeValue):
+    """A MAXScript value pymxs hands over as a wrapper (Point3, Color, Name...)."""
+
+    def __init__(self, runtime, class_name, text):
+        self._runtime = runtime
+        self._class_name = class_name
+        self._text = text
+
+    def _repr(self):
+        return self._text
+
+
+class FakePoint3(FakeWrapped):
+    def __init__(self, runtime, xyz):
+        super().__init__(runtime, "Point3", "[%g,%g,%g]" % tuple(xyz))
+        self.x, self.y, self.z = xyz
+
+
+class FakeObject(FakeValue):
+    """A MAXScript object with properties: a node, material, modifier or custom attribute block."""
+
+    def __init__(self, runtime, cls, props, name="", ca_sources=(), scripted=False):
+        self._runtime = runtime
+        self._cls = cls
+        self._props = dict(props)
+        self._name = name
+        self._ca_sources = list(ca_sources)
+        self._scripted = scripted
+        self.material = None
+        self.modifiers = FakeArray(runtime)
+        self._refs = []  # (slot, FakeObject) reference graph children
+
+    def _add_ref(self, slot, child):
+        self._refs.append((slot, child))
+        return child
+
+    @property
+    def name(self):
+        return self._name
+
+    def _repr(self):
+        return f"{self._cls._name}:{self._name}"
+
+
+class FakeTime(FakeWrapped):
+    def __init__(self, runtime, frame):
+        super().__init__(runtime, "Time", "%gf" % frame)
+        self.frame = frame
+
+
+class FakeController(FakeObject):
+    """
+    A controller with sorted (frame, value numbers) keys; .value is the
+    value of the last key at or before the current `attime` frame. Script
+    and expression controllers expose .script / .getExpression().
+    """
+
+    def __init__(self, runtime, cls, keys=(), value_class="Float", keyable=True, script=None, expression=None):
+        super().__init__(runtime, cls, {})
+        self._keys = list(keys)
+        self._frames = [k[0] for k in self._keys]
+        self._value_class = value_class
+        self._keyable = keyable
+        if script is not None:
+            self.script = script
+        if expression is not None:
+            self.getExpression = lambda: expression
+
+    @property
+    def value(self):
+        if not self._keys:
+            numbers = (0.0,) * {"Float": 1, "Point3": 3}[self._value_class]
+        else:
+            i = max(bisect.bisect_right(self._frames, self._runtime._time) - 1, 0)
+            numbers = self._keys[i][1]
+        return numbers[0] if self._value_class == "Float" else FakePoint3(self._runtime, numbers)
+
+
+class FakeSubAnim(FakeValue):
+    """A sub-anim slot: a name, maybe a controller, and sub-anims of its own."""
+
+    def __init__(self, runtime, name, controller=None, subs=()):
+        self._runtime = runtime
+        self._name = name
+        self._controller = controller
+        self._subs = list(subs)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def controller(self):
+        return self._controller
+
+    @property
+    def numSubs(self):
+        return len(self._subs)
+
+
+class FakeLayer(FakeValue):
+    def __init__(self, runtime, name):
+        self._runtime = runtime
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+
+class FakeNodeEventCallback(FakeValue):
+    """NodeEventCallback: handlers receive (event name, [anim handles])."""
+
+    def __init__(self, runtime, handlers):
+        self._runtime = runtime
+        self._handlers = handlers
+        self.enabled = True
+
+    def _fire(self, event, handles):
+        handler = self._handlers.get(event)
+        if self.enabled and handler is not None:
+            handler(event, list(handles))
+
+
+class FakeMesh(FakeValue):
+    """A TriMesh from snapshotAsMesh: arrays of one node's mesh."""
+
+    def __init__(self, runtime, mesh):
+        self._runtime = runtime
+        self._mesh = mesh
+
+
+class FakeCustAttribDef(FakeValue):
+    """A custom attribute definition; its source text is what getDefSource returns."""
+
+    def __init__(self, runtime, source):
+        self._runtime = runtime
+        self._source = source
+        self.name = source.split()[1] if len(source.split()) > 1 else "CA"
+
+
+class FakeStruct(FakeValue):
+    """A MAXScript struct value (e.g. custAttributes) whose members are FakeFunctions."""
+
+    def __init__(self, runtime, name, members):
+        self._runtime = runtime
+        for member, fn in members.items():
+            object.__setattr__(self, member, FakeFunction(runtime, f"{name}.{member}", fn))
+
+
+class FakeFunction:
+    """A MAXScript function value; calling it crosses the boundary."""
+
+    def __init__(self, runtime, name, fn):
+        self._runtime = runtime
+        self._name = name
+        self._fn = fn
+
+    def __call__(self, *args, **kwargs):
+        self._runtime.count(f"{self._name}()")
+        return self._fn(*args, **kwargs)
+
+
+class FakeBulkHelpers:
+    """Python implementation of the MaxInspectorBulkDef struct."""
+
+    def __init__(self, runtime, version):
+        self._runtime = runtime
+        self.version = version
+
+    def __getattribute__(self, name):
+        value = object.__getattribute__(self, name)
+        if name.startswith("_") or name == "version":
+            return value
+        return FakeFunction(object.__getattribute__(self, "_runtime"), f"MaxInspectorBulk.{name}", value)
+
+    def scanClasses(self, superclass):
+        return "".join(f"{mxs_escape(c._name)}\t{mxs_escape(c._class_id)}\t{mxs_escape(c._plugin)}\n"
+                       for c in superclass._classes)
+
+    def sceneChildren(self, parent_handle, start, count):
+        rt = self._runtime
+        kids = rt._node_children[parent_handle]
+        lines = [f"{len(kids)}\n"]
+        for i in kids[start:start + count]:
+            lines.append(f"{i}\t{mxs_escape(rt._node_names[i])}\t{len(rt._node_children[i])}\tBox\n")
+        return "".join(lines)
+
+    def nodeInfo(self, handles):
+        rt = self._runtime
+        return "".join(f"{h}\t{rt._node_parents[h]}\t{mxs_escape(rt._node_names[h])}\t"
+                       f"{len(rt._node_children[h])}\tBox\n"
+                       for h in handles if rt._node_alive[h])
+
+    def nodeHandles(self, scope, layer_name):
+        rt = self._runtime
+        if scope == "selection":
+            handles = rt.selected
+        else:
+            handles = [h for h in range(1, len(rt._node_names)) if rt._node_alive[h]
+                       and (scope != "layer" or rt._node_layers[h] == layer_name)]
+        return "".join(f"{h}\n" for h in handles)
+
+    def objectRecords(self, handles, with_props):
+        rt = self._runtime
+        return "".join(line for h in handles if rt._node_alive[h] for line in self._object_lines(h, with_props))
+
+    def snapshotRecords(self, handles):
+        rt = self._runtime
+        out = []
+        for h in handles:
+            if not rt._node_alive[h]:
+                continue
+            out.extend(self._object_lines(h, True))
+            path, p = [rt._node_names[h]], rt._node_parents[h]
+            while p:
+                path.append(rt._node_names[p])
+                p = rt._node_parents[p]
+            out.append(f"H\t{mxs_escape('/'.join(reversed(path)))}\n")
+            _, _, bmin, _ = rt._node_geometry(h)
+            out.append(f"C\tposition\tPosition_XYZ\t[{bmin[0]:g},{bmin[1]:g},{bmin[2]:g}]\n")
+            out.append("C\trotation\tEuler_XYZ\t(quat 0 0 0 1)\n")
+            out.append("C\tscale\tBezier_Scale\t[1,1,1]\n")
+            out.append(f"U\t{mxs_escape(rt.user_props.get(h, ''))}\n")
+        return "".join(out)
+
+    def _object_lines(self, h, with_props):
+        rt = self._runtime
+        obj = rt._node_object(h)
+        fields = vars(obj)  # read the fake's state without counting crossings
+        mat, mods = fields["material"], list(list.__iter__(fields["modifiers"]))
+        yield (f"O\t{h}\t{mxs_escape(rt._node_names[h])}\t{obj._cls._name}\t"
+               f"{obj._cls._superclass._name}\t{mxs_escape(rt._node_layers[h])}\t"
+               f"{mxs_escape(mat._repr() if mat else '')}\t{mat._cls._name if mat else ''}\t{len(mods)}\n")
+        for i, m in enumerate(mods, 1):
+            yield f"M\t{i}\t{mxs_escape(m._name)}\t{m._cls._name}\n"
+        if with_props:
+            owners = [("", obj)] + ([("mat", mat)] if mat else []) + [(str(i), m) for i, m in enumerate(mods, 1)]
+            for owner, value in owners:
+                for line in self._prop_lines(value):
+                    yield f"P\t{owner}\t{line}\n"
+
+    def propSnapshot(self, value):
+        return "".join(f"{line}\n" for line in self._prop_lines(value))
+
+    def _prop_lines(self, value):
+        class_of = self._runtime._globals["classOf"]._fn
+        for name, val in value._props.items():
+            yield (f"{mxs_escape(name)}\t{mxs_escape(class_of(val)._name)}\t"
+                   f"{mxs_escape(val._repr() if isinstance(val, FakeValue) else val)}")
+
+    def sceneStats(self, handles):
+        rt = self._runtime
+        names, nums = [], []
+        for h in handles:
+            if not rt._node_alive[h]:
+                continue
+            obj = rt._node_object(h)
+            mat = vars(obj)["material"]
+            faces, verts, bmin, bmax = rt._node_geometry(h)
+            names.append(f"{obj._cls._name}\t{obj._cls._superclass._name}\n")
+            nums.append(f"{h} {faces} {verts} {len(vars(obj)['modifiers'])} "
+                        f"{rt._anim_handle(mat) if mat else 0} "
+                        f"{bmin[0]} {bmin[1]} {bmin[2]} {bmax[0]} {bmax[1]} {bmax[2]}\n")
+        return FakeArray(rt, ["".join(names), "".join(nums)])
+
+    def refChildren(self, handles):
+        rt = self._runtime
+        out = []
+        for h in handles:
+            if h < ANIM_HANDLE_BASE:
+                if not (0 < h < len(rt._node_names) and rt._node_alive[h]):
+                    continue
+                obj = rt._node_object(h)
+                fields = vars(obj)
+                refs = [("Object", obj), ("Material", fields["material"])]
+                refs += [(f"Modifier {i}", m) for i, m in enumerate(list.__iter__(fields["modifiers"]), 1)]
+            else:
+                anim = rt._anims.get(h)
+                refs = anim._refs if anim is not None else []
+            for slot, child in refs:
+                if child is not None:
+                    out.append(f"{h}\t{rt._anim_handle(child)}\t{mxs_escape(slot)}\t{child._cls._name}\t"
+                               f"{child._cls._superclass._name}\t{mxs_escape(child._name)}\n")
+        return "".join(out)
+
+    def controllerTree(self, handle, max_depth):
+        rt = self._runtime
+        out = []
+
+        def walk(subs, depth):
+            for sa in subs:
+                c = sa._controller
+                if c is None:
+                    out.append(f"{depth}\t{mxs_escape(sa._name)}\t0\t\t\t-1\t\t\n")
+                else:
+                    fields = vars(c)
+                    keys = len(c._keys) if c._keyable else -1
+                    if "script" in fields:
+                        kind, detail = "script", fields["script"]
+                    elif "getExpression" in fields:
+                        kind, detail = "expression", fields["getExpression"]()
+                    elif c._cls._name.lower().endswith("_list"):
+                        kind, detail = "list", "active 1"
+                    else:
+                        kind, detail = ("keyframe" if keys >= 0 else "procedural"), ""
+                    out.append(f"{depth}\t{mxs_escape(sa._name)}\t{rt._anim_handle(c)}\t{c._cls._name}\t"
+                               f"{c._cls._superclass._name}\t{keys}\t{kind}\t{mxs_escape(detail)}\n")
+                if depth < max_depth:
+                    walk(sa._subs, depth + 1)
+
+        walk(rt._node_subanims.get(handle, ()), 1)
+        return "".join(out)
+
+    def controllerKeys(self, handle, start, count):
+        rt = self._runtime
+        c = rt._anims.get(handle)
+        keys = c._keys if c is not None and c._keyable else []
+        page = keys[start:start + count]
+        dims = {"Float": 1, "Point3": 3}[c._value_class] if page else 0
+        times = "".join(f"{frame:g} " for frame, _ in page)
+        values = "".join(f"{x:g} " for _, numbers in page for x in numbers)
+        return FakeArray(rt, [len(keys), dims, c._value_class if page else "", times, values])
+
+    def assetPaths(self):
+        rt = self._runtime
+        out, seen = [], set()
+
+        def walk(value):
+            if value is None or id(value) in seen:
+                return
+            seen.add(id(value))
+            for name, val in value._props.items():
+                if isinstance(val, str):
+                    if val and any(word in name.lower() for word in ("file", "path", "mapname", "source")):
+                        out.append(f"{rt._anim_handle(value)}\t{value._cls._name}\t{mxs_escape(value._name)}\t"
+                                   f"{mxs_escape(name)}\t{mxs_escape(val)}\n")
+                elif isinstance(val, FakeObject) and val._cls._superclass._name in ("Material", "TextureMap"):
+                    walk(val)
+            for _, child in value._refs:
+                if child._cls._superclass._name in ("Material", "TextureMap"):
+                    walk(child)
+
+        for h in range(1, len(rt._node_names)):
+            if rt._node_alive[h]:
+                fields = vars(rt._node_object(h))
+                walk(fields["material"])
+                for m in list.__iter__(fields["modifiers"]):
+                    walk(m)
+        walk(rt._globals["environmentMap"])
+        return "".join(out)
+
+    def pluginDirs(self):
+        return "".join(f"{mxs_escape(d)}\n" for d in self._runtime.plugin_dirs)
+
+    def writeMesh(self, handle, path):
+        import numpy as np
+        mesh = self._runtime._node_meshes.get(handle)
+        if mesh is None:
+            return ""
+        verts, faces, normals, maps = mesh
+        info = [f"{len(verts)} {len(faces)}"]
+        with open(path, "wb") as f:
+            np.asarray(verts, dtype="<f4").tofile(f)
+            np.asarray(faces, dtype="<i4").tofile(f)
+            np.asarray(normals, dtype="<f4").tofile(f)
+            for ch in sorted(maps):
+                map_verts, map_faces = maps[ch]
+                np.asarray(map_verts, dtype="<f4").tofile(f)
+                np.asarray(map_faces, dtype="<i4").tofile(f)
+                info.append(f"{ch}:{len(map_verts)}:{len(map_faces)}")
+        return " ".join(info)
+
+
+class FakeRuntime:
+    def __init__(self):
+        self.calls = collections.Counter()
+        self.plugin_dirs = []
+        self._globals = {}
+        for name in SUPERCLASS_NAMES:
+            self._globals[name] = FakeSuperClass(self, name)
+        self._globals["MaxInspectorBulk"] = None
+        self._globals["environmentMap"] = None
+        self._globals["maxFilePath"] = ""  # the scene folder, "" for an unsaved scene
+        self._globals["currentTime"] = FakeTime(self, 0)
+        self._value_classes = {}
+        self._anim_handles = {}
+        self._anims = {}
+        self.load_classes([("Bezier_Float", "Controller", "#(8192, 0)", "")])
+        # Scene: index 0 is the root node; a node's index is also its anim handle
+        self._reset_scene()
+        self._node_callbacks = []
+
+        def class_of(value):
+            if isinstance(value, FakeClass):
+                return value
+            if isinstance(value, FakeObject):
+                return value._cls
+            if isinstance(value, FakeNode):
+                return value._object._cls
+            if isinstance(value, FakeWrapped):
+                return self._value_class(value._class_name)
+            for py_type, class_name in PRIMITIVE_CLASSES:
+                if isinstance(value, py_type):
+                    return self._value_class(class_name)
+            raise RuntimeError("classOf: unsupported value in fake runtime")
+
+        def super_class_of(value):
+            if isinstance(value, FakeClass):
+                return value._superclass
+            if isinstance(value, (FakeObject, FakeNode)):
+                return class_of(value)._superclass
+            raise RuntimeError("superClassOf: unsupported value in fake runtime")
+
+        def class_id(value):
+            if isinstance(value, FakeClass) and value._class_id:
+                return value._class_id
+            raise RuntimeError("classID: no class id")
+
+        def plugin_name(value):
+            if isinstance(value, FakeClass) and value._plugin:
+                return value._plugin
+            raise RuntimeError("pluginName: unknown")
+
+        def get_anim_by_handle(handle):
+            if handle >= ANIM_HANDLE_BASE:
+                return self._anims.get(handle)
+            if 0 <= handle < len(self._node_names) and self._node_alive[handle]:
+                return FakeNode(self, handle)
+            return None
+
+        def get_handle_by_anim(value):
+            return value._index if isinstance(value, FakeNode) else self._anim_handle(value)
+
+        def is_valid_node(node):
+            return isinstance(node, FakeNode) and self._node_alive[node._index]
+
+        def node_event_callback(**handlers):
+            callback = FakeNodeEventCallback(self, handlers)
+            self._node_callbacks.append(callback)
+            return callback
+
+        def get_prop_names(value):
+            return FakeArray(self, [FakeWrapped(self, "Name", n) for n in value._props])
+
+        def get_property(value, name):
+            name = name._text if isinstance(name, FakeWrapped) else name
+            try:
+                return value._props[name]
+            except KeyError:
+                raise RuntimeError(f"Unknown property: \"{name}\"") from None
+
+        def get_polygon_count(node):
+            faces, verts, _, _ = self._node_geometry(node._index)
+            return FakeArray(self, [faces, verts])
+
+        def get_sub_anim(value, index):
+            subs = self._node_subanims.get(value._index, ()) if isinstance(value, FakeNode) else value._subs
+            return subs[index - 1]
+
+        def num_keys(controller):
+            return len(controller._keys) if controller._keyable else -1
+
+        def get_key_time(controller, index):
+            return FakeTime(self, controller._keys[index - 1][0])
+
+        def gc(light=False):
+            self._node_callbacks = [c for c in self._node_callbacks if c.enabled]
+
+        def get_defs(value):
+            sources = getattr(value, "_ca_sources", ()) if isinstance(value, FakeObject) else ()
+            return FakeArray(self, [FakeCustAttribDef(self, src) for src in sources]) if sources else None
+
+        self._globals["custAttributes"] = FakeStruct(self, "custAttributes", {
+            "getDefs": get_defs,
+            "getDefSource": lambda d: d._source,
+            "get": lambda value, d: FakeObject(self, self._value_class(d.name), {})})
+
+        def snapshot_as_mesh(node):
+            mesh = self._node_meshes.get(node._index)
+            if mesh is None:
+                raise RuntimeError("no mesh")
+            return FakeMesh(self, mesh)
+
+        def point(values, offset=0.0):
+            return FakePoint3(self, [float(x) + offset for x in values])
+
+        def face(values):
+            return point(values, 1.0)
+
+        def sub_refs(value, superclass_name):
+            return [child for _, child in getattr(value, "_refs", ()) if child._cls._superclass._name == superclass_name]
+
+        self._globals["meshop"] = FakeStruct(self, "meshop", {
+            "getNumMaps": lambda m: max(m._mesh[3], default=0) + 1,
+            "getMapSupport": lambda m, ch: ch in m._mesh[3],
+            "getNumMapVerts": lambda m, ch: len(m._mesh[3][ch][0]),
+            "getNumMapFaces": lambda m, ch: len(m._mesh[3][ch][1]),
+            "getMapVert": lambda m, ch, i: point(m._mesh[3][ch][0][i - 1]),
+            "getMapFace": lambda m, ch, i: face(m._mesh[3][ch][1][i - 1])})
+        for name, fn in (("snapshotAsMesh", snapshot_as_mesh),
+                         ("getNumVerts", lambda m: len(m._mesh[0])), ("getNumFaces", lambda m: len(m._mesh[1])),
+                         ("getVert", lambda m, i: point(m._mesh[0][i - 1])),
+                         ("getFace", lambda m, i: face(m._mesh[1][i - 1])),
+                         ("getNormal", lambda m, i: point(m._mesh[2][i - 1])),
+                         ("delete", lambda value: None),
+                         ("getNumSubMtls", lambda v: len(sub_refs(v, "Material"))),
+                         ("getSubMtl", lambda v, i: sub_refs(v, "Material")[i - 1]),
+                         ("getNumSubTexmaps", lambda v: len(sub_refs(v, "TextureMap"))),
+                         ("getSubTexmap", lambda v, i: sub_refs(v, "TextureMap")[i - 1])):
+            self._globals[name] = FakeFunction(self, name, fn)
+
+        for name, fn in (("classOf", class_of), ("superClassOf", super_class_of),
+                         ("classID", class_id), ("pluginName", plugin_name),
+                         ("getAnimByHandle", get_anim_by_handle),
+                         ("getHandleByAnim", get_handle_by_anim),
+                         ("isValidNode", is_valid_node),
+                         ("isMSPlugin", lambda v: bool(getattr(v, "_scripted", False))),
+                         ("isMSCustAttrib", lambda v: False),
+                         ("getPolygonCount", get_polygon_count),
+                         ("getPropNames", get_prop_names), ("getProperty", get_property),
+                         ("getSubAnim", get_sub_anim), ("numKeys", num_keys),
+                         ("getKeyTime", get_key_time),
+                         ("NodeEventCallback", node_event_callback), ("gc", gc),
+                         ("execute", self._execute)):
+            self._globals[name] = FakeFunction(self, name, fn)
+
+    def _value_class(self, name):
+        cls = self._value_classes.get(name)
+        if cls is None:
+            cls = self._value_classes[name] = FakeClass(self, name, self._globals["Controller"])
+        return cls
+
+    # --- benchmark setup ---
+    def load_classes(self, rows):
+        """Replaces the class lists with (name, superclass name, classid, plugin) rows."""
+        for name in SUPERCLASS_NAMES:
+            self._globals[name]._classes = []
+        for cname, sc, cid, pname in rows:
+            superclass = self._globals[sc]
+            cls = FakeClass(self, cname, superclass, cid, pname)
+            superclass._classes.append(cls)
+            self._globals.setdefault(cname, cls)
+
+    def make_object(self, class_name, superclass_name, props, **kwargs):
+        """Creates a FakeObject of a (possibly new) class; props maps names to values."""
+        cls = self._globals.get(class_name)
+        if not isinstance(cls, FakeClass):
+            superclass = self._globals[superclass_name]
+            cls = FakeClass(self, class_name, superclass, f"#({len(self._globals)}, 0)")
+            superclass._classes.append(cls)
+            self._globals[class_name] = cls
+        return FakeObject(self, cls, props, **kwargs)
+
+    def make_controller(self, class_name, keys=(), value_class="Float", **kwargs):
+        """Creates a FakeController of a (possibly new) Controller class; keys are (frame, numbers) pairs."""
+        cls = self._globals.get(class_name)
+        if not isinstance(cls, FakeClass):
+            cls = FakeClass(self, class_name, self._globals["Controller"], f"#({len(self._globals)}, 0)")
+            self._globals["Controller"]._classes.append(cls)
+            self._globals[class_name] = cls
+        return FakeController(self, cls, keys, value_class, **kwargs)
+
+    def sub_anim(self, name, controller=None, subs=()):
+        return FakeSubAnim(self, name, controller, subs)
+
+    def animate_node(self, handle, subs):
+        """Sets the sub-anims (FakeSubAnim list) of a node."""
+        self._node_subanims[handle] = list(subs)
+
+    def set_mesh(self, handle, verts, faces, normals=None, maps=None):
+        """Gives node `handle` a mesh: (n, 3) vertices and 0-based faces, vertex normals, {channel: (verts, faces)}."""
+        if normals is None:
+            normals = [(0.0, 0.0, 1.0)] * len(verts)
+        self._node_meshes[handle] = (verts, faces, normals, dict(maps or {}))
+
+    def wrap(self, class_name, text):
+        return FakeWrapped(self, class_name, text)
+
+    def load_scene(self, count, nested=0.3, seed=0):
+        """Builds a scene of `count` nodes; a `nested` share of them are parented under earlier nodes."""
+        rnd = random.Random(seed)
+        self._reset_scene()
+        for i in range(1, count + 1):
+            parent = rnd.randrange(1, i) if i > 1 and rnd.random() < nested else 0
+            self._add_node(f"Node_{i:07d}", parent)
+
+    def dress_nodes(self, make_object, layers=("0",)):
+        """Gives every node the FakeObject make_object(handle) returns (props, material, modifiers) and a layer."""
+        for h in range(1, len(self._node_names)):
+            self._node_objects[h] = make_object(h)
+            self._node_layers[h] = layers[h % len(layers)]
+
+    def _node_geometry(self, handle):
+        """Deterministic synthetic (faces, vertices, bbox min, bbox max) of a node."""
+        faces = (handle * 7919) % 50000 if handle % 7 else 0
+        x, y = (handle * 31) % 1000 - 500.0, (handle * 17) % 1000 - 500.0
+        return faces, faces // 2 + (2 if faces else 0), (x, y, 0.0), (x + 10.0, y + 10.0, 25.0)
+
+    def _anim_handle(self, value):
+        """Anim handle of a non-node value; node handles stay below ANIM_HANDLE_BASE."""
+        key = id(value)
+        handle = self._anim_handles.get(key)
+        if handle is None:
+            handle = self._anim_handles[key] = ANIM_HANDLE_BASE + len(self._anim_handles)
+            self._anims[handle] = value
+        return handle
+
+    def _node_object(self, handle):
+        obj = self._node_objects.get(handle)
+        if obj is None:
+            obj = self._node_objects[handle] = self.make_object("Box", "GeometryClass", {})
+        return obj
+
+    def _reset_scene(self):
+        self._time = 0.0
+        self._node_subanims = {}
+        self._node_meshes = {}
+        self.selected = []
+        self.user_props = {}
+        self._node_objects = {}
+        self._node_names = ["<root>"]
+        self._node_parents = [0]
+        self._node_children = [[]]
+        self._node_alive = [True]
+        self._node_layers = ["0"]
+
+    def _add_node(self, name, parent):
+        handle = len(self._node_names)
+        self._node_names.append(name)
+        self._node_parents.append(parent)
+        self._node_children.append([])
+        self._node_alive.append(True)
+        self._node_layers.append("0")
+        self._node_children[parent].append(handle)
+        return handle
+
+    # --- scene edits that fire NodeEventCallbacks ---
+    def create_nodes(self, names, parent=0):
+        handles = [self._add_node(name, parent) for name in names]
+        self._fire_node_event("added", handles)
+        return handles
+
+    def delete_nodes(self, handles):
+        for h in handles:
+            self._node_alive[h] = False
+            self._node_children[self._node_parents[h]].remove(h)
+        self._fire_node_event("deleted", handles)
+
+    def rename_node(self, handle, name):
+        self._node_names[handle] = name
+        self._fire_node_event("nameChanged", [handle])
+
+    def edit_nodes(self, handles, event="geometryChanged"):
+        """Reports an edit of existing nodes (a NodeEventCallback event such as #materialOtherEvent)."""
+        self._fire_node_event(event, handles)
+
+    def _fire_node_event(self, event, handles):
+        for callback in list(self._node_callbacks):
+            callback._fire(event, handles)
+
+    def count(self, what):
+        self.calls[what] += 1
+
+    def reset_counts(self):
+        self.calls.clear()
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    # --- runtime surface ---
+    def _execute(self, source):
+        if "struct MaxInspectorBulkDef" in source:
+            version = int(source.split("version =", 1)[1].split(",", 1)[0])
+            self._globals["MaxInspectorBulk"] = FakeBulkHelpers(self, version)
+            return None
+        if "fn MaxInspectorSchemaKey" in source:
+            self._globals["MaxInspectorSchemaKey"] = FakeFunction(self, "MaxInspectorSchemaKey", self._schema_key)
+            return None
+        raise NotImplementedError("fake runtime cannot evaluate arbitrary MAXScript")
+
+    def _schema_key(self, value):
+        """Python twin of the MaxInspectorSchemaKey function."""
+        if isinstance(value, FakeNode):
+            owners = [value._object]
+            value = value._object
+        elif isinstance(value, FakeObject):
+            owners = [value]
+        else:
+            return ""
+        cls = value._cls
+        if value._scripted or not cls._class_id:
+            return ""
+        parts = [cls._superclass._name, cls._name, cls._class_id]
+        parts += [str(hash(source)) for owner in owners for source in owner._ca_sources]
+        return "|".join(parts)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        self.count(f"rt.{name}")
+        if name == "rootNode":
+            return FakeNode(self, 0)
+        if name == "selection":
+            return FakeArray(self, [FakeNode(self, i) for i in self.selected if self._node_alive[i]])
+        if name == "objects":
+            return FakeArray(self, [FakeNode(self, i) for i in range(1, len(self._node_names))
+                                    if self._node_alive[i]])
+        try:
+            return self._globals[name]
+        except KeyError:
+            raise AttributeError(f"fake runtime has no attribute '{name}'") from None
+
+
+runtime = FakeRuntime()
+
+
+@contextlib.contextmanager
+def attime(t):
+    """pymxs.attime: evaluates controller values at time t."""
+    previous, runtime._time = runtime._time, vars(t)["frame"] if isinstance(t, FakeTime) else float(t)
+    try:
+        yield
+    finally:
+        runtime._time = previous
@@ -0,0 +1,71 @@
+import pytest
+
+from max_inspector.anim import KeyTrack, read_controller_tree
+
+KEYS = 23
+
+
+def build_node(rt):
+    """Node 1: a Position_XYZ with three keyed axes, a Point3 scale track, a script, and a branch with no controller."""
+    def track(offset):
+        return rt.make_controller("Bezier_Float", [(float(f * 2), (float(f + offset),)) for f in range(KEYS)])
+
+    axes = [rt.sub_anim(f"{axis} Position", track(i * 100)) for i, axis in enumerate("XYZ")]
+    scale = rt.make_controller("Bezier_Scale", [(0.0, (1.0, 1.0, 1.0)), (10.0, (2.0, 2.0, 2.5))],
+                               value_class="Point3")
+    transform = rt.sub_anim("Transform", rt.make_controller("Position_Rotation_Scale", keyable=False), [
+        rt.sub_anim("Position", rt.make_controller("Position_XYZ", keyable=False), axes),
+        rt.sub_anim("Scale", scale)])
+    params = rt.sub_anim("Object (Box)", None, [
+        rt.sub_anim("Length", rt.make_controller("Float_Script", keyable=False, script="sin (currentTime * 10)")),
+        rt.sub_anim("Height", None)])
+    rt.load_scene(1)
+    rt.animate_node(1, [rt.sub_anim("Visibility", None), transform, params])
+
+
+def tree(rows):
+    return [(depth, name, cls, keys, kind) for depth, name, _, cls, _, keys, kind, _ in rows]
+
+
+def test_controller_tree_drops_branches_without_controllers(rt, helpers):
+    build_node(rt)
+    rows = read_controller_tree(1, helpers)
+    assert tree(rows) == [
+        (1, "Transform", "Position_Rotation_Scale", -1, "procedural"),
+        (2, "Position", "Position_XYZ", -1, "procedural"),
+        (3, "X Position", "Bezier_Float", KEYS, "keyframe"),
+        (3, "Y Position", "Bezier_Float", KEYS, "keyframe"),
+        (3, "Z Position", "Bezier_Float", KEYS, "keyframe"),
+        (2, "Scale", "Bezier_Scale", 2, "keyframe"),
+        (1, "Object (Box)", "", -1, ""),
+        (2, "Length", "Float_Script", -1, "script")]
+    assert rows[-1][7] == "sin (currentTime * 10)"
+    assert tree(read_controller_tree(1, None)) == tree(rows)
+    assert tree(read_controller_tree(1, helpers, max_depth=1)) == [(1, "Transform", "Position_Rotation_Scale", -1,
+                                                                    "procedural")]
+
+
+@pytest.mark.parametrize("bulk", [True, False], ids=["bulk", "per-key"])
+def test_key_track_streams_every_key(rt, helpers, bulk):
+    build_node(rt)
+    handle = next(row[2] for row in read_controller_tree(1, helpers) if row[1] == "Y Position")
+    track = KeyTrack(handle, helpers if bulk else None)
+    steps = sum(1 for _ in track.load_steps(chunk_size=5))
+    assert track.is_complete() and len(track) == track.total == KEYS
+    assert (track.dims, track.value_class) == (1, "Float")
+    assert list(track.times) == [float(f * 2) for f in range(KEYS)]
+    assert list(track.value(4)) == [104.0]
+    assert track.row_at_frame(7) == 4 and track.row_at_frame(8) == 4
+    if bulk:
+        assert steps == 5  # ceil(23 / 5) controllerKeys calls
+
+
+def test_key_track_of_a_point3_controller(rt, helpers):
+    build_node(rt)
+    handle = next(row[2] for row in read_controller_tree(1, helpers) if row[1] == "Scale")
+    track = KeyTrack(handle, helpers)
+    for _ in track.load_steps():
+        pass
+    assert (track.dims, track.value_class) == (3, "Point3")
+    assert list(track.value(1)) == [2.0, 2.0, 2.5]
+
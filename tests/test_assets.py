@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from max_inspector.assets import AssetAudit, AssetStatCache, read_asset_refs
+
+
+@pytest.fixture
+def scene(rt, tmp_path):
+    """maps/a.png and maps/b.png (same content), maps/c.tga (other content); node 2 points at a missing file."""
+    (tmp_path / "maps").mkdir()
+    (tmp_path / "maps" / "a.png").write_bytes(b"same pixels")
+    (tmp_path / "maps" / "b.png").write_bytes(b"same pixels")
+    (tmp_path / "maps" / "c.tga").write_bytes(b"other pixels, larger")
+    paths = {1: ["maps/a.png", "maps/b.png"], 2: ["maps/a.png", "maps/missing.png"],
+             3: [str(tmp_path / "maps" / "c.tga")]}
+    rt.load_scene(3)
+
+    def make(handle):
+        maps = [rt.make_object("Bitmaptexture", "TextureMap", {"filename": path}, name=f"Map {handle}.{i}")
+                for i, path in enumerate(paths[handle])]
+        mat = rt.make_object("PhysicalMaterial", "Material", dict(zip(("base_color_map", "bump_map"), maps)),
+                             name=f"Mat {handle}")
+        obj = rt.make_object("Box", "GeometryClass", {})
+        obj.material = mat
+        return obj
+
+    rt.dress_nodes(make)
+    return tmp_path
+
+
+def key(root, *parts):
+    return os.path.normcase(os.path.normpath(os.path.join(str(root), *parts)))
+
+
+def test_read_asset_refs(rt, helpers, scene):
+    refs = read_asset_refs(helpers)
+    assert sorted((name, prop, path) for _, cls, name, prop, path in refs) == sorted([
+        ("Map 1.0", "filename", "maps/a.png"), ("Map 1.1", "filename", "maps/b.png"),
+        ("Map 2.0", "filename", "maps/a.png"), ("Map 2.1", "filename", "maps/missing.png"),
+        ("Map 3.0", "filename", str(scene / "maps" / "c.tga"))])
+    assert {cls for _, cls, _, _, _ in refs} == {"Bitmaptexture"}
+    assert sorted(ref[1:] for ref in read_asset_refs(None)) == sorted(ref[1:] for ref in refs)
+
+
+def test_audit_checks_each_file_once(rt, helpers, scene):
+    audit = AssetAudit(read_asset_refs(helpers), base_dir=str(scene), hash_files=True, workers=2).run()
+    assert len(audit.files) == 4  # maps/a.png is referenced twice
+    assert audit.missing() == [key(scene, "maps", "missing.png")]
+    assert audit.largest(1) == [(20, os.path.normpath(str(scene / "maps" / "c.tga")))]
+    assert audit.total_size() == 11 + 11 + 20
+    assert audit.duplicates() == [sorted(os.path.normpath(str(scene / "maps" / name)) for name in ("a.png", "b.png"))]
+    assert sorted(audit.owners(key(scene, "maps", "a.png"))) == [
+        'Bitmaptexture "Map 1.0".filename', 'Bitmaptexture "Map 2.0".filename']
+    assert audit.hashed == 3
+
+
+def test_audit_answers_from_the_cache(rt, helpers, scene, tmp_path):
+    refs = read_asset_refs(helpers)
+    cache_path = str(tmp_path / "assets.json")
+    cache = AssetStatCache(cache_path)
+    AssetAudit(refs, base_dir=str(scene), cache=cache, hash_files=True).run()
+    cache.save()
+
+    cache = AssetStatCache(cache_path)
+    assert len(cache) == 4
+    audit = AssetAudit(refs, base_dir=str(scene), cache=cache, hash_files=True).run()
+    assert (audit.from_cache, audit.hashed) == (4, 0)
+    assert len(audit.duplicates()) == 1
+
+    stale = AssetAudit(refs, base_dir=str(scene), cache=cache, hash_files=True, max_age=-1).run()
+    assert (stale.from_cache, stale.hashed) == (0, 0)  # re-stat'ed, digests kept for unchanged files
+    assert stale.results == audit.results
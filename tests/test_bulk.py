@@ -0,0 +1,36 @@
+import math
+
+from max_inspector.bulk import (MXS_BULK_VERSION, get_bulk_helpers, parse_bulk_records, parse_mxs_int,
+                                parse_mxs_numbers, unescape_bulk_field)
+from tests.fake_pymxs import mxs_escape
+
+
+def test_parse_mxs_int_strips_integer64_and_ptr_suffixes():
+    assert parse_mxs_int("42") == 42
+    assert parse_mxs_int("1099511627776L") == 1 << 40
+    assert parse_mxs_int("-7P") == -7
+
+
+def test_parse_mxs_numbers():
+    assert list(parse_mxs_numbers("1 -2.5 3e2\n1099511627776L 7P")) == [1.0, -2.5, 300.0, float(1 << 40), 7.0]
+    values = parse_mxs_numbers("1 #inf 2")
+    assert values[0] == 1.0 and math.isnan(values[1]) and values[2] == 2.0
+    assert len(parse_mxs_numbers("")) == 0
+
+
+def test_unescape_bulk_field_round_trips_the_maxscript_escaping():
+    for text in ("plain", "tab\there", "two\nlines\r\n", "back\\slash\\t", ""):
+        assert unescape_bulk_field(mxs_escape(text)) == text
+
+
+def test_parse_bulk_records_splits_lines_and_fields():
+    text = "a\t" + mxs_escape("b\tc") + "\t\n\nd\t" + mxs_escape("e\\f") + "\n"
+    assert list(parse_bulk_records(text)) == [["a", "b\tc", ""], ["d", "e\\f"]]
+
+
+def test_get_bulk_helpers_defines_the_struct_once(rt):
+    helpers = get_bulk_helpers()
+    assert helpers.version == MXS_BULK_VERSION
+    assert get_bulk_helpers() is helpers
+    rt._globals["MaxInspectorBulk"].version = MXS_BULK_VERSION - 1  # a session with an older definition
+    assert get_bulk_helpers() is not helpers
@@ -0,0 +1,119 @@
+import json
+import os
+
+import pytest
+
+from max_inspector import cache
+from max_inspector.cache import (BinaryClassCache, LayeredClassCache, pack_class_cache, read_json_class_cache,
+                                 write_class_cache, write_json_class_cache)
+
+ROWS = [("Box", "GeometryClass", "#(16, 0)", ""),
+        ("Bend", "Modifier", "#(17, 0)", "bend.dlm"),
+        ("Ünïcode", "Modifier", "#(18, 0)", "bend.dlm")]
+
+
+def test_binary_cache_round_trips_rows_and_meta(tmp_path):
+    path = str(tmp_path / "classes.bin")
+    write_class_cache(path, ROWS, {"category_counts": {"Modifier": 2}})
+    with BinaryClassCache(path) as cache:
+        assert len(cache) == 3
+        assert list(cache) == ROWS
+        assert cache[1] == ROWS[1]
+        assert cache.meta == {"category_counts": {"Modifier": 2}}
+        with pytest.raises(IndexError):
+            cache[3]
+
+
+def test_binary_cache_rejects_damaged_files(tmp_path):
+    path = str(tmp_path / "classes.bin")
+    data = bytearray(pack_class_cache(ROWS))
+    data[-3] ^= 0xFF
+    with open(path, "wb") as f:
+        f.write(data)
+    with pytest.raises(ValueError, match="checksum"):
+        BinaryClassCache(path)
+    with open(path, "wb") as f:
+        f.write(data[:-5])
+    with pytest.raises(ValueError, match="truncated"):
+        BinaryClassCache(path)
+
+
+def test_atomic_write_leaves_no_temp_files(tmp_path):
+    path = str(tmp_path / "classes.bin")
+    write_class_cache(path, ROWS)
+    write_class_cache(path, ROWS[:1])
+    assert sorted(os.listdir(tmp_path)) == ["classes.bin", "classes.bin.lock"]
+    with BinaryClassCache(path) as cache:
+        assert list(cache) == ROWS[:1]
+
+
+def test_json_cache_round_trips_rows(tmp_path):
+    path = str(tmp_path / "classes.json")
+    write_json_class_cache(path, ROWS)
+    with open(path) as f:
+        assert json.load(f)[0] == list(ROWS[0])
+    assert read_json_class_cache(path) == ROWS
+
+
+def read_only(monkeypatch, *paths):
+    """Makes writes to `paths` fail the way a read-only network share does (root ignores file modes)."""
+    write = cache.write_class_cache
+
+    def write_class_cache_unless_read_only(path, rows, meta=None):
+        if path in paths:
+            raise PermissionError(13, "Access is denied", path)
+        write(path, rows, meta)
+
+    monkeypatch.setattr(cache, "write_class_cache", write_class_cache_unless_read_only)
+
+
+def test_layered_cache_overlays_changed_categories(tmp_path, monkeypatch):
+    shared, user = str(tmp_path / "shared.bin"), str(tmp_path / "user" / "overlay.bin")
+    write_class_cache(shared, ROWS, {"version": "shared"})
+    read_only(monkeypatch, shared)
+    new_rows = ROWS[:2] + [("Twist", "Modifier", "#(19, 0)", "")]
+    saving = LayeredClassCache(shared, user)
+    assert saving.save(new_rows, {"version": "user"}) == user
+    assert isinstance(saving.last_write_error, PermissionError)
+    with BinaryClassCache(user) as overlay:
+        assert list(overlay) == [ROWS[1], new_rows[2]]  # only the Modifier category changed
+        assert overlay.meta["overlay_categories"] == ["Modifier"]
+
+    layered = LayeredClassCache(shared, user)
+    rows, meta = layered.load()
+    assert sorted(rows) == sorted(new_rows)
+    assert meta == {"version": "user"}
+    assert layered.sources == [shared, user]
+
+
+def test_layered_cache_skips_a_corrupt_layer(tmp_path):
+    shared, user = str(tmp_path / "shared.bin"), str(tmp_path / "overlay.bin")
+    write_class_cache(shared, ROWS)
+    with open(user, "wb") as f:
+        f.write(b"MXIC garbage")
+    layered = LayeredClassCache(shared, user)
+    rows, _ = layered.load()
+    assert rows == ROWS
+    assert [path for path, _ in layered.errors] == [user]
+
+
+def test_overlay_without_its_shared_cache_is_not_loaded(tmp_path, monkeypatch):
+    shared, user = str(tmp_path / "shared.bin"), str(tmp_path / "overlay.bin")
+    write_class_cache(shared, ROWS)
+    read_only(monkeypatch, shared)
+    LayeredClassCache(shared, user).save(ROWS[:1])
+    os.remove(shared)  # e.g. the network install was moved
+    layered = LayeredClassCache(shared, user)
+    assert layered.load() is None
+    assert layered.sources == [] and [path for path, _ in layered.errors] == [user]
+
+
+def test_whole_cache_overlay_loads_without_a_shared_cache(tmp_path, monkeypatch):
+    shared, user = str(tmp_path / "shared.bin"), str(tmp_path / "overlay.bin")
+    read_only(monkeypatch, shared)
+    layered = LayeredClassCache(shared, user)
+    assert layered.save(ROWS) == user
+    assert layered.load() == (ROWS, {})
+    monkeypatch.undo()
+    assert layered.save(ROWS) == shared and layered.last_write_error is None
+    assert not os.path.exists(user)  # the shared file took over
@@ -0,0 +1,116 @@
+import json
+import types
+
+import pytest
+
+from max_inspector import cli
+from max_inspector.cache import BinaryClassCache
+from tests.fake_pymxs import FakeFunction
+
+RUNTIME = ["--runtime", "tests.fake_pymxs"]  # the fixture's FakeRuntime (fake_pymxs.runtime)
+CLEAN_SECTIONS = ["--section", "Scene Info", "--section", "Scene Objects"]
+CLASSES = [("Box", "GeometryClass", "#(16, 0)", "prim.dlo"), ("Sphere", "GeometryClass", "#(17, 0)", "prim.dlo"),
+           ("Bend", "Modifier", "#(32, 0)", "mods.dlm"), ("Bezier_Float", "Controller", "#(8192, 0)", "")]
+
+
+@pytest.fixture
+def scene(rt):
+    rt.load_classes(CLASSES)
+    rt.load_scene(4)
+
+
+def test_json_report(rt, scene, tmp_path):
+    path = tmp_path / "scene.json"
+    assert cli.main(RUNTIME + ["--report", str(path)] + CLEAN_SECTIONS) == cli.EXIT_OK
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    assert set(report) == {"created", "scene", "sections"}
+    assert [section["section"] for section in report["sections"]] == ["Scene Info", "Scene Objects"]
+    objects = report["sections"][1]["lines"]
+    assert objects[:4] == [f"Node_{h:07d} (Box)" for h in range(1, 5)]
+    assert all("error" not in section for section in report["sections"])
+
+
+def test_ndjson_report_and_failed_sections(rt, scene, tmp_path):
+    path = tmp_path / "scene.ndjson"
+    status = cli.main(RUNTIME + ["--report", str(path), "--section", "Scene Info", "--section", "Units"])
+    assert status == cli.EXIT_PARTIAL  # the fake runtime has no rt.units
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["type"] for record in records] == ["report", "section", "section"]
+    assert set(records[0]) == {"type", "created", "scene"}
+    info, units = records[1:]
+    assert info["section"] == "Scene Info" and "error" not in info and info["lines"]
+    assert units["section"] == "Units" and units["error"] and units["lines"] == []
+
+
+def test_class_cache(rt, scene, tmp_path):
+    path = str(tmp_path / "classes.bin")
+    assert cli.main(RUNTIME + ["--cache", path]) == cli.EXIT_OK
+    with BinaryClassCache(path) as cache:
+        assert sorted(row[0] for row in cache) == sorted(name for name, _, _, _ in CLASSES)
+        assert cache.meta["category_counts"]["GeometryClass"] == 2
+
+
+def test_update_rescans_only_changed_categories(rt, scene, tmp_path, monkeypatch):
+    path = str(tmp_path / "classes.bin")
+    assert cli.main(RUNTIME + ["--cache", path]) == cli.EXIT_OK
+    scanned = []
+    scan_classes = cli.scan_classes
+
+    def recording_scan(categories, helpers):
+        scanned.append([name for name, _ in categories])
+        return scan_classes(categories, helpers)
+
+    monkeypatch.setattr(cli, "scan_classes", recording_scan)
+    assert cli.main(RUNTIME + ["--cache", path, "--update"]) == cli.EXIT_OK
+    assert scanned == []  # up to date: nothing re-scanned, the file is left alone
+
+    rt.load_classes(CLASSES + [("Twist", "Modifier", "#(33, 0)", "mods.dlm")])
+    assert cli.main(RUNTIME + ["--cache", path, "--update"]) == cli.EXIT_OK
+    assert scanned == [["Modifier"]]
+    with BinaryClassCache(path) as cache:
+        assert sorted(row[0] for row in cache) == ["Bend", "Bezier_Float", "Box", "Sphere", "Twist"]
+        assert cache.meta["category_counts"]["Modifier"] == 2
+
+
+def test_exit_statuses(rt, scene, tmp_path, capsys):
+    report = str(tmp_path / "scene.json")
+    assert cli.main(["--runtime", "no_such_runtime_module", "--report", report]) == cli.EXIT_NO_RUNTIME
+    assert "No 3ds Max runtime" in capsys.readouterr().err
+
+    rt.load_classes([])
+    assert cli.main(RUNTIME + ["--cache", str(tmp_path / "classes.bin")]) == cli.EXIT_FAILED
+    assert "Collected 0 classes" in capsys.readouterr().err
+    assert cli.main(RUNTIME + ["--report", str(tmp_path / "no_such_dir" / "scene.json")]) == cli.EXIT_FAILED
+
+    loads = []
+    rt._globals["loadMaxFile"] = FakeFunction(rt, "loadMaxFile", lambda path, quiet=False: loads.append(quiet))
+    assert cli.main(RUNTIME + ["--scene", "missing.max", "--report", report]) == cli.EXIT_FAILED
+    assert loads == [True]
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(RUNTIME)  # nothing to do
+    assert exit_info.value.code == cli.EXIT_USAGE
+
+
+def test_worst_status_wins(rt, scene, tmp_path):
+    rt._globals["loadMaxFile"] = FakeFunction(rt, "loadMaxFile", lambda path, quiet=False: True)
+    argv = RUNTIME + ["--scene", "shot.max", "--cache", str(tmp_path / "classes.bin"),
+                      "--report", str(tmp_path / "scene.json"), "--section", "Units"]
+    assert cli.main(argv) == cli.EXIT_PARTIAL
+
+
+def test_batch_argv_splits_the_mxs_string(rt, monkeypatch):
+    monkeypatch.setattr(cli.sys, "argv", ["max_inspector", "--report", "outside.json"])
+    assert cli.batch_argv() == ["--report", "outside.json"]  # no maxOps: not a 3dsmaxbatch run
+
+    args = {"args": '--scene "C:/shots/shot 01.max" --report C:/out/a.ndjson --section "Scene Info"'}
+    rt._globals["maxOps"] = types.SimpleNamespace(mxsCmdLineArgs=args)
+    rt._globals["GetDictValue"] = FakeFunction(rt, "GetDictValue", lambda d, key: d.get(key))
+    rt._globals["Name"] = FakeFunction(rt, "Name", str)
+    assert cli.batch_argv() == ["--scene", "C:/shots/shot 01.max", "--report", "C:/out/a.ndjson",
+                                "--section", "Scene Info"]
+
+    args.clear()  # 3dsmaxbatch without -mxsString
+    assert cli.batch_argv() == ["--report", "outside.json"]
@@ -0,0 +1,72 @@
+import pytest
+
+from max_inspector.index import ClassLookupIndex, ClassSearchIndex, ClassTable, group_class_rows, prepare_class_rows
+
+RAW_ROWS = [["Bend", "Modifier", "#(17, 0)", "bend.dlm"],
+            ["Box", "GeometryClass", "#(16, 0)", ""],
+            ["bend", "SpacewarpObject", "#(20, 0)", "bend.dlm"],
+            ["Box", "GeometryClass", "#(16, 0)", ""],
+            ["Omni", "Light", "#(4113, 0)", ""],
+            ["Twist", "", "#(19, 0)", ""]]
+
+
+@pytest.fixture(params=["tuples", "table"])
+def rows(request):
+    rows = prepare_class_rows(RAW_ROWS)
+    return rows if request.param == "tuples" else ClassTable(rows)
+
+
+def test_prepare_class_rows_dedupes_and_sorts_by_name():
+    rows = prepare_class_rows(RAW_ROWS)
+    assert [row[0] for row in rows] == ["Bend", "bend", "Box", "Omni", "Twist"]
+    assert all(isinstance(row, tuple) for row in rows)
+
+
+def test_class_table_stands_in_for_the_rows():
+    rows = prepare_class_rows(RAW_ROWS)
+    table = ClassTable(rows)
+    assert len(table) == len(rows)
+    assert list(table) == rows
+    assert [table[i] for i in range(len(rows))] == rows
+    assert table[-1] == rows[-1]
+    assert table[1:3] == rows[1:3]
+    assert sorted(table.superclasses) == ["", "GeometryClass", "Light", "Modifier", "SpacewarpObject"]
+
+
+def test_group_class_rows(rows):
+    by_super, by_plugin = group_class_rows(rows)
+    assert {k: list(v) for k, v in by_super.items()} == {
+        "Modifier": [0], "SpacewarpObject": [1], "GeometryClass": [2], "Light": [3], "<no_super>": [4]}
+    assert {k: list(v) for k, v in by_plugin.items()} == {"bend.dlm": [0, 1], "<core>": [2, 3, 4]}
+
+
+def test_lookup_index(rows):
+    index = ClassLookupIndex(rows)
+    assert index.rows_for_name("Bend") == [0]
+    assert index.rows_for_name("bend") == [1]
+    assert index.rows_for_name("BEND") == []
+    assert index.rows_for_name("Missing") == []
+    assert index.row_for_classid("#(4113, 0)") == 3
+    assert index.row_for_classid("#(1, 1)") is None
+
+
+def test_lookup_index_over_many_colliding_rows():
+    rows = prepare_class_rows([(f"Class_{i}", "Modifier", f"#({i}, 0)", "") for i in range(5000)] +
+                              [("Class_2500", "Helper", "#(2500, 1)", ""), ("CLASS_2500", "Helper", "#(2500, 2)", "")])
+    index = ClassLookupIndex(ClassTable(rows))
+    for row_id in (0, 1, 4999, len(rows) - 1):
+        assert index.rows_for_name(rows[row_id][0]) == [row_id]
+        assert index.row_for_classid(rows[row_id][2]) == row_id
+    same_name = [i for i, row in enumerate(rows) if row[0] == "Class_2500"]
+    assert len(same_name) == 2 and index.rows_for_name("Class_2500") == same_name
+
+
+def test_search_index(rows):
+    index = ClassSearchIndex(rows)
+    assert index.search("") is None
+    assert index.search("ben") == [0, 1]
+    assert index.search("bend.d") == [0, 1]  # narrows the previous hits, matches the plugin field
+    assert index.search("bo") == [2]
+    assert index.search("light") == [3]
+    assert index.search("endmod") == []  # never matches across fields
+    assert index.search("  OMNI ") == [3]
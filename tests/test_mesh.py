@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from max_inspector.mesh import MeshBuffer, MeshStats, component_labels  # noqa: E402  (after the NumPy skip)
+
+# A 2 x 2 quad, a triangle wound against its normals, an isolated vertex,
+# a face repeating an index and one pointing past the last vertex
+VERTS = [(0, 0, 0), (2, 0, 0), (2, 2, 0), (0, 2, 0), (5, 0, 0), (6, 0, 0), (5, 1, 0), (9, 9, 9)]
+FACES = [(0, 1, 2), (0, 2, 3), (4, 6, 5), (4, 4, 5), (0, 1, 99)]
+# The unit UV tile, with the lower right half mapped twice (the second time flipped)
+UVS = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+UV_FACES = [(0, 1, 2), (0, 2, 3), (0, 2, 1)]
+
+
+@pytest.fixture
+def mesh(rt):
+    rt.load_scene(2)
+    rt.set_mesh(1, VERTS, FACES, maps={1: (UVS, UV_FACES)})
+
+
+@pytest.mark.parametrize("bulk", [True, False], ids=["bulk", "per-vertex"])
+def test_mesh_buffer_maps_the_written_mesh(rt, helpers, mesh, bulk):
+    with MeshBuffer.read(1, helpers if bulk else None) as buffer:
+        assert (buffer.num_verts, buffer.num_faces, buffer.channels) == (8, 5, [(1, 4, 3)])
+        assert buffer.verts.tolist() == [list(map(float, v)) for v in VERTS]
+        assert buffer.faces.tolist() == [list(f) for f in FACES]
+        assert buffer.normals[:, 2].tolist() == [1.0] * 8
+        assert buffer.map_faces[1].tolist() == [list(f) for f in UV_FACES]
+        path = buffer.path
+    assert not os.path.exists(path)  # close() removed the temp file
+
+
+def test_mesh_buffer_of_a_node_without_a_mesh(rt, helpers, mesh):
+    rt.delete_nodes([2])
+    assert MeshBuffer.read(2, helpers) is None
+
+
+def test_mesh_stats(rt, helpers, mesh):
+    with MeshBuffer.read(1, helpers) as buffer:
+        stats = MeshStats(buffer, chunk_size=2, uv_resolution=64)
+    assert [b.tolist() for b in stats.bounds] == [[0, 0, 0], [9, 9, 9]]
+    assert stats.area == pytest.approx(4.5)
+    assert (stats.invalid_faces, stats.repeated_index_faces, stats.zero_area_faces) == (1, 1, 0)
+    assert (stats.inverted_faces, stats.isolated_verts, stats.zero_normals) == (1, 1, 0)
+    assert stats.elements() == 2 and stats.element_faces.tolist() == [2, 2]
+    (channel, verts, faces, bounds, flipped, zero, shells, covered, overlap), = stats.uv
+    assert (channel, verts, faces, flipped, zero, shells) == (1, 4, 3, 1, 0, 1)
+    assert [b.tolist() for b in bounds] == [[0, 0], [1, 1]]
+    assert covered == 100.0
+    assert overlap == pytest.approx(50.0, abs=2.0)
+
+
+def test_component_labels_join_chains_across_chunks():
+    # Each face links the previous one to a lower vertex, so labels travel down the whole chain
+    faces = np.array([(10, 11, 12), (8, 9, 10), (6, 7, 8), (4, 5, 6), (2, 3, 4), (0, 1, 2), (13, 14, 15)],
+                     dtype=np.int32)
+    labels = component_labels(faces, 17, chunk_size=2)
+    assert labels.tolist() == [0] * 13 + [13, 13, 13, 16]
+
+
+def test_component_labels_of_shuffled_meshes():
+    rng = np.random.default_rng(7)
+    count = 500
+    faces = rng.integers(0, count, size=(300, 3), dtype=np.int32)
+    parent = list(range(count))  # reference: sequential union-find
+
+    def root(v):
+        while parent[v] != v:
+            v = parent[v]
+        return v
+
+    for a, b, c in faces.tolist():
+        for u in (b, c):
+            ra, ru = root(a), root(u)
+            parent[max(ra, ru)] = min(ra, ru)
+    expected = [root(v) for v in range(count)]
+    for chunk_size in (1, 7, 1000):  # hooks onto the same root compete within a chunk
+        assert component_labels(faces, count, chunk_size=chunk_size).tolist() == expected
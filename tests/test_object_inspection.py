@@ -0,0 +1,107 @@
+import importlib.util
+import os
+
+import pytest
+
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from max_inspector.inspectors import OBJECT_INSPECTORS  # noqa: E402  (after the PySide6 skip)
+from max_inspector.results import NODE_CHANGE_EVENTS  # noqa: E402
+from max_inspector.scene import get_node_by_handle  # noqa: E402
+from tests.fake_pymxs import FakeTime  # noqa: E402
+
+SECTIONS = [name for name, _ in OBJECT_INSPECTORS]
+# The sections each kind of change is claimed to leave stale
+EXPECTED = {
+    "parameters": {"Properties", "Modifiers", "Base Params", "Custom Attributes"},
+    "modifiers": {"Properties", "Modifiers", "Methods", "Class Info", "Base Params", "Custom Attributes"},
+    "transform": {"Properties", "Controllers", "Custom Attributes"},
+    "material": {"Properties", "Material"},
+    "user_properties": {"Properties", "User Properties"},
+    "name": set(SECTIONS),
+    "node": {"Properties", "Custom Attributes", "User Properties"},
+}
+
+
+@pytest.fixture(scope="module")
+def inspector_module():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "3dsMaxInspector.py")
+    spec = importlib.util.spec_from_file_location("max_inspector_script", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    return module
+
+
+@pytest.fixture
+def inspector(rt, inspector_module):
+    """An inspector window over two nodes with a material and a modifier; computed sections go to `.computed`."""
+    rt.load_scene(2, nested=0)
+
+    def make(handle):
+        obj = rt.make_object("Box", "GeometryClass", {"length": 10.0, "segs": 4})
+        obj.material = rt.make_object("PhysicalMaterial", "Material", {"roughness": 0.5}, name=f"Mat_{handle}")
+        obj.modifiers.append(rt.make_object("Bend", "Modifier", {"angle": 30.0}, name="Bend"))
+        return obj
+
+    rt.dress_nodes(make)
+
+    class TestInspector(inspector_module.MaxInspector):
+        def load_from_cache(self):
+            return False
+
+        def log(self, text):
+            pass
+
+        def log_lines(self, lines):
+            self.report.append(list(lines))
+
+    ui = TestInspector()
+    ui.report, ui.computed = [], []
+    cache = ui._inspection_cache
+    put = cache.put
+    cache.put = lambda handle, section, time, lines: ui.computed.append(section) or put(handle, section, time, lines)
+    yield ui
+    ui.close()
+
+
+def click(ui, handle):
+    ui.report, ui.computed = [], []
+    ui.inspect_object_all(get_node_by_handle(handle))
+    return ui.report
+
+
+@pytest.mark.parametrize("kind", sorted(NODE_CHANGE_EVENTS))
+def test_each_change_kind_recomputes_exactly_its_sections(rt, inspector, kind):
+    click(inspector, 1)
+    click(inspector, 2)
+    for event in NODE_CHANGE_EVENTS[kind]:
+        click(inspector, 1)
+        assert inspector.computed == []
+        rt.edit_nodes([1], event)
+        click(inspector, 1)
+        assert set(inspector.computed) == EXPECTED[kind], event
+        click(inspector, 2)
+        assert inspector.computed == []  # the other node keeps all of its sections
+
+
+def test_a_material_edit_keeps_the_other_seven_sections(rt, inspector):
+    before = click(inspector, 1)
+    rt._node_object(1).material = rt.make_object("PhysicalMaterial", "Material", {"roughness": 0.9},
+                                                 name="Chrome")
+    rt.edit_nodes([1], "materialOtherEvent")
+    after = click(inspector, 1)
+    assert inspector.computed == ["Properties", "Material"]
+    changed = [name for name, old, new in zip(SECTIONS, before, after) if old != new]
+    assert "Material" in changed and set(changed) <= {"Properties", "Material"}
+    assert any("Chrome" in line for line in after[SECTIONS.index("Material")])
+    inspector._inspection_cache.clear()
+    assert click(inspector, 1) == after  # the replayed sections match a fresh inspection
+
+
+def test_time_change_recomputes_only_animated_sections(rt, inspector):
+    click(inspector, 1)
+    rt._globals["currentTime"] = FakeTime(rt, 10)
+    click(inspector, 1)
+    assert set(inspector.computed) == set(SECTIONS) - {"Methods", "Class Info", "User Properties"}
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from max_inspector import runtime
+from max_inspector.profiling import (Profiler, ProfiledRuntime, active_profiler, disable_profiling,
+                                     enable_profiling, profile_scope)
+from max_inspector.runtime import rt as engine_rt
+from tests.fake_pymxs import FakeFunction, FakeNode
+
+
+@pytest.fixture
+def profiler(rt):
+    rt.load_scene(3)
+    profiler = enable_profiling()
+    yield profiler
+    disable_profiling()
+
+
+def test_profiled_values_are_unwrapped_in_args_and_kwargs(rt, profiler):
+    received = []
+
+    def probe(*args, **kwargs):
+        received.append((args, kwargs))
+        return True
+
+    rt._globals["probe"] = FakeFunction(rt, "probe", probe)
+    node = engine_rt.getAnimByHandle(1)
+    node_class = engine_rt.classOf(node)
+    assert engine_rt.probe(node_class, node, quiet=engine_rt.classOf, target=node_class, flag=True)
+    (args, kwargs), = received
+    assert args == (rt.classOf(node), node)
+    assert kwargs["quiet"] is rt._globals["classOf"] and kwargs["target"] is args[0]
+    assert kwargs["flag"] is True
+    assert all(type(value).__name__ != "_ProfiledValue" for value in (*args, *kwargs.values()))
+
+
+def test_calls_are_recorded_per_scope(rt, profiler):
+    with profile_scope("Inspect Node"):
+        for handle in (1, 2, 3):
+            engine_rt.isValidNode(engine_rt.getAnimByHandle(handle))
+        with profile_scope("Properties"):
+            engine_rt.maxFilePath
+    counts = {(scope, call): count for (scope, call), (count, _) in profiler.calls.items()}
+    assert counts == {("Inspect Node", "getAnimByHandle"): 3, ("Inspect Node", "isValidNode"): 3,
+                      ("Inspect Node / Properties", "rt.maxFilePath"): 1}
+    assert [scope for scope, _, _ in profiler.summary()][:1] == ["Inspect Node"]
+
+
+def test_disable_restores_the_previous_runtime(rt):
+    assert runtime.runtime_override() is rt
+    profiler = enable_profiling()
+    assert isinstance(runtime.runtime_override(), ProfiledRuntime)
+    assert enable_profiling() is profiler  # enabling twice does not wrap the wrapper
+    assert runtime.runtime_override()._runtime is rt
+    disable_profiling()
+    assert runtime.runtime_override() is rt and active_profiler() is None
+    assert profile_scope("Off") is profile_scope("Still off")
+    disable_profiling()
+    assert runtime.runtime_override() is rt
+
+
+def test_chrome_trace_is_valid_and_nested(rt, profiler, tmp_path):
+    with profile_scope("Job"):
+        with profile_scope("Page"):
+            engine_rt.getAnimByHandle(1)
+            engine_rt.getAnimByHandle(2)
+        engine_rt.classOf(FakeNode(rt, 3))
+    path = tmp_path / "trace.json"
+    written = profiler.write_chrome_trace(str(path))
+    with open(path, encoding="utf-8") as f:
+        trace = json.load(f)
+    events = trace["traceEvents"]
+    assert written == len(events) == 5
+    # Complete ("X") events carry their own end, so every begin has exactly one matching end
+    assert {event["ph"] for event in events} == {"X"}
+    assert all(event["dur"] >= 0 and event["ts"] >= 0 for event in events)
+    spans = {event["args"]["scope"]: (event["ts"], event["ts"] + event["dur"])
+             for event in events if event["cat"] == "scope"}
+    assert set(spans) == {"Job", "Job / Page"}
+    for event in events:
+        start, end = spans[event["args"]["scope"]]
+        assert start <= event["ts"] and event["ts"] + event["dur"] <= end + 0.001  # inside its scope
+    assert spans["Job"][0] <= spans["Job / Page"][0] and spans["Job / Page"][1] <= spans["Job"][1] + 0.001
+
+
+def test_event_buffer_keeps_the_newest_events(rt):
+    profiler = Profiler(max_events=4)
+    for i in range(10):
+        profiler.record(f"call{i}", float(i), 0.0)
+    assert [event[0] for event in profiler.events] == ["call6", "call7", "call8", "call9"]
+    assert sum(count for count, _ in profiler.calls.values()) == 10
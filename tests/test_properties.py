@@ -0,0 +1,70 @@
+from max_inspector import properties
+from max_inspector.properties import PropertySchemaCache, property_snapshot
+
+PROPS = {"radius": 25.0, "segs": 32, "smooth": True}
+
+
+def test_schema_key_is_one_call_per_value(rt):
+    schemas = PropertySchemaCache()
+    box = rt.make_object("Box", "GeometryClass", PROPS)
+    schemas.schema_key(box)  # defines MaxInspectorSchemaKey
+    class_id = rt.Box._class_id
+    rt.reset_counts()
+    assert schemas.schema_key(box) == "GeometryClass|Box|" + class_id
+    assert rt.calls == {"MaxInspectorSchemaKey()": 1}
+
+
+def test_schema_key_tracks_custom_attribute_definitions(rt):
+    schemas = PropertySchemaCache()
+    plain = rt.make_object("Box", "GeometryClass", PROPS)
+    with_ca = rt.make_object("Box", "GeometryClass", PROPS, ca_sources=["attributes Rig (parameters p ())"])
+    redefined = rt.make_object("Box", "GeometryClass", PROPS, ca_sources=["attributes Rig (parameters p (w))"])
+    keys = [schemas.schema_key(value) for value in (plain, with_ca, redefined)]
+    assert len(set(keys)) == 3 and all(key.startswith("GeometryClass|Box|") for key in keys)
+
+
+def test_values_without_a_key_are_read_uncached(rt):
+    schemas = PropertySchemaCache()
+    scripted = rt.make_object("MyScriptedBox", "GeometryClass", PROPS, scripted=True)
+    assert schemas.schema_key(scripted) is None
+    assert schemas.schema_key(rt.wrap("Point3", "[0,0,0]")) is None  # no class ID
+    assert schemas.schema_key(1.5) is None
+    schemas.read(scripted)
+    schemas.read(scripted)
+    assert (len(schemas), schemas.hits, schemas.misses) == (0, 0, 2)
+
+
+def test_cached_reads_match_uncached_reads(rt):
+    schemas = PropertySchemaCache()
+    values = [rt.make_object("Box", "GeometryClass", dict(PROPS, radius=float(i))) for i in range(3)]
+    reads = [schemas.read(value) for value in values]
+    assert (len(schemas), schemas.hits, schemas.misses) == (1, 2, 1)
+    assert reads[2] == [("radius", "Float", "2.0"), ("segs", "Integer", "32"), ("smooth", "BooleanClass", "True")]
+    rt.reset_counts()
+    schemas.read(values[0])
+    assert "rt.getPropNames" not in rt.calls and "getPropNames()" not in rt.calls
+
+
+def test_schema_key_when_the_function_cannot_be_defined(rt, monkeypatch):
+    def execute(source):
+        raise RuntimeError("-- Syntax error")
+
+    monkeypatch.setitem(rt._globals, "execute", execute)
+    schemas = PropertySchemaCache()
+    box = rt.make_object("Box", "GeometryClass", PROPS)
+    assert schemas.schema_key(box) is None
+    assert schemas.schema_key(box) is None
+    assert len(schemas.read(box)) == 3
+
+
+def test_property_snapshot_falls_back_to_the_schema_cache(rt, monkeypatch):
+    box = rt.make_object("Box", "GeometryClass", PROPS)
+    bulk = property_snapshot(box)
+
+    def helpers_unavailable():
+        raise RuntimeError("MaxInspectorBulk could not be defined")
+
+    monkeypatch.setattr(properties, "get_bulk_helpers", helpers_unavailable)
+    schemas = PropertySchemaCache()
+    assert property_snapshot(box, schemas) == bulk
+    assert property_snapshot(box) == []
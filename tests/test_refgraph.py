@@ -0,0 +1,65 @@
+from max_inspector.refgraph import RefGraphWalker
+
+
+def build_scene(rt):
+    """Two nodes sharing a Multimaterial whose two sub-materials share a map; two maps reference each other."""
+    shared = rt.make_object("Bitmaptexture", "TextureMap", {}, name="Shared")
+    mix_a = rt.make_object("Mix", "TextureMap", {}, name="Mix A")
+    mix_b = rt.make_object("Mix", "TextureMap", {}, name="Mix B")
+    mix_a._add_ref("Map 1", mix_b)
+    mix_b._add_ref("Map 1", mix_a)  # a cycle
+    subs = []
+    for i in range(2):
+        sub = rt.make_object("PhysicalMaterial", "Material", {}, name=f"Sub {i}")
+        sub._add_ref("base_color_map", shared)
+        subs.append(sub)
+    subs[1]._add_ref("bump_map", mix_a)
+    multi = rt.make_object("Multimaterial", "Material", {}, name="Multi")
+    for i, sub in enumerate(subs, 1):
+        multi._add_ref(f"Sub-Material {i}", sub)
+    rt.load_scene(2)
+
+    def make(handle):
+        obj = rt.make_object("Editable_Poly", "GeometryClass", {}, name=f"Poly {handle}")
+        obj.material = multi
+        return obj
+
+    rt.dress_nodes(make)
+
+
+def names(entries):
+    return [(depth, slot, name, first) for depth, _, slot, _, _, name, first in entries]
+
+
+def test_walk_lists_shared_anims_once(rt, helpers):
+    build_scene(rt)
+    walker = RefGraphWalker(helpers)
+    assert names(walker.walk(1)) == [
+        (1, "Object", "Poly 1", True),
+        (1, "Material", "Multi", True),
+        (2, "Sub-Material 1", "Sub 0", True),
+        (3, "base_color_map", "Shared", True),
+        (2, "Sub-Material 2", "Sub 1", True),
+        (3, "base_color_map", "Shared", False),
+        (3, "bump_map", "Mix A", True),
+        (4, "Map 1", "Mix B", True),
+        (5, "Map 1", "Mix A", False)]  # the cycle ends at the anim seen before
+    assert walker.fetches == 5  # one refChildren call per level of new anims
+
+
+def test_walk_reuses_the_children_read_before(rt, helpers):
+    build_scene(rt)
+    walker = RefGraphWalker(helpers)
+    walker.walk(1)
+    fetches, calls = walker.fetches, rt.total_calls
+    entries = walker.walk(2)
+    assert entries[1][5] == "Multi" and len(entries) == 9
+    assert walker.fetches == fetches + 2  # the second node and its own object; the material tree is known
+    assert rt.total_calls == calls + 2
+
+
+def test_walk_stops_at_max_depth(rt, helpers):
+    build_scene(rt)
+    entries = RefGraphWalker(helpers).walk(1, max_depth=2)
+    assert max(e[0] for e in entries) == 2
+    assert names(entries)[-1] == (2, "Sub-Material 2", "Sub 1", True)
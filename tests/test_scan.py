@@ -0,0 +1,115 @@
+import os
+
+from max_inspector.scan import (SCAN_SUPERCLASSES, diff_class_fingerprint, get_class_fingerprint,
+                                get_scan_categories, iter_class_fingerprint, iter_class_scan, scan_category_bulk,
+                                scan_category_per_class)
+
+CLASSES = [("Bend", "Modifier", "#(17, 0)", "bend.dlm"),
+           ("Twist", "Modifier", "#(19, 0)", ""),
+           ("Box", "GeometryClass", "#(16, 0)", ""),
+           ("Odd\tName", "Helper", "", "helpers.dlo"),
+           ("Bezier_Float", "Controller", "#(8192, 0)", "")]
+
+
+def scan(helpers):
+    rows, failed = [], []
+    steps = list(iter_class_scan(get_scan_categories()[0], helpers, rows, failed, log=lambda text: None))
+    return rows, failed, steps
+
+
+def test_scan_categories_include_controllers(rt):
+    categories, error = get_scan_categories()
+    assert error is None
+    assert [name for name, _ in categories] == list(SCAN_SUPERCLASSES) + ["Controller"]
+
+
+def test_bulk_scan_matches_the_per_class_scan(rt, helpers):
+    rt.load_classes(CLASSES)
+    bulk_rows, bulk_failed, _ = scan(helpers)
+    per_class_rows, per_class_failed, _ = scan(None)
+    assert sorted(bulk_rows) == sorted(per_class_rows) == sorted(CLASSES)
+    assert bulk_failed == per_class_failed == []
+    assert scan_category_bulk("Helper", rt.Helper, helpers) == ([CLASSES[3]], [])  # tab survives the escaping
+
+
+def test_scan_steps_report_each_category(rt, helpers):
+    rt.load_classes(CLASSES)
+    steps = [step for step in scan(helpers)[2] if step is not None]
+    names = list(SCAN_SUPERCLASSES) + ["Controller"]
+    assert steps[0::2] == [(i, name, None) for i, name in enumerate(names)]
+    counts = {name: n for _, name, n in steps[1::2]}
+    assert counts["Modifier"] == 2 and counts["Light"] == 0 and counts["Controller"] == 1
+
+
+def test_scan_falls_back_per_class_when_the_bulk_call_fails(rt, helpers, monkeypatch):
+    rt.load_classes(CLASSES)
+
+    def scan_classes(self, superclass):
+        raise RuntimeError("-- Runtime error: scanClasses")
+
+    monkeypatch.setattr(type(helpers), "scanClasses", scan_classes)
+    rows, failed, steps = scan(helpers)
+    assert sorted(rows) == sorted(CLASSES)
+    assert None in steps  # per-class steps
+    assert scan_category_per_class("Modifier", rt.Modifier) == (CLASSES[:2], [])
+
+
+def test_fingerprint_diff_picks_the_categories_to_rescan(rt, helpers, tmp_path):
+    plugin = tmp_path / "bend.dlm"
+    plugin.write_bytes(b"v1")
+    (tmp_path / "readme.txt").write_text("not a plugin")
+    rt.plugin_dirs = [str(tmp_path)]
+    rt.load_classes(CLASSES)
+    categories, _ = get_scan_categories()
+    old = get_class_fingerprint(categories, helpers)
+    assert list(old["plugin_files"]) == [os.path.normcase(str(plugin))]
+    assert old["category_counts"]["Modifier"] == 2
+
+    assert diff_class_fingerprint(old, get_class_fingerprint(categories, helpers), CLASSES) == (set(), [])
+
+    plugin.write_bytes(b"version 2")  # the plugin was updated: its classes' category is rescanned
+    rt.load_classes(CLASSES + [("Omni", "Light", "#(4113, 0)", "")])  # and a light class appeared
+    changed, changed_files = diff_class_fingerprint(old, get_class_fingerprint(categories, helpers), CLASSES)
+    assert changed == {"Modifier", "Light"}
+    assert changed_files == [os.path.normcase(str(plugin))]
+
+
+def test_fingerprint_steps_read_the_counts_before_the_plugin_folders(rt, helpers, tmp_path):
+    for d in ("a", "b"):
+        (tmp_path / d).mkdir()
+        (tmp_path / d / f"{d}.dlm").write_bytes(b"plugin")
+    rt.plugin_dirs = [str(tmp_path / "a"), str(tmp_path / "b")]
+    rt.load_classes(CLASSES)
+    categories, _ = get_scan_categories()
+    fingerprint = {}
+    steps = iter_class_fingerprint(categories, helpers, fingerprint)
+    next(steps)
+    assert fingerprint["category_counts"]["Modifier"] == 2 and fingerprint["plugin_files"] == {}
+    rt.reset_counts()
+    steps.close()  # a caller that saw the counts change stops here
+    assert rt.total_calls == 0
+    assert get_class_fingerprint(categories, helpers)["plugin_files"].keys() == {
+        os.path.normcase(str(tmp_path / d / f"{d}.dlm")) for d in ("a", "b")}
+
+
+def test_bulk_crossings_do_not_grow_with_the_class_count(rt, helpers):
+    """Guards the bulk paths: one scanClasses call per category however many classes there are."""
+    crossings = []
+    for count in (30, 3000):
+        rt.load_classes([(f"Class{i}", ("Modifier", "GeometryClass", "Material")[i % 3], f"#({i}, 0)", "")
+                         for i in range(count)])
+        categories, _ = get_scan_categories()
+        rt.reset_counts()
+        rows, failed = [], []
+        for _ in iter_class_scan(categories, helpers, rows, failed, log=lambda text: None):
+            pass
+        assert len(rows) == count
+        assert rt.calls == {"MaxInspectorBulk.scanClasses()": len(categories)}
+        rt.reset_counts()
+        get_class_fingerprint(categories, helpers)
+        crossings.append(rt.total_calls)
+    assert crossings[0] == crossings[1] <= 2 * len(categories) + 1  # .classes.count per category, pluginDirs()
+
+    rt.reset_counts()
+    scan_category_per_class("Modifier", rt.Modifier)
+    assert rt.total_calls >= 1000  # what every category would cost per class without the bulk helpers
@@ -0,0 +1,71 @@
+import types
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from max_inspector.results import NODE_CHANGE_EVENTS  # noqa: E402  (after the PySide6 skip)
+from max_inspector.ui.base import SceneEventWatcher  # noqa: E402
+
+
+@pytest.fixture
+def watcher(rt):
+    rt.load_scene(5)
+    watcher = SceneEventWatcher()
+    watcher.batches, watcher.edits = [], []
+    watcher.changed.connect(lambda added, deleted, renamed: watcher.batches.append((added, deleted, renamed)))
+    watcher.modified.connect(lambda handles, kind: watcher.edits.append((handles, kind)))
+    watcher.start()
+    yield watcher
+    watcher.stop()
+
+
+def test_scene_changes_are_coalesced(rt, watcher):
+    new = rt.create_nodes(["A", "B"])
+    rt.delete_nodes([new[1], 2])  # B was created and deleted within the window
+    rt.rename_node(3, "Renamed")
+    rt.rename_node(new[0], "A2")  # a new node's name is read when it is added
+    assert watcher.batches == []
+    watcher.flush()
+    assert watcher.batches == [({new[0]}, {2}, {3})]
+    watcher.flush()
+    assert len(watcher.batches) == 1
+
+
+def test_edits_are_emitted_right_away_with_their_kind(rt, watcher):
+    for kind, events in NODE_CHANGE_EVENTS.items():
+        for event in events:
+            rt.edit_nodes([4], event)
+    expected = [([4], kind) for kind, events in NODE_CHANGE_EVENTS.items() for _ in events]
+    assert watcher.edits == expected
+    assert watcher.batches == []
+
+
+def test_handlers_are_plain_functions(rt, watcher):
+    callback, = rt._node_callbacks
+    assert all(isinstance(handler, (types.FunctionType, types.MethodType)) for handler in callback._handlers.values())
+
+
+def test_stop_unregisters_the_callback(rt, watcher):
+    watcher.stop()
+    rt.create_nodes(["Late"])
+    rt.edit_nodes([1], "materialOtherEvent")
+    watcher.flush()
+    assert watcher.batches == [] and watcher.edits == []
+    assert rt._node_callbacks == []  # disabled, then dropped by gc
+
+
+def test_registration_failure_propagates_and_start_can_retry(rt, monkeypatch):
+    def unavailable(**handlers):
+        raise RuntimeError("-- Type error: NodeEventCallback")
+
+    node_event_callback = rt._globals["NodeEventCallback"]
+    monkeypatch.setitem(rt._globals, "NodeEventCallback", unavailable)
+    watcher = SceneEventWatcher()
+    with pytest.raises(RuntimeError):
+        watcher.start()
+    assert rt._node_callbacks == []
+    monkeypatch.setitem(rt._globals, "NodeEventCallback", node_event_callback)
+    watcher.start()
+    assert len(rt._node_callbacks) == 1
+    watcher.stop()
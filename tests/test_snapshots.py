@@ -0,0 +1,182 @@
+import json
+import shutil
+import sqlite3
+import zlib
+
+import pytest
+
+from max_inspector.batch import BatchRecordSource
+from max_inspector.snapshots import (SceneSnapshot, SnapshotDiff, SnapshotWriter, iter_capture_snapshot,
+                                     snapshot_digest, split_digests, split_snapshot_records)
+
+
+def dress_scene(rt, count=40):
+    """`count` nested nodes sharing two materials and one instanced Bend modifier."""
+    rt.load_scene(count, nested=0.5)
+    materials = [rt.make_object("PhysicalMaterial", "Material", {"roughness": 0.1 * i}, name=f"Mat_{i}")
+                 for i in range(2)]
+    bend = rt.make_object("Bend", "Modifier", {"angle": 45.0}, name="Bend")
+
+    def make(handle):
+        obj = rt.make_object("Sphere", "GeometryClass", {"radius": float(handle), "segments": 32})
+        obj.material = materials[handle % 2]
+        if handle % 3 == 0:
+            obj.modifiers.append(bend)
+        return obj
+
+    rt.dress_nodes(make)
+
+
+def capture(helpers, path, scene="C:/shots/a.max"):
+    writer = SnapshotWriter(path)
+    for _ in iter_capture_snapshot(helpers, BatchRecordSource(helpers).handles("scene"), writer, chunk_size=7):
+        pass
+    writer.close({"scene": scene})
+    return SceneSnapshot(path)
+
+
+def renumber(path, copy):
+    """A copy of a snapshot with every anim handle reassigned, the way reloading the scene does."""
+    shutil.copyfile(path, copy)
+    with sqlite3.connect(copy) as db:
+        db.execute("UPDATE nodes SET handle = -handle")  # through negatives to keep the handles unique
+        db.execute("UPDATE nodes SET handle = 1000 - handle * 7")
+    return SceneSnapshot(copy)
+
+
+def downgrade(snapshot, path):
+    """
+    Rewrites a snapshot in format version 1: no path column, and the node's
+    own section keeps its anim handle in the O line and has no H line.
+    """
+    with sqlite3.connect(path) as db:
+        db.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE nodes (handle INTEGER PRIMARY KEY, name TEXT, digest BLOB, sections BLOB);
+            CREATE TABLE sections (digest BLOB PRIMARY KEY, data BLOB) WITHOUT ROWID;
+        """)
+        for handle, (name, _, joined, _) in snapshot.nodes().items():
+            digests = split_digests(joined)
+            lines = [line for line in snapshot.section(digests[0]).split("\n") if not line.startswith("H\t")]
+            lines[0] = f"O\t{handle}\t" + lines[0].split("\t", 2)[2]
+            own = "\n".join(lines).encode("utf-8")
+            digests[0] = snapshot_digest(own)
+            for digest in digests:
+                data = own if digest == digests[0] else snapshot.section(digest).encode("utf-8")
+                db.execute("INSERT OR IGNORE INTO sections VALUES (?, ?)", (digest, zlib.compress(data)))
+            joined = b"".join(digests)
+            db.execute("INSERT INTO nodes VALUES (?, ?, ?, ?)", (handle, name, snapshot_digest(joined), joined))
+        db.executemany("INSERT INTO meta VALUES (?, ?)",
+                       [(k, json.dumps(v)) for k, v in dict(snapshot.meta, version=1).items()])
+    snapshot.close()
+    return SceneSnapshot(path)
+
+
+def test_records_split_into_shareable_sections(rt, helpers):
+    dress_scene(rt, 9)
+    records = list(split_snapshot_records(helpers.snapshotRecords([3, 9])))
+    assert [(h, name) for h, name, _, _ in records] == [(3, "Node_0000003"), (9, "Node_0000009")]
+    _, _, path, sections = records[0]
+    assert path.endswith("Node_0000003")
+    assert len(sections) == 3  # node, material, modifier
+    assert "\t3\t" not in sections[0]  # the anim handle is not part of the digest
+    assert sections[0] != records[1][3][0]
+    assert sections[1:] == records[1][3][1:]  # the shared material and instanced modifier digest the same
+
+
+def test_snapshot_stores_shared_sections_once(rt, helpers, tmp_path):
+    dress_scene(rt, 40)
+    snapshot = capture(helpers, str(tmp_path / "a.snapshot"))
+    assert snapshot.meta["nodes"] == 40
+    assert len(snapshot.nodes()) == 40
+    with sqlite3.connect(snapshot.path) as db:
+        sections = db.execute("SELECT COUNT(*) FROM sections").fetchone()[0]
+    assert sections == 40 + 2 + 1  # every node's own section, two materials, one modifier
+    snapshot.close()
+
+
+def test_diff_reports_changed_added_and_removed_nodes(rt, helpers, tmp_path):
+    dress_scene(rt, 40)
+    old = capture(helpers, str(tmp_path / "old.snapshot"))
+    vars(rt._node_object(5))["_props"]["radius"] = -1.0
+    rt.rename_node(8, "Renamed")
+    rt.user_props[9] = "exportable = true"
+    rt.delete_nodes([12])
+    rt.create_nodes(["New"])
+    new = capture(helpers, str(tmp_path / "new.snapshot"))
+
+    diff = SnapshotDiff(old, new)
+    assert diff.handles_matched and diff.warnings == []
+    assert [diff.name(node) for node in diff.changed] == ["Node_0000005", "Node_0000009", "Renamed"]
+    assert [diff.name(node) for node in diff.added] == ["New"]
+    assert diff.removed == [(12, None)]
+    assert diff.unchanged == 40 - 1 - 3
+    assert diff.changes((5, 5)) == [("Properties", "radius", "(Float) 5.0", "(Float) -1.0")]
+    assert ("Node", "Name", "Node_0000008", "Renamed") in diff.changes((8, 8))
+    assert diff.changes((9, 9)) == [("User Properties", "", "", "exportable = true")]
+    added = dict(((group, key), new_value) for group, key, old_value, new_value in diff.changes(diff.added[0]))
+    assert added[("Node", "Name")] == "New"
+    diff.close()
+
+
+def test_diff_matches_reassigned_handles_on_paths(rt, helpers, tmp_path):
+    dress_scene(rt, 40)
+    old = capture(helpers, str(tmp_path / "old.snapshot"))
+    vars(rt._node_object(5))["_props"]["radius"] = -1.0
+    rt.rename_node(8, "Renamed")
+    capture(helpers, str(tmp_path / "new.snapshot")).close()
+    new = renumber(str(tmp_path / "new.snapshot"), str(tmp_path / "reloaded.snapshot"))
+
+    diff = SnapshotDiff(old, new)
+    assert not diff.handles_matched
+    assert len(diff.warnings) == 1 and "matched on their hierarchy path" in diff.warnings[0]
+    assert diff.changed == [(5, 1000 + 5 * 7)]
+    assert diff.changes(diff.changed[0]) == [("Properties", "radius", "(Float) 5.0", "(Float) -1.0")]
+    # The renamed node and the nodes below it have new paths, so they show as removed and added
+    removed, added = {diff.name(node) for node in diff.removed}, {diff.name(node) for node in diff.added}
+    assert removed - added == {"Node_0000008"} and added - removed == {"Renamed"}
+    assert diff.unchanged == 40 - 1 - len(removed)
+    diff.close()
+
+
+@pytest.mark.parametrize("downgraded", ["old", "new"])
+def test_diff_of_version_1_and_version_2_snapshots(rt, helpers, tmp_path, downgraded):
+    dress_scene(rt, 40)
+    old = capture(helpers, str(tmp_path / "old.snapshot"))
+    vars(rt._node_object(5))["_props"]["radius"] = -1.0
+    rt.rename_node(8, "Renamed")
+    rt.delete_nodes([12])
+    new = capture(helpers, str(tmp_path / "new.snapshot"))
+    if downgraded == "old":
+        old = downgrade(old, str(tmp_path / "old_v1.snapshot"))
+    else:
+        new = downgrade(new, str(tmp_path / "new_v1.snapshot"))
+
+    diff = SnapshotDiff(old, new)
+    assert diff.mixed and diff.handles_matched
+    assert len(diff.warnings) == 1 and "format versions" in diff.warnings[0]
+    assert [diff.name(node) for node in diff.changed] == ["Node_0000005", "Renamed"]
+    assert diff.removed == [(12, None)] and diff.added == []
+    assert diff.unchanged == 40 - 1 - 2
+    assert diff.changes((5, 5)) == [("Properties", "radius", "(Float) 5.0", "(Float) -1.0")]
+    assert diff.changes((8, 8)) == [("Node", "Name", "Node_0000008", "Renamed")]  # the path is not compared
+    diff.close()
+
+
+def test_diff_warns_about_different_scene_files(rt, helpers, tmp_path):
+    dress_scene(rt, 10)
+    old = capture(helpers, str(tmp_path / "old.snapshot"), scene="C:/shots/a.max")
+    new = capture(helpers, str(tmp_path / "new.snapshot"), scene="C:/shots/b.max")
+    diff = SnapshotDiff(old, new)
+    assert diff.unchanged == 10
+    assert len(diff.warnings) == 1 and "different scene files" in diff.warnings[0]
+    diff.close()
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    path = tmp_path / "notes.snapshot"
+    path.write_text("not a database")
+    with pytest.raises(ValueError):
+        SceneSnapshot(str(path))
+    with pytest.raises(FileNotFoundError):
+        SceneSnapshot(str(tmp_path / "missing.snapshot"))
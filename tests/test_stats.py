@@ -0,0 +1,88 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from max_inspector.stats import SCENE_STATS_COLUMNS, SceneStats  # noqa: E402  (after the NumPy skip)
+
+
+@pytest.fixture
+def scene(rt):
+    """30 nodes: Box/Sphere geometry and Line shapes, three materials on two of every three nodes, 0-2 modifiers."""
+    rt.load_scene(30)
+    materials = [rt.make_object("PhysicalMaterial", "Material", {}, name=f"Mat_{i}") for i in range(3)]
+
+    def make(handle):
+        if handle % 5 == 0:
+            obj = rt.make_object("Line", "Shape", {})
+        else:
+            obj = rt.make_object("Box" if handle % 2 else "Sphere", "GeometryClass", {})
+        obj.material = materials[handle % 3] if handle % 3 else None
+        for m in range(handle % 3):
+            obj.modifiers.append(rt.make_object("Bend", "Modifier", {}))
+        return obj
+
+    rt.dress_nodes(make)
+    return [(h, *rt._node_geometry(h)) for h in range(1, 31)]
+
+
+def test_gather_reads_every_node(rt, helpers, scene):
+    stats = SceneStats.gather(helpers, page_size=7)
+    assert len(stats) == 30
+    assert stats.column("handle").tolist() == list(range(1, 31))
+    assert stats.column("faces").tolist() == [faces for _, faces, _, _, _ in scene]
+    assert stats.totals() == {"faces": sum(faces for _, faces, _, _, _ in scene),
+                              "verts": sum(verts for _, _, verts, _, _ in scene),
+                              "modifiers": sum(h % 3 for h in range(1, 31))}
+
+
+def test_bulk_and_per_node_gather_agree(rt, helpers, scene):
+    bulk, per_node = SceneStats.gather(helpers), SceneStats.gather(None)
+    for name in SCENE_STATS_COLUMNS:
+        assert bulk.column(name).tolist() == per_node.column(name).tolist()
+    assert bulk.by_class() == per_node.by_class()
+    assert bulk.by_superclass() == per_node.by_superclass()
+
+
+def test_group_bys(rt, helpers, scene):
+    stats = SceneStats.gather(helpers)
+    by_class = {name: (nodes, faces) for name, nodes, faces, _ in stats.by_class()}
+    lines = [row for row in scene if row[0] % 5 == 0]
+    assert by_class["Line"] == (len(lines), sum(faces for _, faces, _, _, _ in lines))
+    assert by_class["Box"][0] == 12 and by_class["Sphere"][0] == 12
+    assert [(name, nodes) for name, nodes, _, _ in stats.by_superclass()] == [("GeometryClass", 24), ("Shape", 6)]
+
+    unique, without, shared = stats.material_reuse()
+    assert (unique, without) == (2, 10)  # handle % 3 == 0 has no material, so Mat_0 is never used
+    assert sorted(nodes for _, nodes in shared) == [10, 10]
+    assert stats.modifier_histogram() == [(0, 10), (1, 10), (2, 10)]
+    assert sum(nodes for _, nodes in stats.face_histogram()) == 30
+
+
+def test_extents(rt, helpers, scene):
+    lo, hi = SceneStats.gather(helpers).extents()
+    assert lo.tolist() == [min(row[3][axis] for row in scene) for axis in range(3)]
+    assert hi.tolist() == [max(row[4][axis] for row in scene) for axis in range(3)]
+    rt.load_scene(0)
+    assert SceneStats.gather(helpers).extents() is None
+
+
+def test_gather_skips_nodes_deleted_between_pages(rt, helpers, scene, monkeypatch):
+    scene_stats = type(helpers).sceneStats
+    pages = []
+
+    def scene_stats_while_editing(self, handles):
+        pages.append(list(handles))
+        result = scene_stats(self, handles)
+        if len(pages) == 1:  # the user edits the scene after the first page
+            rt.delete_nodes([3, 12, 25])
+            rt.create_nodes(["Late"])
+        return result
+
+    monkeypatch.setattr(type(helpers), "sceneStats", scene_stats_while_editing)
+    stats = SceneStats.gather(helpers, page_size=10)
+    assert [len(page) for page in pages] == [10, 10, 10]  # the handles were taken before the edit
+    kept = [h for h in range(1, 31) if h not in (12, 25)]  # node 3 was already read
+    assert stats.column("handle").tolist() == kept
+    assert stats.column("faces").tolist() == [rt._node_geometry(h)[0] for h in kept]
+    classes = [stats.class_names[code] for code in stats.class_codes]
+    assert classes == [rt._node_object(h)._cls._name for h in kept]  # class codes stay aligned with the rows